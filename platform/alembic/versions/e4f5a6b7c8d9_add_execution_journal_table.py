@@ -0,0 +1,44 @@
+"""add_execution_journal_table
+
+Revision ID: e4f5a6b7c8d9
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4f5a6b7c8d9'
+down_revision: Union[str, Sequence[str], None] = 'c5d6e7f8a9b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "execution_journal",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("execution_id", sa.String(36), nullable=False),
+        sa.Column("node_id", sa.String(255), nullable=False),
+        sa.Column("route", sa.String(255), nullable=True),
+        sa.Column("state_delta", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(
+            ["execution_id"], ["workflow_executions.execution_id"], ondelete="CASCADE",
+        ),
+    )
+    op.create_index(
+        "ix_execution_journal_execution_id", "execution_journal", ["execution_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_execution_journal_execution_id", table_name="execution_journal")
+    op.drop_table("execution_journal")
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import logging
+
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 
@@ -9,6 +11,12 @@ from models.node import BaseComponentConfig, ModelComponentConfig, TriggerCompon
 from models.scheduled_job import ScheduledJob
 from models.user import UserProfile, UserRole
 from models.workflow import Workflow
+from services.topology import invalidate_topology_cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds a client is asked to wait before retrying a trigger rejected by backpressure
+BACKPRESSURE_RETRY_AFTER_SECONDS = 5
 
 
 def get_workflow(slug: str, profile: UserProfile, db: Session) -> Workflow:
@@ -25,6 +33,38 @@ def get_workflow(slug: str, profile: UserProfile, db: Session) -> Workflow:
     return wf
 
 
+def check_backpressure() -> None:
+    """Reject a new execution with a 503 while the execution queues are full."""
+    from services.admission import BackpressureError, check_backpressure as _check
+
+    try:
+        _check()
+    except BackpressureError as exc:
+        raise backpressure_unavailable(exc)
+
+
+def backpressure_unavailable(exc: Exception) -> HTTPException:
+    """The 503 returned for a trigger rejected by ``BackpressureError``."""
+    return HTTPException(
+        status_code=503,
+        detail=str(exc),
+        headers={"Retry-After": str(BACKPRESSURE_RETRY_AFTER_SECONDS)},
+    )
+
+
+def invalidate_topology(workflow_id: int) -> None:
+    """Invalidate the workflow's compiled topologies after a committed edit.
+
+    Best-effort: the edit is already saved, so a failure is only logged.
+    New executions may then run the previous version until its entry
+    expires (``TOPOLOGY_CACHE_TTL``) or the next edit invalidates it.
+    """
+    try:
+        invalidate_topology_cache(workflow_id)
+    except Exception:
+        logger.exception("Failed to invalidate topology cache for workflow %s", workflow_id)
+
+
 def serialize_config(cc: BaseComponentConfig) -> dict:
     """Serialize a component config to the ComponentConfigData shape."""
     result = {
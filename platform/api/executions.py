@@ -10,21 +10,22 @@ from sqlalchemy.orm import Session
 
 import logging
 
-import redis
 from rq import Queue
 
-from auth import get_current_user
+from auth import get_current_user, require_admin
 from components.agent import _get_checkpointer
-from config import settings
 from database import get_db
-from models.execution import ExecutionLog, WorkflowExecution
+from models.execution import ExecutionJournalEntry, ExecutionLog, WorkflowExecution
 from models.node import WorkflowNode
 from models.user import UserProfile, UserRole
 from models.workflow import Workflow
 from schemas.execution import ChatMessageIn, ChatMessageOut, ExecutionDetailOut, ExecutionOut
+from services import admission, blob_store
 from services.execution_recovery import on_execution_job_failure
+from services.queues import CONTROL_QUEUE
+from services.redis_pool import get_redis_binary
 from tasks import execute_workflow_job
-from api._helpers import get_workflow
+from api._helpers import check_backpressure, get_workflow
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +53,21 @@ def list_executions(
     return {"items": [_serialize_execution(e, db) for e in executions], "total": total}
 
 
+@router.get("/admission/")
+def admission_stats(profile: UserProfile = Depends(require_admin)):
+    """Admitted and waiting execution counts, queue depth and concurrency limits."""
+    return admission.stats()
+
+
+def _log_output(output):
+    """A logged node output, loading it from the blob store if it was offloaded."""
+    try:
+        return blob_store.resolve(output)
+    except OSError:
+        logger.warning("Blob for logged output %s is unavailable", output, exc_info=True)
+        return output
+
+
 @router.get("/{execution_id}/", response_model=ExecutionDetailOut)
 def get_execution(
     execution_id: str,
@@ -78,7 +94,7 @@ def get_execution(
             "node_id": log.node_id,
             "status": log.status,
             "input": log.input,
-            "output": log.output,
+            "output": _log_output(log.output),
             "error": log.error,
             "error_code": log.error_code,
             "metadata": log.log_metadata,
@@ -163,6 +179,9 @@ def batch_delete_executions(
     db.query(ExecutionLog).filter(
         ExecutionLog.execution_id.in_(owned_exec_ids),
     ).delete(synchronize_session=False)
+    db.query(ExecutionJournalEntry).filter(
+        ExecutionJournalEntry.execution_id.in_(owned_exec_ids),
+    ).delete(synchronize_session=False)
     db.query(WorkflowExecution).filter(
         WorkflowExecution.execution_id.in_(owned_exec_ids),
     ).delete(synchronize_session=False)
@@ -217,6 +236,7 @@ def send_chat_message(
     if not trigger_node:
         raise HTTPException(status_code=404, detail="No chat trigger found.")
 
+    check_backpressure()
     execution = WorkflowExecution(
         workflow_id=workflow.id,
         trigger_node_id=trigger_node.id,
@@ -230,8 +250,7 @@ def send_chat_message(
 
     # Enqueue via RQ — frontend connects via WebSocket to stream results
     try:
-        rq_conn = redis.from_url(settings.REDIS_URL)
-        queue = Queue("workflows", connection=rq_conn)
+        queue = Queue(CONTROL_QUEUE, connection=get_redis_binary())
         queue.enqueue(
             execute_workflow_job,
             str(execution.execution_id),
@@ -7,14 +7,12 @@ import re
 import uuid
 from datetime import datetime, timezone
 
-import redis
 from sqlalchemy.exc import IntegrityError
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from rq import Queue
 from sqlalchemy.orm import Session
 
 from auth import verify_gateway_token
-from config import settings
 from database import get_db
 from handlers import dispatch_event
 from models.execution import PendingTask
@@ -22,7 +20,11 @@ from models.node import WorkflowNode
 from models.user import UserProfile
 from models.workflow import Workflow
 from schemas.inbound import GatewayInboundMessage
+from api._helpers import backpressure_unavailable
+from services.admission import BackpressureError
 from services.gateway_client import get_gateway_client
+from services.queues import CONTROL_QUEUE
+from services.redis_pool import get_redis_binary
 
 logger = logging.getLogger(__name__)
 
@@ -119,14 +121,17 @@ def inbound_webhook(
     }
 
     # 8. Dispatch event
-    execution = dispatch_event(
-        "gateway_inbound",
-        event_data,
-        user_profile,
-        db,
-        workflow_id=wf.id,
-        trigger_node_id=node.node_id,
-    )
+    try:
+        execution = dispatch_event(
+            "gateway_inbound",
+            event_data,
+            user_profile,
+            db,
+            workflow_id=wf.id,
+            trigger_node_id=node.node_id,
+        )
+    except BackpressureError as exc:
+        raise backpressure_unavailable(exc)
 
     if execution is None:
         raise HTTPException(
@@ -199,12 +204,8 @@ def _handle_confirmation(
 
     # confirm → resume execution
     # Enqueue BEFORE committing the delete so we don't lose the task on crash
-    conn = redis.from_url(settings.REDIS_URL)
-    try:
-        queue = Queue("workflows", connection=conn)
-        queue.enqueue(resume_workflow_job, str(execution.execution_id), action)
-    finally:
-        conn.close()
+    queue = Queue(CONTROL_QUEUE, connection=get_redis_binary())
+    queue.enqueue(resume_workflow_job, str(execution.execution_id), action)
 
     db.delete(pending)
     db.commit()
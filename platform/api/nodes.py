@@ -21,7 +21,7 @@ from models.node import (
 from models.scheduled_job import ScheduledJob
 from models.user import UserProfile
 from schemas.node import EdgeIn, EdgeOut, EdgeUpdate, NodeIn, NodeOut, NodeUpdate
-from api._helpers import get_workflow, serialize_edge, serialize_node
+from api._helpers import get_workflow, invalidate_topology, serialize_edge, serialize_node
 from services.scheduler import pause_scheduled_job, resume_scheduled_job, start_scheduled_job
 from ws.broadcast import broadcast
 
@@ -164,6 +164,7 @@ def create_node(
         else:
             raise HTTPException(status_code=409, detail=f"Node with id '{node_id}' already exists.")
     db.refresh(node)
+    invalidate_topology(wf.id)
     result = serialize_node(node, db)
     broadcast(f"workflow:{slug}", "node_created", result)
     return result
@@ -218,6 +219,7 @@ def update_node(
         setattr(node, attr, value)
 
     db.commit()
+    invalidate_topology(wf.id)
     db.refresh(node)
     result = serialize_node(node, db)
     broadcast(f"workflow:{slug}", "node_updated", result)
@@ -273,6 +275,7 @@ def delete_node(
     if cc:
         db.delete(cc)
     db.commit()
+    invalidate_topology(wf.id)
     broadcast(f"workflow:{slug}", "node_deleted", {"node_id": deleted_node_id})
 
 
@@ -482,6 +485,7 @@ def create_edge(
         _link_sub_component(db, wf.id, payload.source_node_id, payload.target_node_id, "llm_model_config_id")
 
     db.commit()
+    invalidate_topology(wf.id)
     db.refresh(edge)
     result = serialize_edge(edge)
     broadcast(f"workflow:{slug}", "edge_created", result)
@@ -507,6 +511,7 @@ def update_edge(
     for attr, value in payload.model_dump(exclude_unset=True).items():
         setattr(edge, attr, value)
     db.commit()
+    invalidate_topology(wf.id)
     db.refresh(edge)
     result = serialize_edge(edge)
     broadcast(f"workflow:{slug}", "edge_updated", result)
@@ -536,4 +541,5 @@ def delete_edge(
     deleted_edge_id = edge.id
     db.delete(edge)
     db.commit()
+    invalidate_topology(wf.id)
     broadcast(f"workflow:{slug}", "edge_deleted", {"id": deleted_edge_id})
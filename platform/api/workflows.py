@@ -11,7 +11,7 @@ from database import get_db
 from models.user import UserProfile, UserRole
 from models.workflow import Workflow
 from schemas.workflow import WorkflowDetailOut, WorkflowIn, WorkflowOut, WorkflowUpdate
-from api._helpers import get_workflow, serialize_workflow, serialize_workflow_detail
+from api._helpers import get_workflow, invalidate_topology, serialize_workflow, serialize_workflow_detail
 from ws.broadcast import broadcast
 
 router = APIRouter()
@@ -97,6 +97,8 @@ def update_workflow(
     for attr, value in payload.model_dump(exclude_unset=True).items():
         setattr(wf, attr, value)
     db.commit()
+    # Compiled topologies embed the slug.
+    invalidate_topology(wf.id)
     db.refresh(wf)
     result = serialize_workflow(wf, db)
     broadcast(f"workflow:{slug}", "workflow_updated", result)
@@ -123,8 +125,11 @@ def delete_workflow(
     profile: UserProfile = Depends(get_current_user),
 ):
     wf = get_workflow(slug, profile, db)
+    workflow_id = wf.id
     db.delete(wf)
     db.commit()
+    # Workflow ids can be reused; never let a new one pick up this one's topology
+    invalidate_topology(workflow_id)
 
 
 class BatchDeleteWorkflowsIn(BaseModel):
@@ -147,6 +152,9 @@ def batch_delete_workflows(
             .filter(Workflow.slug.in_(payload.slugs), Workflow.owner_id == profile.id)
             .all()
         )
+    workflow_ids = [wf.id for wf in workflows]
     for wf in workflows:
         db.delete(wf)
     db.commit()
+    for workflow_id in workflow_ids:
+        invalidate_topology(workflow_id)
@@ -0,0 +1,4 @@
+"""Micro-benchmarks for hot paths. Run a module directly, e.g.
+
+    cd platform && python -m benchmarks.expressions
+"""
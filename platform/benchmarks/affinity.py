@@ -0,0 +1,76 @@
+"""Micro-benchmark for the per-hop state cost of EXECUTION_AFFINITY.
+
+Runs a linear chain of nodes over one execution whose state holds an agent
+conversation: each hop loads the state, adds a node output and a reply, and
+saves it, as ``_execute_node`` does. Without affinity every hop reads the
+whole state back from Redis; with it the worker checks out the state it
+saved on the previous hop after one version GET. Redis is fakeredis with a
+simulated network round-trip time added to every request sent.
+
+    cd platform && python -m benchmarks.affinity [--rtt-ms 0.5] [--turns 5,20,50] [--hops 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from unittest.mock import patch
+
+import fakeredis
+import redis
+from langchain_core.messages import AIMessage
+
+from benchmarks.fanout import _SlowConnection
+from benchmarks.state_codec import _conversation
+from config import settings
+from services import orchestrator
+from services.redis_pool import _CountingRedis, count_commands
+
+EXECUTION_ID = "bench"
+
+
+def _run_chain(turns: int, hops: int, affinity: bool) -> tuple[int, int, float]:
+    r = _CountingRedis(connection_pool=redis.ConnectionPool(
+        connection_class=_SlowConnection, server=fakeredis.FakeServer(), decode_responses=True,
+    ))
+    with (
+        patch.object(orchestrator, "_redis", return_value=r),
+        patch.object(settings, "EXECUTION_AFFINITY", affinity),
+    ):
+        orchestrator.save_state(EXECUTION_ID, {"messages": _conversation(turns), "route": "", "node_outputs": {}})
+        with count_commands() as counter:
+            start = time.perf_counter()
+            for hop in range(hops):
+                state = orchestrator.load_state(EXECUTION_ID)
+                reply = AIMessage(content=f"Reply {hop}", id=f"hop-{hop}")
+                state["messages"] = state["messages"] + [reply]
+                state["node_outputs"][f"node_{hop}"] = {"output": reply.content}
+                orchestrator.save_state(EXECUTION_ID, state)
+                orchestrator._remember_state(EXECUTION_ID, state)
+            elapsed = time.perf_counter() - start
+        orchestrator._forget_state(EXECUTION_ID)
+    return counter.round_trips, counter.commands, elapsed / hops * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="simulated Redis round-trip time")
+    parser.add_argument("--turns", default="5,20,50", help="comma-separated conversation sizes (4 messages per turn)")
+    parser.add_argument("--hops", type=int, default=20, help="nodes in the chain")
+    args = parser.parse_args()
+
+    _SlowConnection.rtt = args.rtt_ms / 1e3
+    print(f"simulated RTT {args.rtt_ms} ms, {args.hops} hops; per hop:\n")
+    print(f"{'turns':>5} {'cold':>30} {'affinity':>30}")
+    for turns in (int(t) for t in args.turns.split(",")):
+        cold = _run_chain(turns, args.hops, affinity=False)
+        hot = _run_chain(turns, args.hops, affinity=True)
+        print(
+            f"{turns:>5}"
+            f" {cold[0] / args.hops:5.1f} rt {cold[1] / args.hops:5.1f} cmd {cold[2]:7.2f} ms"
+            f" {hot[0] / args.hops:5.1f} rt {hot[1] / args.hops:5.1f} cmd {hot[2]:7.2f} ms ({cold[2] / hot[2]:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Micro-benchmark for services.expressions.
+
+Compares resolving a node's templated config the old way (re-parsing every
+template on every call, copying the whole context) with the compiled-template
+cache, for a workflow with many upstream node outputs.
+
+    cd platform && python -m benchmarks.expressions [--outputs 200] [--number 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from services import expressions
+from services.expressions import resolve_config_expressions, resolve_expressions
+
+SYSTEM_PROMPT = (
+    "You are helping {{ trigger.user }}. The customer tier is {{ lookup_1.tier | upper }} "
+    "and their last order was {{ orders_2.last.id }}."
+)
+
+CONFIG = {
+    "url": "https://api.example.com/orders/{{ orders_2.last.id }}",
+    "headers": {"Authorization": "Bearer {{ secrets_1.token }}", "Accept": "application/json"},
+    "retries": 3,
+    "fields": ["id", "status", "{{ lookup_1.tier }}"],
+    "options": {"timeout": 30, "verify": True, "labels": ["a", "b", "c"]},
+}
+
+STATIC_CONFIG = {
+    "conversation_memory": True,
+    "max_wall_time": 600,
+    "compacting": "summarize",
+    "options": {"timeout": 30, "labels": ["a", "b", "c"]},
+}
+
+
+def _uncached_resolve(template_str: str, node_outputs: dict, trigger: dict | None = None) -> str:
+    """The pre-cache implementation, kept here as the baseline."""
+    if not template_str or "{{" not in template_str:
+        return template_str
+    context = dict(node_outputs)
+    if trigger is not None:
+        context["trigger"] = trigger
+    try:
+        return expressions._env.from_string(template_str).render(context)
+    except Exception:
+        return template_str
+
+
+def _node_outputs(count: int) -> dict:
+    outputs = {f"node_{i}": {"output": f"value {i}", "extra": list(range(10))} for i in range(count)}
+    outputs["lookup_1"] = {"tier": "gold"}
+    outputs["orders_2"] = {"last": {"id": 4211}}
+    outputs["secrets_1"] = {"token": "t0k3n"}
+    return outputs
+
+
+def _report(label: str, seconds: float, number: int, baseline: float | None = None) -> None:
+    per_call_us = seconds / number * 1e6
+    speedup = f"  ({baseline / seconds:.1f}x)" if baseline else ""
+    print(f"{label:<38} {per_call_us:9.2f} us/call{speedup}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--outputs", type=int, default=200, help="upstream node outputs in state")
+    parser.add_argument("--number", type=int, default=2000, help="calls per measurement")
+    args = parser.parse_args()
+
+    node_outputs = _node_outputs(args.outputs)
+    trigger = {"user": "Ada"}
+    assert resolve_expressions(SYSTEM_PROMPT, node_outputs, trigger) == _uncached_resolve(
+        SYSTEM_PROMPT, node_outputs, trigger
+    )
+
+    print(f"{args.outputs} upstream outputs, {args.number} calls each\n")
+
+    baseline = timeit.timeit(lambda: _uncached_resolve(SYSTEM_PROMPT, node_outputs, trigger), number=args.number)
+    _report("system prompt, re-parsed each call", baseline, args.number)
+    cached = timeit.timeit(lambda: resolve_expressions(SYSTEM_PROMPT, node_outputs, trigger), number=args.number)
+    _report("system prompt, compiled cache", cached, args.number, baseline)
+
+    def uncached_config(value):
+        if isinstance(value, str):
+            return _uncached_resolve(value, node_outputs, trigger)
+        if isinstance(value, dict):
+            return {k: uncached_config(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [uncached_config(v) if isinstance(v, (str, dict)) else v for v in value]
+        return value
+
+    baseline = timeit.timeit(lambda: uncached_config(CONFIG), number=args.number)
+    _report("templated extra_config, re-parsed", baseline, args.number)
+    cached = timeit.timeit(lambda: resolve_config_expressions(CONFIG, node_outputs, trigger), number=args.number)
+    _report("templated extra_config, cached", cached, args.number, baseline)
+
+    baseline = timeit.timeit(lambda: uncached_config(STATIC_CONFIG), number=args.number)
+    _report("template-free extra_config, copied", baseline, args.number)
+    cached = timeit.timeit(lambda: resolve_config_expressions(STATIC_CONFIG, node_outputs, trigger), number=args.number)
+    _report("template-free extra_config, shared", cached, args.number, baseline)
+
+    info = expressions.compile_template.cache_info()
+    print(f"\ntemplate cache: {info.hits} hits, {info.misses} misses, {info.currsize}/{info.maxsize} entries")
+
+
+if __name__ == "__main__":
+    main()
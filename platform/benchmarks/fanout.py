@@ -0,0 +1,108 @@
+"""Micro-benchmark for enqueueing a node's successors.
+
+Launches one loop iteration with a body of N target nodes, either as the
+orchestrator used to (an inflight ``INCR`` and a separately executed RQ
+enqueue per target) or batched on one pipeline, and reports Redis
+round-trips, commands and hop latency per fan-out width. Redis is
+fakeredis with a simulated network round-trip time added to every request
+sent, so the numbers show what the round-trips cost on a real network.
+``--delay`` measures delayed (``_delay_seconds``) targets instead.
+
+    cd platform && python -m benchmarks.fanout [--rtt-ms 0.5] [--widths 1,5,10,25,50,100] [--delay]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from unittest.mock import patch
+
+import fakeredis
+import redis
+from rq import Queue
+
+from services import orchestrator
+from services.redis_pool import _CountingRedis, count_commands
+
+EXECUTION_ID = "bench"
+
+
+class _SlowConnection(fakeredis.FakeRedisConnection):
+    rtt = 0.0
+
+    def send_packed_command(self, command, check_health=True):
+        time.sleep(self.rtt)
+        return super().send_packed_command(command, check_health)
+
+
+def _per_target(loop_node_id: str, topo_data: dict, delay_seconds: float | None) -> None:
+    """The pre-batching loop body launch, kept here as the baseline."""
+    r = orchestrator._redis()
+    r.delete(orchestrator._loop_iter_done_key(EXECUTION_ID, loop_node_id, 0))
+    for target_id in topo_data["loop_bodies"][loop_node_id]:
+        r.incr(orchestrator._inflight_key(EXECUTION_ID))
+        orchestrator._enqueue_node_job(
+            EXECUTION_ID, target_id,
+            loop_iteration=0, delay_seconds=delay_seconds, topo_data=topo_data,
+        )
+
+
+def _batched(loop_node_id: str, topo_data: dict, delay_seconds: float | None) -> None:
+    orchestrator._advance_loop_body(EXECUTION_ID, loop_node_id, topo_data, "bench", delay_seconds=delay_seconds)
+
+
+def _measure(launch, width: int, delay_seconds: float | None, repeat: int) -> tuple[int, int, float]:
+    server = fakeredis.FakeServer()
+
+    def client(decode: bool) -> redis.Redis:
+        return _CountingRedis(connection_pool=redis.ConnectionPool(
+            connection_class=_SlowConnection, server=server, decode_responses=decode,
+        ))
+
+    r = client(True)
+    q = Queue("workflows", connection=client(False))
+    q.get_redis_server_version()  # cached per Queue, as _queue() reuses it
+    targets = [f"node_{i}" for i in range(width)]
+    topo_data = {
+        "loop_bodies": {"loop": targets},
+        "nodes": {t: {"node_id": t, "component_type": "code"} for t in targets},
+        "workflow_slug": "bench",
+    }
+    with (
+        patch.object(orchestrator, "_redis", return_value=r),
+        patch.object(orchestrator, "_queue", return_value=q),
+        patch.object(orchestrator, "_publish_event"),
+    ):
+        best = float("inf")
+        for _ in range(repeat):
+            with count_commands() as counter:
+                start = time.perf_counter()
+                launch("loop", topo_data, delay_seconds)
+                best = min(best, time.perf_counter() - start)
+    return counter.round_trips, counter.commands, best * 1e3
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="simulated Redis round-trip time")
+    parser.add_argument("--widths", default="1,5,10,25,50,100", help="comma-separated fan-out widths")
+    parser.add_argument("--delay", action="store_true", help="enqueue delayed targets")
+    parser.add_argument("--repeat", type=int, default=5, help="launches per measurement (best is reported)")
+    args = parser.parse_args()
+
+    _SlowConnection.rtt = args.rtt_ms / 1e3
+    delay_seconds = 5.0 if args.delay else None
+    print(f"simulated RTT {args.rtt_ms} ms, {'delayed' if args.delay else 'immediate'} targets\n")
+    print(f"{'width':>5} {'per target':>30} {'batched':>30}")
+    for width in (int(w) for w in args.widths.split(",")):
+        before = _measure(_per_target, width, delay_seconds, args.repeat)
+        after = _measure(_batched, width, delay_seconds, args.repeat)
+        print(
+            f"{width:>5}"
+            f" {before[0]:>5} rt {before[1]:>5} cmd {before[2]:>7.2f} ms"
+            f" {after[0]:>5} rt {after[1]:>5} cmd {after[2]:>7.2f} ms ({before[2] / after[2]:5.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
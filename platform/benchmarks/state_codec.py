@@ -0,0 +1,144 @@
+"""Micro-benchmark for services.state_codec.
+
+Encodes the fields of a realistic agent-conversation execution state (the
+``messages`` list as ``messages_to_dict`` produces it, tool results and node
+outputs) with each JSON encoder and compression setting, and reports bytes
+stored in Redis and encode/decode time per save. ``json, none`` is how state
+was written before the codec. msgpack is shown for reference only: its
+binary output cannot go through the text Redis client without base85.
+
+    cd platform && python -m benchmarks.state_codec [--turns 20] [--number 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from config import settings
+from services import state_codec
+from services.state import serialize_state
+
+CONFIGURATIONS = [
+    ("json", "none"),
+    ("orjson", "none"),
+    ("json", "zlib"),
+    ("orjson", "zlib"),
+    ("orjson", "zstd"),
+]
+
+
+def _conversation(turns: int) -> list:
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(
+            content=f"Can you check the status of order {1000 + i} and tell me when it will arrive?",
+            id=f"human-{i}",
+            additional_kwargs={"timestamp": f"2025-01-15T10:{i % 60:02d}:00Z"},
+        ))
+        messages.append(AIMessage(
+            content="",
+            id=f"run-{i}-0",
+            tool_calls=[{"name": "lookup_order", "args": {"order_id": str(1000 + i)}, "id": f"call_{i}"}],
+            usage_metadata={"input_tokens": 900 + 40 * i, "output_tokens": 24, "total_tokens": 924 + 40 * i},
+            response_metadata={"model_name": "claude-sonnet-4-20250514", "stop_reason": "tool_use", "id": f"msg_{i}a"},
+        ))
+        messages.append(ToolMessage(
+            content=json.dumps({
+                "order_id": 1000 + i,
+                "status": "in_transit",
+                "carrier": "UPS",
+                "events": [
+                    {"at": f"2025-01-{10 + d:02d}T08:00:00Z", "location": "Distribution center", "note": "Departed facility"}
+                    for d in range(5)
+                ],
+            }),
+            tool_call_id=f"call_{i}",
+            name="lookup_order",
+            id=f"tool-{i}",
+        ))
+        messages.append(AIMessage(
+            content=(
+                f"Order {1000 + i} is on its way with UPS. It left the distribution center this morning "
+                "and should arrive within two business days. I'll let you know if anything changes."
+            ),
+            id=f"run-{i}-1",
+            usage_metadata={"input_tokens": 1100 + 40 * i, "output_tokens": 48, "total_tokens": 1148 + 40 * i},
+            response_metadata={"model_name": "claude-sonnet-4-20250514", "stop_reason": "end_turn", "id": f"msg_{i}b"},
+        ))
+    return messages
+
+
+def _fields(turns: int) -> dict:
+    """Fields of one execution state, as save_state encodes them."""
+    messages = serialize_state({"messages": _conversation(turns)})["messages"]
+    return {
+        "messages": messages,
+        "trigger": {"text": "Where is my order?", "chat_id": 42, "payload": {"source": "telegram"}},
+        "node_outputs.agent_1": {"output": messages[-1]["data"]["content"]},
+        "node_outputs.categorizer_1": {"category": "order_status", "raw": '{"category": "order_status"}'},
+        "node_results.agent_1": {
+            "status": "success", "data": {"output": "..."}, "metadata": {"token_usage": {"input_tokens": 900}},
+            "started_at": "2025-01-15T10:00:00Z", "completed_at": "2025-01-15T10:00:03Z",
+        },
+    }
+
+
+def _measure(fields: dict, number: int) -> tuple[int, float, float]:
+    encoded = {k: state_codec.encode(v) for k, v in fields.items()}
+    size = sum(len(v.encode()) for v in encoded.values())
+    encode_s = timeit.timeit(lambda: [state_codec.encode(v) for v in fields.values()], number=number)
+    decode_s = timeit.timeit(lambda: [state_codec.decode(v) for v in encoded.values()], number=number)
+    return size, encode_s / number * 1e6, decode_s / number * 1e6
+
+
+def _msgpack_reference(fields: dict, number: int) -> tuple[int, float, float] | None:
+    try:
+        import ormsgpack
+    except ImportError:
+        return None
+    encoded = {k: ormsgpack.packb(v) for k, v in fields.items()}
+    size = sum(len(v) for v in encoded.values())
+    encode_s = timeit.timeit(lambda: [ormsgpack.packb(v) for v in fields.values()], number=number)
+    decode_s = timeit.timeit(lambda: [ormsgpack.unpackb(v) for v in encoded.values()], number=number)
+    return size, encode_s / number * 1e6, decode_s / number * 1e6
+
+
+def _report(label: str, result: tuple[int, float, float], baseline: tuple[int, float, float]) -> None:
+    size, enc, dec = result
+    print(
+        f"{label:<26} {size:>9,} B ({baseline[0] / size:4.1f}x)"
+        f" {enc:9.1f} us ({baseline[1] / enc:4.1f}x) {dec:9.1f} us ({baseline[2] / dec:4.1f}x)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=20, help="conversation turns (4 messages each)")
+    parser.add_argument("--number", type=int, default=200, help="encodes/decodes per measurement")
+    args = parser.parse_args()
+
+    fields = _fields(args.turns)
+    saved = (settings.STATE_JSON_ENCODER, settings.STATE_COMPRESSION)
+    print(f"{args.turns} turns, {4 * args.turns} messages; threshold {settings.STATE_COMPRESSION_MIN_BYTES} B\n")
+    print(f"{'encoder, compression':<26} {'stored':>20} {'encode':>20} {'decode':>20}")
+    baseline = None
+    try:
+        for encoder, compression in CONFIGURATIONS:
+            settings.STATE_JSON_ENCODER, settings.STATE_COMPRESSION = encoder, compression
+            result = _measure(fields, args.number)
+            baseline = baseline or result
+            _report(f"{encoder}, {compression}", result, baseline)
+    finally:
+        settings.STATE_JSON_ENCODER, settings.STATE_COMPRESSION = saved
+
+    reference = _msgpack_reference(fields, args.number)
+    if reference:
+        _report("msgpack, none (binary)", reference, baseline)
+
+
+if __name__ == "__main__":
+    main()
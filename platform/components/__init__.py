@@ -2,16 +2,42 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
 
 COMPONENT_REGISTRY: dict[str, Callable[[Any], Callable[[dict], dict]]] = {}
 
+# Types whose built callables take templated config per run (the resolved
+# system prompt arrives as state["_system_prompt"]), so one instance can
+# serve many runs of the same node. An AsyncPipelitWorker runs those runs
+# concurrently on its thread pool, so such a callable must keep anything
+# per-run (watchdogs, prompts, dedup markers) in locals or the invoke
+# context, never on the instance, its closure or its middleware.
+REUSABLE_COMPONENTS: set[str] = set()
 
-def register(component_type: str):
+# Types whose callables read state["messages"]. The conversation is loaded
+# only for these; other nodes see state without it (appending to it through
+# ``_messages`` still works).
+MESSAGE_COMPONENTS: set[str] = set()
+
+COMPONENT_CACHE_SIZE = 128
+COMPONENT_CACHE_MAX_AGE = 300  # seconds; bounds staleness of credentials etc.
+
+_instances: OrderedDict[tuple, tuple[float, Callable[[dict], dict]]] = OrderedDict()
+_instances_lock = threading.Lock()
+
+
+def register(component_type: str, reusable: bool = False, reads_messages: bool = False):
     """Decorator to register a component factory."""
 
     def decorator(factory):
         COMPONENT_REGISTRY[component_type] = factory
+        if reusable:
+            REUSABLE_COMPONENTS.add(component_type)
+        if reads_messages:
+            MESSAGE_COMPONENTS.add(component_type)
         return factory
 
     return decorator
@@ -27,6 +53,37 @@ def get_component_factory(component_type: str):
     return COMPONENT_REGISTRY[component_type]
 
 
+def build_component(node, cache_key: Hashable | None = None) -> Callable[[dict], dict]:
+    """Build *node*'s callable, reusing this worker's cached instance when possible.
+
+    Only reusable types are cached, under (type, node id, *cache_key*); the
+    caller's key must change whenever anything the factory reads does.
+    """
+    factory = get_component_factory(node.component_type)
+    if cache_key is None or node.component_type not in REUSABLE_COMPONENTS:
+        return factory(node)
+
+    key = (node.component_type, node.id, cache_key)
+    now = time.monotonic()
+    with _instances_lock:
+        cached = _instances.get(key)
+        if cached is not None and now - cached[0] < COMPONENT_CACHE_MAX_AGE:
+            _instances.move_to_end(key)
+            return cached[1]
+
+    node_fn = factory(node)
+    with _instances_lock:
+        _instances[key] = (now, node_fn)
+        _instances.move_to_end(key)
+        while len(_instances) > COMPONENT_CACHE_SIZE:
+            _instances.popitem(last=False)
+    return node_fn
+
+
+def clear_component_cache() -> None:
+    _instances.clear()
+
+
 # Import all component modules to trigger @register decorators
 from components import (  # noqa: E402, F401
     agent,
@@ -5,12 +5,15 @@ from __future__ import annotations
 import logging
 import os
 import threading
+import time
 from typing import Annotated, Any
 
 from typing_extensions import NotRequired
 
 from langchain.agents.middleware import AgentMiddleware
 from langchain.agents.middleware.types import AgentState, OmitFromOutput
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import SystemMessage
 from langgraph.errors import GraphInterrupt
 
 logger = logging.getLogger(__name__)
@@ -284,9 +287,18 @@ class PipelitAgentMiddleware(AgentMiddleware):
         self._workflow_slug = workflow_slug
         self._watchdog = watchdog
 
+    def _run_watchdog(self, request):
+        """This run's watchdog: reused agents pass theirs in the invoke
+        context, others are built with one."""
+        context = getattr(getattr(request, "runtime", None), "context", None)
+        if isinstance(context, dict) and context.get("watchdog") is not None:
+            return context["watchdog"]
+        return self._watchdog
+
     def wrap_tool_call(self, request, handler):
-        if self._watchdog:
-            self._watchdog.ping()
+        watchdog = self._run_watchdog(request)
+        if watchdog:
+            watchdog.ping()
 
         tool_name = request.tool_call.get("name", "") if isinstance(request.tool_call, dict) else getattr(request.tool_call, "name", "")
         meta = self._tool_metadata.get(tool_name, {})
@@ -311,8 +323,8 @@ class PipelitAgentMiddleware(AgentMiddleware):
         )
         try:
             result = handler(request)
-            if self._watchdog:
-                self._watchdog.ping()
+            if watchdog:
+                watchdog.ping()
             _publish_tool_status(
                 tool_node_id=tool_node_id, status="success",
                 workflow_slug=self._workflow_slug,
@@ -322,8 +334,8 @@ class PipelitAgentMiddleware(AgentMiddleware):
             )
             return result
         except Exception as e:
-            if self._watchdog:
-                self._watchdog.ping()
+            if watchdog:
+                watchdog.ping()
             if isinstance(e, GraphInterrupt):
                 _publish_tool_status(
                     tool_node_id=tool_node_id, status="waiting",
@@ -343,16 +355,23 @@ class PipelitAgentMiddleware(AgentMiddleware):
             raise
 
     def wrap_model_call(self, request, handler):
-        if self._watchdog:
-            self._watchdog.ping()
+        watchdog = self._run_watchdog(request)
+        if watchdog:
+            watchdog.ping()
+        # Reused agents get this run's resolved system prompt through the
+        # invoke context rather than the one they were built with.
+        context = getattr(getattr(request, "runtime", None), "context", None)
+        if isinstance(context, dict) and context.get("system_prompt") is not None:
+            prompt = context["system_prompt"]
+            request = request.override(system_message=SystemMessage(content=prompt) if prompt else None)
         # Strip thinking/web-search blocks before the LLM call so they are
         # never sent to a different provider AND never persisted by the checkpointer.
         strip_thinking_blocks(request.messages)
         strip_web_search_blocks(request.messages)
         strip_empty_text_blocks(request.messages)
         response = handler(request)
-        if self._watchdog:
-            self._watchdog.ping()
+        if watchdog:
+            watchdog.ping()
         try:
             exec_id = None
             state = request.state
@@ -376,11 +395,13 @@ class PipelitAgentMiddleware(AgentMiddleware):
                     break
 
             if text.strip():
-                # Deduplicate: skip if same text already published for this execution
+                # Deduplicate: skip if same text already published for this
+                # execution. Reused agents keep the marker in their run's context.
                 dedup_key = f"{exec_id}:{hash(text)}"
-                if dedup_key == getattr(self, '_last_chat_dedup', None):
+                seen = context if isinstance(context, dict) else self.__dict__
+                if dedup_key == seen.get("_last_chat_dedup"):
                     return response
-                self._last_chat_dedup = dedup_key
+                seen["_last_chat_dedup"] = dedup_key
 
                 from services.orchestrator import _publish_event
                 _publish_event(
@@ -394,6 +415,86 @@ class PipelitAgentMiddleware(AgentMiddleware):
         return response
 
 
+class ChatDeltaPublisher(BaseCallbackHandler):
+    """Publish an agent's reply tokens as ``chat_delta`` events while it generates.
+
+    Passed as an invoke callback when a node sets ``stream_tokens``. Defining
+    ``tap_output_iter`` makes LangChain stream the chat model, so tokens
+    arrive through ``on_llm_new_token``; they are buffered and published at
+    most once per ``CHAT_DELTA_INTERVAL_MS`` after the first. Only the agent's own ``model``
+    step is streamed: summarization calls and subagent graphs are skipped.
+    The final ``chat_message`` from ``PipelitAgentMiddleware`` remains the
+    authoritative reply.
+    """
+
+    def __init__(self, execution_id: str, node_id: str, workflow_slug: str):
+        from config import settings
+
+        self._execution_id = execution_id
+        self._node_id = node_id
+        self._workflow_slug = workflow_slug
+        self._interval = settings.CHAT_DELTA_INTERVAL_MS / 1000
+        # run_id -> [buffered text, seq of the next delta, time of last publish]
+        self._runs: dict = {}
+        self._lock = threading.Lock()
+
+    def tap_output_iter(self, run_id, output):
+        return output
+
+    def tap_output_aiter(self, run_id, output):
+        return output
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        metadata = metadata or {}
+        if metadata.get("langgraph_node") != "model":
+            return
+        if "|" in (metadata.get("langgraph_checkpoint_ns") or ""):
+            return
+        with self._lock:
+            # The first token goes out immediately
+            self._runs[run_id] = ["", 0, 0.0]
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        if not isinstance(token, str) or not token:
+            return
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                return
+            run[0] += token
+            if time.monotonic() - run[2] < self._interval:
+                return
+            delta = self._take(run_id, run)
+        self._publish(delta)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._finish(run_id)
+
+    def _finish(self, run_id) -> None:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+            delta = self._take(run_id, run) if run is not None and run[0] else None
+        if delta:
+            self._publish(delta)
+
+    def _take(self, run_id, run: list) -> dict:
+        delta = {"node_id": self._node_id, "text": run[0], "run_id": str(run_id), "seq": run[1]}
+        run[0] = ""
+        run[1] += 1
+        run[2] = time.monotonic()
+        return delta
+
+    def _publish(self, delta: dict) -> None:
+        try:
+            from services.orchestrator import _publish_event
+            _publish_event(self._execution_id, "chat_delta", delta, workflow_slug=self._workflow_slug)
+        except Exception:
+            logger.debug("ChatDeltaPublisher publish failed (non-fatal)", exc_info=True)
+
+
 # Lazy singleton for SqliteSaver checkpointer (permanent — conversation memory)
 _checkpointer = None
 _checkpointer_lock = threading.Lock()
@@ -10,6 +10,7 @@ from langchain.agents import create_agent
 
 from components import register
 from components._agent_shared import (
+    ChatDeltaPublisher,
     PipelitAgentMiddleware,
     _get_ai_model_extra,
     _get_checkpointer,
@@ -32,9 +33,13 @@ from services.token_usage import (
 logger = logging.getLogger(__name__)
 
 
-@register("agent")
+@register("agent", reusable=True, reads_messages=True)
 def agent_factory(node):
-    """Build an agent graph node."""
+    """Build an agent graph node.
+
+    The node is reusable: a resolved ``state["_system_prompt"]`` replaces
+    the prompt it was built with, so cached instances serve templated prompts.
+    """
     llm = resolve_llm_for_node(node)
     try:
         model_name = get_model_name_for_node(node)
@@ -46,20 +51,27 @@ def agent_factory(node):
     extra = getattr(concrete, "extra_config", None) or {}
 
     # Prepend environment capabilities when workspace is configured
+    cap_context = ""
     if extra.get("workspace_id"):
         try:
             from services.capabilities import detect_capabilities, format_capability_context
             caps = detect_capabilities()
-            cap_context = format_capability_context(caps)
-            if cap_context:
-                system_prompt = f"{cap_context}\n\n{system_prompt}" if system_prompt else cap_context
+            cap_context = format_capability_context(caps) or ""
         except Exception:
             logger.debug("agent: failed to inject capability context", exc_info=True)
 
+    def _with_capabilities(prompt: str) -> str:
+        if not cap_context:
+            return prompt
+        return f"{cap_context}\n\n{prompt}" if prompt else cap_context
+
+    system_prompt = _with_capabilities(system_prompt)
+
     workflow_id = node.workflow_id
     workflow_slug = node.workflow.slug if node.workflow else ""
     node_id = node.node_id
     conversation_memory = extra.get("conversation_memory", False)
+    stream_tokens = extra.get("stream_tokens", False)
     max_completion_tokens = getattr(concrete, "max_tokens", None)
     context_window_override = extra.get("context_window", None)
     if context_window_override is not None:
@@ -100,10 +112,10 @@ def agent_factory(node):
     if native_search_tools:
         llm = _wrap_llm_with_native_tools(llm, native_search_tools)
 
-    # Activity watchdog — extends RQ timeout while agent is active
+    # Activity watchdog — extends RQ timeout while agent is active. One per
+    # run, since this agent may be reused across runs.
     inactivity_timeout = int(extra.get("inactivity_timeout", DEFAULT_INACTIVITY_TIMEOUT))
     max_wall_time = int(extra.get("max_wall_time", DEFAULT_MAX_WALL_TIME))
-    watchdog = ActivityWatchdog(inactivity_timeout=inactivity_timeout, max_wall_time=max_wall_time)
 
     # Detect spawn_and_await tool
     has_spawn_tool = any(
@@ -120,7 +132,7 @@ def agent_factory(node):
     elif has_spawn_tool:
         checkpointer = _get_redis_checkpointer()
 
-    middleware = PipelitAgentMiddleware(tool_metadata, node_id, workflow_slug, watchdog=watchdog)
+    middleware = PipelitAgentMiddleware(tool_metadata, node_id, workflow_slug)
 
     # Build middleware list — optionally prepend SummarizationMiddleware
     middlewares: list = []
@@ -163,31 +175,29 @@ def agent_factory(node):
 
     agent = create_agent(**agent_kwargs)
 
-    # HumanMessage fallback for providers that ignore the system role (e.g. Venice.ai).
-    # Stable id prevents duplication across checkpointer invocations.
-    _prompt_fallback = (
-        HumanMessage(
-            content=f"[System instructions — follow these for the entire conversation]\n{system_prompt}",
-            id="system_prompt_fallback",
-        )
-        if system_prompt
-        else None
-    )
-
     def agent_node(state: dict) -> dict:
         from datetime import datetime, timezone
         from langgraph.types import Command
 
+        watchdog = ActivityWatchdog(inactivity_timeout=inactivity_timeout, max_wall_time=max_wall_time)
         watchdog.start()
         try:
-            return _agent_node_inner(state)
+            return _agent_node_inner(state, watchdog)
         finally:
             watchdog.stop()
 
-    def _agent_node_inner(state: dict) -> dict:
+    def _agent_node_inner(state: dict, watchdog: ActivityWatchdog) -> dict:
         from datetime import datetime, timezone
         from langgraph.types import Command
 
+        run_prompt = state.get("_system_prompt")
+        prompt = system_prompt if run_prompt is None else _with_capabilities(run_prompt)
+        # The middleware reads this run's watchdog and prompt from the context
+        context: dict = {"watchdog": watchdog}
+        if run_prompt is not None:
+            context["system_prompt"] = prompt
+        invoke_kwargs: dict = {"context": context}
+
         _input_override = state.get("_input_override")
         if _input_override:
             messages = [HumanMessage(content=_input_override)]
@@ -207,8 +217,13 @@ def agent_factory(node):
                 cleaned.append(msg)
             messages = cleaned
 
-        if _prompt_fallback:
-            messages = [_prompt_fallback] + messages
+        # HumanMessage fallback for providers that ignore the system role (e.g. Venice.ai).
+        # Stable id prevents duplication across checkpointer invocations.
+        if prompt:
+            messages = [HumanMessage(
+                content=f"[System instructions — follow these for the entire conversation]\n{prompt}",
+                id="system_prompt_fallback",
+            )] + messages
 
         # Trim messages as hard safety net against context overflow
         from services.context import trim_messages_for_model
@@ -218,7 +233,7 @@ def agent_factory(node):
             context_window_override=context_window_override,
         )
 
-        logger.info("Agent %s: sending %d messages (has_prompt=%s)", node_id, len(messages), bool(system_prompt))
+        logger.info("Agent %s: sending %d messages (has_prompt=%s)", node_id, len(messages), bool(prompt))
 
         # Build thread config for checkpointer
         config = None
@@ -249,16 +264,19 @@ def agent_factory(node):
         invoke_input = {"messages": messages}
         if exec_id:
             invoke_input["execution_id"] = exec_id
+        if stream_tokens and exec_id:
+            callbacks = [ChatDeltaPublisher(exec_id, node_id, workflow_slug)]
+            config = {**(config or {}), "callbacks": callbacks}
 
         # Check if we're resuming from a child workflow result
         child_result = state.get("_subworkflow_results", {}).get(node_id)
         if child_result is not None and has_spawn_tool and checkpointer is not None:
             # Resume: agent graph restores from checkpoint, interrupt() returns child_result
             logger.info("Agent %s: resuming from child result", node_id)
-            result = agent.invoke(Command(resume=child_result), config=config)
+            result = agent.invoke(Command(resume=child_result), config=config, **invoke_kwargs)
         else:
             try:
-                result = agent.invoke(invoke_input, config=config)
+                result = agent.invoke(invoke_input, config=config, **invoke_kwargs)
             except Exception as exc:
                 # Check if this is a GraphInterrupt from spawn_and_await
                 from langgraph.errors import GraphInterrupt
@@ -345,6 +363,13 @@ def _try_create_children(interrupt_data: dict, state: dict, node_id: str) -> dic
         if not tasks:
             return {"output": "spawn_and_await: no tasks provided"}
 
+        from services.admission import BackpressureError, check_backpressure
+        try:
+            check_backpressure()
+        except BackpressureError as exc:
+            logger.warning("Agent %s: %s", node_id, exc)
+            return {"output": f"spawn_and_await rejected: {exc}. Try again later."}
+
         child_ids = []
         for task in tasks:
             child_id = _create_child_from_interrupt(task, state, node_id)
@@ -458,12 +483,11 @@ def _create_child_from_interrupt(
         child_id = str(child_execution.execution_id)
 
         # Enqueue child execution on RQ
-        import redis
         from rq import Queue
-        from config import settings
+        from services.queues import CONTROL_QUEUE
+        from services.redis_pool import get_redis_binary
 
-        conn = redis.from_url(settings.REDIS_URL)
-        q = Queue("workflows", connection=conn)
+        q = Queue(CONTROL_QUEUE, connection=get_redis_binary())
         from tasks import execute_workflow_job
 
         q.enqueue(execute_workflow_job, child_id)
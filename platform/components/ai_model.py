@@ -6,7 +6,7 @@ from components import register
 from services.llm import resolve_llm_for_node
 
 
-@register("ai_model")
+@register("ai_model", reads_messages=True)
 def ai_model_factory(node):
     """Build an ai_model graph node."""
     llm = resolve_llm_for_node(node)
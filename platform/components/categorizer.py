@@ -20,7 +20,7 @@ from services.token_usage import (
 logger = logging.getLogger(__name__)
 
 
-@register("categorizer")
+@register("categorizer", reads_messages=True)
 def categorizer_factory(node):
     """Build a categorizer graph node."""
     llm = resolve_llm_for_node(node)
@@ -63,7 +63,8 @@ def categorizer_factory(node):
         # Extract token usage (best-effort — never crash the node)
         try:
             usage = extract_usage_from_response(response).copy()
-            usage["llm_calls"] = 1
+            # Answers from the response cache (services/llm_cache.py) are free
+            usage["llm_calls"] = 0 if response.response_metadata.get("cache_hit") is True else 1
             usage["cost_usd"] = calculate_cost(
                 model_name, usage.get("input_tokens", 0), usage.get("output_tokens", 0)
             )
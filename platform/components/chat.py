@@ -8,7 +8,7 @@ from components import register
 from services.llm import resolve_llm_for_node
 
 
-@register("chat_model")
+@register("chat_model", reads_messages=True)
 def chat_model_factory(node):
     """Build a chat_model graph node."""
     llm = resolve_llm_for_node(node)
@@ -46,7 +46,7 @@ with open("__output__.json", "w") as f:
 '''
 
 
-@register("code")
+@register("code", reads_messages=True)
 def code_factory(node):
     """Build a code graph node that executes a Python snippet in a subprocess."""
     extra = node.component_config.extra_config or {}
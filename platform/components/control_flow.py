@@ -9,6 +9,7 @@ def loop_factory(node):
     extra = node.component_config.extra_config
     source_node = extra.get("source_node")
     field = extra.get("field", "")
+    max_concurrency = max(1, int(extra.get("max_concurrency") or 1))
 
     def loop_node(state: dict) -> dict:
         data = None
@@ -21,7 +22,11 @@ def loop_factory(node):
         if not isinstance(data, list):
             data = [data] if data is not None else []
 
-        return {"_loop": {"items": data}, "items": data, "results": []}
+        return {
+            "_loop": {"items": data, "max_concurrency": max_concurrency},
+            "items": data,
+            "results": [],
+        }
 
     return loop_node
 
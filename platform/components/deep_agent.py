@@ -10,6 +10,7 @@ from deepagents.middleware.subagents import SubAgent
 
 from components import register
 from components._agent_shared import (
+    ChatDeltaPublisher,
     PipelitAgentMiddleware,
     _build_backend,
     _compute_skill_path_mapping,
@@ -67,7 +68,7 @@ def _build_subagents(extra: dict) -> list[SubAgent] | None:
     return subagents if subagents else None
 
 
-@register("deep_agent")
+@register("deep_agent", reads_messages=True)
 def deep_agent_factory(node):
     """Build a deep agent graph node using create_deep_agent."""
     llm = resolve_llm_for_node(node)
@@ -95,6 +96,7 @@ def deep_agent_factory(node):
     workflow_slug = node.workflow.slug if node.workflow else ""
     node_id = node.node_id
     conversation_memory = extra.get("conversation_memory", False)
+    stream_tokens = extra.get("stream_tokens", False)
     max_completion_tokens = getattr(concrete, "max_tokens", None)
     context_window_override = extra.get("context_window", None)
     if context_window_override is not None:
@@ -274,6 +276,9 @@ def deep_agent_factory(node):
         invoke_input: dict = {"messages": messages}
         if exec_id:
             invoke_input["execution_id"] = exec_id
+        if stream_tokens and exec_id:
+            callbacks = [ChatDeltaPublisher(exec_id, node_id, workflow_slug)]
+            config = {**(config or {}), "callbacks": callbacks}
 
         try:
             result = agent.invoke(invoke_input, config=config)
@@ -8,7 +8,7 @@ import re
 from components import register
 
 
-@register("output_parser")
+@register("output_parser", reads_messages=True)
 def output_parser_factory(node):
     """Build an output_parser graph node."""
     extra = node.component_config.extra_config
@@ -104,6 +104,9 @@ def _create_child_execution(
         if not user_profile_id:
             raise ValueError("Cannot determine user_profile_id for child execution")
 
+        from services.admission import check_backpressure
+        check_backpressure()
+
         child_execution = WorkflowExecution(
             workflow_id=target_workflow.id,
             user_profile_id=user_profile_id,
@@ -119,13 +122,12 @@ def _create_child_execution(
         child_id = str(child_execution.execution_id)
 
         # Enqueue child execution on RQ
-        import redis
         from rq import Queue
 
-        from config import settings
+        from services.queues import CONTROL_QUEUE
+        from services.redis_pool import get_redis_binary
 
-        conn = redis.from_url(settings.REDIS_URL)
-        q = Queue("workflows", connection=conn)
+        q = Queue(CONTROL_QUEUE, connection=get_redis_binary())
         from tasks import execute_workflow_job
 
         q.enqueue(execute_workflow_job, child_id)
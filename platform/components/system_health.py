@@ -36,6 +36,7 @@ def system_health_factory(node):
         from database import SessionLocal
         from models.execution import WorkflowExecution
         from models.scheduled_job import ScheduledJob
+        from services.queues import ALL_QUEUES
 
         now = datetime.now(timezone.utc)
         checks = {}
@@ -90,13 +91,36 @@ def system_health_factory(node):
             try:
                 rq_conn = redis_lib.from_url(settings.REDIS_URL, decode_responses=False)
                 queue_info = {}
-                for queue_name in ("workflows", "default"):
+                for queue_name in (*ALL_QUEUES, "default"):
                     q = Queue(queue_name, connection=rq_conn)
                     queue_info[queue_name] = len(q)
                 checks["queues"] = {"status": "ok", **queue_info}
             except Exception as e:
                 checks["queues"] = {"status": "error", "error": str(e)}
 
+            # --- Admission ---
+            try:
+                from services.admission import stats as admission_stats
+                admission = admission_stats()
+                checks["admission"] = {"status": "ok", **admission}
+                depth_limit = admission["limits"]["queue_depth"]
+                if depth_limit and admission["queue_depth"] >= depth_limit:
+                    checks["admission"]["status"] = "warn"
+                    issues.append({
+                        "severity": "warn",
+                        "check": "admission",
+                        "detail": f"Execution queues full ({admission['queue_depth']}/{depth_limit}); new triggers are rejected",
+                    })
+            except Exception as e:
+                checks["admission"] = {"status": "error", "error": str(e)}
+
+            # --- LLM response cache ---
+            try:
+                from services.llm_cache import stats as llm_cache_stats
+                checks["llm_cache"] = {"status": "ok", **llm_cache_stats()}
+            except Exception as e:
+                checks["llm_cache"] = {"status": "error", "error": str(e)}
+
         # --- Stuck Executions ---
         db = SessionLocal()
         try:
@@ -106,6 +106,9 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str = _conf.database_url or f"sqlite:///{BASE_DIR / 'db.sqlite3'}"
     REDIS_URL: str = _conf.redis_url or "redis://localhost:6379/0"
+    # Shared connection pools (services/redis_pool.py), one per process
+    REDIS_POOL_MAX_CONNECTIONS: int = 50
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30  # seconds idle before a connection is PINGed
 
     FIELD_ENCRYPTION_KEY: str = ""
 
@@ -133,6 +136,89 @@ class Settings(BaseSettings):
     SKILLS_DIR: str = ""  # default: ~/.config/pipelit/community_skills/ (resolved at runtime)
     WORKSPACE_DIR: str = ""  # default: ~/.config/pipelit/workspaces/default (resolved at runtime)
     ROOTFS_DIR: str = ""  # default: {pipelit_dir}/rootfs/ (resolved at runtime)
+    BLOB_STORE_DIR: str = ""  # default: {pipelit_dir}/blobs/ (resolved at runtime)
+
+    # Max cheap successor nodes a worker runs inline after finishing a node
+    # instead of round-tripping through RQ (0 = disabled).
+    FUSED_EXECUTION_MAX_NODES: int = 16
+
+    # Execution affinity: a worker also keeps an execution's single next node
+    # when it belongs on the worker's own queue, up to
+    # EXECUTION_AFFINITY_MAX_NODES per job (independent of the fused budget
+    # above), and reuses the state it just saved unless another worker has
+    # written it since.
+    EXECUTION_AFFINITY: bool = False
+    EXECUTION_AFFINITY_MAX_NODES: int = 16
+
+    # How long execution events may sit in a worker's buffer before being
+    # published in one pipelined batch (0 = publish each event inline).
+    EVENT_FLUSH_INTERVAL_MS: int = 20
+
+    # Agent nodes with extra_config.stream_tokens publish their reply as
+    # chat_delta events at most this often while the model generates.
+    CHAT_DELTA_INTERVAL_MS: int = 100
+
+    # ExecutionLog rows are buffered per worker and bulk-inserted when this
+    # many are pending or this long after the first one (0 ms = write each
+    # row inline). Finalization waits up to the timeout for other workers'
+    # buffered rows of the execution.
+    EXECUTION_LOG_BATCH_SIZE: int = 200
+    EXECUTION_LOG_FLUSH_INTERVAL_MS: int = 100
+    EXECUTION_LOG_FINALIZE_TIMEOUT: float = 5.0
+
+    # Node jobs an AsyncPipelitWorker process runs at once (worker_class.py)
+    WORKER_CONCURRENCY: int = 32
+    # Node jobs a SandboxWorker process runs at once; each holds a sandbox
+    SANDBOX_WORKER_CONCURRENCY: int = 4
+
+    # Top-level executions allowed to run at once, overall, per workflow and
+    # per user (0 = unlimited). Executions over a cap wait as "pending" and
+    # are admitted as running ones finish (services/admission.py).
+    MAX_CONCURRENT_EXECUTIONS: int = 0
+    MAX_CONCURRENT_EXECUTIONS_PER_WORKFLOW: int = 0
+    MAX_CONCURRENT_EXECUTIONS_PER_USER: int = 0
+    # Queued jobs plus executions waiting for admission beyond which new
+    # trigger events are rejected (0 = never reject).
+    EXECUTION_QUEUE_MAX_DEPTH: int = 0
+
+    # Workers refresh a heartbeat for every execution they are running a
+    # node of this often; a running execution silent for longer than
+    # ZOMBIE_EXECUTION_THRESHOLD_SECONDS (and with nothing queued) is
+    # resumed from its journal. The watchdog re-checks on this interval
+    # (0 = only at startup).
+    EXECUTION_HEARTBEAT_INTERVAL_SECONDS: int = 10
+    EXECUTION_WATCHDOG_INTERVAL_SECONDS: int = 60
+
+    # Nodes with extra_config.cache_outputs reuse stored results for the
+    # same config and inputs (services/node_cache.py): default lifetime of
+    # an entry, and entries kept before the least recently used are evicted.
+    NODE_CACHE_TTL_SECONDS: int = 86400
+    NODE_CACHE_MAX_ENTRIES: int = 10000
+    # Same, for LLM responses of nodes with extra_config.cache_llm_responses
+    # (services/llm_cache.py)
+    LLM_RESPONSE_CACHE_TTL_SECONDS: int = 86400
+    LLM_RESPONSE_CACHE_MAX_ENTRIES: int = 10000
+
+    # Node outputs whose JSON encoding is larger than this are written once
+    # to the blob store and kept in execution state as a reference
+    # (services/blob_store.py; 0 = never offload).
+    NODE_OUTPUT_OFFLOAD_BYTES: int = 65536
+    # Days a blob is kept after it was last written; a sweep on the
+    # maintenance queue deletes older ones. Keep it longer than
+    # NODE_CACHE_TTL_SECONDS and the longest execution (0 = keep forever).
+    BLOB_STORE_RETENTION_DAYS: int = 30
+    # Encoded state fields longer than this are compressed (with
+    # STATE_COMPRESSION) before they are journaled
+    # (services/execution_journal.py).
+    JOURNAL_COMPRESSION_MIN_BYTES: int = 1024
+
+    # Encoding of execution state and compiled topologies in Redis
+    # (services/state_codec.py): JSON encoder ("orjson" or "json"), and
+    # compression ("zstd", "zlib" or "none") of values longer than
+    # STATE_COMPRESSION_MIN_BYTES. Any worker reads every encoding.
+    STATE_JSON_ENCODER: str = "orjson"
+    STATE_COMPRESSION: str = "zstd"
+    STATE_COMPRESSION_MIN_BYTES: int = 4096
 
     model_config = ConfigDict(
         env_file=str(BASE_DIR.parent / ".env"),
@@ -66,6 +66,27 @@ def _mock_sandbox_mode_for_ci():
             yield
 
 
+@pytest.fixture
+def sync_events():
+    """Publish orchestrator events inline, with a fresh parent-lineage memo."""
+    from services import orchestrator
+    from services.events import EventPublisher
+
+    with patch.object(orchestrator, "_events", EventPublisher(lambda: orchestrator._redis(), interval=0)), \
+         patch.dict(orchestrator._lineage_memo, clear=True):
+        yield
+
+
+@pytest.fixture
+def sync_execution_logs():
+    """Write ExecutionLog rows inline through the caller's session."""
+    from services import orchestrator
+    from services.execution_logs import ExecutionLogBuffer
+
+    with patch.object(orchestrator, "_execution_logs", ExecutionLogBuffer(lambda: orchestrator._redis(), 0, 1)):
+        yield
+
+
 @pytest.fixture
 def db():
     """Yield a test database session."""
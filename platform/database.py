@@ -13,6 +13,9 @@ engine = create_engine(
     connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
     echo=False,
     isolation_level="SERIALIZABLE" if "sqlite" in settings.DATABASE_URL else None,
+    # Node jobs hold a session while they run; an AsyncPipelitWorker runs
+    # WORKER_CONCURRENCY of them in one process
+    max_overflow=max(10, settings.WORKER_CONCURRENCY),
 )
 
 # Enable WAL mode and foreign keys for SQLite
@@ -504,7 +504,7 @@ function PlatformTab({
               }}
             />
             <p className="text-xs text-muted-foreground">
-              Executions running longer than this are considered zombies. Default: 900 (15 min).
+              Executions with no worker activity for this long are considered zombies. Default: 900 (15 min).
             </p>
           </div>
         </div>
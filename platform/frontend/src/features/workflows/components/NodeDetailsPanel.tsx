@@ -90,6 +90,7 @@ function NodeConfigPanel({ slug, node, workflow, onClose }: Props) {
   const [interruptBefore, setInterruptBefore] = useState(node.interrupt_before)
   const [interruptAfter, setInterruptAfter] = useState(node.interrupt_after)
   const [conversationMemory, setConversationMemory] = useState<boolean>(Boolean(node.config.extra_config?.conversation_memory))
+  const [streamTokens, setStreamTokens] = useState<boolean>(Boolean(node.config.extra_config?.stream_tokens))
   const [contextWindow, setContextWindow] = useState<string>(
     (node.config.extra_config?.context_window as number)?.toString() ?? ""
   )
@@ -157,6 +158,7 @@ function NodeConfigPanel({ slug, node, workflow, onClose }: Props) {
   const [loopSourceNode, setLoopSourceNode] = useState<string>((node.config.extra_config?.source_node as string) ?? "")
   const [loopField, setLoopField] = useState<string>((node.config.extra_config?.field as string) ?? "")
   const [loopOnError, setLoopOnError] = useState<string>((node.config.extra_config?.on_error as string) ?? "stop")
+  const [loopMaxConcurrency, setLoopMaxConcurrency] = useState<number>((node.config.extra_config?.max_concurrency as number) ?? 1)
 
   // Subworkflow state
   const [subworkflowTarget, setSubworkflowTarget] = useState<string>((node.config.extra_config?.target_workflow as string) ?? "")
@@ -291,6 +293,7 @@ function NodeConfigPanel({ slug, node, workflow, onClose }: Props) {
       parsedExtra = {
         ...parsedExtra,
         conversation_memory: conversationMemory,
+        stream_tokens: streamTokens,
         context_window: contextWindow ? (Number(contextWindow) || null) : null,
         compacting: compacting || null,
         compacting_trigger: compacting === "summarize" ? (Number(compactingTrigger) || null) : null,
@@ -341,7 +344,7 @@ function NodeConfigPanel({ slug, node, workflow, onClose }: Props) {
       parsedExtra = { ...parsedExtra, mode: mergeMode }
     }
     if (node.component_type === "loop") {
-      parsedExtra = { ...parsedExtra, source_node: loopSourceNode || undefined, field: loopField || undefined, on_error: loopOnError }
+      parsedExtra = { ...parsedExtra, source_node: loopSourceNode || undefined, field: loopField || undefined, on_error: loopOnError, max_concurrency: loopMaxConcurrency }
     }
     if (node.component_type === "workflow") {
       parsedExtra = { ...parsedExtra, target_workflow: subworkflowTarget || undefined, trigger_mode: subworkflowTriggerMode }
@@ -937,6 +940,13 @@ function NodeConfigPanel({ slug, node, workflow, onClose }: Props) {
             </div>
             <Switch checked={conversationMemory} onCheckedChange={setConversationMemory} />
           </div>
+          <div className="flex items-center justify-between">
+            <div>
+              <Label className="text-xs">Stream Tokens</Label>
+              <p className="text-xs text-muted-foreground">Send the reply to chat clients as it is generated</p>
+            </div>
+            <Switch checked={streamTokens} onCheckedChange={setStreamTokens} />
+          </div>
           {searchBackend && (
             <div className="flex items-center justify-between">
               <div>
@@ -1500,6 +1510,11 @@ function NodeConfigPanel({ slug, node, workflow, onClose }: Props) {
                   : "When a body node fails, stop the entire execution"}
               </p>
             </div>
+            <div className="space-y-1">
+              <Label className="text-[10px]">Max Concurrency</Label>
+              <Input type="number" min={1} value={loopMaxConcurrency} onChange={(e) => setLoopMaxConcurrency(Math.max(1, parseInt(e.target.value) || 1))} className="text-xs h-7" />
+              <p className="text-[10px] text-muted-foreground">Number of items whose body runs at the same time. Results are always returned in input order.</p>
+            </div>
             <div className="border rounded-md p-2 space-y-1 bg-muted/50">
               <p className="text-[10px] font-medium">Loop handles</p>
               <p className="text-[10px] text-muted-foreground"><span className="text-amber-500 font-medium">Each Item</span> — connect to the first body node(s)</p>
@@ -5,11 +5,12 @@ from __future__ import annotations
 import logging
 import uuid
 
-import redis
 from rq import Queue
 from sqlalchemy.orm import Session
 
-from config import settings
+from services import admission
+from services.queues import CONTROL_QUEUE
+from services.redis_pool import get_redis_binary
 from triggers.resolver import trigger_resolver
 
 logger = logging.getLogger(__name__)
@@ -29,6 +30,9 @@ def dispatch_event(
     When both workflow_id and trigger_node_id are provided (e.g. from the
     scheduler), the resolver is bypassed and the specific workflow/trigger
     is targeted directly.
+
+    Raises ``services.admission.BackpressureError`` instead of creating an
+    execution when the execution queues are past ``EXECUTION_QUEUE_MAX_DEPTH``.
     """
     from models.execution import WorkflowExecution
     from models.node import WorkflowNode
@@ -52,6 +56,8 @@ def dispatch_event(
             return None
         workflow, trigger_node = result
 
+    admission.check_backpressure()
+
     execution = WorkflowExecution(
         workflow_id=workflow.id,
         trigger_node_id=trigger_node.id,
@@ -63,8 +69,7 @@ def dispatch_event(
     db.commit()
     db.refresh(execution)
 
-    conn = redis.from_url(settings.REDIS_URL)
-    queue = Queue("workflows", connection=conn)
+    queue = Queue(CONTROL_QUEUE, connection=get_redis_binary())
     from services.execution_recovery import on_execution_job_failure
     queue.enqueue(execute_workflow_job, str(execution.execution_id),
                   on_failure=on_execution_job_failure)
@@ -16,6 +16,8 @@ from models.execution import WorkflowExecution
 from models.node import WorkflowNode
 from models.user import UserProfile
 from models.workflow import Workflow
+from api._helpers import backpressure_unavailable, check_backpressure
+from services.admission import BackpressureError
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +54,7 @@ def manual_execute_view(
         if not trigger_node:
             raise HTTPException(status_code=404, detail="Manual trigger node not found")
 
+        check_backpressure()
         execution = WorkflowExecution(
             workflow_id=workflow.id,
             trigger_node_id=trigger_node.id,
@@ -63,21 +66,23 @@ def manual_execute_view(
         db.commit()
         db.refresh(execution)
 
-        import redis
         from rq import Queue
 
-        from config import settings
         from services.execution_recovery import on_execution_job_failure
+        from services.queues import CONTROL_QUEUE
+        from services.redis_pool import get_redis_binary
         from tasks import execute_workflow_job
 
-        conn = redis.from_url(settings.REDIS_URL)
-        queue = Queue("workflows", connection=conn)
+        queue = Queue(CONTROL_QUEUE, connection=get_redis_binary())
         queue.enqueue(execute_workflow_job, str(execution.execution_id),
                       on_failure=on_execution_job_failure)
     else:
         # Fallback — existing dispatch_event path
         event_data = {"text": payload.text, "workflow_slug": workflow_slug}
-        execution = dispatch_event("manual", event_data, profile, db)
+        try:
+            execution = dispatch_event("manual", event_data, profile, db)
+        except BackpressureError as exc:
+            raise backpressure_unavailable(exc)
 
     if execution is None:
         raise HTTPException(status_code=404, detail="No trigger configured for manual execution")
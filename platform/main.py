@@ -114,15 +114,21 @@ async def lifespan(app: FastAPI):
     except Exception:
         logger.exception("Failed to detect capabilities on startup")
 
-    # Recover any executions stuck in "running" from a previous crash
+    # Recover any executions stuck in "running" from a previous crash, then
+    # keep checking periodically
     try:
-        from services.execution_recovery import recover_zombie_executions
+        from services.execution_recovery import recover_zombie_executions, schedule_watchdog
         recovered_executions = recover_zombie_executions()
         if recovered_executions:
             logger.info("Recovered %d zombie executions", recovered_executions)
+        schedule_watchdog()
     except Exception:
         logger.exception("Failed to recover zombie executions on startup")
 
+    # Delete offloaded node outputs past their retention, periodically
+    from services.blob_store import schedule_sweep
+    schedule_sweep()
+
     yield
 
 
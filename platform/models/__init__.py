@@ -21,7 +21,7 @@ from models.node import (  # noqa: F401
     WorkflowEdge,
     COMPONENT_TYPE_TO_CONFIG,
 )
-from models.execution import WorkflowExecution, ExecutionLog, PendingTask  # noqa: F401
+from models.execution import WorkflowExecution, ExecutionLog, ExecutionJournalEntry, PendingTask  # noqa: F401
 from models.tool import ToolDefinition, WorkflowTool, ToolCredentialMapping  # noqa: F401
 from models.code import CodeBlock, CodeBlockVersion, CodeBlockTest, CodeBlockTestRun  # noqa: F401
 from models.git import GitRepository, GitCommit, GitSyncTask  # noqa: F401
@@ -1,4 +1,4 @@
-"""WorkflowExecution, ExecutionLog, and PendingTask models."""
+"""WorkflowExecution, ExecutionLog, ExecutionJournalEntry, and PendingTask models."""
 
 from __future__ import annotations
 
@@ -53,6 +53,9 @@ class WorkflowExecution(Base):
     pending_tasks: Mapped[list["PendingTask"]] = relationship(
         "PendingTask", back_populates="execution", cascade="all, delete-orphan"
     )
+    journal: Mapped[list["ExecutionJournalEntry"]] = relationship(
+        "ExecutionJournalEntry", back_populates="execution", cascade="all, delete-orphan"
+    )
 
     def __repr__(self):
         return f"<Execution {self.execution_id} ({self.status})>"
@@ -82,6 +85,30 @@ class ExecutionLog(Base):
         return f"<Log {self.node_id} ({self.status})>"
 
 
+class ExecutionJournalEntry(Base):
+    """A node that completed in a running execution and the state it wrote.
+
+    Lets a crashed execution resume without re-running finished nodes (see
+    ``services/execution_journal.py``); rows are deleted once it ends.
+    """
+
+    __tablename__ = "execution_journal"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    execution_id: Mapped[str] = mapped_column(
+        ForeignKey("workflow_executions.execution_id", ondelete="CASCADE"), index=True
+    )
+    node_id: Mapped[str] = mapped_column(String(255))
+    route: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    state_delta: Mapped[dict] = mapped_column(JSON, default=dict)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    execution: Mapped[WorkflowExecution] = relationship("WorkflowExecution", back_populates="journal")
+
+    def __repr__(self):
+        return f"<JournalEntry {self.node_id}>"
+
+
 class PendingTask(Base):
     __tablename__ = "pending_tasks"
 
@@ -0,0 +1,249 @@
+"""Admission control and queue backpressure for workflow executions.
+
+Nothing used to limit how many executions of a workflow ran at once, so a
+burst of trigger events could enqueue unbounded work. ``start_execution``
+now asks ``try_admit`` for a slot before running a top-level execution;
+the slot counts against the global, per-workflow and per-user caps from
+settings. An execution over a cap stays ``pending`` in a FIFO list, and
+``release`` — called when an execution's Redis keys are cleaned up, which
+every terminal path does — frees its slot and starts whichever waiting
+executions now fit.
+
+Child executions (subworkflows, ``spawn_and_await``) are admitted without
+taking a slot: their parent already holds one and waits on them, so making
+them wait too could deadlock. Their fan-out is bounded by backpressure
+instead: ``check_backpressure`` rejects new work once queued jobs plus
+waiting executions pass ``EXECUTION_QUEUE_MAX_DEPTH``.
+
+Bookkeeping lives in four Redis keys, each admission or release updating
+them in one Lua script, a single atomic round-trip that never retries:
+
+- ``admission:active`` — hash of admitted execution ID → ``"<workflow>:<user>"``
+- ``admission:counts`` — hash of ``workflow:<id>`` / ``user:<id>`` → admitted count
+- ``admission:pending`` — list of waiting execution IDs, oldest first
+- ``admission:pending_info`` — hash of waiting execution ID → ``"<workflow>:<user>"``
+"""
+
+from __future__ import annotations
+
+import logging
+
+from config import settings
+from services.queues import CONTROL_QUEUE, LLM_QUEUE, SANDBOX_QUEUE
+from services.redis_pool import get_redis, get_redis_binary
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_KEY = "admission:active"
+COUNTS_KEY = "admission:counts"
+PENDING_KEY = "admission:pending"
+PENDING_INFO_KEY = "admission:pending_info"
+
+# Waiting executions considered per release; bounds the script's run time
+# when the head of the list is blocked by per-workflow or per-user caps.
+RELEASE_SCAN_LIMIT = 100
+
+_KEYS = [ACTIVE_KEY, COUNTS_KEY, PENDING_KEY, PENDING_INFO_KEY]
+
+# Shared by both scripts. ARGV[2..4] are the global, per-workflow and
+# per-user caps (0 = unlimited); an owner is "<workflow>:<user>".
+_LUA_HELPERS = """
+local caps = {tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])}
+local function fits(active, workflow_count, user_count)
+    local counts = {active, workflow_count, user_count}
+    for i = 1, 3 do
+        if caps[i] > 0 and counts[i] >= caps[i] then
+            return false
+        end
+    end
+    return true
+end
+local function owner_fields(owner)
+    local sep = string.find(owner, ":", 1, true)
+    return "workflow:" .. string.sub(owner, 1, sep - 1), "user:" .. string.sub(owner, sep + 1)
+end
+local function count(field)
+    return tonumber(redis.call("HGET", KEYS[2], field) or 0)
+end
+local function take_slot(execution_id, owner)
+    local workflow_field, user_field = owner_fields(owner)
+    redis.call("HSET", KEYS[1], execution_id, owner)
+    redis.call("HINCRBY", KEYS[2], workflow_field, 1)
+    redis.call("HINCRBY", KEYS[2], user_field, 1)
+    redis.call("LREM", KEYS[3], 0, execution_id)
+    redis.call("HDEL", KEYS[4], execution_id)
+end
+"""
+
+# ARGV: execution ID, caps, owner. Returns 1 if admitted, 0 if queued.
+_ADMIT_LUA = _LUA_HELPERS + """
+local execution_id, owner = ARGV[1], ARGV[5]
+if redis.call("HEXISTS", KEYS[1], execution_id) == 1 then
+    return 1
+end
+local workflow_field, user_field = owner_fields(owner)
+if not fits(redis.call("HLEN", KEYS[1]), count(workflow_field), count(user_field)) then
+    if redis.call("HSETNX", KEYS[4], execution_id, owner) == 1 then
+        redis.call("RPUSH", KEYS[3], execution_id)
+    end
+    return 0
+end
+take_slot(execution_id, owner)
+return 1
+"""
+
+# ARGV: execution ID, caps, scan limit. Returns the IDs admitted.
+_RELEASE_LUA = _LUA_HELPERS + """
+local execution_id = ARGV[1]
+local owner = redis.call("HGET", KEYS[1], execution_id)
+if owner then
+    redis.call("HDEL", KEYS[1], execution_id)
+    for _, field in ipairs({owner_fields(owner)}) do
+        -- Drop counters that reach zero so the hash only holds busy owners
+        if redis.call("HINCRBY", KEYS[2], field, -1) <= 0 then
+            redis.call("HDEL", KEYS[2], field)
+        end
+    end
+end
+if redis.call("HDEL", KEYS[4], execution_id) == 1 then
+    redis.call("LREM", KEYS[3], 0, execution_id)
+end
+
+local admitted = {}
+local active = redis.call("HLEN", KEYS[1])
+for _, candidate in ipairs(redis.call("LRANGE", KEYS[3], 0, tonumber(ARGV[5]) - 1)) do
+    local candidate_owner = redis.call("HGET", KEYS[4], candidate)
+    if candidate_owner then
+        local workflow_field, user_field = owner_fields(candidate_owner)
+        if fits(active, count(workflow_field), count(user_field)) then
+            take_slot(candidate, candidate_owner)
+            active = active + 1
+            table.insert(admitted, candidate)
+        end
+    end
+end
+return admitted
+"""
+
+
+class BackpressureError(Exception):
+    """Raised when the execution queues are too deep to accept more work."""
+
+
+def enabled() -> bool:
+    return bool(
+        settings.MAX_CONCURRENT_EXECUTIONS
+        or settings.MAX_CONCURRENT_EXECUTIONS_PER_WORKFLOW
+        or settings.MAX_CONCURRENT_EXECUTIONS_PER_USER
+    )
+
+
+def _caps() -> list[int]:
+    return [
+        settings.MAX_CONCURRENT_EXECUTIONS or 0,
+        settings.MAX_CONCURRENT_EXECUTIONS_PER_WORKFLOW or 0,
+        settings.MAX_CONCURRENT_EXECUTIONS_PER_USER or 0,
+    ]
+
+
+def try_admit(execution_id: str, workflow_id: int, user_profile_id: int | None) -> bool:
+    """Take a slot for *execution_id*, or queue it and return False.
+
+    Idempotent: an execution that already holds a slot (e.g. one admitted
+    by ``release``) is admitted again without counting twice.
+    """
+    if not enabled():
+        return True
+
+    r = get_redis()
+    owner = f"{workflow_id}:{user_profile_id or ''}"
+    admit = r.register_script(_ADMIT_LUA)
+    return bool(admit(keys=_KEYS, args=[execution_id, *_caps(), owner], client=r))
+
+
+def release(execution_id: str, r=None) -> list[str]:
+    """Free *execution_id*'s slot or waiting entry and start what now fits.
+
+    Returns the IDs of the executions admitted. Best-effort: errors are
+    logged, never raised, since callers are cleaning up after an execution.
+    """
+    try:
+        r = r or get_redis()
+        if not enabled() and not r.exists(PENDING_KEY):
+            return []
+        release_slot = r.register_script(_RELEASE_LUA)
+        admitted = [
+            eid.decode() if isinstance(eid, bytes) else eid
+            for eid in release_slot(keys=_KEYS, args=[execution_id, *_caps(), RELEASE_SCAN_LIMIT], client=r)
+        ]
+    except Exception:
+        logger.warning("Failed to release admission slot of execution %s", execution_id, exc_info=True)
+        return []
+
+    for admitted_id in admitted:
+        try:
+            _enqueue_start(admitted_id)
+        except Exception:
+            logger.exception("Failed to start admitted execution %s", admitted_id)
+    if admitted:
+        logger.info("Admitted waiting executions %s", admitted)
+    return admitted
+
+
+def _enqueue_start(execution_id: str) -> None:
+    from rq import Queue
+
+    from services.execution_recovery import on_execution_job_failure
+    from tasks import execute_workflow_job
+
+    queue = Queue(CONTROL_QUEUE, connection=get_redis_binary())
+    queue.enqueue(execute_workflow_job, execution_id, on_failure=on_execution_job_failure)
+
+
+def queue_depth() -> int:
+    """Jobs waiting in the execution queues plus executions waiting for a slot."""
+    from rq import Queue
+
+    conn = get_redis_binary()
+    with conn.pipeline(transaction=False) as pipe:
+        for name in (CONTROL_QUEUE, LLM_QUEUE, SANDBOX_QUEUE):
+            pipe.llen(Queue(name, connection=conn).key)
+        pipe.llen(PENDING_KEY)
+        return sum(pipe.execute())
+
+
+def check_backpressure() -> None:
+    """Raise ``BackpressureError`` if new executions should be rejected."""
+    limit = settings.EXECUTION_QUEUE_MAX_DEPTH
+    if not limit:
+        return
+    depth = queue_depth()
+    if depth >= limit:
+        raise BackpressureError(f"Execution queues are full ({depth} waiting, limit {limit})")
+
+
+def stats() -> dict:
+    """Current admission counts, queue depth and configured limits."""
+    r = get_redis()
+    with r.pipeline(transaction=False) as pipe:
+        pipe.hlen(ACTIVE_KEY)
+        pipe.llen(PENDING_KEY)
+        pipe.hgetall(COUNTS_KEY)
+        active, pending, counts = pipe.execute()
+    return {
+        "admitted": active,
+        "pending": pending,
+        "admitted_by_workflow": {
+            field.split(":", 1)[1]: int(value) for field, value in counts.items() if field.startswith("workflow:")
+        },
+        "admitted_by_user": {
+            field.split(":", 1)[1]: int(value) for field, value in counts.items() if field.startswith("user:")
+        },
+        "queue_depth": queue_depth(),
+        "limits": {
+            "global": settings.MAX_CONCURRENT_EXECUTIONS,
+            "per_workflow": settings.MAX_CONCURRENT_EXECUTIONS_PER_WORKFLOW,
+            "per_user": settings.MAX_CONCURRENT_EXECUTIONS_PER_USER,
+            "queue_depth": settings.EXECUTION_QUEUE_MAX_DEPTH,
+        },
+    }
@@ -0,0 +1,198 @@
+"""Content-addressed file store for large node outputs.
+
+Scraped pages, code results and big filter results would otherwise be
+re-encoded into Redis on every ``save_state`` and copied into each
+``ExecutionLog`` row. ``save_state`` writes any node output whose JSON
+encoding exceeds ``NODE_OUTPUT_OFFLOAD_BYTES`` here once, named by the
+SHA-256 of the encoding, and stores a small reference in its place::
+
+    {"$blob": "<sha256>", "size": <bytes>}
+
+Execution state loaded by ``load_state`` keeps node outputs in a
+``LazyNodeOutputs`` mapping that reads a blob back only when a component
+or template actually looks the output up. Identical outputs share one
+file. Blobs live under ``BLOB_STORE_DIR`` (default ``{pipelit_dir}/blobs/``).
+
+Blobs are kept for ``BLOB_STORE_RETENTION_DAYS`` after they were last
+written: ``put`` refreshes the mtime of a blob that already exists, and
+``sweep``, run every ``SWEEP_INTERVAL_SECONDS`` on the maintenance queue,
+deletes the files older than that. Execution logs outlive their blobs and
+then show the reference instead of the output.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from config import settings
+from services import state_codec
+
+logger = logging.getLogger(__name__)
+
+REF_KEY = "$blob"
+
+# How often the retention sweep runs
+SWEEP_INTERVAL_SECONDS = 3600
+
+# Set while a sweep is scheduled, so startups don't add a second chain
+SWEEP_SCHEDULED_KEY = "blob_store:sweep_scheduled"
+
+# Temporary files of writes that died before their rename
+_STALE_TMP_SECONDS = 3600
+
+_DIGEST_RE = re.compile(r"[0-9a-f]{64}")
+
+
+def get_blob_dir() -> Path:
+    """Return the blob store directory.
+
+    Uses ``settings.BLOB_STORE_DIR`` if set, otherwise ``{pipelit_dir}/blobs/``.
+    """
+    from config import get_pipelit_dir
+
+    if settings.BLOB_STORE_DIR:
+        return Path(settings.BLOB_STORE_DIR)
+    return get_pipelit_dir() / "blobs"
+
+
+def is_ref(value) -> bool:
+    """Whether *value* is a blob reference."""
+    if not isinstance(value, dict) or len(value) != 2:
+        return False
+    digest = value.get(REF_KEY)
+    return isinstance(digest, str) and _DIGEST_RE.fullmatch(digest) is not None
+
+
+def put(encoded: str) -> dict:
+    """Store the JSON text *encoded* and return its reference."""
+    data = encoded.encode()
+    digest = hashlib.sha256(data).hexdigest()
+    path = _path(digest)
+    try:
+        # Restart the retention period of a blob that is still being produced
+        os.utime(path)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent readers never see a partial blob
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+    return {REF_KEY: digest, "size": len(data)}
+
+
+def get(ref: dict):
+    """Load the value *ref* points to. Raises ``FileNotFoundError`` if it is gone."""
+    return state_codec.decode(_path(ref[REF_KEY]).read_bytes())
+
+
+def resolve(value):
+    """*value*, or the value it references if it is a blob reference."""
+    return get(value) if is_ref(value) else value
+
+
+def should_offload(encoded: str) -> bool:
+    """Whether a node output encoded as *encoded* belongs in the blob store."""
+    threshold = settings.NODE_OUTPUT_OFFLOAD_BYTES
+    return threshold > 0 and len(encoded) > threshold
+
+
+def stored(node_outputs: dict, node_id: str):
+    """The value kept in *node_outputs* for *node_id*, without loading a blob."""
+    return dict.get(node_outputs, node_id)
+
+
+class LazyNodeOutputs(dict):
+    """``node_outputs`` whose blob references are loaded on lookup.
+
+    Lookups (``[]``, ``get``, ``items``, ``values``) return resolved outputs;
+    each one reads the blob again, so callers that mutate an output must
+    assign it back. Copying with ``dict(...)`` or ``{**...}`` keeps the raw
+    references, which is what ``save_state`` wants.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        return resolve(super().__getitem__(key))
+
+    def get(self, key, default=None):
+        return resolve(super().get(key, default))
+
+    def items(self):
+        return [(k, resolve(v)) for k, v in super().items()]
+
+    def values(self):
+        return [resolve(v) for v in super().values()]
+
+    def copy(self) -> LazyNodeOutputs:
+        return LazyNodeOutputs(self)
+
+
+def sweep() -> int:
+    """Delete blobs not written for ``BLOB_STORE_RETENTION_DAYS``; return how many.
+
+    Also removes temporary files left by writes that died. A no-op when
+    the retention is ``0``.
+    """
+    if settings.BLOB_STORE_RETENTION_DAYS <= 0:
+        return 0
+    blob_dir = get_blob_dir()
+    if not blob_dir.is_dir():
+        return 0
+    now = time.time()
+    cutoff = now - settings.BLOB_STORE_RETENTION_DAYS * 86400
+    deleted = 0
+    for path in blob_dir.glob("*/*"):
+        try:
+            mtime = path.stat().st_mtime
+            if path.name.startswith(".tmp-"):
+                if mtime < now - _STALE_TMP_SECONDS:
+                    path.unlink(missing_ok=True)
+            elif _DIGEST_RE.fullmatch(path.stem) and mtime < cutoff:
+                path.unlink(missing_ok=True)
+                deleted += 1
+        except OSError:
+            logger.warning("Failed to sweep blob %s", path, exc_info=True)
+    if deleted:
+        logger.info("Deleted %d blobs older than %d days", deleted, settings.BLOB_STORE_RETENTION_DAYS)
+    return deleted
+
+
+def schedule_sweep(reschedule: bool = False) -> None:
+    """Run ``sweep_blob_store_job`` after ``SWEEP_INTERVAL_SECONDS`` (best-effort).
+
+    Does nothing if a run is already scheduled, unless *reschedule* — the
+    sweep job itself passes it to schedule its successor.
+    """
+    if settings.BLOB_STORE_RETENTION_DAYS <= 0:
+        return
+    try:
+        from rq import Queue
+
+        from services.queues import MAINTENANCE_QUEUE
+        from services.redis_pool import get_redis, get_redis_binary
+        from tasks import sweep_blob_store_job
+
+        # Expires if the chain dies, so the next startup restarts it
+        if not get_redis().set(SWEEP_SCHEDULED_KEY, 1, ex=2 * SWEEP_INTERVAL_SECONDS + 60, nx=not reschedule):
+            return
+        queue = Queue(MAINTENANCE_QUEUE, connection=get_redis_binary())
+        queue.enqueue_in(timedelta(seconds=SWEEP_INTERVAL_SECONDS), sweep_blob_store_job)
+    except Exception:
+        logger.warning("Failed to schedule the blob store sweep (non-fatal)", exc_info=True)
+
+
+def _path(digest: str) -> Path:
+    return get_blob_dir() / digest[:2] / f"{digest}.json"
@@ -0,0 +1,77 @@
+"""Coalescing pub/sub publisher for execution events.
+
+Callers hand over already-serialized ``(channel, payload)`` pairs and return
+immediately; a background thread publishes whatever has accumulated in one
+non-transactional pipeline, at most ``interval`` seconds after the first
+pending event. ``flush=True`` publishes the buffer synchronously, in order —
+for events a client must see before the caller moves on (terminal
+``execution_*`` events). An ``interval`` of ``0`` publishes every call inline.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterable
+
+import redis as redis_lib
+
+logger = logging.getLogger(__name__)
+
+
+class EventPublisher:
+    def __init__(self, client_factory: Callable[[], redis_lib.Redis], interval: float) -> None:
+        self._client_factory = client_factory
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # keeps batches in publish order
+        self._pending = threading.Event()
+        self._buffer: list[tuple[str, str]] = []
+        self._thread: threading.Thread | None = None
+        self._pid = os.getpid()
+        atexit.register(self._flush_quietly)
+
+    def publish(self, messages: Iterable[tuple[str, str]], flush: bool = False) -> None:
+        """Queue *messages*; publish them (and anything queued before) now if *flush*."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked: the parent's buffer and flusher thread stay with the parent
+                self._buffer, self._thread, self._pid = [], None, os.getpid()
+                self._pending = threading.Event()
+            self._buffer.extend(messages)
+            inline = flush or self._interval <= 0
+            if not inline and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="event-publisher", daemon=True)
+                self._thread.start()
+        if inline:
+            self.flush()
+        else:
+            self._pending.set()
+
+    def flush(self) -> None:
+        """Publish everything buffered in one pipelined round-trip."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+            pipe = self._client_factory().pipeline(transaction=False)
+            for channel, raw in batch:
+                pipe.publish(channel, raw)
+            pipe.execute()
+
+    def _flush_quietly(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            logger.warning("Failed to publish buffered events (non-fatal)", exc_info=True)
+
+    def _run(self) -> None:
+        while True:
+            self._pending.wait()
+            time.sleep(self._interval)
+            self._pending.clear()
+            self._flush_quietly()
@@ -0,0 +1,161 @@
+"""Durable journal of completed nodes, used to resume crashed executions.
+
+Execution state lives in Redis under a one-hour TTL, so after a worker
+crash or an eviction ``recover_zombie_executions`` could only mark the
+execution failed, throwing away every node that had already finished.
+Each node that completes outside a loop body now appends an
+``ExecutionJournalEntry`` holding the state delta ``save_state`` wrote for
+it and, for conditionally routing nodes, the route it took. A loop is
+journaled once, when its last iteration finishes, together with the
+outputs of its body nodes.
+
+``orchestrator.resume_from_journal`` rebuilds the Redis state from these
+rows and re-enqueues the nodes that had not completed. Entries are written
+before the node's successors are enqueued, so a journaled node's
+predecessors are always journaled too. Nodes that were running when the
+worker died run again: execution is at-least-once per node.
+
+Inside a node job (``batched``) entries are only buffered, and ``flush``
+writes them in one transaction just before work leaves the process, that
+is when ``_enqueue_node_job`` hands a successor to RQ, and when the job
+ends. Fused successors therefore add no commit of their own. Payloads stay
+inline, so deleting the rows deletes everything an execution journaled;
+encoded fields longer than ``JOURNAL_COMPRESSION_MIN_BYTES`` are written as
+``state_codec`` frames, which Redis state accepts as they are.
+"""
+
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from config import settings
+from services import state_codec
+
+logger = logging.getLogger(__name__)
+
+# Entries of the current node job not yet written, as (bind, row) pairs
+_pending: ContextVar[list | None] = ContextVar("_journal_pending", default=None)
+
+
+def record(db: Session, execution_id: str, node_id: str, delta: dict, route: str | None = None) -> None:
+    """Append a completed node and the state delta it wrote.
+
+    Buffered until the next ``flush`` inside ``batched``; otherwise
+    committed immediately.
+    """
+    from models.execution import ExecutionJournalEntry
+
+    row = {
+        "execution_id": execution_id,
+        "node_id": node_id,
+        "route": route,
+        "state_delta": _compress(delta),
+    }
+    pending = _pending.get()
+    if pending is not None:
+        pending.append((db.get_bind(), row))
+        return
+    db.add(ExecutionJournalEntry(**row))
+    db.commit()
+
+
+@contextmanager
+def batched():
+    """Buffer the entries recorded in this block, writing them at ``flush`` or on exit."""
+    token = _pending.set([])
+    try:
+        yield
+    finally:
+        try:
+            flush()
+        except Exception:
+            logger.exception("Failed to write journal entries")
+        finally:
+            _pending.reset(token)
+
+
+def flush() -> None:
+    """Write the entries buffered by ``batched`` in one transaction.
+
+    Raises if the write fails, so no successor is enqueued ahead of the
+    journal entries of its predecessors. A no-op outside ``batched``.
+    """
+    from models.execution import ExecutionJournalEntry
+
+    pending = _pending.get()
+    if not pending:
+        return
+    batch = pending[:]
+    del pending[:]
+    by_bind: dict[object, list[dict]] = {}
+    for bind, row in batch:
+        by_bind.setdefault(bind, []).append(row)
+    for bind, rows in by_bind.items():
+        with Session(bind) as session:
+            session.execute(insert(ExecutionJournalEntry), rows)
+            session.commit()
+
+
+def state_delta(entry) -> dict:
+    """The state delta of *entry*, its fields encoded as ``save_state`` stores them."""
+    return entry.state_delta or {}
+
+
+def _compress(delta: dict) -> dict:
+    """*delta* with encoded fields over ``JOURNAL_COMPRESSION_MIN_BYTES`` compressed."""
+    return {
+        key: value if key == "removed" else _map_fields(value, _compress_field)
+        for key, value in delta.items()
+    }
+
+
+def _map_fields(value, fn):
+    if isinstance(value, dict):
+        return {k: fn(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [fn(v) for v in value]
+    return value
+
+
+def _compress_field(encoded):
+    if isinstance(encoded, str) and not encoded.startswith(state_codec.FRAME_PREFIX):
+        return state_codec.pack(encoded, min_bytes=settings.JOURNAL_COMPRESSION_MIN_BYTES)
+    return encoded
+
+
+def entries(db: Session, execution_id: str) -> list:
+    """An execution's journal entries in the order they were written."""
+    from models.execution import ExecutionJournalEntry
+
+    return (
+        db.query(ExecutionJournalEntry)
+        .filter(ExecutionJournalEntry.execution_id == execution_id)
+        .order_by(ExecutionJournalEntry.id)
+        .all()
+    )
+
+
+def discard(execution_id: str) -> None:
+    """Delete an execution's journal once it has ended (best-effort)."""
+    from database import SessionLocal
+    from models.execution import ExecutionJournalEntry
+
+    pending = _pending.get()
+    if pending:
+        pending[:] = [(bind, row) for bind, row in pending if row["execution_id"] != execution_id]
+    try:
+        db = SessionLocal()
+        try:
+            db.query(ExecutionJournalEntry).filter(
+                ExecutionJournalEntry.execution_id == execution_id,
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+    except Exception:
+        logger.warning("Failed to discard journal of execution %s (non-fatal)", execution_id, exc_info=True)
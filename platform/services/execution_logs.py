@@ -0,0 +1,144 @@
+"""Buffered, bulk-inserting sink for ExecutionLog rows.
+
+Writing a log row used to cost its own INSERT and COMMIT — an fsync under
+SQLite WAL — for every node completion and failure. Rows are now buffered
+per worker and written with one bulk INSERT per flush: when the buffer
+reaches ``batch_size`` rows, ``interval`` seconds after the first pending
+row, or when an execution finishes.
+
+The worker finalizing an execution is often not the one holding its last
+rows, so each buffered row is also counted in a per-execution Redis counter
+that flushing decrements; ``wait_for_execution`` blocks until it drains.
+An ``interval`` of ``0`` writes every row inline through the caller's session.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Callable
+
+import redis as redis_lib
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+PENDING_TTL = 3600  # matches the orchestrator's STATE_TTL
+WAIT_POLL_INTERVAL = 0.01  # seconds
+
+
+def pending_key(execution_id: str) -> str:
+    return f"execution:{execution_id}:log_pending"
+
+
+class ExecutionLogBuffer:
+    def __init__(
+        self,
+        client_factory: Callable[[], redis_lib.Redis],
+        interval: float,
+        batch_size: int,
+    ) -> None:
+        self._client_factory = client_factory
+        self._interval = interval
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending = threading.Event()
+        self._rows: list[tuple[object, dict]] = []
+        self._thread: threading.Thread | None = None
+        self._pid = os.getpid()
+        atexit.register(self.flush)
+
+    def add(self, db: Session, row: dict) -> None:
+        """Buffer one ``ExecutionLog`` row (attribute name → value) for *db*'s engine."""
+        from models.execution import ExecutionLog
+
+        if self._interval <= 0:
+            db.add(ExecutionLog(**row))
+            db.commit()
+            return
+
+        row.setdefault("timestamp", datetime.now(timezone.utc))
+        execution_id = row["execution_id"]
+        pipe = self._client_factory().pipeline(transaction=False)
+        pipe.incr(pending_key(execution_id))
+        pipe.expire(pending_key(execution_id), PENDING_TTL)
+        pipe.execute()
+
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked: the parent's rows and flusher thread stay with the parent
+                self._rows, self._thread, self._pid = [], None, os.getpid()
+                self._pending = threading.Event()
+            self._rows.append((db.get_bind(), row))
+            full = len(self._rows) >= self._batch_size
+            if not full and self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="execution-log-writer", daemon=True)
+                self._thread.start()
+        if full:
+            self.flush()
+        else:
+            self._pending.set()
+
+    def flush(self) -> None:
+        """Bulk-insert everything buffered; never raises."""
+        from models.execution import ExecutionLog
+
+        with self._flush_lock:
+            with self._lock:
+                batch, self._rows = self._rows, []
+            if not batch:
+                return
+
+            by_bind: dict[object, list[dict]] = defaultdict(list)
+            for bind, row in batch:
+                by_bind[bind].append(row)
+            for bind, rows in by_bind.items():
+                try:
+                    with Session(bind) as session:
+                        session.execute(insert(ExecutionLog), rows)
+                        session.commit()
+                except Exception:
+                    logger.exception("Failed to write %d execution log rows", len(rows))
+
+            # Rows that failed to insert are released too, so finalization never hangs on them
+            try:
+                pipe = self._client_factory().pipeline(transaction=False)
+                for execution_id, count in Counter(row["execution_id"] for _, row in batch).items():
+                    pipe.decrby(pending_key(execution_id), count)
+                    pipe.expire(pending_key(execution_id), PENDING_TTL)
+                pipe.execute()
+            except Exception:
+                logger.warning("Failed to release pending execution log counters", exc_info=True)
+
+    def wait_for_execution(self, execution_id: str, timeout: float) -> bool:
+        """Flush local rows, then wait for other workers to flush theirs.
+
+        Returns ``False`` if rows for *execution_id* were still pending
+        after *timeout* seconds (e.g. a worker died holding them).
+        """
+        self.flush()
+        if self._interval <= 0:
+            return True
+        r = self._client_factory()
+        deadline = time.monotonic() + timeout
+        while True:
+            pending = r.get(pending_key(execution_id))
+            if not pending or int(pending) <= 0:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(WAIT_POLL_INTERVAL)
+
+    def _run(self) -> None:
+        while True:
+            self._pending.wait()
+            time.sleep(self._interval)
+            self._pending.clear()
+            self.flush()
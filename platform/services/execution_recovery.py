@@ -2,13 +2,18 @@
 
 A zombie execution is one whose RQ worker crashed (OOM, host reboot, etc.)
 leaving the DB row in ``status='running'`` with no worker to finish it.
+Liveness comes from worker heartbeats (``services/heartbeats.py``), the
+execution's queued node jobs and its running child executions, not from
+how long ago it started. A zombie is resumed from its journal of
+completed nodes (``services/execution_journal.py``) up to its
+``max_retries``; only then, or if resuming fails, is it marked failed.
 
 Two entry points:
 
 - ``recover_zombie_executions()`` — called on server startup (mirrors
   ``recover_scheduled_jobs()`` in ``services/scheduler.py``)
 - ``recover_zombie_executions_job()`` in ``tasks/__init__.py`` — periodic
-  RQ watchdog (mirrors ``cleanup_stuck_child_waits_job()``)
+  RQ watchdog, rescheduled by ``schedule_watchdog()``
 """
 
 from __future__ import annotations
@@ -18,23 +23,30 @@ import logging
 import time
 from datetime import datetime, timezone
 
-import redis as redis_lib
 from sqlalchemy.orm import Session
 
 from config import settings
 
 logger = logging.getLogger(__name__)
 
+# Set while a watchdog run is scheduled, so startups don't add a second chain
+WATCHDOG_SCHEDULED_KEY = "execution_watchdog:scheduled"
+
+# RQ job statuses that mean a node job is still waiting to run
+_WAITING_JOB_STATUSES = frozenset({"queued", "scheduled", "deferred"})
+
 
 def recover_zombie_executions(threshold_seconds: int | None = None) -> int:
     """Find and recover all zombie executions.
 
     An execution is considered a zombie when:
     - ``status == 'running'``
-    - ``started_at`` is older than *threshold_seconds* ago
+    - it started, and last sent a heartbeat, more than *threshold_seconds* ago
+    - none of its node jobs is waiting in a queue
+    - none of its child executions is pending or running
 
-    Each zombie is marked ``failed`` with an explanatory error message,
-    a WebSocket event is published, and its Redis keys are cleaned up.
+    Each zombie is resumed from its journal, or marked ``failed`` once its
+    resume attempts are used up (see ``_recover_one``).
 
     Returns the number of executions recovered.
     """
@@ -47,7 +59,7 @@ def recover_zombie_executions(threshold_seconds: int | None = None) -> int:
     db: Session = SessionLocal()
     try:
         cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - _timedelta(threshold_seconds)
-        zombies = (
+        candidates = (
             db.query(WorkflowExecution)
             .filter(
                 WorkflowExecution.status == "running",
@@ -55,12 +67,15 @@ def recover_zombie_executions(threshold_seconds: int | None = None) -> int:
             )
             .all()
         )
-        if not zombies:
+        if not candidates:
             return 0
 
         recovered = 0
-        for execution in zombies:
+        silent_since = time.time() - threshold_seconds
+        for execution in candidates:
             try:
+                if _is_alive(execution, silent_since, db):
+                    continue
                 _recover_one(execution, db)
                 recovered += 1
             except Exception:
@@ -75,17 +90,61 @@ def recover_zombie_executions(threshold_seconds: int | None = None) -> int:
         db.close()
 
 
+def _is_alive(execution, silent_since: float, db: Session) -> bool:
+    """Whether *execution* shows any sign of progress since *silent_since*."""
+    from rq.job import Job
+
+    from models.execution import WorkflowExecution
+    from services.heartbeats import last_beat
+    from services.orchestrator import _jobs_key
+    from services.redis_pool import get_redis, get_redis_binary
+
+    execution_id = execution.execution_id
+    r = get_redis()
+    beat = last_beat(r, execution_id)
+    if beat is not None and beat >= silent_since:
+        return True
+
+    job_ids = list(r.smembers(_jobs_key(execution_id)))
+    if job_ids:
+        jobs = Job.fetch_many(job_ids, connection=get_redis_binary())
+        if any(job is not None and job.get_status(refresh=False) in _WAITING_JOB_STATUSES for job in jobs):
+            return True
+
+    child = (
+        db.query(WorkflowExecution.execution_id)
+        .filter(
+            WorkflowExecution.parent_execution_id == execution_id,
+            WorkflowExecution.status.in_(("pending", "running")),
+        )
+        .first()
+    )
+    return child is not None
+
+
 def _recover_one(execution, db: Session) -> None:
-    """Mark a single zombie execution as failed and clean up."""
+    """Resume a single zombie execution from its journal, or mark it failed."""
     from models.workflow import Workflow
+    from services.orchestrator import resume_from_journal
 
     execution_id = execution.execution_id
     logger.warning("Recovering zombie execution %s", execution_id)
 
+    if (execution.retry_count or 0) < (execution.max_retries or 0):
+        # Count the attempt first, so an execution that keeps crashing its
+        # workers is eventually failed rather than resumed forever
+        execution.retry_count = (execution.retry_count or 0) + 1
+        db.commit()
+        try:
+            resume_from_journal(execution, db)
+            return
+        except Exception:
+            logger.exception("Could not resume zombie execution %s; marking it failed", execution_id)
+
     execution.status = "failed"
     execution.error_message = (
         "Execution recovered as failed: worker presumed crashed "
-        "(exceeded zombie threshold)"
+        "(no heartbeat or queued work within the zombie threshold)"
     )
     execution.completed_at = datetime.now(timezone.utc)
     db.commit()
@@ -103,28 +162,52 @@ def _recover_one(execution, db: Session) -> None:
     _cleanup_redis(execution_id)
 
 
+def schedule_watchdog(reschedule: bool = False) -> None:
+    """Run ``recover_zombie_executions_job`` after the watchdog interval (best-effort).
+
+    Does nothing if a run is already scheduled, unless *reschedule* — the
+    watchdog job itself passes it to schedule its successor.
+    """
+    interval = settings.EXECUTION_WATCHDOG_INTERVAL_SECONDS
+    if interval <= 0:
+        return
+    try:
+        from rq import Queue
+
+        from services.queues import MAINTENANCE_QUEUE
+        from services.redis_pool import get_redis, get_redis_binary
+        from tasks import recover_zombie_executions_job
+
+        # Expires if the chain dies, so the next startup restarts it
+        if not get_redis().set(WATCHDOG_SCHEDULED_KEY, 1, ex=2 * interval + 60, nx=not reschedule):
+            return
+        queue = Queue(MAINTENANCE_QUEUE, connection=get_redis_binary())
+        queue.enqueue_in(_timedelta(interval), recover_zombie_executions_job)
+    except Exception:
+        logger.warning("Failed to schedule the execution watchdog (non-fatal)", exc_info=True)
+
+
 def _publish_zombie_event(
     execution_id: str,
     workflow_slug: str | None,
     error: str = "Execution recovered as failed (zombie)",
 ) -> None:
     """Publish an ``execution_failed`` event via Redis pub/sub (best-effort)."""
+    from services.redis_pool import get_redis
+
     try:
-        r = redis_lib.from_url(settings.REDIS_URL, decode_responses=True)
-        try:
-            payload = {
-                "type": "execution_failed",
-                "execution_id": execution_id,
-                "timestamp": time.time(),
-                "data": {"error": error},
-            }
-            raw = json.dumps(payload)
-            r.publish(f"execution:{execution_id}", raw)
-            if workflow_slug:
-                payload["channel"] = f"workflow:{workflow_slug}"
-                r.publish(f"workflow:{workflow_slug}", json.dumps(payload))
-        finally:
-            r.close()
+        r = get_redis()
+        payload = {
+            "type": "execution_failed",
+            "execution_id": execution_id,
+            "timestamp": time.time(),
+            "data": {"error": error},
+        }
+        raw = json.dumps(payload)
+        r.publish(f"execution:{execution_id}", raw)
+        if workflow_slug:
+            payload["channel"] = f"workflow:{workflow_slug}"
+            r.publish(f"workflow:{workflow_slug}", json.dumps(payload))
     except Exception:
         logger.warning(
             "Failed to publish zombie event for execution %s (non-fatal)",
@@ -134,21 +217,22 @@ def _publish_zombie_event(
 
 
 def _cleanup_redis(execution_id: str) -> None:
-    """Delete ``execution:{id}:*`` keys from Redis (best-effort)."""
+    """Delete the execution's tracked Redis keys, free its admission slot and drop its journal (best-effort)."""
+    from services import admission, execution_journal
+    from services.orchestrator import _execution_keys
+    from services.redis_pool import get_redis
+
     try:
-        r = redis_lib.from_url(settings.REDIS_URL, decode_responses=True)
-        try:
-            keys = r.keys(f"execution:{execution_id}:*")
-            if keys:
-                r.delete(*keys)
-        finally:
-            r.close()
+        r = get_redis()
+        r.unlink(*_execution_keys(r, execution_id))
+        admission.release(execution_id, r)
     except Exception:
         logger.warning(
             "Failed to clean up Redis keys for execution %s (non-fatal)",
             execution_id,
             exc_info=True,
         )
+    execution_journal.discard(execution_id)
 
 
 def on_execution_job_failure(job, connection, exc_type, exc_value, traceback):
@@ -2,16 +2,26 @@
 
 Resolves ``{{ nodeId.portName }}`` expressions in system prompts,
 extra_config values, and other string config fields.
+
+Templates are compiled once per source text and kept in an LRU cache
+together with the top-level variables they reference, so rendering only
+pulls those entries out of ``node_outputs``.
 """
 
 from __future__ import annotations
 
 import logging
+from dataclasses import dataclass
+from functools import lru_cache
+
+from jinja2 import BaseLoader, Environment, StrictUndefined, Template, TemplateSyntaxError, UndefinedError, meta
 
-from jinja2 import BaseLoader, Environment, StrictUndefined, UndefinedError
+from services.blob_store import resolve
 
 logger = logging.getLogger(__name__)
 
+TEMPLATE_CACHE_SIZE = 1024
+
 _env = Environment(
     loader=BaseLoader(),
     undefined=StrictUndefined,
@@ -20,6 +30,26 @@ _env = Environment(
 )
 
 
+@dataclass(frozen=True)
+class CompiledTemplate:
+    template: Template
+    variables: frozenset[str]
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(template_str: str) -> CompiledTemplate | None:
+    """Parse and compile *template_str* once; ``None`` if it is not valid Jinja."""
+    try:
+        ast = _env.parse(template_str)
+        return CompiledTemplate(
+            template=_env.from_string(ast),
+            variables=frozenset(meta.find_undeclared_variables(ast)),
+        )
+    except TemplateSyntaxError as exc:
+        logger.debug("Expression compilation failed: %s", exc)
+        return None
+
+
 def resolve_expressions(
     template_str: str,
     node_outputs: dict,
@@ -34,13 +64,20 @@ def resolve_expressions(
     if not template_str or "{{" not in template_str:
         return template_str
 
-    context = dict(node_outputs)
-    if trigger is not None:
+    compiled = compile_template(template_str)
+    if compiled is None:
+        return template_str
+
+    # Offloaded outputs are loaded only when a template references them
+    context = {
+        name: resolve(node_outputs[name])
+        for name in compiled.variables if name in node_outputs
+    }
+    if trigger is not None and "trigger" in compiled.variables:
         context["trigger"] = trigger
 
     try:
-        tpl = _env.from_string(template_str)
-        return tpl.render(context)
+        return compiled.template.render(context)
     except (UndefinedError, Exception) as exc:
         logger.debug("Expression resolution failed: %s — returning original", exc)
         return template_str
@@ -51,25 +88,38 @@ def resolve_config_expressions(
     node_outputs: dict,
     trigger: dict | None = None,
 ) -> dict:
-    """Recursively resolve expressions in all string values of a config dict."""
+    """Recursively resolve expressions in all string values of a config dict.
+
+    Subtrees without expressions are returned as-is rather than copied, so a
+    template-free config comes back as the same object.
+    """
     if not config:
         return config
+    return _resolve_value(config, node_outputs, trigger)
+
 
-    resolved = {}
-    for key, value in config.items():
-        if isinstance(value, str):
-            resolved[key] = resolve_expressions(value, node_outputs, trigger)
-        elif isinstance(value, dict):
-            resolved[key] = resolve_config_expressions(value, node_outputs, trigger)
-        elif isinstance(value, list):
-            resolved[key] = [
-                resolve_expressions(item, node_outputs, trigger)
-                if isinstance(item, str)
-                else resolve_config_expressions(item, node_outputs, trigger)
-                if isinstance(item, dict)
-                else item
-                for item in value
-            ]
-        else:
-            resolved[key] = value
-    return resolved
+def _resolve_value(value, node_outputs: dict, trigger: dict | None):
+    if isinstance(value, str):
+        return resolve_expressions(value, node_outputs, trigger)
+    if isinstance(value, dict):
+        resolved = None
+        for key, item in value.items():
+            new = _resolve_value(item, node_outputs, trigger)
+            if new is not item:
+                if resolved is None:
+                    resolved = dict(value)
+                resolved[key] = new
+        return value if resolved is None else resolved
+    if isinstance(value, list):
+        # Only strings and dicts inside lists are resolved; nested lists are kept
+        resolved = None
+        for i, item in enumerate(value):
+            if not isinstance(item, (str, dict)):
+                continue
+            new = _resolve_value(item, node_outputs, trigger)
+            if new is not item:
+                if resolved is None:
+                    resolved = list(value)
+                resolved[i] = new
+        return value if resolved is None else resolved
+    return value
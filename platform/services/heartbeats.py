@@ -0,0 +1,100 @@
+"""Worker heartbeats for running executions.
+
+Zombie detection used to go by ``started_at`` alone, so a long but healthy
+execution looked exactly like one whose worker had died. While a node job
+runs, its execution is registered with this process, and a daemon thread
+rewrites ``execution:<id>:heartbeat`` (the Unix time of the beat) every
+``EXECUTION_HEARTBEAT_INTERVAL_SECONDS`` for each registered execution.
+The watchdog in ``services/execution_recovery.py`` reads it back with
+``last_beat``.
+
+Forked RQ work-horses start their own thread on their first job; it dies
+with the horse, which is exactly when the beats should stop.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
+
+from config import settings
+from services.redis_pool import get_redis
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_TTL = 3600  # matches the orchestrator's STATE_TTL
+
+_lock = threading.Lock()
+_running: Counter[str] = Counter()
+_thread: threading.Thread | None = None
+
+
+def heartbeat_key(execution_id: str) -> str:
+    return f"execution:{execution_id}:heartbeat"
+
+
+def beat(r, execution_id: str) -> None:
+    """Record a heartbeat for *execution_id* on *r* (a client or pipeline)."""
+    r.set(heartbeat_key(execution_id), time.time(), ex=HEARTBEAT_TTL)
+
+
+def last_beat(r, execution_id: str) -> float | None:
+    """Unix time of the execution's latest heartbeat, if any."""
+    raw = r.get(heartbeat_key(execution_id))
+    return float(raw) if raw is not None else None
+
+
+@contextmanager
+def running(execution_id: str) -> Iterator[None]:
+    """Keep *execution_id*'s heartbeat fresh while the block runs."""
+    with _lock:
+        _running[execution_id] += 1
+        _ensure_thread()
+    try:
+        yield
+    finally:
+        with _lock:
+            _running[execution_id] -= 1
+            if _running[execution_id] <= 0:
+                del _running[execution_id]
+
+
+def _ensure_thread() -> None:
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _thread = threading.Thread(target=_run, name="execution-heartbeats", daemon=True)
+    _thread.start()
+
+
+def _after_fork() -> None:
+    # Work-horses start clean: the parent's registrations and thread (and a
+    # lock it may have held mid-fork) don't carry over
+    global _lock, _thread
+    _lock = threading.Lock()
+    _running.clear()
+    _thread = None
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+def _run() -> None:
+    while True:
+        time.sleep(max(1, settings.EXECUTION_HEARTBEAT_INTERVAL_SECONDS))
+        with _lock:
+            execution_ids = list(_running)
+        if not execution_ids:
+            continue
+        try:
+            with get_redis().pipeline(transaction=False) as pipe:
+                for execution_id in execution_ids:
+                    beat(pipe, execution_id)
+                pipe.execute()
+        except Exception:
+            logger.debug("Failed to refresh execution heartbeats", exc_info=True)
@@ -170,7 +170,7 @@ def resolve_llm_for_node(node, db: Session | None = None) -> BaseChatModel:
                     f"Credential ID {cc.llm_credential_id} for node '{node.node_id}' "
                     "has no LLM provider configuration."
                 )
-            return create_llm_from_db(
+            llm = create_llm_from_db(
                 llm_cred,
                 cc.model_name,
                 temperature=cc.temperature,
@@ -182,6 +182,7 @@ def resolve_llm_for_node(node, db: Session | None = None) -> BaseChatModel:
                 max_retries=cc.max_retries,
                 response_format=cc.response_format,
             )
+            return _with_response_cache(llm, node, cc.llm_credential_id)
 
         # AI nodes: resolve via llm_model_config_id FK (set when ai_model edge is created)
         if cc.llm_model_config_id:
@@ -200,7 +201,7 @@ def resolve_llm_for_node(node, db: Session | None = None) -> BaseChatModel:
                         f"Credential ID {tc.llm_credential_id} for ai_model config "
                         f"linked to node '{node.node_id}' has no LLM provider configuration."
                     )
-                return create_llm_from_db(
+                llm = create_llm_from_db(
                     llm_cred,
                     tc.model_name,
                     temperature=tc.temperature,
@@ -212,6 +213,7 @@ def resolve_llm_for_node(node, db: Session | None = None) -> BaseChatModel:
                     max_retries=tc.max_retries,
                     response_format=tc.response_format,
                 )
+                return _with_response_cache(llm, node, tc.llm_credential_id)
 
         raise ValueError(
             f"Node '{node.node_id}' has no connected ai_model node via edge_label='llm'."
@@ -221,6 +223,15 @@ def resolve_llm_for_node(node, db: Session | None = None) -> BaseChatModel:
             db.close()
 
 
+def _with_response_cache(llm: BaseChatModel, node, credential_id: int | None) -> BaseChatModel:
+    """Attach the shared response cache to *llm* if *node* opted in (services/llm_cache.py)."""
+    from services.llm_cache import ResponseCache, enabled_for
+
+    if enabled_for(node):
+        llm.cache = ResponseCache(credential_id)
+    return llm
+
+
 def resolve_credential_for_node(node, db: Session | None = None):
     """Resolve the LLMProviderCredential for a node (agent or ai_model).
 
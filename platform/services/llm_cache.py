@@ -0,0 +1,156 @@
+"""Exact-match cache of LLM responses for classification-style nodes.
+
+Categorizer-style nodes send the same system prompt and last user message
+on every run, and many inbound messages are identical ("hi", "/start").
+A node opts in with ``extra_config.cache_llm_responses``;
+``services.llm.resolve_llm_for_node`` then attaches a ``ResponseCache`` to
+the chat model it builds, and LangChain consults it before calling the
+provider.
+
+The key covers the credential, the model and its sampling parameters
+(LangChain's ``llm_string``) and the messages reduced to their role,
+content and tool calls, so per-run ids and timestamps don't defeat it.
+Entries are shared through Redis, expire after
+``LLM_RESPONSE_CACHE_TTL_SECONDS`` and the least recently used are evicted
+past ``LLM_RESPONSE_CACHE_MAX_ENTRIES``. A hit comes back with zero token
+usage and ``response_metadata["cache_hit"]``, so it is recorded as a free
+call. Hits and misses are counted in ``STATS_KEY``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from typing import Any
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import AIMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration
+
+from config import settings
+from services.redis_pool import get_redis
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_COMPONENT_TYPES = frozenset({"categorizer", "router", "extractor"})
+
+ENTRY_PREFIX = "llm_cache:entry:"
+LRU_KEY = "llm_cache:lru"
+STATS_KEY = "llm_cache:stats"
+
+_ZERO_USAGE = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+
+
+def enabled_for(node) -> bool:
+    """Whether *node* opted in to response caching."""
+    config = node.component_config
+    extra = getattr(config, "extra_config", None) or {}
+    return config.component_type in CACHEABLE_COMPONENT_TYPES and extra.get("cache_llm_responses") is True
+
+
+class ResponseCache(BaseCache):
+    """Redis-backed LangChain cache scoped to one provider credential."""
+
+    def __init__(self, credential_id: int | None):
+        self.credential_id = credential_id
+
+    def lookup(self, prompt: str, llm_string: str) -> list[ChatGeneration] | None:
+        try:
+            r = get_redis()
+            key = self._key(prompt, llm_string)
+            raw = r.get(ENTRY_PREFIX + key)
+            with r.pipeline(transaction=False) as pipe:
+                pipe.hincrby(STATS_KEY, "misses" if raw is None else "hits", 1)
+                if raw is not None:
+                    pipe.zadd(LRU_KEY, {key: time.time()})
+                pipe.execute()
+            if raw is None:
+                return None
+            return [_cached_generation(entry) for entry in json.loads(raw)]
+        except Exception:
+            logger.warning("LLM response cache lookup failed (non-fatal)", exc_info=True)
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: list) -> None:
+        try:
+            entries = [
+                {"message": message_to_dict(gen.message), "generation_info": gen.generation_info}
+                for gen in return_val
+            ]
+            encoded = json.dumps(entries)
+        except (AttributeError, TypeError, ValueError):
+            return
+        try:
+            r = get_redis()
+            key = self._key(prompt, llm_string)
+            with r.pipeline(transaction=False) as pipe:
+                pipe.set(ENTRY_PREFIX + key, encoded, ex=settings.LLM_RESPONSE_CACHE_TTL_SECONDS)
+                pipe.zadd(LRU_KEY, {key: time.time()})
+                pipe.zcard(LRU_KEY)
+                size = pipe.execute()[-1]
+            excess = size - settings.LLM_RESPONSE_CACHE_MAX_ENTRIES
+            if excess > 0:
+                evicted = [member for member, _ in r.zpopmin(LRU_KEY, excess)]
+                if evicted:
+                    r.unlink(*(ENTRY_PREFIX + member for member in evicted))
+        except Exception:
+            logger.warning("LLM response cache update failed (non-fatal)", exc_info=True)
+
+    def clear(self, **kwargs: Any) -> None:
+        r = get_redis()
+        members = r.zrange(LRU_KEY, 0, -1)
+        if members:
+            r.unlink(*(ENTRY_PREFIX + member for member in members))
+        r.unlink(LRU_KEY)
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        encoded = json.dumps([self.credential_id, llm_string, _normalize(prompt)], default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def stats() -> dict:
+    """Hit and miss counts since the counters were created, and entries held."""
+    r = get_redis()
+    with r.pipeline(transaction=False) as pipe:
+        pipe.hgetall(STATS_KEY)
+        pipe.zcard(LRU_KEY)
+        counts, entries = pipe.execute()
+    return {
+        "hits": int(counts.get("hits", 0)),
+        "misses": int(counts.get("misses", 0)),
+        "entries": entries,
+    }
+
+
+def _normalize(prompt: str):
+    """Reduce LangChain's serialized message list to role, content and tool calls."""
+    try:
+        messages = json.loads(prompt)
+    except (TypeError, ValueError):
+        return prompt
+    if not isinstance(messages, list):
+        return prompt
+    normalized = []
+    for msg in messages:
+        if not isinstance(msg, dict):
+            normalized.append(msg)
+            continue
+        kwargs = msg.get("kwargs") or {}
+        normalized.append([
+            kwargs.get("type") or (msg.get("id") or [""])[-1],
+            kwargs.get("content"),
+            kwargs.get("tool_calls") or None,
+            kwargs.get("tool_call_id"),
+            kwargs.get("name"),
+        ])
+    return normalized
+
+
+def _cached_generation(entry: dict) -> ChatGeneration:
+    message = messages_from_dict([entry["message"]])[0]
+    if isinstance(message, AIMessage):
+        message.usage_metadata = dict(_ZERO_USAGE)
+    message.response_metadata = {**(message.response_metadata or {}), "cache_hit": True}
+    return ChatGeneration(message=message, generation_info=entry.get("generation_info"))
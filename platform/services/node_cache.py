@@ -0,0 +1,191 @@
+"""Content-addressed memoization of deterministic node outputs.
+
+Nodes such as ``filter``, ``switch``, ``output_parser`` and ``merge`` are
+pure functions of their resolved config and the state they read, so re-running a workflow over the same trigger recomputes the same
+outputs. A node opts in with ``extra_config.cache_outputs``; its result is
+then stored in Redis under a hash of its component type, resolved config
+and the inputs it reads, and reused by any worker that computes the same
+hash. LLM-backed ``categorizer`` and ``extractor`` nodes qualify only while
+their linked model samples at temperature 0. ``code`` nodes are not
+memoized: their snippet sees the whole execution state.
+
+Entries expire after ``extra_config.cache_ttl_seconds`` (default
+``NODE_CACHE_TTL_SECONDS``) and the least recently used are evicted once
+there are more than ``NODE_CACHE_MAX_ENTRIES``. Cache failures never fail
+a node: the component simply runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Iterable
+
+from sqlalchemy.orm import Session
+
+from config import settings
+from services.redis_pool import get_redis
+
+logger = logging.getLogger(__name__)
+
+MEMOIZABLE_COMPONENT_TYPES = frozenset({"filter", "switch", "router", "output_parser", "merge"})
+# Deterministic only when their model samples greedily
+LLM_MEMOIZABLE_COMPONENT_TYPES = frozenset({"categorizer", "extractor"})
+
+ENTRY_PREFIX = "node_cache:entry:"
+LRU_KEY = "node_cache:lru"
+MAX_ENTRY_BYTES = 1_048_576
+
+# Result keys whose effects can't be replayed from a stored copy
+_UNCACHEABLE_RESULT_KEYS = frozenset({"_messages", "_loop", "_subworkflow", "_delay_seconds"})
+
+
+def cache_key(db_node, state: dict, db: Session, inbound: Iterable[str] = ()) -> str | None:
+    """Hash identifying this run of *db_node*, or None if it is not memoized.
+
+    Call it after expressions in the node's config have been resolved, so
+    the hash covers the values the component will actually see. *inbound*
+    are the sources of the node's incoming edges.
+    """
+    config = db_node.component_config
+    extra = config.extra_config or {}
+    component_type = db_node.component_type
+    memoizable = MEMOIZABLE_COMPONENT_TYPES | LLM_MEMOIZABLE_COMPONENT_TYPES
+    if component_type not in memoizable or extra.get("cache_outputs") is not True:
+        return None
+
+    parts: dict = {
+        "type": component_type,
+        "node_id": db_node.node_id,
+        "system_prompt": config.system_prompt or "",
+        "extra_config": extra,
+        "input": _inputs(component_type, extra, state, inbound),
+    }
+    if component_type in LLM_MEMOIZABLE_COMPONENT_TYPES:
+        model = _greedy_model(config, db)
+        if model is None:
+            return None
+        parts["model"] = model
+
+    encoded = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def ttl_for(db_node) -> int:
+    """Lifetime in seconds of *db_node*'s cache entries."""
+    extra = db_node.component_config.extra_config or {}
+    return int(extra.get("cache_ttl_seconds") or settings.NODE_CACHE_TTL_SECONDS)
+
+
+def lookup(key: str) -> dict | None:
+    """The stored result for *key*, refreshing its recency, or None on a miss."""
+    try:
+        r = get_redis()
+        raw = r.get(ENTRY_PREFIX + key)
+        if raw is None:
+            return None
+        r.zadd(LRU_KEY, {key: time.time()})
+        return json.loads(raw)
+    except Exception:
+        logger.warning("Node cache lookup failed (non-fatal)", exc_info=True)
+        return None
+
+
+def store(key: str, result, ttl: int) -> bool:
+    """Store a component's raw *result* under *key*; returns whether it was stored.
+
+    Token usage is dropped (a hit costs nothing), and results with side
+    effects that only make sense once (messages, loops, child executions,
+    delays), or that don't fit in ``MAX_ENTRY_BYTES``, are not stored.
+    """
+    if not isinstance(result, dict) or _UNCACHEABLE_RESULT_KEYS & result.keys():
+        return False
+    try:
+        encoded = json.dumps({k: v for k, v in result.items() if k != "_token_usage"})
+    except (TypeError, ValueError):
+        return False
+    if len(encoded) > MAX_ENTRY_BYTES or ttl <= 0:
+        return False
+    try:
+        r = get_redis()
+        with r.pipeline(transaction=False) as pipe:
+            pipe.set(ENTRY_PREFIX + key, encoded, ex=ttl)
+            pipe.zadd(LRU_KEY, {key: time.time()})
+            pipe.zcard(LRU_KEY)
+            size = pipe.execute()[-1]
+        excess = size - settings.NODE_CACHE_MAX_ENTRIES
+        if excess > 0:
+            evicted = [member for member, _ in r.zpopmin(LRU_KEY, excess)]
+            if evicted:
+                r.unlink(*(ENTRY_PREFIX + member for member in evicted))
+        return True
+    except Exception:
+        logger.warning("Node cache store failed (non-fatal)", exc_info=True)
+        return False
+
+
+def _inputs(component_type: str, extra: dict, state: dict, inbound: Iterable[str]) -> dict:
+    """The parts of *state* a node of *component_type* can read."""
+    outputs = state.get("node_outputs") or {}
+    if component_type in ("filter", "output_parser"):
+        # Without a source node they read the output or the last message
+        sources = [extra["source_node"]] if extra.get("source_node") else []
+    elif component_type == "merge":
+        # Without source nodes a merge combines every output there is
+        sources = list(extra.get("source_nodes") or []) or sorted(outputs)
+    else:
+        referenced = _referenced_outputs(extra)
+        sources = sorted(outputs) if referenced is None else sorted({*inbound, *referenced})
+    inputs = {
+        # Raw values: an offloaded output is hashed by its blob reference,
+        # which names its content, so building the key reads no blob
+        "node_outputs": {nid: dict.get(outputs, nid) for nid in sources},
+        "trigger": state.get("trigger"),
+        "route": state.get("route"),
+        "loop": state.get("loop"),
+        "output": state.get("output"),
+        "input_override": state.get("_input_override"),
+    }
+    messages = state.get("messages") or []
+    if messages:
+        # Only the content: messages carry per-run ids and timestamps
+        last = messages[-1]
+        inputs["last_message"] = [getattr(last, "type", ""), getattr(last, "content", last)]
+    return inputs
+
+
+def _referenced_outputs(extra: dict) -> set[str] | None:
+    """Nodes whose outputs a switch or router's fields name, or None for all of them."""
+    paths = [rule.get("field") or "" for rule in extra.get("rules") or [] if isinstance(rule, dict)]
+    paths.append(extra.get("condition_field") or "")
+    paths.append((extra.get("condition_expression") or "").split("==", 1)[0])
+    referenced: set[str] = set()
+    for path in paths:
+        parts = path.strip().split(".")
+        if parts[0] == "state":
+            parts = parts[1:]
+        if parts and parts[0] == "node_outputs":
+            if len(parts) < 2:
+                return None
+            referenced.add(parts[1])
+    return referenced
+
+
+def _greedy_model(config, db: Session) -> dict | None:
+    """Identity of the node's linked model, if it samples at temperature 0."""
+    from models.node import BaseComponentConfig
+
+    model_config_id = getattr(config, "llm_model_config_id", None)
+    model = db.get(BaseComponentConfig, model_config_id) if model_config_id else None
+    if model is None or model.temperature != 0:
+        return None
+    return {
+        "id": model.id,
+        "model_name": model.model_name,
+        "credential_id": model.llm_credential_id,
+        "max_tokens": model.max_tokens,
+        "response_format": model.response_format,
+        "updated_at": model.updated_at,
+    }
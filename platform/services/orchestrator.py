@@ -4,34 +4,94 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 import time
 import uuid
-from collections import deque
+from collections import OrderedDict, deque
+from contextvars import ContextVar
 from datetime import datetime, timedelta, timezone
+from typing import Iterable
 
 import redis as redis_lib
 from rq import Queue
+from rq.job import JobStatus
 from sqlalchemy.orm import Session
 
 from config import settings
-from services.state import deserialize_state, merge_state_update, serialize_state
-from services.topology import build_topology
+from services import admission, blob_store, execution_journal, heartbeats, node_cache, state_codec
+from services.events import EventPublisher
+from services.execution_logs import ExecutionLogBuffer, pending_key
+from services.redis_pool import count_commands, get_redis, get_redis_binary
+from services.queues import CONTROL_QUEUE, queue_for_component
+from services.state import ExecutionState, deserialize_state, merge_state_update, serialize_state
+from services.topology import (
+    TOPOLOGY_CACHE_TTL,
+    build_topology,
+    compile_plan,
+    plan_tables,
+    topology_cache_key,
+    topology_version_key,
+)
 
 logger = logging.getLogger(__name__)
 
 STATE_TTL = 3600  # 1 hour
 LOCK_TTL = 30  # seconds
+LOOP_ITEMS_CHUNK = 1000  # items per RPUSH when storing loop items
 MAX_NODE_RETRIES = 3
 PUBSUB_CHANNEL_PREFIX = "execution:"
 
+# Events published straight away (with anything still buffered) rather than
+# on the publisher's next tick.
+FLUSH_EVENT_TYPES = frozenset({"execution_completed", "execution_failed", "execution_interrupted"})
+
+# Cheap, CPU-only component types that a worker may run inline right after
+# their predecessor instead of paying an RQ round-trip per hop.
+FUSABLE_COMPONENT_TYPES = frozenset({"switch", "filter", "merge", "output_parser", "loop", "wait"})
+
+# Set while execute_node_job runs; _advance appends fusable successors here
+# instead of enqueueing them.
+_fused_targets: ContextVar[deque | None] = ContextVar("_fused_targets", default=None)
+# Same, for the lone successors kept under EXECUTION_AFFINITY
+_kept_targets: ContextVar[deque | None] = ContextVar("_kept_targets", default=None)
+
 
 def _redis() -> redis_lib.Redis:
-    return redis_lib.from_url(settings.REDIS_URL, decode_responses=True)
+    return get_redis()
+
+
+# Looked up through _redis at flush time so tests can patch the client
+_events = EventPublisher(lambda: _redis(), settings.EVENT_FLUSH_INTERVAL_MS / 1000)
+_execution_logs = ExecutionLogBuffer(
+    lambda: _redis(),
+    settings.EXECUTION_LOG_FLUSH_INTERVAL_MS / 1000,
+    settings.EXECUTION_LOG_BATCH_SIZE,
+)
+
 
+_queues: dict[str, Queue] = {}
 
-def _queue() -> Queue:
-    conn = redis_lib.from_url(settings.REDIS_URL)
-    return Queue("workflows", connection=conn, default_timeout=7200)
+
+def _queue(name: str = CONTROL_QUEUE) -> Queue:
+    # Reused while the pool is: RQ caches the server version per Queue
+    # object, so a fresh Queue would cost an INFO round-trip per enqueue.
+    conn = get_redis_binary()
+    q = _queues.get(name)
+    if q is None or q.connection.connection_pool is not conn.connection_pool:
+        q = _queues[name] = Queue(name, connection=conn, default_timeout=7200)
+    return q
+
+
+def _node_queue(execution_id: str, node_id: str, topo_data: dict | None = None) -> Queue:
+    """Return the queue for *node_id*'s resource profile (see ``services.queues``)."""
+    try:
+        if topo_data is None:
+            topo_data = _load_topology(execution_id)
+        component_type = topo_data["nodes"][node_id]["component_type"]
+    except Exception:
+        logger.warning("Could not resolve queue for node %s; using the control queue", node_id, exc_info=True)
+        return _queue()
+    return _queue(queue_for_component(component_type))
 
 
 # ── Redis state helpers ────────────────────────────────────────────────────────
@@ -49,6 +109,22 @@ def _lock_key(execution_id: str) -> str:
     return f"execution:{execution_id}:lock"
 
 
+def _node_outputs_key(execution_id: str) -> str:
+    return f"execution:{execution_id}:node_outputs"
+
+
+def _node_results_key(execution_id: str) -> str:
+    return f"execution:{execution_id}:node_results"
+
+
+def _messages_key(execution_id: str) -> str:
+    return f"execution:{execution_id}:messages"
+
+
+def _state_version_key(execution_id: str) -> str:
+    return f"execution:{execution_id}:state_version"
+
+
 def _topo_key(execution_id: str) -> str:
     return f"execution:{execution_id}:topo"
 
@@ -69,20 +145,81 @@ def _child_wait_key(execution_id: str, node_id: str) -> str:
     return f"execution:{execution_id}:child_wait:{node_id}"
 
 
-def _loop_key(execution_id: str, loop_id: str) -> str:
-    return f"execution:{execution_id}:loop:{loop_id}"
+def _loop_key(execution_id: str, loop_id: str, scope: int | str | None = None) -> str:
+    return f"execution:{execution_id}:loop:{_loop_instance(loop_id, scope)}"
 
 
-def _loop_iter_done_key(execution_id: str, loop_id: str, iter_index: int | None = None) -> str:
+def _loop_iter_done_key(execution_id: str, loop_id: str, iter_index: int | str | None = None) -> str:
     if iter_index is not None:
         return f"execution:{execution_id}:loop:{loop_id}:iter:{iter_index}:done"
     return f"execution:{execution_id}:loop:{loop_id}:iter_done"  # legacy fallback
 
 
+def _loop_iter_outputs_key(execution_id: str, loop_id: str, iter_index: int | str) -> str:
+    return f"execution:{execution_id}:loop:{loop_id}:iter:{iter_index}:outputs"
+
+
+def _loop_items_key(execution_id: str, loop_id: str, scope: int | str | None = None) -> str:
+    return f"execution:{execution_id}:loop:{_loop_instance(loop_id, scope)}:items"
+
+
+def _loop_results_key(execution_id: str, loop_id: str, scope: int | str | None = None) -> str:
+    return f"execution:{execution_id}:loop:{_loop_instance(loop_id, scope)}:results"
+
+
+def _loop_instance(loop_id: str, scope: int | str | None) -> str:
+    """Key segment of one run of a loop; *scope* is the outer iteration a nested loop runs in."""
+    return loop_id if scope is None else f"{loop_id}@{scope}"
+
+
 def _parent_info_key(execution_id: str) -> str:
     return f"execution:{execution_id}:parent_info"
 
 
+def _keyset_key(execution_id: str) -> str:
+    return f"execution:{execution_id}:keys"
+
+
+def _jobs_key(execution_id: str) -> str:
+    return f"execution:{execution_id}:jobs"
+
+
+def _fixed_keys(execution_id: str) -> list[str]:
+    """Per-execution keys whose names depend only on the execution id."""
+    return [
+        _state_key(execution_id),
+        _node_outputs_key(execution_id),
+        _node_results_key(execution_id),
+        _messages_key(execution_id),
+        _state_version_key(execution_id),
+        _topo_key(execution_id),
+        _completed_key(execution_id),
+        _episode_key(execution_id),
+        _inflight_key(execution_id),
+        _lock_key(execution_id),
+        _parent_info_key(execution_id),
+        pending_key(execution_id),
+        _jobs_key(execution_id),
+        heartbeats.heartbeat_key(execution_id),
+        _keyset_key(execution_id),
+    ]
+
+
+def _track_keys(r, execution_id: str, *keys: str) -> None:
+    """Register keys named after nodes, loops or iterations for cleanup.
+
+    *r* is usually the pipeline that creates them, so tracking costs no
+    extra round-trip.
+    """
+    r.sadd(_keyset_key(execution_id), *keys)
+    r.expire(_keyset_key(execution_id), STATE_TTL)
+
+
+def _execution_keys(r, execution_id: str) -> list[str]:
+    """Every Redis key an execution may own: the fixed ones plus its keyset."""
+    return [*_fixed_keys(execution_id), *r.smembers(_keyset_key(execution_id))]
+
+
 def _cache_parent_info(
     execution_id: str,
     parent_eid: str,
@@ -93,19 +230,17 @@ def _cache_parent_info(
     root_slug: str,
 ) -> None:
     """Cache parent/root execution metadata so child events can be forwarded."""
+    info = {
+        "parent_execution_id": parent_eid,
+        "parent_node_id": parent_nid,
+        "parent_workflow_slug": parent_slug,
+        "root_execution_id": root_eid,
+        "root_node_id": root_nid,
+        "root_workflow_slug": root_slug,
+    }
     r = _redis()
-    r.set(
-        _parent_info_key(execution_id),
-        json.dumps({
-            "parent_execution_id": parent_eid,
-            "parent_node_id": parent_nid,
-            "parent_workflow_slug": parent_slug,
-            "root_execution_id": root_eid,
-            "root_node_id": root_nid,
-            "root_workflow_slug": root_slug,
-        }),
-        ex=STATE_TTL,
-    )
+    r.set(_parent_info_key(execution_id), json.dumps(info), ex=STATE_TTL)
+    _remember_lineage(execution_id, info)
 
 
 def _get_parent_info(execution_id: str) -> dict | None:
@@ -115,73 +250,325 @@ def _get_parent_info(execution_id: str) -> dict | None:
     return json.loads(raw) if raw else None
 
 
-def load_state(execution_id: str) -> dict:
+_lineage_memo: OrderedDict[str, dict | None] = OrderedDict()
+_LINEAGE_MEMO_SIZE = 256
+
+
+def _remember_lineage(execution_id: str, info: dict | None) -> None:
+    with _memo_lock:
+        _lineage_memo[execution_id] = info
+        _lineage_memo.move_to_end(execution_id)
+        if len(_lineage_memo) > _LINEAGE_MEMO_SIZE:
+            _lineage_memo.popitem(last=False)
+
+
+def _parent_lineage(execution_id: str) -> dict | None:
+    """``_get_parent_info`` memoized per process.
+
+    Lineage is written by start_execution before any node of the execution
+    runs and never changes, so a miss (top-level execution) is cached too.
+    """
+    with _memo_lock:
+        if execution_id in _lineage_memo:
+            _lineage_memo.move_to_end(execution_id)
+            return _lineage_memo[execution_id]
+    info = _get_parent_info(execution_id)
+    _remember_lineage(execution_id, info)
+    return info
+
+
+def _encode_messages(messages) -> list[str]:
+    """Message log entries for *messages*, each one message as ``message_to_dict`` gives it."""
+    return [state_codec.encode(m) for m in serialize_state({"messages": list(messages)})["messages"]]
+
+
+def _node_field_keys(execution_id: str) -> dict[str, str]:
+    return {
+        "node_outputs": _node_outputs_key(execution_id),
+        "node_results": _node_results_key(execution_id),
+    }
+
+
+def load_state(execution_id: str, fields: Iterable[str] | None = None, messages: bool = True) -> dict:
+    """Assemble execution state from its per-field Redis structures.
+
+    Top-level keys live in one hash and each node's output / result record
+    in two more, so writers only touch what they changed. ``messages`` is
+    an append-only list of its own. *fields* limits the load to those
+    top-level keys (``node_outputs``, ``node_results`` and ``messages``
+    pull their whole structure); partial loads return a plain dict.
+
+    ``messages=False`` leaves the conversation out of a full load for
+    nodes that never read it; messages they add are still appended.
+
+    With ``EXECUTION_AFFINITY`` a full load first checks out the state
+    this worker last saved for the execution (see ``_remember_state``).
+    """
     r = _redis()
-    raw = r.get(_state_key(execution_id))
-    if not raw:
+    if fields is None and settings.EXECUTION_AFFINITY:
+        hot = _checkout_state(execution_id, messages)
+        if hot is not None:
+            return hot
+    node_keys = _node_field_keys(execution_id)
+    pipe = r.pipeline(transaction=False)
+    if fields is None:
+        # Read first: a write landing after it only makes the token stale
+        pipe.get(_state_version_key(execution_id))
+        pipe.hgetall(_state_key(execution_id))
+        for key in node_keys.values():
+            pipe.hgetall(key)
+        if messages:
+            pipe.lrange(_messages_key(execution_id), 0, -1)
+        version, top, outputs, results, *log = pipe.execute()
+        log = log[0] if log else []
+        if not (top or outputs or results or log):
+            return {}
+        data = {k: state_codec.decode(v) for k, v in top.items()}
+        if log:
+            data["messages"] = [state_codec.decode(m) for m in log]
+        data["node_outputs"] = blob_store.LazyNodeOutputs({nid: state_codec.decode(v) for nid, v in outputs.items()})
+        if results:
+            data["node_results"] = {nid: state_codec.decode(v) for nid, v in results.items()}
+        state = deserialize_state(data)
+        return ExecutionState(state, loaded={
+            "state": top,
+            "node_outputs": outputs,
+            "node_results": results,
+            # Messages kept in the state hash before the log existed are
+            # moved to the log by the next save
+            "messages": () if "messages" in top else tuple(state.get("messages") or ()),
+            "messages_loaded": messages,
+            "version": version,
+        })
+
+    wanted = list(fields)
+    scalar = [f for f in wanted if f not in node_keys and f != "messages"]
+    nested = [f for f in wanted if f in node_keys]
+    if scalar:
+        pipe.hmget(_state_key(execution_id), scalar)
+    for f in nested:
+        pipe.hgetall(node_keys[f])
+    if "messages" in wanted:
+        pipe.lrange(_messages_key(execution_id), 0, -1)
+    replies = pipe.execute()
+    data = {}
+    if scalar:
+        data = {k: state_codec.decode(v) for k, v in zip(scalar, replies.pop(0)) if v is not None}
+    for f, raw in zip(nested, replies):
+        data[f] = {nid: state_codec.decode(v) for nid, v in raw.items()}
+    if "messages" in wanted:
+        data["messages"] = [state_codec.decode(m) for m in replies[-1]]
+    if "node_outputs" in data:
+        data["node_outputs"] = blob_store.LazyNodeOutputs(data["node_outputs"])
+    return deserialize_state(data)
+
+
+def load_node_outputs(execution_id: str, node_ids: Iterable[str]) -> dict:
+    """Fetch the outputs of just *node_ids* (missing nodes are omitted)."""
+    node_ids = list(node_ids)
+    if not node_ids:
         return {}
-    return deserialize_state(json.loads(raw))
+    raw = _redis().hmget(_node_outputs_key(execution_id), node_ids)
+    return {nid: state_codec.decode(v) for nid, v in zip(node_ids, raw) if v is not None}
 
 
-def save_state(execution_id: str, state: dict) -> None:
-    r = _redis()
-    key = _state_key(execution_id)
-    serialized = serialize_state(state)
-    new_outputs = serialized.get("node_outputs", {})
-    for attempt in range(5):
-        try:
-            with r.pipeline() as pipe:
-                pipe.watch(key)
-                existing_raw = pipe.get(key)
-                if existing_raw:
-                    existing = json.loads(existing_raw)
-                    old_outputs = existing.get("node_outputs", {})
-                    merged_outputs = {**old_outputs, **new_outputs}
-                    serialized["node_outputs"] = merged_outputs
-                pipe.multi()
-                pipe.set(key, json.dumps(serialized), ex=STATE_TTL)
-                pipe.execute()
-                return
-        except Exception:
+def save_state(execution_id: str, state: dict) -> dict:
+    """Write *state* back as per-field deltas in one MULTI/EXEC.
+
+    For states that came from ``load_state`` only fields whose encoding
+    changed are written, and top-level keys popped since loading are
+    removed. Node outputs and results are merged per node, so parallel
+    branches never overwrite each other and no WATCH retry is needed.
+    Node outputs larger than ``NODE_OUTPUT_OFFLOAD_BYTES`` are written to
+    the blob store and replaced, in Redis and in *state*, by a reference.
+    Messages added since loading are appended to the message log; only a
+    conversation that was rewritten (or a plain dict's) is stored whole.
+
+    Returns the delta written, in the form ``_apply_state_delta`` takes;
+    the execution journal stores it for completed nodes.
+
+    Every save stamps the execution with a new state version. A loaded
+    state keeps the new version only if nothing else was written since it
+    was loaded, i.e. only then does it still match Redis as a whole.
+    """
+    loaded = getattr(state, "loaded", None) or {}
+    loaded_top = loaded.get("state", {})
+    node_keys = _node_field_keys(execution_id)
+
+    top_updates: dict[str, str] = {}
+    node_updates: dict[str, dict[str, str]] = {f: {} for f in node_keys}
+    offloaded: dict[str, dict] = {}
+    for key, value in state.items():
+        if key in node_keys:
+            loaded_nodes = loaded.get(key, {})
+            # dict.items: blob references are compared as stored, not loaded
+            for nid, node_value in dict.items(value or {}):
+                text = state_codec.dumps(node_value)
+                if key == "node_outputs" and blob_store.should_offload(text):
+                    offloaded[nid] = blob_store.put(text)
+                    text = state_codec.dumps(offloaded[nid])
+                encoded = state_codec.pack(text)
+                if loaded_nodes.get(nid) != encoded:
+                    node_updates[key][nid] = encoded
             continue
-    r.set(key, json.dumps(serialized), ex=STATE_TTL)
+        if key == "messages":
+            continue
+        encoded = state_codec.encode(value)
+        if loaded_top.get(key) != encoded:
+            top_updates[key] = encoded
+    removed = [k for k in loaded_top if k not in state or k == "messages"]
+    if offloaded:
+        state["node_outputs"] = blob_store.LazyNodeOutputs({**state["node_outputs"], **offloaded})
+
+    delta: dict = {f: updates for f, updates in node_updates.items() if updates}
+    if top_updates:
+        delta["state"] = top_updates
+    if removed:
+        delta["removed"] = removed
+    prior = loaded.get("messages")
+    if prior is None:
+        if "messages" in state:
+            delta["messages"] = _encode_messages(state["messages"] or [])
+    else:
+        msgs = state.get("messages") or []
+        # Components add messages by building a longer list around the loaded ones
+        if len(msgs) >= len(prior) and all(a is b for a, b in zip(msgs, prior)):
+            if len(msgs) > len(prior):
+                delta["messages_appended"] = _encode_messages(msgs[len(prior):])
+        else:
+            delta["messages"] = _encode_messages(msgs)
+    version = uuid.uuid4().hex
+    pipe = _redis().pipeline()
+    pipe.get(_state_version_key(execution_id))
+    _apply_state_delta(pipe, execution_id, delta, version=version)
+    previous = pipe.execute()[0]
+
+    if isinstance(state, ExecutionState) and state.loaded is not None:
+        # Later saves of this same object diff against what is now stored
+        state.loaded = {
+            "state": {**{k: v for k, v in loaded_top.items() if k not in removed}, **top_updates},
+            **{f: {**loaded.get(f, {}), **node_updates[f]} for f in node_keys},
+            "messages": tuple(state.get("messages") or ()),
+            "messages_loaded": loaded.get("messages_loaded", True),
+            "version": version if previous is not None and previous == loaded.get("version") else None,
+        }
+    return delta
+
+
+def _apply_state_delta(pipe, execution_id: str, delta: dict, version: str | None = None) -> None:
+    """Queue the writes for a ``save_state`` delta of already-encoded fields on *pipe*.
+
+    The execution's state version is replaced too (by *version* if given),
+    so states other workers remembered stop matching.
+    """
+    node_keys = _node_field_keys(execution_id)
+    if delta.get("state"):
+        pipe.hset(_state_key(execution_id), mapping=delta["state"])
+    if delta.get("removed"):
+        pipe.hdel(_state_key(execution_id), *delta["removed"])
+    for f, key in node_keys.items():
+        if delta.get(f):
+            pipe.hset(key, mapping=delta[f])
+    messages_key = _messages_key(execution_id)
+    if "messages" in delta:
+        pipe.delete(messages_key)
+    for f in ("messages", "messages_appended"):
+        if delta.get(f):
+            pipe.rpush(messages_key, *delta[f])
+    for key in (_state_key(execution_id), *node_keys.values(), messages_key):
+        pipe.expire(key, STATE_TTL)
+    pipe.set(_state_version_key(execution_id), version or uuid.uuid4().hex, ex=STATE_TTL)
+
+
+# States this worker saved last, by execution, for EXECUTION_AFFINITY. An
+# entry is only used while the execution's state version is still the one
+# its save wrote, and is taken out on use so no two jobs share the object.
+_state_memo: OrderedDict[str, ExecutionState] = OrderedDict()
+_STATE_MEMO_SIZE = 32
+
+
+def _remember_state(execution_id: str, state: dict) -> None:
+    """Keep *state*, as just saved, for the execution's next node on this worker."""
+    if not settings.EXECUTION_AFFINITY or not isinstance(state, ExecutionState) or state.loaded is None:
+        return
+    with _memo_lock:
+        _state_memo[execution_id] = state
+        _state_memo.move_to_end(execution_id)
+        if len(_state_memo) > _STATE_MEMO_SIZE:
+            _state_memo.popitem(last=False)
+
+
+def _forget_state(execution_id: str) -> None:
+    with _memo_lock:
+        _state_memo.pop(execution_id, None)
+
+
+def _checkout_state(execution_id: str, messages: bool) -> ExecutionState | None:
+    """The remembered state of *execution_id* if it is still current, else ``None``.
+
+    Costs one GET of the state version instead of a full load.
+    """
+    with _memo_lock:
+        state = _state_memo.pop(execution_id, None)
+    if state is None:
+        return None
+    loaded = state.loaded or {}
+    version = loaded.get("version")
+    if version is None or (messages and not loaded.get("messages_loaded", True)):
+        return None
+    if _redis().get(_state_version_key(execution_id)) != version:
+        return None
+    return state
+
+
+def _with_channel(raw: str, channel: str) -> str:
+    """Append a ``channel`` key to a serialized payload without re-encoding it."""
+    return f'{raw[:-1]}, "channel": {json.dumps(channel)}}}'
+
+
+def _event_messages(execution_id: str, event_type: str, data: dict | None = None, workflow_slug: str | None = None) -> list[tuple[str, str]]:
+    """Build the ``(channel, payload)`` pairs published for an execution event."""
+    payload = {"type": event_type, "execution_id": execution_id, "timestamp": time.time()}
+    if data:
+        payload["data"] = data
+    raw = json.dumps(payload)
+    messages = [(f"{PUBSUB_CHANNEL_PREFIX}{execution_id}", raw)]
+    # Also publish to workflow channel so global WS subscribers get execution events
+    if workflow_slug:
+        channel = f"workflow:{workflow_slug}"
+        messages.append((channel, _with_channel(raw, channel)))
+    return messages
+
+
+def _child_event_messages(execution_id: str, data: dict | None) -> list[tuple[str, str]]:
+    """Copies of a child execution's node_status for its root parent's channels."""
+    parent_info = _parent_lineage(execution_id)
+    root_eid = parent_info and parent_info.get("root_execution_id")
+    if not root_eid:
+        return []
+    child_data = dict(data) if data else {}
+    child_data["child_execution_id"] = execution_id
+    child_data["parent_node_id"] = parent_info.get("root_node_id")
+    child_data["is_child_event"] = True
+    return _event_messages(root_eid, "child_node_status", child_data, parent_info.get("root_workflow_slug"))
 
 
 def _publish_event(execution_id: str, event_type: str, data: dict | None = None, workflow_slug: str | None = None) -> None:
-    try:
-        r = _redis()
-        payload = {"type": event_type, "execution_id": execution_id, "timestamp": time.time()}
-        if data:
-            payload["data"] = data
-        raw = json.dumps(payload)
-        r.publish(f"{PUBSUB_CHANNEL_PREFIX}{execution_id}", raw)
-        # Also publish to workflow channel so global WS subscribers get execution events
-        if workflow_slug:
-            payload["channel"] = f"workflow:{workflow_slug}"
-            r.publish(f"workflow:{workflow_slug}", json.dumps(payload))
+    """Hand an execution event to the coalescing publisher.
 
+    Node status events (including those forwarded to a child's root parent)
+    are batched and published by a background thread; see ``FLUSH_EVENT_TYPES``
+    for the ones published immediately.
+    """
+    try:
+        messages = _event_messages(execution_id, event_type, data, workflow_slug)
         # Forward child node_status events to root parent's channels
         if event_type == "node_status":
-            parent_info = _get_parent_info(execution_id)
-            if parent_info:
-                root_eid = parent_info.get("root_execution_id")
-                root_slug = parent_info.get("root_workflow_slug")
-                root_nid = parent_info.get("root_node_id")
-                if root_eid:
-                    child_data = dict(data) if data else {}
-                    child_data["child_execution_id"] = execution_id
-                    child_data["parent_node_id"] = root_nid
-                    child_data["is_child_event"] = True
-                    child_payload = {
-                        "type": "child_node_status",
-                        "execution_id": root_eid,
-                        "timestamp": time.time(),
-                        "data": child_data,
-                    }
-                    r.publish(f"{PUBSUB_CHANNEL_PREFIX}{root_eid}", json.dumps(child_payload))
-                    if root_slug:
-                        child_payload["channel"] = f"workflow:{root_slug}"
-                        r.publish(f"workflow:{root_slug}", json.dumps(child_payload))
+            try:
+                messages += _child_event_messages(execution_id, data)
+            except Exception:
+                logger.warning("Failed to resolve parent lineage for execution %s", execution_id, exc_info=True)
+        _events.publish(messages, flush=event_type in FLUSH_EVENT_TYPES)
     except Exception:
         logger.warning(
             "Failed to publish event %s for execution %s (non-fatal)",
@@ -189,52 +576,64 @@ def _publish_event(execution_id: str, event_type: str, data: dict | None = None,
         )
 
 
-def _save_topology(execution_id: str, topo) -> None:
-    """Cache topology edges and node info in Redis for worker access."""
+def _compiled_topology(workflow, db: Session, trigger_node_id: int | None = None) -> tuple[str, dict]:
+    """Return the key and data of the workflow's shared compiled topology.
+
+    Entries are keyed by workflow, trigger and the version bumped by
+    workflow, node and edge edits, so executions of an unchanged workflow
+    skip the DB queries and reachability walk and all point at one copy in
+    Redis.
+    """
     r = _redis()
-    data = {
-        "workflow_slug": getattr(topo, "workflow_slug", ""),
-        "entry_node_ids": topo.entry_node_ids,
-        "nodes": {
-            nid: {
-                "node_id": n.node_id,
-                "component_type": n.component_type,
-                "db_id": n.db_id,
-                "component_config_id": n.component_config_id,
-                "interrupt_before": n.interrupt_before,
-                "interrupt_after": n.interrupt_after,
-            }
-            for nid, n in topo.nodes.items()
-        },
-        "edges_by_source": {
-            src: [
-                {
-                    "source_node_id": e.source_node_id,
-                    "target_node_id": e.target_node_id,
-                    "edge_type": e.edge_type,
-                    "edge_label": getattr(e, "edge_label", "") or "",
-                    "condition_mapping": e.condition_mapping,
-                    "condition_value": getattr(e, "condition_value", "") or "",
-                    "priority": e.priority,
-                }
-                for e in edges
-            ]
-            for src, edges in topo.edges_by_source.items()
-        },
-        "incoming_count": topo.incoming_count,
-        "loop_bodies": getattr(topo, "loop_bodies", {}),
-        "loop_return_nodes": getattr(topo, "loop_return_nodes", {}),
-        "loop_body_all_nodes": {k: list(v) for k, v in getattr(topo, "loop_body_all_nodes", {}).items()},
-    }
-    r.set(_topo_key(execution_id), json.dumps(data), ex=STATE_TTL)
+    version = r.get(topology_version_key(workflow.id)) or "0"
+    key = topology_cache_key(workflow.id, trigger_node_id, version)
+    # Reads never extend the entry, so it is rebuilt from the database at
+    # least once per TOPOLOGY_CACHE_TTL; one about to expire is rebuilt
+    # rather than handed to an execution that may outlive it.
+    raw, ttl = r.pipeline(transaction=False).get(key).ttl(key).execute()
+    if raw and ttl >= STATE_TTL:
+        return key, state_codec.decode(raw)
+    data = compile_plan(build_topology(workflow, db, trigger_node_id=trigger_node_id))
+    data["version"] = version
+    r.set(key, state_codec.encode(data), ex=TOPOLOGY_CACHE_TTL)
+    return key, data
+
+
+def _save_topology(execution_id: str, topology_key: str) -> None:
+    """Point the execution at a shared compiled topology."""
+    _redis().set(_topo_key(execution_id), topology_key, ex=STATE_TTL)
+
+
+# Compiled topologies never change under a given key, so workers keep the
+# most recently used ones parsed.
+_topology_memo: OrderedDict[str, dict] = OrderedDict()
+_TOPOLOGY_MEMO_SIZE = 64
+# Guards the per-process memos; AsyncPipelitWorker runs jobs on many threads
+_memo_lock = threading.Lock()
 
 
 def _load_topology(execution_id: str) -> dict:
     r = _redis()
-    raw = r.get(_topo_key(execution_id))
-    if not raw:
+    ref = r.get(_topo_key(execution_id))
+    if not ref:
         raise RuntimeError(f"Topology not found in Redis for execution {execution_id}")
-    return json.loads(raw)
+    if ref.startswith("{"):
+        # Inline copy written before topologies were shared.
+        return json.loads(ref)
+    with _memo_lock:
+        topo = _topology_memo.get(ref)
+        if topo is not None:
+            _topology_memo.move_to_end(ref)
+            return topo
+    raw = r.get(ref)
+    if not raw:
+        raise RuntimeError(f"Topology {ref} not found in Redis for execution {execution_id}")
+    topo = state_codec.decode(raw)
+    with _memo_lock:
+        _topology_memo[ref] = topo
+        if len(_topology_memo) > _TOPOLOGY_MEMO_SIZE:
+            _topology_memo.popitem(last=False)
+    return topo
 
 
 # ── Node metadata helper ──────────────────────────────────────────────────────
@@ -267,6 +666,7 @@ def start_execution(execution_id: str, db: Session | None = None) -> None:
     if own_session:
         db = SessionLocal()
 
+    execution = None
     try:
         execution = (
             db.query(WorkflowExecution)
@@ -280,6 +680,20 @@ def start_execution(execution_id: str, db: Session | None = None) -> None:
         workflow = db.query(Workflow).filter(Workflow.id == execution.workflow_id).first()
         if not workflow:
             logger.error("Workflow not found for execution %s", execution_id)
+            # release() may have admitted it after the workflow was deleted
+            admission.release(execution_id)
+            return
+
+        if execution.status == "cancelled":
+            logger.info("Execution %s was cancelled before it started", execution_id)
+            admission.release(execution_id)
+            return
+
+        # Child executions run on their parent's slot (see services.admission)
+        if not execution.parent_execution_id and not admission.try_admit(
+            execution_id, workflow.id, execution.user_profile_id,
+        ):
+            logger.info("Execution %s is waiting for an admission slot", execution_id)
             return
 
         execution.status = "running"
@@ -305,65 +719,32 @@ def start_execution(execution_id: str, db: Session | None = None) -> None:
             db=db,
         )
 
-        topo = build_topology(workflow, db, trigger_node_id=execution.trigger_node_id)
-        _save_topology(execution_id, topo)
+        topology_key, topo_data = _compiled_topology(workflow, db, execution.trigger_node_id)
+        _save_topology(execution_id, topology_key)
 
         # Cache parent info for child executions so events can be forwarded
-        if execution.parent_execution_id:
-            parent_eid = str(execution.parent_execution_id)
-            parent_nid = execution.parent_node_id or ""
-            # Resolve parent workflow slug from DB (not the child's workflow.slug)
-            parent_exec = (
-                db.query(WorkflowExecution)
-                .filter(WorkflowExecution.execution_id == parent_eid)
-                .first()
-            )
-            if parent_exec:
-                parent_wf = db.query(Workflow).filter(Workflow.id == parent_exec.workflow_id).first()
-                parent_slug = parent_wf.slug if parent_wf else ""
-            else:
-                parent_slug = ""
-            # Check if parent is itself a child (grandchild+ scenario)
-            grandparent_info = _get_parent_info(parent_eid)
-            if grandparent_info and grandparent_info.get("root_execution_id"):
-                root_eid = grandparent_info["root_execution_id"]
-                root_nid = grandparent_info["root_node_id"]
-                root_slug = grandparent_info["root_workflow_slug"]
-            else:
-                root_eid = parent_eid
-                root_nid = parent_nid
-                root_slug = parent_slug
-            _cache_parent_info(
-                execution_id, parent_eid, parent_nid, parent_slug,
-                root_eid, root_nid, root_slug,
-            )
+        _cache_lineage(execution, db)
 
-        initial_state = _build_initial_state(execution)
-
-        # Pre-populate node_outputs for the trigger node so downstream
-        # Jinja2 expressions like {{ trigger_schedule_xxx.timestamp }} resolve.
-        if execution.trigger_node_id and trigger_node:
-            initial_state["node_outputs"][trigger_node.node_id] = dict(
-                initial_state.get("trigger", {})
-            )
-
-        save_state(execution_id, initial_state)
+        save_state(execution_id, _seed_state(execution, trigger_node))
 
         # Initialize completed-nodes set and inflight counter
         r = _redis()
         r.delete(_completed_key(execution_id))
         r.delete(_inflight_key(execution_id))
 
-        slug = workflow.slug
-        from tasks import execute_node_job as _enqueue_node
-        q = _queue()
-        for node_id in topo.entry_node_ids:
-            r.incr(_inflight_key(execution_id))
-            r.expire(_inflight_key(execution_id), STATE_TTL)
-            _publish_event(execution_id, "node_enqueued", {"node_id": node_id}, workflow_slug=slug)
-            q.enqueue(_enqueue_node, execution_id, node_id)
+        entry_node_ids = topo_data["entry_node_ids"]
+        pipe = r.pipeline()
+        pipe.multi()
+        if entry_node_ids:
+            pipe.incrby(_inflight_key(execution_id), len(entry_node_ids))
+            pipe.expire(_inflight_key(execution_id), STATE_TTL)
+        _enqueue_node_jobs(
+            execution_id, [(node_id, None) for node_id in entry_node_ids],
+            workflow.slug, topo_data=topo_data, pipeline=pipe,
+        )
+        pipe.execute()
 
-        logger.info("Started execution %s with entry nodes %s", execution_id, topo.entry_node_ids)
+        logger.info("Started execution %s with entry nodes %s", execution_id, topo_data["entry_node_ids"])
 
     except Exception as exc:
         logger.exception("Failed to start execution %s", execution_id)
@@ -372,13 +753,264 @@ def start_execution(execution_id: str, db: Session | None = None) -> None:
             execution.error_message = str(exc)[:2000]
             execution.completed_at = datetime.now(timezone.utc)
             db.commit()
+        # Free its admission slot and whatever keys were written before the failure
+        try:
+            _cleanup_redis(execution_id)
+        except Exception:
+            logger.warning("Failed to clean up Redis keys for execution %s", execution_id, exc_info=True)
     finally:
         if own_session:
             db.close()
 
 
-def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> None:
-    """RQ job: execute a single workflow node."""
+def _cache_lineage(execution, db: Session) -> None:
+    """Cache a child execution's parent and root lineage in Redis (no-op for top-level ones)."""
+    from models.execution import WorkflowExecution
+    from models.workflow import Workflow
+
+    if not execution.parent_execution_id:
+        return
+    execution_id = str(execution.execution_id)
+    parent_eid = str(execution.parent_execution_id)
+    parent_nid = execution.parent_node_id or ""
+    # Resolve parent workflow slug from DB (not the child's workflow.slug)
+    parent_exec = (
+        db.query(WorkflowExecution)
+        .filter(WorkflowExecution.execution_id == parent_eid)
+        .first()
+    )
+    if parent_exec:
+        parent_wf = db.query(Workflow).filter(Workflow.id == parent_exec.workflow_id).first()
+        parent_slug = parent_wf.slug if parent_wf else ""
+    else:
+        parent_slug = ""
+    # Check if parent is itself a child (grandchild+ scenario)
+    grandparent_info = _get_parent_info(parent_eid)
+    if grandparent_info and grandparent_info.get("root_execution_id"):
+        root_eid = grandparent_info["root_execution_id"]
+        root_nid = grandparent_info["root_node_id"]
+        root_slug = grandparent_info["root_workflow_slug"]
+    else:
+        root_eid = parent_eid
+        root_nid = parent_nid
+        root_slug = parent_slug
+    _cache_parent_info(
+        execution_id, parent_eid, parent_nid, parent_slug,
+        root_eid, root_nid, root_slug,
+    )
+
+
+def _seed_state(execution, trigger_node) -> dict:
+    """Initial state of an execution, including its trigger node's output."""
+    initial_state = _build_initial_state(execution)
+
+    # Pre-populate node_outputs for the trigger node so downstream
+    # Jinja2 expressions like {{ trigger_schedule_xxx.timestamp }} resolve.
+    if execution.trigger_node_id and trigger_node:
+        initial_state["node_outputs"][trigger_node.node_id] = dict(
+            initial_state.get("trigger", {})
+        )
+    return initial_state
+
+
+def resume_from_journal(execution, db: Session) -> list[str]:
+    """Rebuild a crashed execution from its journal and enqueue what is left.
+
+    Whatever the crash left in Redis is dropped; the state is re-seeded
+    from the trigger and every journaled delta is replayed in order. The
+    completed set, fan-in counters and inflight counter are then restored
+    by walking the plan from the entry nodes through the journaled nodes,
+    and the nodes reached but never journaled (the frontier) are enqueued.
+    The admission slot and the open memory episode are kept. Returns the
+    frontier.
+    """
+    from models.node import WorkflowNode
+    from models.workflow import Workflow
+
+    execution_id = str(execution.execution_id)
+    workflow = db.query(Workflow).filter(Workflow.id == execution.workflow_id).first()
+    if not workflow:
+        raise RuntimeError(f"Workflow not found for execution {execution_id}")
+    trigger_node = db.get(WorkflowNode, execution.trigger_node_id) if execution.trigger_node_id else None
+
+    r = _redis()
+    r.unlink(*_execution_keys(r, execution_id))
+
+    topology_key, topo_data = _compiled_topology(workflow, db, execution.trigger_node_id)
+    _save_topology(execution_id, topology_key)
+    _cache_lineage(execution, db)
+    _restore_episode(execution_id, db)
+    save_state(execution_id, _seed_state(execution, trigger_node))
+
+    entries = execution_journal.entries(db, execution_id)
+    frontier, fanin_counts = _journal_frontier(topo_data, entries)
+
+    pipe = r.pipeline()
+    for entry in entries:
+        _apply_state_delta(pipe, execution_id, execution_journal.state_delta(entry))
+    if entries:
+        pipe.sadd(_completed_key(execution_id), *{entry.node_id for entry in entries})
+        pipe.expire(_completed_key(execution_id), STATE_TTL)
+    for node_id, count in fanin_counts.items():
+        pipe.set(_fanin_key(execution_id, node_id), count, ex=STATE_TTL)
+    if fanin_counts:
+        _track_keys(pipe, execution_id, *(_fanin_key(execution_id, nid) for nid in fanin_counts))
+    pipe.set(_inflight_key(execution_id), len(frontier), ex=STATE_TTL)
+    pipe.execute()
+
+    if not frontier:
+        # Every node finished; only finalization was lost
+        _finalize(execution_id, db)
+        return []
+
+    _enqueue_node_jobs(execution_id, [(node_id, None) for node_id in frontier], workflow.slug, topo_data=topo_data)
+    logger.info(
+        "Resumed execution %s from %d journaled nodes; re-enqueued %s",
+        execution_id, len(entries), frontier,
+    )
+    return frontier
+
+
+def _journal_frontier(topo_data: dict, entries: list) -> tuple[list[str], dict[str, int]]:
+    """Nodes to re-run after replaying *entries*, plus partial fan-in counts.
+
+    Follows the same routing as ``_advance`` from the entry nodes: a
+    journaled node passes control to its successors (conditional ones by
+    its journaled route, merges once all parents are in), and an unjournaled
+    node that is reached belongs to the frontier.
+    """
+    plan = _plan(topo_data)
+    routes = {entry.node_id: entry.route for entry in entries}
+    frontier: list[str] = []
+    fanin_counts: dict[str, int] = {}
+    seen: set[str] = set()
+    pending = deque(topo_data["entry_node_ids"])
+    while pending:
+        node_id = pending.popleft()
+        if node_id in seen:
+            continue
+        seen.add(node_id)
+        if node_id not in routes:
+            frontier.append(node_id)
+            continue
+        conditional = plan["conditional_routes"].get(node_id)
+        if conditional is not None:
+            target = conditional.get(routes[node_id] or "")
+            targets = [target] if target and target != "__end__" else []
+        else:
+            targets = plan["direct_successors"].get(node_id, [])
+        for target_id in targets:
+            if target_id not in topo_data["nodes"]:
+                continue
+            if target_id in plan["fan_in"]:
+                fanin_counts[target_id] = fanin_counts.get(target_id, 0) + 1
+                if fanin_counts[target_id] < plan["fan_in"][target_id]:
+                    continue
+            pending.append(target_id)
+    return frontier, fanin_counts
+
+
+def execute_node_job(
+    execution_id: str,
+    node_id: str,
+    retry_count: int = 0,
+    loop_iteration: int | str | None = None,
+) -> None:
+    """RQ job: execute a workflow node, then any fused cheap successors inline.
+
+    When every ready successor of a node is in ``FUSABLE_COMPONENT_TYPES``,
+    ``_advance`` hands it back through ``_fused_targets`` and this job keeps
+    going, up to ``settings.FUSED_EXECUTION_MAX_NODES`` extra nodes.  Fused
+    nodes go through the exact same path as enqueued ones (inflight counters,
+    ``node_status`` events, ExecutionLog rows); only the RQ hop is skipped.
+    With ``settings.EXECUTION_AFFINITY`` a lone successor on this job's own
+    queue is kept the same way through ``_kept_targets``, up to
+    ``settings.EXECUTION_AFFINITY_MAX_NODES`` nodes, and picks up the state
+    this job saved.
+
+    The execution's heartbeat is kept fresh while the job runs (see
+    ``services/heartbeats.py``), and the journal entries of the nodes it
+    completes are written together (see ``services/execution_journal.py``).
+    Redis commands issued by the whole job are counted and logged at DEBUG.
+    """
+    with count_commands() as redis_commands:
+        _mark_job_started(execution_id)
+        with heartbeats.running(execution_id), execution_journal.batched():
+            _execute_node_and_fused(execution_id, node_id, retry_count, loop_iteration)
+    logger.debug(
+        "Node job %s issued %d Redis commands in %d round-trips",
+        node_id, redis_commands.commands, redis_commands.round_trips,
+    )
+
+
+def _mark_job_started(execution_id: str) -> None:
+    """Move this job from the execution's waiting job set to its heartbeat."""
+    from rq import get_current_job
+
+    job = get_current_job()
+    pipe = _redis().pipeline(transaction=False)
+    if job is not None:
+        pipe.srem(_jobs_key(execution_id), job.id)
+    heartbeats.beat(pipe, execution_id)
+    pipe.execute()
+
+
+def _execute_node_and_fused(
+    execution_id: str,
+    node_id: str,
+    retry_count: int = 0,
+    loop_iteration: int | str | None = None,
+) -> None:
+    fused_budget = settings.FUSED_EXECUTION_MAX_NODES
+    kept_budget = settings.EXECUTION_AFFINITY_MAX_NODES if settings.EXECUTION_AFFINITY else 0
+    if fused_budget <= 0 and kept_budget <= 0:
+        _execute_node(execution_id, node_id, retry_count, loop_iteration)
+        return
+
+    from logging_config import node_id_var
+
+    # Each mechanism is only offered successors while it has budget left
+    fused: deque = deque()
+    kept: deque = deque()
+    fused_token = _fused_targets.set(fused if fused_budget > 0 else None)
+    kept_token = _kept_targets.set(kept if kept_budget > 0 else None)
+    try:
+        _execute_node(execution_id, node_id, retry_count, loop_iteration)
+        fused_count = kept_count = 0
+        while (fused and fused_count < fused_budget) or (kept and kept_count < kept_budget):
+            if fused and fused_count < fused_budget:
+                target_id, target_iter = fused.popleft()
+                fused_count += 1
+            else:
+                target_id, target_iter = kept.popleft()
+                kept_count += 1
+            node_token = node_id_var.set(target_id)
+            try:
+                _execute_node(execution_id, target_id, loop_iteration=target_iter)
+            finally:
+                node_id_var.reset(node_token)
+    finally:
+        _fused_targets.reset(fused_token)
+        _kept_targets.reset(kept_token)
+        # Budget exhausted (or unexpected error) — hand the rest to RQ.  Their
+        # inflight counters were already incremented by _advance.
+        for pending in (fused, kept):
+            while pending:
+                target_id, target_iter = pending.popleft()
+                _enqueue_node_job(execution_id, target_id, loop_iteration=target_iter)
+
+
+def _execute_node(
+    execution_id: str,
+    node_id: str,
+    retry_count: int = 0,
+    loop_iteration: int | str | None = None,
+) -> None:
+    """Execute a single workflow node.
+
+    *loop_iteration* is set for loop body nodes and selects the iteration
+    whose ``loop`` context and body outputs the node sees.
+    """
     from database import SessionLocal
     from models.execution import ExecutionLog, WorkflowExecution
     from models.node import WorkflowNode
@@ -409,11 +1041,17 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
                 _finalize(execution_id, db)
             return
 
-        state = load_state(execution_id)
+        from components import MESSAGE_COMPONENTS
+        state = load_state(execution_id, messages=node_info["component_type"] in MESSAGE_COMPONENTS)
+
+        owning_loop_id = _owning_loop(node_id, topo_data)
+        if owning_loop_id and loop_iteration is not None:
+            _apply_loop_iteration(execution_id, owning_loop_id, loop_iteration, state)
 
         # Check interrupt_before — skip if resuming (state already has _resume_input)
         if node_info.get("interrupt_before"):
             if "_resume_input" not in state:
+                _remember_interrupted_iteration(execution_id, state, loop_iteration)
                 _handle_interrupt(execution, node_id, "before", db)
                 # Decrement inflight — execution is now "interrupted" so _finalize()
                 # will no-op even if counter reaches 0. resume_node_job() re-increments.
@@ -440,6 +1078,7 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
                 state["_max_execution_seconds"] = max_seconds
                 save_state(execution_id, state)
             if elapsed > max_seconds:
+                _execution_logs.flush()
                 execution.status = "failed"
                 execution.error_message = f"Execution timed out after {int(elapsed)}s (limit: {max_seconds}s)"
                 execution.completed_at = datetime.now(timezone.utc)
@@ -494,17 +1133,35 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
             if _it:
                 _node_input_log["input_template"] = _it[:4000]
 
-        from components import get_component_factory
-        factory = get_component_factory(node_info["component_type"])
-        node_fn = factory(db_node)
+        from components import REUSABLE_COMPONENTS, build_component
+        component_cache_key = None
+        if node_info["component_type"] in REUSABLE_COMPONENTS:
+            # Built instances are reused while the node's config, the
+            # workflow version (linked model/tool nodes) and the resolved
+            # extra_config stay the same; the prompt is passed per run.
+            config = db_node.component_config
+            state["_system_prompt"] = config.system_prompt or ""
+            component_cache_key = (
+                config.updated_at,
+                topo_data.get("version"),
+                json.dumps(config.extra_config or {}, sort_keys=True, default=str),
+            )
+
+        # Opted-in deterministic nodes reuse a stored result for the same
+        # resolved config and inputs instead of running
+        memo_key = node_cache.cache_key(db_node, state, db, _plan(topo_data)["predecessors"].get(node_id, ()))
+        cached_result = node_cache.lookup(memo_key) if memo_key else None
+        cache_hit = cached_result is not None
+        node_fn = None if cache_hit else build_component(db_node, component_cache_key)
 
         from schemas.node_io import NodeResult, NodeStatus
 
         started_at = datetime.now(timezone.utc)
         start_time = time.monotonic()
         try:
-            result = node_fn(state)
+            result = cached_result if cache_hit else node_fn(state)
         except Exception as exc:
+            state.pop("_system_prompt", None)
             duration_ms = int((time.monotonic() - start_time) * 1000)
             exc_type = type(exc).__name__
             error_msg = str(exc)
@@ -548,26 +1205,17 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
             # Retry logic
             if not skip_retry and retry_count < MAX_NODE_RETRIES:
                 logger.warning("Node %s failed (attempt %d), retrying", node_id, retry_count + 1)
-                from tasks import execute_node_job as _enqueue_node
-                q = _queue()
-                q.enqueue_in(
-                    timedelta(seconds=2 ** retry_count),
-                    _enqueue_node,
-                    execution_id,
-                    node_id,
-                    retry_count + 1,
+                _enqueue_node_job(
+                    execution_id, node_id,
+                    retry_count=retry_count + 1,
+                    loop_iteration=loop_iteration,
+                    delay_seconds=2 ** retry_count,
+                    topo_data=topo_data,
                 )
                 return
 
             # Check if failed node is inside a loop body with on_error=continue
             r = _redis()
-            loop_body_all = topo_data.get("loop_body_all_nodes", {})
-            owning_loop_id = None
-            for lid, all_body in loop_body_all.items():
-                if node_id in set(all_body):
-                    owning_loop_id = lid
-                    break
-
             if owning_loop_id:
                 from models.node import WorkflowNode as _WFNode
                 loop_info = topo_data["nodes"].get(owning_loop_id)
@@ -579,26 +1227,21 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
 
                 if on_error == "continue":
                     logger.warning("Node %s failed in loop %s body (on_error=continue), skipping", node_id, owning_loop_id)
-                    # Store error in state so _loop_next_iteration includes it
-                    state = load_state(execution_id)
-                    loop_errors = state.get("_loop_errors", {})
-                    loop_errors.setdefault(owning_loop_id, {})[node_id] = {
-                        "error": error_msg[:500], "error_code": exc_type,
-                    }
-                    state["_loop_errors"] = loop_errors
-                    save_state(execution_id, state)
+                    # Record the error as this node's iteration output so
+                    # _loop_next_iteration includes it in the results
+                    iter_index = loop_iteration if loop_iteration is not None else 0
+                    _record_loop_iteration_output(
+                        execution_id, owning_loop_id, iter_index, node_id,
+                        {"error": error_msg[:500], "error_code": exc_type},
+                    )
 
                     # Check if this is a completion node or intermediate
-                    return_nodes = topo_data.get("loop_return_nodes", {}).get(owning_loop_id, [])
-                    body_targets = topo_data.get("loop_bodies", {}).get(owning_loop_id, [])
-                    completion_nodes = return_nodes if return_nodes else body_targets
-
-                    if node_id not in completion_nodes:
+                    if topo_data["completion_role"].get(node_id) != owning_loop_id:
                         # Intermediate node failed — downstream won't run, force advance
-                        _loop_next_iteration(execution_id, owning_loop_id, topo_data, db)
+                        _loop_next_iteration(execution_id, owning_loop_id, topo_data, db, iter_index=iter_index)
                     else:
                         # Completion node failed — _check_loop_body_done handles it normally
-                        _check_loop_body_done(execution_id, node_id, topo_data, db)
+                        _check_loop_body_done(execution_id, node_id, topo_data, db, iter_index=iter_index)
 
                     # Decrement inflight for the failed node
                     remaining = r.decr(_inflight_key(execution_id))
@@ -608,10 +1251,11 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
 
             # on_error == "stop" (default) — fail the entire execution
             logger.exception("Node %s failed permanently in execution %s", node_id, execution_id)
+            _execution_logs.flush()
             execution.status = "failed"
             execution.error_message = f"Node {node_id}: {error_msg[:1900]}"
             execution.completed_at = datetime.now(timezone.utc)
-            _persist_execution_costs(execution, load_state(execution_id))
+            _persist_execution_costs(execution, load_state(execution_id, fields=("_execution_token_usage",)))
             db.commit()
             _clear_stale_checkpoints(execution_id, db)
             _publish_event(execution_id, "execution_failed", {"error": error_msg[:500]}, workflow_slug=slug)
@@ -628,6 +1272,8 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
 
         duration_ms = int((time.monotonic() - start_time) * 1000)
         completed_at = datetime.now(timezone.utc)
+        if memo_key and not cache_hit:
+            node_cache.store(memo_key, result, node_cache.ttl_for(db_node))
 
         # Wrap raw result in NodeResult
         result_data = _safe_json(result) or {}
@@ -636,6 +1282,8 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
             started_at=started_at,
             completed_at=completed_at,
         )
+        if memo_key:
+            node_result.metadata["cache_hit"] = cache_hit
 
         # Merge result into state
         delay_seconds = None
@@ -685,17 +1333,26 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
         node_results[node_id] = node_result.model_dump(mode="json")
         state["node_results"] = node_results
 
-        # Clear _resume_input after node execution to prevent stale data on subsequent nodes
+        # Clear _resume_input and _input_override after node execution to
+        # prevent stale data on subsequent nodes
         state.pop("_resume_input", None)
-
-        save_state(execution_id, state)
-
-        # Clear _input_override so it doesn't leak into subsequent nodes
+        state.pop("_system_prompt", None)
         state.pop("_input_override", None)
 
         # Extract output for log and WS event (truncate large values)
         node_output = state.get("node_outputs", {}).get(node_id)
-        log_output = _safe_json(node_output) if node_output is not None else result_data
+
+        written = save_state(execution_id, state)
+        _remember_state(execution_id, state)
+
+        # Offloaded outputs are logged as their blob reference
+        stored_output = blob_store.stored(state.get("node_outputs", {}), node_id)
+        log_output = _safe_json(stored_output) if stored_output is not None else result_data
+
+        # Loop body outputs are also kept per iteration so concurrent
+        # iterations never read each other's results
+        if owning_loop_id and loop_iteration is not None:
+            _record_loop_iteration_output(execution_id, owning_loop_id, loop_iteration, node_id, log_output)
 
         _write_log(
             db, execution_id, node_id, "completed",
@@ -711,14 +1368,25 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
         }
         if token_usage:
             ws_data["token_usage"] = token_usage
+        if memo_key:
+            ws_data["cache_hit"] = cache_hit
         _publish_event(execution_id, "node_status", ws_data, workflow_slug=slug)
 
+        # Journal the node before any successor can run, unless it only
+        # started a loop or a child execution (it completes later) or runs
+        # inside a loop body (journaled with its loop)
+        starts_loop = bool(loop_data and loop_data.get("items") and topo_data.get("loop_bodies", {}).get(node_id))
+        if not (owning_loop_id or subworkflow_data or starts_loop):
+            route = state.get("route") if node_id in _plan(topo_data)["conditional_routes"] else None
+            execution_journal.record(db, execution_id, node_id, written, route=route)
+
         # Mark node completed
         r = _redis()
         r.sadd(_completed_key(execution_id), node_id)
 
         # Check interrupt_after
         if node_info.get("interrupt_after"):
+            _remember_interrupted_iteration(execution_id, state, loop_iteration)
             _handle_interrupt(execution, node_id, "after", db)
             # Decrement inflight — execution is now "interrupted" so _finalize()
             # will no-op even if counter reaches 0. resume_node_job() re-increments.
@@ -730,13 +1398,16 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
             items = loop_data.get("items", [])
             body_targets = topo_data.get("loop_bodies", {}).get(node_id, [])
             if items and body_targets:
-                r.set(_loop_key(execution_id, node_id), json.dumps({
-                    "items": items, "index": 0, "results": [],
-                    "body_targets": body_targets,
-                }), ex=STATE_TTL)
-                state["loop"] = {"item": items[0], "index": 0, "total": len(items)}
-                save_state(execution_id, state)
-                _advance_loop_body(execution_id, node_id, topo_data, slug, iter_index=0)
+                # Up to max_concurrency iterations run at once; each finished
+                # iteration launches the next pending one (_loop_next_iteration)
+                concurrency = max(1, int(loop_data.get("max_concurrency") or 1))
+                initial = min(concurrency, len(items))
+                _init_loop_state(execution_id, node_id, items, initial, scope=loop_iteration)
+                for iter_index in range(initial):
+                    _advance_loop_body(
+                        execution_id, node_id, topo_data, slug,
+                        iter_index=_nested_iteration(loop_iteration, iter_index),
+                    )
                 return
             # Empty array or no body targets — advance normally
 
@@ -764,12 +1435,13 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
                 "total": count,
                 "child_ids": child_ids,
                 "results": {},
+                "loop_iteration": loop_iteration,
             }
-            r.set(
-                _child_wait_key(execution_id, node_id),
-                json.dumps(wait_data),
-                ex=timeout_seconds + 60,
-            )
+            wait_key = _child_wait_key(execution_id, node_id)
+            pipe = r.pipeline()
+            pipe.set(wait_key, json.dumps(wait_data), ex=timeout_seconds + 60)
+            _track_keys(pipe, execution_id, wait_key)
+            pipe.execute()
             _publish_event(execution_id, "node_status", {
                 "node_id": node_id, "status": NodeStatus.WAITING.value,
                 "child_execution_ids": child_ids,
@@ -780,18 +1452,19 @@ def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> N
             return
 
         # Handle delay: pass delay to _advance
-        _advance(execution_id, node_id, state, topo_data, db, delay_seconds=delay_seconds)
+        _advance(execution_id, node_id, state, topo_data, db, delay_seconds=delay_seconds, iter_index=loop_iteration)
 
     except Exception as exc:
         logger.exception("Unexpected error in execute_node_job(%s, %s)", execution_id, node_id)
         _exec = locals().get("execution")
         try:
+            _execution_logs.flush()
             if _exec:
                 _exec.status = "failed"
                 _exec.error_message = str(exc)[:2000]
                 _exec.completed_at = datetime.now(timezone.utc)
                 try:
-                    _persist_execution_costs(_exec, load_state(execution_id))
+                    _persist_execution_costs(_exec, load_state(execution_id, fields=("_execution_token_usage",)))
                 except Exception:
                     logger.exception("Failed to persist execution costs for %s", execution_id)
                 db.commit()
@@ -859,17 +1532,16 @@ def resume_node_job(execution_id: str, user_input: str) -> None:
             return
 
         # Inject resume input into state
-        state = load_state(execution_id)
+        state = load_state(execution_id, messages=False)
         state["_resume_input"] = user_input
+        loop_iteration = state.pop("_interrupted_loop_iteration", None)
         save_state(execution_id, state)
 
         # Re-enqueue the node (increment inflight to match the decrement on interrupt)
         r = _redis()
         r.incr(_inflight_key(execution_id))
         r.expire(_inflight_key(execution_id), STATE_TTL)
-        from tasks import execute_node_job as _enqueue_node
-        q = _queue()
-        q.enqueue(_enqueue_node, execution_id, node_id)
+        _enqueue_node_job(execution_id, node_id, loop_iteration=loop_iteration)
 
     finally:
         db.close()
@@ -937,6 +1609,7 @@ def _resume_from_child(
             return
 
         wait_data = json.loads(raw)
+        loop_iteration = wait_data.get("loop_iteration")
 
         if wait_data.get("parallel") and child_execution_id:
             # Parallel mode: accumulate results under Redis lock
@@ -986,7 +1659,7 @@ def _resume_from_child(
             ordered_results = child_output
 
         # Inject child output into parent state
-        state = load_state(parent_execution_id)
+        state = load_state(parent_execution_id, fields=("_subworkflow_results",))
         subworkflow_results = state.get("_subworkflow_results", {})
         subworkflow_results[parent_node_id] = ordered_results
         state["_subworkflow_results"] = subworkflow_results
@@ -994,10 +1667,7 @@ def _resume_from_child(
 
         # Re-enqueue the subworkflow node — on re-entry it will see the
         # child result and return it as normal output, then advance.
-        from tasks import execute_node_job as _enqueue_node
-
-        q = _queue()
-        q.enqueue(_enqueue_node, parent_execution_id, parent_node_id)
+        _enqueue_node_job(parent_execution_id, parent_node_id, loop_iteration=loop_iteration)
 
         logger.info(
             "Resumed parent execution %s at node %s with child output",
@@ -1032,11 +1702,7 @@ def _auto_promote_agent_output(
     if not node_info or node_info.get("component_type") not in _AGENT_COMPONENT_TYPES:
         return
 
-    has_reply_chat = any(
-        n.get("component_type") == "reply_chat"
-        for n in topo_data["nodes"].values()
-    )
-    if has_reply_chat:
+    if _plan(topo_data)["has_reply_chat"]:
         return
 
     node_output = state.get("node_outputs", {}).get(completed_node_id, {})
@@ -1057,16 +1723,21 @@ def _advance(
     topo_data: dict,
     db: Session,
     delay_seconds: float | None = None,
+    iter_index: int | str | None = None,
 ) -> None:
-    """Enqueue successor nodes after a node completes."""
+    """Enqueue successor nodes after a node completes.
+
+    *iter_index* is the loop iteration the completed node ran in; successors
+    inside the same loop body inherit it.
+    """
     r = _redis()
-    # Filter to non-loop_body edges for normal advancement
-    all_edges = topo_data["edges_by_source"].get(completed_node_id, [])
-    edges = [e for e in all_edges if e.get("edge_label", "") not in ("loop_body", "loop_return")]
-    if not edges:
+    plan = _plan(topo_data)
+    if completed_node_id not in plan["direct_successors"]:
         # Check if completed node is inside a loop body
-        if _check_loop_body_done(execution_id, completed_node_id, topo_data, db, delay_seconds=delay_seconds):
-            r.decr(_inflight_key(execution_id))
+        if _check_loop_body_done(execution_id, completed_node_id, topo_data, db, delay_seconds=delay_seconds, iter_index=iter_index):
+            # The loop may have completed first, leaving this the last node
+            if r.decr(_inflight_key(execution_id)) <= 0:
+                _finalize(execution_id, db)
             return
 
         # Auto-reply: if a terminal agent node completes and the workflow
@@ -1079,182 +1750,454 @@ def _advance(
             _finalize(execution_id, db)
         return
 
-    q = _queue()
-
-    # Separate direct and conditional edges
-    conditional = [e for e in edges if e["edge_type"] == "conditional"]
-    direct = [e for e in edges if e["edge_type"] == "direct"]
-
-    targets_to_enqueue: list[str] = []
-
-    if conditional:
-        # Route based on state["route"] using individual condition_value edges
-        route_val = state.get("route", "")
-        matched_target = None
-        for e in conditional:
-            if e.get("condition_value") == route_val:
-                matched_target = e["target_node_id"]
-                break
-        # Fallback: legacy condition_mapping
-        if matched_target is None:
-            edge = conditional[0]
-            mapping = edge.get("condition_mapping") or {}
-            matched_target = mapping.get(route_val)
-        if matched_target and matched_target != "__end__":
-            targets_to_enqueue.append(matched_target)
+    routes = plan["conditional_routes"].get(completed_node_id)
+    if routes is not None:
+        # Route based on state["route"]
+        matched_target = routes.get(state.get("route", ""))
+        targets_to_enqueue = [matched_target] if matched_target and matched_target != "__end__" else []
     else:
         # Fan-out: enqueue ALL direct edge targets
-        for e in direct:
-            target = e["target_node_id"]
-            if target and target != "__end__":
-                targets_to_enqueue.append(target)
+        targets_to_enqueue = plan["direct_successors"][completed_node_id]
 
-    enqueued_count = 0
+    candidates: list[tuple[str, int | str | None]] = []
+    fanin_keys: dict[str, str] = {}
     for target_id in targets_to_enqueue:
         target_info = topo_data["nodes"].get(target_id)
         if not target_info:
             continue
 
-        # Check if target is a merge node (fan-in)
-        if target_info["component_type"] == "merge":
-            expected = topo_data["incoming_count"].get(target_id, 1)
-            count = r.incr(_fanin_key(execution_id, target_id))
-            r.expire(_fanin_key(execution_id, target_id), STATE_TTL)
-            if count < expected:
+        target_iter = iter_index if iter_index is not None and target_id in plan["owning_loop"] else None
+        candidates.append((target_id, target_iter))
+
+        # Merge nodes (fan-in) are counted per loop iteration inside loop
+        # bodies so concurrent iterations don't share a counter
+        if target_id in plan["fan_in"]:
+            fanin_key = _fanin_key(execution_id, target_id)
+            if target_iter is not None:
+                fanin_key = f"{fanin_key}:iter:{target_iter}"
+            fanin_keys[target_id] = fanin_key
+
+    # One round-trip for every fan-in counter; only needed when a merge is
+    # among the successors, since readiness decides what gets enqueued
+    fanin_counts: dict[str, int] = {}
+    if fanin_keys:
+        pipe = r.pipeline(transaction=False)
+        for fanin_key in fanin_keys.values():
+            pipe.incr(fanin_key)
+            pipe.expire(fanin_key, STATE_TTL)
+        _track_keys(pipe, execution_id, *fanin_keys.values())
+        replies = pipe.execute()
+        fanin_counts = dict(zip(fanin_keys, replies[:2 * len(fanin_keys):2]))
+
+    ready_targets: list[tuple[str, int | str | None]] = []
+    for target_id, target_iter in candidates:
+        if target_id in fanin_counts:
+            expected = plan["fan_in"][target_id]
+            if fanin_counts[target_id] < expected:
                 logger.debug(
-                    "Fan-in %s: %d/%d parents done", target_id, count, expected
+                    "Fan-in %s: %d/%d parents done", target_id, fanin_counts[target_id], expected
                 )
                 continue
             # All parents done — fall through to enqueue
+        ready_targets.append((target_id, target_iter))
+
+    # Fused execution: if every ready successor is cheap, the current worker
+    # runs them inline (see execute_node_job) instead of enqueueing. With
+    # EXECUTION_AFFINITY it also keeps a lone successor of its own queue.
+    inline = None
+    if ready_targets and not (delay_seconds and delay_seconds > 0):
+        fused, kept = _fused_targets.get(), _kept_targets.get()
+        if fused is not None and all(_is_fusable(topo_data["nodes"][t]) for t, _ in ready_targets):
+            inline = fused
+        elif kept is not None and len(ready_targets) == 1 and _keeps_affinity(topo_data["nodes"][ready_targets[0][0]]):
+            inline = kept
+
+    # Inflight bookkeeping, RQ jobs and (outside loop bodies) the completed
+    # node's own decrement go out in one MULTI/EXEC, so the counter can never
+    # be observed between a successor's increment and its job being visible.
+    in_loop_body = completed_node_id in plan["owning_loop"]
+    slug = topo_data.get("workflow_slug", "")
+    pipe = r.pipeline()
+    pipe.multi()  # explicit, so RQ's enqueue(pipeline=...) won't re-enter MULTI
+    if ready_targets:
+        pipe.incrby(_inflight_key(execution_id), len(ready_targets))
+    if inline is not None:
+        for target_id, target_iter in ready_targets:
+            _publish_event(execution_id, "node_enqueued", {"node_id": target_id}, workflow_slug=slug)
+            inline.append((target_id, target_iter))
+    else:
+        _enqueue_node_jobs(
+            execution_id, ready_targets, slug,
+            delay_seconds=delay_seconds, topo_data=topo_data, pipeline=pipe,
+        )
+    if not in_loop_body:
+        pipe.decr(_inflight_key(execution_id))
+    replies = pipe.execute()
+
+    if in_loop_body:
+        # The loop may launch its next iteration (or complete) first, so the
+        # completed node's decrement has to follow it
+        _check_loop_body_done(execution_id, completed_node_id, topo_data, db, delay_seconds=delay_seconds, iter_index=iter_index)
+        remaining = r.decr(_inflight_key(execution_id))
+    else:
+        remaining = replies[-1]
 
-        r.incr(_inflight_key(execution_id))
-        enqueued_count += 1
-        _publish_event(execution_id, "node_enqueued", {"node_id": target_id}, workflow_slug=topo_data.get("workflow_slug", ""))
-        from tasks import execute_node_job as _enqueue_node
-        if delay_seconds and delay_seconds > 0:
-            q.enqueue_in(timedelta(seconds=delay_seconds), _enqueue_node, execution_id, target_id)
-        else:
-            q.enqueue(_enqueue_node, execution_id, target_id)
-
-    # Check if completed node is inside a loop body
-    _check_loop_body_done(execution_id, completed_node_id, topo_data, db, delay_seconds=delay_seconds)
-
-    # Decrement inflight for the completed node and check if execution is done
-    remaining = r.decr(_inflight_key(execution_id))
+    # Check if execution is done
     if remaining <= 0:
         _finalize(execution_id, db)
 
 
-def _advance_loop_body(execution_id: str, loop_node_id: str, topo_data: dict, slug: str, iter_index: int = 0, delay_seconds: float | None = None) -> None:
-    """Enqueue body target nodes for the current loop iteration."""
-    r = _redis()
-    q = _queue()
-    body_targets = topo_data.get("loop_bodies", {}).get(loop_node_id, [])
-    r.delete(_loop_iter_done_key(execution_id, loop_node_id, iter_index))
+def _is_fusable(node_info: dict) -> bool:
+    """Whether a node may run inline in the worker that completed its predecessor."""
+    return (
+        node_info.get("component_type") in FUSABLE_COMPONENT_TYPES
+        and not node_info.get("interrupt_before")
+    )
+
+
+def _keeps_affinity(node_info: dict) -> bool:
+    """Whether, under ``EXECUTION_AFFINITY``, the current job may run *node_info* next.
+
+    Only nodes of the queue the job came from qualify, so a node never runs
+    on a worker outside its resource profile.
+    """
+    if not settings.EXECUTION_AFFINITY or node_info.get("interrupt_before"):
+        return False
+    from rq import get_current_job
+
+    job = get_current_job()
+    return job is not None and job.origin == queue_for_component(node_info.get("component_type", ""))
 
+
+def _enqueue_node_job(
+    execution_id: str,
+    node_id: str,
+    retry_count: int = 0,
+    loop_iteration: int | str | None = None,
+    delay_seconds: float | None = None,
+    topo_data: dict | None = None,
+    pipeline=None,
+) -> None:
+    """Enqueue ``tasks.execute_node_job``, optionally delayed and bound to a loop iteration.
+
+    The job goes to the queue of the node's resource profile; *topo_data*
+    saves loading the topology to look it up. With *pipeline* the job is
+    only queued on it; the caller executes it.
+
+    The job ID is added to the execution's job set in the same pipeline,
+    so the zombie watchdog can tell an execution whose jobs are still
+    waiting in a queue from one whose worker died.
+    """
     from tasks import execute_node_job as _enqueue_node
 
-    for target_id in body_targets:
-        r.incr(_inflight_key(execution_id))
-        _publish_event(execution_id, "node_enqueued", {"node_id": target_id}, workflow_slug=slug)
-        if delay_seconds and delay_seconds > 0:
-            q.enqueue_in(timedelta(seconds=delay_seconds), _enqueue_node, execution_id, target_id)
-        else:
-            q.enqueue(_enqueue_node, execution_id, target_id)
+    # Completed nodes must be journaled before their successors can run
+    execution_journal.flush()
+    q = _node_queue(execution_id, node_id, topo_data)
+
+    args: list = [execution_id, node_id]
+    if retry_count or loop_iteration is not None:
+        args.append(retry_count)
+    if loop_iteration is not None:
+        args.append(loop_iteration)
+    pipe = pipeline if pipeline is not None else q.connection.pipeline()
+    if delay_seconds and delay_seconds > 0:
+        # Queue.enqueue_in adds the scheduled-registry entry outside the
+        # pipeline it is given, a round-trip per job that also lands before
+        # the job itself, so delayed jobs are scheduled here instead
+        job = q.create_job(_enqueue_node, args=args, status=JobStatus.SCHEDULED)
+        pipe.sadd(q.redis_queues_keys, q.key)
+        job.save(pipeline=pipe)
+        pipe.zadd(q.scheduled_job_registry.key, {job.id: int(time.time() + delay_seconds)})
+    else:
+        job = q.enqueue(_enqueue_node, *args, pipeline=pipe)
+    pipe.sadd(_jobs_key(execution_id), job.id)
+    pipe.expire(_jobs_key(execution_id), STATE_TTL)
+    if pipeline is None:
+        pipe.execute()
 
 
-def _check_loop_body_done(execution_id: str, completed_node_id: str, topo_data: dict, db: Session, delay_seconds: float | None = None) -> bool:
-    """Check if completed node is a loop body node, and if all completion nodes for this iteration are done.
+def _enqueue_node_jobs(
+    execution_id: str,
+    targets: list[tuple[str, int | str | None]],
+    slug: str,
+    delay_seconds: float | None = None,
+    topo_data: dict | None = None,
+    pipeline=None,
+) -> None:
+    """Enqueue every ``(node_id, loop_iteration)`` in *targets* in one round-trip.
 
-    Returns True if the node was inside a loop body (caller should handle inflight differently).
+    Every job (immediate or delayed, whatever its queue) is only added to
+    one pipeline, so the whole fan-out and its ``node_enqueued`` events go
+    out together. With
+    *pipeline* the caller executes it, along with its own bookkeeping.
     """
+    pipe = pipeline if pipeline is not None else _redis().pipeline()
+    for node_id, loop_iteration in targets:
+        _publish_event(execution_id, "node_enqueued", {"node_id": node_id}, workflow_slug=slug)
+        _enqueue_node_job(
+            execution_id, node_id,
+            loop_iteration=loop_iteration, delay_seconds=delay_seconds,
+            topo_data=topo_data, pipeline=pipe,
+        )
+    if pipeline is None:
+        pipe.execute()
+
+
+# ── Loops ─────────────────────────────────────────────────────────────────────
+
+
+def _plan(topo_data: dict) -> dict:
+    """Return *topo_data* with its plan lookup tables, filling them in once if absent."""
+    if "predecessors" not in topo_data:
+        topo_data.update(plan_tables(topo_data))
+    return topo_data
+
+
+def _owning_loop(node_id: str, topo_data: dict) -> str | None:
+    """Return the loop whose body contains *node_id*, if any."""
+    return _plan(topo_data)["owning_loop"].get(node_id)
+
+
+def _nested_iteration(scope: int | str | None, index: int) -> int | str:
+    """Iteration id of *index* in a loop run started in outer iteration *scope*.
+
+    Top-level loops number iterations ``0, 1, ...``; a loop nested in another
+    loop's body prefixes them with the outer iteration (``"2.0"``, ``"2.1"``),
+    so every key built from an iteration id is unique per outer iteration.
+    """
+    return index if scope is None else f"{scope}.{index}"
+
+
+def _split_iteration(iteration: int | str) -> tuple[int | str | None, int]:
+    """Inverse of ``_nested_iteration``: ``(scope, index)``."""
+    if isinstance(iteration, int):
+        return None, iteration
+    scope, _, index = iteration.rpartition(".")
+    if not scope:
+        return None, int(index)
+    return (scope if "." in scope else int(scope)), int(index)
+
+
+def _init_loop_state(execution_id: str, loop_id: str, items: list, next_index: int, scope: int | str | None = None) -> None:
+    """Store a loop's items and counters.
+
+    Items go into a list read by index and results into a hash filled in by
+    index, so each iteration costs O(1) Redis work regardless of loop size.
+    A loop nested in another loop's body keeps one set of keys per outer
+    iteration *scope*, which is also stored so completion resumes it.
+    """
+    r = _redis()
+    loop_key = _loop_key(execution_id, loop_id, scope)
+    items_key = _loop_items_key(execution_id, loop_id, scope)
+    results_key = _loop_results_key(execution_id, loop_id, scope)
+    counters: dict = {"total": len(items), "next_index": next_index, "completed": 0}
+    if scope is not None:
+        counters["outer_iteration"] = state_codec.encode(scope)
+    pipe = r.pipeline()
+    pipe.delete(loop_key, items_key, results_key)
+    pipe.hset(loop_key, mapping=counters)
+    for start in range(0, len(items), LOOP_ITEMS_CHUNK):
+        pipe.rpush(items_key, *(state_codec.encode(item) for item in items[start:start + LOOP_ITEMS_CHUNK]))
+    for key in (loop_key, items_key):
+        pipe.expire(key, STATE_TTL)
+    _track_keys(pipe, execution_id, loop_key, items_key, results_key)
+    pipe.execute()
+
+
+def _apply_loop_iteration(execution_id: str, loop_id: str, iteration: int | str, state: dict) -> None:
+    """Scope *state* to one loop iteration: its ``loop`` context and body outputs."""
+    scope, iter_index = _split_iteration(iteration)
     r = _redis()
-    loop_bodies = topo_data.get("loop_bodies", {})
-    loop_return_nodes = topo_data.get("loop_return_nodes", {})
-    loop_body_all = topo_data.get("loop_body_all_nodes", {})
+    pipe = r.pipeline()
+    pipe.hget(_loop_key(execution_id, loop_id, scope), "total")
+    pipe.lindex(_loop_items_key(execution_id, loop_id, scope), iter_index)
+    pipe.hgetall(_loop_iter_outputs_key(execution_id, loop_id, iteration))
+    total_raw, item_raw, iter_outputs = pipe.execute()
+    if total_raw is None:
+        return
+    if item_raw is not None:
+        state["loop"] = {"item": state_codec.decode(item_raw), "index": iter_index, "total": int(total_raw)}
 
-    for loop_id, body_targets in loop_bodies.items():
-        all_body = set(loop_body_all.get(loop_id, body_targets))
-        if completed_node_id not in all_body:
-            continue
+    if iter_outputs:
+        node_outputs = state.get("node_outputs", {}).copy()
+        for nid, raw in iter_outputs.items():
+            node_outputs[nid] = state_codec.decode(raw)
+        state["node_outputs"] = node_outputs
+
+
+def _record_loop_iteration_output(execution_id: str, loop_id: str, iter_index: int | str, node_id: str, output) -> None:
+    """Store a body node's output (or on_error=continue error) for one iteration."""
+    key = _loop_iter_outputs_key(execution_id, loop_id, iter_index)
+    pipe = _redis().pipeline(transaction=False)
+    pipe.hset(key, node_id, state_codec.encode(output))
+    pipe.expire(key, STATE_TTL)
+    _track_keys(pipe, execution_id, key)
+    pipe.execute()
+
+
+def _remember_interrupted_iteration(execution_id: str, state: dict, loop_iteration: int | str | None) -> None:
+    """Persist the loop iteration of an interrupted node so resume_node_job can restore it."""
+    if loop_iteration is None:
+        return
+    state["_interrupted_loop_iteration"] = loop_iteration
+    save_state(execution_id, state)
 
-        # Node is inside this loop's body
-        return_nodes = loop_return_nodes.get(loop_id, [])
-        completion_nodes = return_nodes if return_nodes else body_targets
 
-        if completed_node_id in completion_nodes:
-            # Get current iteration index
-            loop_raw = r.get(_loop_key(execution_id, loop_id))
-            iter_index = json.loads(loop_raw).get("index", 0) if loop_raw else 0
+def _advance_loop_body(execution_id: str, loop_node_id: str, topo_data: dict, slug: str, iter_index: int | str = 0, delay_seconds: float | None = None) -> None:
+    """Enqueue body target nodes for one loop iteration."""
+    body_targets = topo_data.get("loop_bodies", {}).get(loop_node_id, [])
+    pipe = _redis().pipeline()
+    pipe.multi()
+    pipe.delete(_loop_iter_done_key(execution_id, loop_node_id, iter_index))
+    if body_targets:
+        pipe.incrby(_inflight_key(execution_id), len(body_targets))
+    _enqueue_node_jobs(
+        execution_id, [(target_id, iter_index) for target_id in body_targets], slug,
+        delay_seconds=delay_seconds, topo_data=topo_data, pipeline=pipe,
+    )
+    pipe.execute()
 
-            done_key = _loop_iter_done_key(execution_id, loop_id, iter_index)
-            count = r.incr(done_key)
-            r.expire(done_key, STATE_TTL)
-            if count >= len(completion_nodes):
-                # All completion nodes done for this iteration
-                _loop_next_iteration(execution_id, loop_id, topo_data, db, delay_seconds=delay_seconds)
 
-        return True  # All body nodes return True (skip _finalize check)
+def _check_loop_body_done(
+    execution_id: str,
+    completed_node_id: str,
+    topo_data: dict,
+    db: Session,
+    delay_seconds: float | None = None,
+    iter_index: int | str | None = None,
+) -> bool:
+    """Check if completed node is a loop body node, and if all completion nodes for its iteration are done.
 
-    return False
+    Returns True if the node was inside a loop body (caller should handle inflight differently).
+    """
+    loop_id = _owning_loop(completed_node_id, topo_data)
+    if loop_id is None:
+        return False
 
+    if topo_data["completion_role"].get(completed_node_id) == loop_id:
+        if iter_index is None:
+            iter_index = 0
+        r = _redis()
+        done_key = _loop_iter_done_key(execution_id, loop_id, iter_index)
+        pipe = r.pipeline(transaction=False)
+        pipe.incr(done_key)
+        pipe.expire(done_key, STATE_TTL)
+        _track_keys(pipe, execution_id, done_key)
+        count = pipe.execute()[0]
+        if count >= len(topo_data["loop_completion_nodes"][loop_id]):
+            # All completion nodes done for this iteration
+            _loop_next_iteration(execution_id, loop_id, topo_data, db, delay_seconds=delay_seconds, iter_index=iter_index)
 
-def _loop_next_iteration(execution_id: str, loop_node_id: str, topo_data: dict, db: Session, delay_seconds: float | None = None) -> None:
-    """Advance loop to next iteration or complete it."""
+    return True  # All body nodes return True (skip _finalize check)
+
+
+def _loop_next_iteration(
+    execution_id: str,
+    loop_node_id: str,
+    topo_data: dict,
+    db: Session,
+    delay_seconds: float | None = None,
+    iter_index: int | str = 0,
+) -> None:
+    """Record a finished iteration, then launch the next pending one or complete the loop.
+
+    With ``max_concurrency`` > 1 iterations finish out of order, so results
+    are stored by index and always come back in input order. Counters are
+    updated with HINCRBY, so no lock is needed between concurrent finishers.
+    A nested loop completes into the outer iteration it was started in.
+    """
     r = _redis()
-    loop_raw = r.get(_loop_key(execution_id, loop_node_id))
-    loop_state = json.loads(loop_raw) if loop_raw else {}
-    items = loop_state.get("items", [])
-    index = loop_state.get("index", 0)
-    results = loop_state.get("results", [])
-
-    # Collect body outputs for this iteration
-    state = load_state(execution_id)
-    body_targets = loop_state.get("body_targets", [])
-    return_nodes = topo_data.get("loop_return_nodes", {}).get(loop_node_id, [])
-    output_nodes = return_nodes if return_nodes else body_targets
-
-    # Check for recorded errors from on_error=continue
-    loop_errors = state.get("_loop_errors", {}).get(loop_node_id, {})
-    iter_output = {}
-    for bt in output_nodes:
-        if bt in loop_errors:
-            iter_output[bt] = loop_errors[bt]
-        else:
-            iter_output[bt] = state.get("node_outputs", {}).get(bt)
+    output_nodes = _plan(topo_data)["loop_completion_nodes"].get(loop_node_id, [])
+
+    # Collect body outputs for this iteration (including errors recorded by
+    # on_error=continue); fall back to shared state for unscoped nodes
+    scope, index = _split_iteration(iter_index)
+    outputs_key = _loop_iter_outputs_key(execution_id, loop_node_id, iter_index)
+    iter_outputs = r.hgetall(outputs_key) or {}
+    shared_outputs = load_node_outputs(execution_id, [bt for bt in output_nodes if bt not in iter_outputs])
+    iter_output = {
+        bt: blob_store.resolve(state_codec.decode(iter_outputs[bt]) if bt in iter_outputs else shared_outputs.get(bt))
+        for bt in output_nodes
+    }
+    r.delete(outputs_key)
+
+    loop_key = _loop_key(execution_id, loop_node_id, scope)
+    results_key = _loop_results_key(execution_id, loop_node_id, scope)
+    pipe = r.pipeline()
+    pipe.hset(results_key, str(index), state_codec.encode(iter_output))
+    pipe.expire(results_key, STATE_TTL)
+    pipe.hincrby(loop_key, "completed", 1)
+    # Claim the next pending index; concurrent finishers each get a distinct
+    # one, and claims past the end are simply ignored
+    pipe.hincrby(loop_key, "next_index", 1)
+    pipe.hmget(loop_key, ["total", "outer_iteration"])
+    _, _, completed, claimed, (total_raw, outer_raw) = pipe.execute()
+    total = int(total_raw or 0)
+    launch_index = claimed - 1
+
+    if launch_index < total:
+        # More items — start the next pending iteration in this slot
+        slug = topo_data.get("workflow_slug", "")
+        _advance_loop_body(
+            execution_id, loop_node_id, topo_data, slug,
+            iter_index=_nested_iteration(scope, launch_index), delay_seconds=delay_seconds,
+        )
+        return
 
-    # Clear errors for this iteration
-    if loop_node_id in state.get("_loop_errors", {}):
-        del state["_loop_errors"][loop_node_id]
+    if completed < total:
+        # Other iterations still running — the last one to finish completes the loop
+        return
 
-    results.append(iter_output)
-    index += 1
+    # Materialise the ordered results once, then drop the loop bookkeeping
+    raw_results = r.hgetall(results_key) or {}
+    results = [
+        state_codec.decode(raw_results[str(i)]) if str(i) in raw_results else None
+        for i in range(total)
+    ]
+    r.delete(loop_key, _loop_items_key(execution_id, loop_node_id, scope), results_key)
+    outer_iteration = state_codec.decode(outer_raw) if outer_raw is not None else None
+
+    # Loop complete — store results and advance via non-body edges
+    state = load_state(execution_id, messages=False)
+    node_outputs = state.get("node_outputs", {})
+    # Assigned back: an offloaded loop output is a fresh copy on every lookup
+    node_outputs[loop_node_id] = {**(node_outputs.get(loop_node_id) or {}), "results": results}
+    state["node_outputs"] = node_outputs
+    # Clear loop context
+    state.pop("loop", None)
+    save_state(execution_id, state)
+    outer_loop_id = _owning_loop(loop_node_id, topo_data)
+    if outer_loop_id is None:
+        execution_journal.record(db, execution_id, loop_node_id, _loop_journal_delta(execution_id, state, loop_node_id, topo_data))
+    elif outer_iteration is not None:
+        # Shared node_outputs are overwritten by every outer iteration, so
+        # the outer body reads these results from its own iteration outputs
+        _record_loop_iteration_output(
+            execution_id, outer_loop_id, outer_iteration, loop_node_id,
+            blob_store.stored(state["node_outputs"], loop_node_id),
+        )
+    # Advance via normal direct edges (the "done" path), still inside the
+    # outer iteration when this loop is nested
+    _advance(execution_id, loop_node_id, state, topo_data, db, delay_seconds=delay_seconds, iter_index=outer_iteration)
 
-    slug = topo_data.get("workflow_slug", "")
 
-    if index < len(items):
-        # More items — update loop state, set next item, re-enqueue body
-        loop_state["index"] = index
-        loop_state["results"] = results
-        r.set(_loop_key(execution_id, loop_node_id), json.dumps(loop_state), ex=STATE_TTL)
-        state["loop"] = {"item": items[index], "index": index, "total": len(items)}
-        save_state(execution_id, state)
-        _advance_loop_body(execution_id, loop_node_id, topo_data, slug, iter_index=index, delay_seconds=delay_seconds)
-    else:
-        # Loop complete — store results and advance via non-body edges
-        loop_state["results"] = results
-        r.set(_loop_key(execution_id, loop_node_id), json.dumps(loop_state), ex=STATE_TTL)
-        node_outputs = state.get("node_outputs", {})
-        if loop_node_id in node_outputs:
-            node_outputs[loop_node_id]["results"] = results
-        else:
-            node_outputs[loop_node_id] = {"results": results}
-        state["node_outputs"] = node_outputs
-        # Clear loop context
-        state.pop("loop", None)
-        save_state(execution_id, state)
-        # Advance via normal direct edges (the "done" path)
-        _advance(execution_id, loop_node_id, state, topo_data, db, delay_seconds=delay_seconds)
+def _loop_journal_delta(execution_id: str, state: dict, loop_node_id: str, topo_data: dict) -> dict:
+    """Journal delta for a completed loop: the whole top-level state and
+    message log plus the outputs and results of the loop and its body nodes.
+
+    Body nodes are not journaled one by one, so their changes to shared
+    state (messages, token usage, ...) are captured here instead.
+    """
+    node_ids = {loop_node_id, *topo_data.get("loop_body_all_nodes", {}).get(loop_node_id, [])}
+    loaded = getattr(state, "loaded", None) or {}
+    delta: dict = {
+        "state": dict(loaded.get("state", {})),
+        "messages": _redis().lrange(_messages_key(execution_id), 0, -1),
+    }
+    for field in ("node_outputs", "node_results"):
+        encoded = loaded.get(field, {})
+        delta[field] = {nid: encoded[nid] for nid in node_ids if nid in encoded}
+    return delta
 
 
 def _maybe_finalize(execution_id: str, topo_data: dict, db: Session) -> None:
@@ -1282,6 +2225,15 @@ def _finalize(execution_id: str, db: Session) -> None:
     if not execution or execution.status != "running":
         return
 
+    # Every node's log row should be in the database before the execution
+    # is reported complete; other workers may still be buffering theirs.
+    # Best-effort: missing log rows must not fail a finished execution.
+    try:
+        if not _execution_logs.wait_for_execution(execution_id, settings.EXECUTION_LOG_FINALIZE_TIMEOUT):
+            logger.warning("Execution %s finalized with log rows still pending", execution_id)
+    except Exception:
+        logger.warning("Failed to wait for log rows of execution %s", execution_id, exc_info=True)
+
     try:
         state = load_state(execution_id)
         execution.status = "completed"
@@ -1499,21 +2451,18 @@ def _write_log(
     metadata: dict | None = None,
     input: dict | None = None,
 ) -> None:
-    from models.execution import ExecutionLog
-
-    log = ExecutionLog(
-        execution_id=execution_id,
-        node_id=node_id,
-        status=status,
-        input=input,
-        output=output,
-        error=error[:2000] if error else "",
-        error_code=error_code,
-        log_metadata=metadata or {},
-        duration_ms=duration_ms,
-    )
-    db.add(log)
-    db.commit()
+    """Queue a node's ExecutionLog row on the worker's bulk-insert buffer."""
+    _execution_logs.add(db, {
+        "execution_id": execution_id,
+        "node_id": node_id,
+        "status": status,
+        "input": input,
+        "output": output,
+        "error": error[:2000] if error else "",
+        "error_code": error_code,
+        "log_metadata": metadata or {},
+        "duration_ms": duration_ms,
+    })
 
 
 def _extract_output(state: dict) -> dict | None:
@@ -1530,7 +2479,7 @@ def _extract_output(state: dict) -> dict | None:
                 return {"message": extract_text_content(msg.content)}
     node_outputs = state.get("node_outputs", {})
     if node_outputs:
-        return {"node_outputs": node_outputs}
+        return {"node_outputs": dict(node_outputs.items())}
     if messages:
         last = messages[-1]
         content = last.content if hasattr(last, "content") else str(last)
@@ -1684,11 +2633,16 @@ def _clear_stale_checkpoints(execution_id: str, db: Session) -> None:
 
 
 def _cleanup_redis(execution_id: str) -> None:
-    """Remove execution keys from Redis."""
+    """Remove execution keys from Redis, free its admission slot and drop its journal.
+
+    Deletes exactly the keys listed by ``_execution_keys`` with UNLINK, so
+    neither the lookup nor the deletion blocks Redis on a large keyspace.
+    """
     r = _redis()
-    keys = r.keys(f"execution:{execution_id}:*")
-    if keys:
-        r.delete(*keys)
+    r.unlink(*_execution_keys(r, execution_id))
+    _forget_state(execution_id)
+    admission.release(execution_id, r)
+    execution_journal.discard(execution_id)
 
 
 # ── Episode logging helpers ───────────────────────────────────────────────────
@@ -1738,6 +2692,20 @@ def _start_episode(
         return None
 
 
+def _restore_episode(execution_id: str, db: Session) -> None:
+    """Point the episode key back at the execution's open episode, if any."""
+    from models.memory import MemoryEpisode
+
+    episode = (
+        db.query(MemoryEpisode)
+        .filter(MemoryEpisode.execution_id == execution_id, MemoryEpisode.ended_at.is_(None))
+        .order_by(MemoryEpisode.started_at.desc())
+        .first()
+    )
+    if episode:
+        _redis().set(_episode_key(execution_id), episode.id, ex=STATE_TTL)
+
+
 def _complete_episode(
     execution_id: str,
     success: bool,
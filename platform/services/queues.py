@@ -0,0 +1,36 @@
+"""RQ queue names and the routing of jobs onto them.
+
+Every job used to share the ``workflows`` queue, so a burst of long agent
+runs starved sub-millisecond control-flow hops, scheduled jobs and the
+maintenance watchdogs queued behind them. Jobs are now routed by resource
+profile, and each queue is served by its own worker pool (see the
+``worker_class`` profiles and the Procfile):
+
+- ``control`` — execution starts, resumes and every node that is neither of
+  the below. Keeps the legacy ``workflows`` name, so workers started with the
+  old command line still serve it.
+- ``llm`` — nodes that wait on a model: agents, categorizers, chat models.
+- ``sandbox`` — nodes that run user code in a sandbox.
+- ``maintenance`` — scheduled-job ticks and cleanup/recovery watchdogs.
+"""
+
+from __future__ import annotations
+
+CONTROL_QUEUE = "workflows"
+LLM_QUEUE = "llm"
+SANDBOX_QUEUE = "sandbox"
+MAINTENANCE_QUEUE = "maintenance"
+
+ALL_QUEUES = (CONTROL_QUEUE, LLM_QUEUE, SANDBOX_QUEUE, MAINTENANCE_QUEUE)
+
+LLM_COMPONENT_TYPES = frozenset({"agent", "deep_agent", "categorizer", "chat_model"})
+SANDBOX_COMPONENT_TYPES = frozenset({"code"})
+
+
+def queue_for_component(component_type: str) -> str:
+    """Return the name of the queue that runs nodes of *component_type*."""
+    if component_type in LLM_COMPONENT_TYPES:
+        return LLM_QUEUE
+    if component_type in SANDBOX_COMPONENT_TYPES:
+        return SANDBOX_QUEUE
+    return CONTROL_QUEUE
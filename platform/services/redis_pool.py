@@ -0,0 +1,112 @@
+"""Process-wide pooled Redis clients.
+
+Every caller used to build its own client with ``redis.from_url``, which
+opens a fresh connection per call. These helpers hand out clients backed by
+one shared ``ConnectionPool`` per (URL, decoding) pair instead. redis-py pools
+check the owning PID on checkout, so RQ work-horses forked from a parent
+transparently open their own sockets rather than sharing the parent's.
+
+Use ``get_redis()`` for str-decoded access (state, pub/sub, counters) and
+``get_redis_binary()`` wherever raw bytes are required — RQ queues pickle
+job payloads and must not decode responses.
+
+``count_commands()`` tallies commands and round-trips issued by the current
+context, so per-job Redis traffic can be logged and compared.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+import redis as redis_lib
+from redis.client import Pipeline
+
+from config import settings
+
+
+@dataclass
+class CommandCounter:
+    commands: int = 0
+    round_trips: int = 0
+
+
+_counter: ContextVar[CommandCounter | None] = ContextVar("redis_command_counter", default=None)
+
+
+def _count(commands: int) -> None:
+    counter = _counter.get()
+    if counter is not None:
+        counter.commands += commands
+        counter.round_trips += 1
+
+
+class _CountingPipeline(Pipeline):
+    def execute(self, raise_on_error: bool = True):
+        if self.command_stack:
+            _count(len(self.command_stack))
+        return super().execute(raise_on_error)
+
+
+class _CountingRedis(redis_lib.Redis):
+    def execute_command(self, *args, **options):
+        _count(1)
+        return super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> Pipeline:
+        return _CountingPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint,
+        )
+
+
+_pools: dict[tuple[str, bool], redis_lib.ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool(decode_responses: bool) -> redis_lib.ConnectionPool:
+    key = (settings.REDIS_URL, decode_responses)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = redis_lib.ConnectionPool.from_url(
+                    settings.REDIS_URL,
+                    decode_responses=decode_responses,
+                    max_connections=settings.REDIS_POOL_MAX_CONNECTIONS,
+                    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+                )
+                _pools[key] = pool
+    return pool
+
+
+def get_redis() -> redis_lib.Redis:
+    """Return a pooled client that decodes responses to ``str``."""
+    return _CountingRedis(connection_pool=_pool(True))
+
+
+def get_redis_binary() -> redis_lib.Redis:
+    """Return a pooled client that returns raw ``bytes`` (required by RQ)."""
+    return _CountingRedis(connection_pool=_pool(False))
+
+
+def reset_pools() -> None:
+    """Disconnect and drop every pool (tests, or after changing ``REDIS_URL``)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.disconnect()
+        _pools.clear()
+
+
+@contextmanager
+def count_commands() -> Iterator[CommandCounter]:
+    """Count Redis commands issued by pooled clients within this context."""
+    counter = CommandCounter()
+    token = _counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _counter.reset(token)
@@ -8,6 +8,7 @@ from datetime import datetime, timedelta, timezone
 from database import SessionLocal
 from models.execution import WorkflowExecution
 from models.scheduled_job import ScheduledJob
+from services.admission import BackpressureError
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +61,11 @@ def execute_scheduled_job(job_id: str, current_repeat: int = 0, current_retry: i
             else:
                 _enqueue_next(job, next_n, 0, job.interval_seconds)
 
+        except BackpressureError as e:
+            # Queues are full: skip this run without counting it as a failure
+            logger.warning("Skipping scheduled job %s: %s", job.id, e)
+            _enqueue_next(job, current_repeat, current_retry, job.interval_seconds)
+
         except Exception as e:
             # FAIL path
             next_rc = current_retry + 1
@@ -96,12 +102,12 @@ def _enqueue_next(job: ScheduledJob, n: int, rc: int, delay_seconds: int) -> Non
     """
     from tasks import execute_scheduled_job_task
 
-    import redis
     from rq import Queue
-    from config import settings
 
-    conn = redis.from_url(settings.REDIS_URL)
-    q = Queue("workflows", connection=conn)
+    from services.queues import MAINTENANCE_QUEUE
+    from services.redis_pool import get_redis_binary
+
+    q = Queue(MAINTENANCE_QUEUE, connection=get_redis_binary())
     rq_job_id = f"sched-{job.id}-n{n}-rc{rc}"
     q.enqueue_in(
         timedelta(seconds=delay_seconds),
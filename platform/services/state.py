@@ -37,12 +37,15 @@ def merge_state_update(current: dict[str, Any], update: dict[str, Any]) -> dict[
     - ``node_outputs`` → dict merge (``|``)
     - everything else → overwrite
     """
-    merged = dict(current)
+    merged = current.copy()
     for key, value in update.items():
         if key == "messages":
             merged["messages"] = merged.get("messages", []) + (value or [])
         elif key == "node_outputs":
-            merged["node_outputs"] = {**merged.get("node_outputs", {}), **(value or {})}
+            # copy() keeps a LazyNodeOutputs lazy
+            outputs = merged.get("node_outputs", {}).copy()
+            outputs.update(value or {})
+            merged["node_outputs"] = outputs
         else:
             merged[key] = value
     return merged
@@ -68,3 +71,21 @@ def deserialize_state(data: dict[str, Any]) -> dict[str, Any]:
     if msgs and isinstance(msgs, list) and msgs and isinstance(msgs[0], dict):
         out["messages"] = messages_from_dict(msgs)
     return out
+
+
+class ExecutionState(dict):
+    """Execution state loaded from Redis, remembering how it was stored.
+
+    ``loaded`` maps each storage field to the encoded value it was read
+    with, so ``save_state`` can write back only the fields that changed.
+    Plain dicts are saved in full.
+    """
+
+    __slots__ = ("loaded",)
+
+    def __init__(self, *args: Any, loaded: dict[str, Any] | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.loaded = loaded
+
+    def copy(self) -> ExecutionState:
+        return ExecutionState(self, loaded=self.loaded)
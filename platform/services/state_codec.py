@@ -0,0 +1,126 @@
+"""Encoding of execution state values and compiled topologies in Redis.
+
+Every field of an execution's state hashes is stored as text, because the
+orchestrator reads them through a ``decode_responses`` client. A value is
+either plain JSON or, once its JSON is longer than
+``STATE_COMPRESSION_MIN_BYTES``, a compressed frame::
+
+    ~z1:<base64 of zstd-compressed JSON>
+    ~d1:<base64 of zlib-compressed JSON>
+
+JSON never starts with ``~``, so plain values written before frames existed
+(or with compression off) still decode. The tag names the algorithm and
+frame version; ``decode`` understands every tag whatever the settings, so
+workers can be reconfigured or upgraded one at a time. Compression is
+deterministic, which keeps ``save_state``'s compare-encodings diff working.
+
+``STATE_JSON_ENCODER`` picks ``orjson`` (compact, several times faster) or
+the standard library ``json``; ``orjson`` and ``zstandard`` are optional
+and fall back to ``json`` and ``zlib`` when missing. Compare the options
+with ``python -m benchmarks.state_codec``.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import threading
+import zlib
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+FRAME_PREFIX = "~"
+ZSTD_TAG = "~z1:"
+ZLIB_TAG = "~d1:"
+
+_ZSTD_LEVEL = 3
+_ZLIB_LEVEL = 6
+
+# zstd contexts are costly to create and not safe to share between threads
+_zstd = threading.local()
+
+
+def _zstd_compressor():
+    if not hasattr(_zstd, "compressor"):
+        _zstd.compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+    return _zstd.compressor
+
+
+def _zstd_decompressor():
+    if not hasattr(_zstd, "decompressor"):
+        _zstd.decompressor = zstandard.ZstdDecompressor()
+    return _zstd.decompressor
+
+
+def dumps(value) -> str:
+    """JSON text of *value*, with the configured encoder."""
+    if settings.STATE_JSON_ENCODER == "orjson" and orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # Values orjson rejects (e.g. integers over 64 bits) may still be JSON
+            pass
+    return json.dumps(value)
+
+
+def pack(text: str, min_bytes: int | None = None) -> str:
+    """*text* as stored: compressed into a frame if it is longer than
+    *min_bytes* (default ``STATE_COMPRESSION_MIN_BYTES``)."""
+    algorithm = settings.STATE_COMPRESSION
+    if min_bytes is None:
+        min_bytes = settings.STATE_COMPRESSION_MIN_BYTES
+    if algorithm == "none" or len(text) <= min_bytes:
+        return text
+    data = text.encode()
+    if algorithm == "zstd" and zstandard is not None:
+        tag, compressed = ZSTD_TAG, _zstd_compressor().compress(data)
+    else:
+        tag, compressed = ZLIB_TAG, zlib.compress(data, _ZLIB_LEVEL)
+    framed = tag + base64.b64encode(compressed).decode()
+    # Incompressible values are kept as they are
+    return framed if len(framed) < len(text) else text
+
+
+def encode(value) -> str:
+    """Encode *value* for storage."""
+    return pack(dumps(value))
+
+
+def decode(raw: str | bytes):
+    """Decode a stored value written by ``encode`` or as plain JSON."""
+    if isinstance(raw, bytes):
+        raw = raw.decode()
+    if raw.startswith(FRAME_PREFIX):
+        raw = _unpack(raw)
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # json.dumps output orjson refuses, such as NaN
+            pass
+    return json.loads(raw)
+
+
+def _unpack(framed: str) -> str:
+    tag, payload = framed[:len(ZSTD_TAG)], framed[len(ZSTD_TAG):]
+    compressed = base64.b64decode(payload)
+    if tag == ZSTD_TAG:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed execution state")
+        return _zstd_decompressor().decompress(compressed).decode()
+    if tag == ZLIB_TAG:
+        return zlib.decompress(compressed).decode()
+    raise ValueError(f"Unknown state encoding {tag!r}")
@@ -10,6 +10,8 @@ from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+TOPOLOGY_CACHE_TTL = 86400  # shared compiled topologies; rebuilt from the DB at least this often
+
 SUB_COMPONENT_TYPES = {"ai_model", "run_command", "output_parser", "memory_read", "memory_write", "code_execute", "platform_api", "whoami", "spawn_and_await", "workflow_create", "workflow_discover", "scheduler_tools", "system_health", "skill"}
 
 
@@ -189,6 +191,148 @@ def build_topology(workflow, db: Session, trigger_node_id: int | None = None) ->
     return topo
 
 
+def compile_plan(topo: Topology) -> dict:
+    """Flatten a Topology into the JSON-able execution plan workers read.
+
+    Besides the raw nodes and edges the plan carries the lookup tables from
+    ``plan_tables``, so per-hop bookkeeping is a dict lookup.
+    """
+    data = {
+        "workflow_slug": getattr(topo, "workflow_slug", ""),
+        "entry_node_ids": topo.entry_node_ids,
+        "nodes": {
+            nid: {
+                "node_id": n.node_id,
+                "component_type": n.component_type,
+                "db_id": n.db_id,
+                "component_config_id": n.component_config_id,
+                "interrupt_before": n.interrupt_before,
+                "interrupt_after": n.interrupt_after,
+            }
+            for nid, n in topo.nodes.items()
+        },
+        "edges_by_source": {
+            src: [
+                {
+                    "source_node_id": e.source_node_id,
+                    "target_node_id": e.target_node_id,
+                    "edge_type": e.edge_type,
+                    "edge_label": getattr(e, "edge_label", "") or "",
+                    "condition_mapping": e.condition_mapping,
+                    "condition_value": getattr(e, "condition_value", "") or "",
+                    "priority": e.priority,
+                }
+                for e in edges
+            ]
+            for src, edges in topo.edges_by_source.items()
+        },
+        "incoming_count": topo.incoming_count,
+        "loop_bodies": getattr(topo, "loop_bodies", {}),
+        "loop_return_nodes": getattr(topo, "loop_return_nodes", {}),
+        "loop_body_all_nodes": {k: list(v) for k, v in getattr(topo, "loop_body_all_nodes", {}).items()},
+    }
+    data.update(plan_tables(data))
+    return data
+
+
+def plan_tables(data: dict) -> dict:
+    """Precompute the reverse indexes the orchestrator consults on every hop.
+
+    Works on a flattened topology dict, so plans cached before these tables
+    existed can be completed after loading:
+
+    - ``owning_loop``: node -> loop whose body contains it
+    - ``completion_role``: node -> loop whose iteration it completes
+    - ``loop_completion_nodes``: loop -> nodes that complete an iteration
+    - ``direct_successors``: node -> direct targets, for every node with
+      outgoing flow edges (empty when it routes conditionally)
+    - ``conditional_routes``: node -> ``condition_value`` -> target
+    - ``predecessors``: node -> sources of its incoming edges
+    - ``fan_in``: merge node -> number of parents it waits for
+    """
+    loop_bodies = data.get("loop_bodies", {})
+    loop_body_all = data.get("loop_body_all_nodes", {})
+    loop_returns = data.get("loop_return_nodes", {})
+
+    owning_loop: dict[str, str] = {}
+    for loop_id, body_targets in loop_bodies.items():
+        for nid in loop_body_all.get(loop_id, body_targets):
+            owning_loop.setdefault(nid, loop_id)
+
+    completion_role: dict[str, str] = {}
+    loop_completion_nodes: dict[str, list[str]] = {}
+    for loop_id, body_targets in loop_bodies.items():
+        completion = loop_returns.get(loop_id) or body_targets
+        loop_completion_nodes[loop_id] = list(completion)
+        for nid in completion:
+            if owning_loop.get(nid) == loop_id:
+                completion_role[nid] = loop_id
+
+    direct_successors: dict[str, list[str]] = {}
+    conditional_routes: dict[str, dict[str, str]] = {}
+    for src, edges in data.get("edges_by_source", {}).items():
+        flow = [e for e in edges if e.get("edge_label", "") not in ("loop_body", "loop_return")]
+        if not flow:
+            continue
+        conditional = [e for e in flow if e["edge_type"] == "conditional"]
+        if conditional:
+            # Per-edge condition_value wins over the legacy mapping, and the
+            # first edge (by priority) wins among equal values
+            routes = dict(conditional[0].get("condition_mapping") or {})
+            by_value: dict[str, str] = {}
+            for e in conditional:
+                by_value.setdefault(e.get("condition_value") or "", e["target_node_id"])
+            routes.update(by_value)
+            conditional_routes[src] = routes
+            direct_successors[src] = []
+        else:
+            direct_successors[src] = [
+                e["target_node_id"] for e in flow
+                if e["edge_type"] == "direct" and e["target_node_id"] and e["target_node_id"] != "__end__"
+            ]
+
+    predecessors: dict[str, list[str]] = {}
+    for src, edges in data.get("edges_by_source", {}).items():
+        for e in edges:
+            if e.get("target_node_id") and src not in predecessors.setdefault(e["target_node_id"], []):
+                predecessors[e["target_node_id"]].append(src)
+
+    incoming = data.get("incoming_count", {})
+    nodes = data.get("nodes", {})
+    return {
+        "owning_loop": owning_loop,
+        "completion_role": completion_role,
+        "loop_completion_nodes": loop_completion_nodes,
+        "direct_successors": direct_successors,
+        "conditional_routes": conditional_routes,
+        "predecessors": predecessors,
+        "fan_in": {
+            nid: incoming.get(nid, 1) for nid, n in nodes.items() if n.get("component_type") == "merge"
+        },
+        "has_reply_chat": any(n.get("component_type") == "reply_chat" for n in nodes.values()),
+    }
+
+
+def topology_version_key(workflow_id: int) -> str:
+    return f"workflow:{workflow_id}:topology_version"
+
+
+def topology_cache_key(workflow_id: int, trigger_node_id: int | None, version: str) -> str:
+    """Redis key of a compiled topology shared by every execution of that version."""
+    return f"topology:{workflow_id}:{trigger_node_id or 'all'}:v{version}"
+
+
+def invalidate_topology_cache(workflow_id: int) -> None:
+    """Bump the workflow's topology version so new executions recompile it.
+
+    Executions already running keep the version they started with; the old
+    entry simply expires. Raises if Redis cannot be reached.
+    """
+    from services.redis_pool import get_redis
+
+    get_redis().incr(topology_version_key(workflow_id))
+
+
 def _reachable_node_ids(start_node_id: str, all_edges) -> set[str]:
     """BFS from start_node_id following direct, conditional, and loop_body edges."""
     adjacency: dict[str, list[str]] = {}
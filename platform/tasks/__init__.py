@@ -28,13 +28,18 @@ def resume_workflow_job(execution_id: str, user_input: str) -> None:
         execution_id_var.reset(token)
 
 
-def execute_node_job(execution_id: str, node_id: str, retry_count: int = 0) -> None:
+def execute_node_job(
+    execution_id: str,
+    node_id: str,
+    retry_count: int = 0,
+    loop_iteration: int | str | None = None,
+) -> None:
     exec_token = execution_id_var.set(execution_id)
     try:
         node_token = node_id_var.set(node_id)
         try:
             from services.orchestrator import execute_node_job as _run
-            _run(execution_id, node_id, retry_count)
+            _run(execution_id, node_id, retry_count, loop_iteration)
         finally:
             node_id_var.reset(node_token)
     finally:
@@ -65,8 +70,19 @@ def execute_scheduled_job_task(job_id: str, current_repeat: int = 0, current_ret
 
 
 def recover_zombie_executions_job() -> int:
-    from services.execution_recovery import recover_zombie_executions
-    return recover_zombie_executions()
+    from services.execution_recovery import recover_zombie_executions, schedule_watchdog
+    try:
+        return recover_zombie_executions()
+    finally:
+        schedule_watchdog(reschedule=True)
+
+
+def sweep_blob_store_job() -> int:
+    from services.blob_store import schedule_sweep, sweep
+    try:
+        return sweep()
+    finally:
+        schedule_sweep(reschedule=True)
 
 
 def prepare_rootfs_job(tier: int = 2) -> str:
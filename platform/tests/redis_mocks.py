@@ -0,0 +1,40 @@
+"""Helpers for MagicMock-based Redis clients used across orchestrator tests."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+
+class ForwardingPipeline:
+    """Pipeline stand-in that replays queued commands on the mock client.
+
+    Lets tests keep asserting on ``mock_r.incr`` / ``mock_r.decr`` etc. (and
+    configuring their return values) when the code under test batches those
+    commands through ``r.pipeline()``.
+    """
+
+    def __init__(self, client: MagicMock) -> None:
+        self._client = client
+        self._ops: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+        return queue
+
+    def __enter__(self) -> ForwardingPipeline:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._ops.clear()
+
+    def execute(self, *args, **kwargs) -> list:
+        ops, self._ops = self._ops, []
+        return [getattr(self._client, name)(*a, **kw) for name, a, kw in ops]
+
+
+def forward_pipeline(mock_r: MagicMock) -> MagicMock:
+    """Make ``mock_r.pipeline()`` return a ``ForwardingPipeline`` onto *mock_r*."""
+    mock_r.pipeline.side_effect = lambda *args, **kwargs: ForwardingPipeline(mock_r)
+    return mock_r
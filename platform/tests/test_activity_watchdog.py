@@ -199,6 +199,29 @@ class TestMiddlewareIntegration:
         # Should ping on entry and after handler returns
         assert mock_watchdog.ping.call_count == 2
 
+    def test_context_watchdog_is_pinged(self):
+        """A reused agent passes each run's watchdog in the invoke context."""
+        from components._agent_shared import PipelitAgentMiddleware
+
+        built, run = MagicMock(), MagicMock()
+        mw = PipelitAgentMiddleware(
+            tool_metadata={},
+            agent_node_id="agent_1",
+            workflow_slug="test-wf",
+            watchdog=built,
+        )
+
+        mock_request = MagicMock()
+        mock_request.tool_call = {"name": "test_tool"}
+        mock_request.state = {}
+        mock_request.runtime.context = {"watchdog": run}
+
+        with patch("components._agent_shared._publish_tool_status"):
+            mw.wrap_tool_call(mock_request, MagicMock(return_value="result"))
+
+        assert run.ping.call_count == 2
+        built.ping.assert_not_called()
+
     def test_no_watchdog_no_pings(self):
         """When watchdog is None, no errors and no pings."""
         from components._agent_shared import PipelitAgentMiddleware
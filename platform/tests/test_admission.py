@@ -0,0 +1,157 @@
+"""Tests for execution admission control and queue backpressure."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+
+from config import settings
+from services import admission
+
+
+@pytest.fixture
+def redis_client():
+    r = fakeredis.FakeRedis(decode_responses=True)
+    with patch("services.admission.get_redis", return_value=r):
+        yield r
+
+
+@pytest.fixture
+def enqueued():
+    with patch("services.admission._enqueue_start") as mock_enqueue:
+        yield mock_enqueue
+
+
+def _caps(monkeypatch, total=0, per_workflow=0, per_user=0):
+    monkeypatch.setattr(settings, "MAX_CONCURRENT_EXECUTIONS", total)
+    monkeypatch.setattr(settings, "MAX_CONCURRENT_EXECUTIONS_PER_WORKFLOW", per_workflow)
+    monkeypatch.setattr(settings, "MAX_CONCURRENT_EXECUTIONS_PER_USER", per_user)
+
+
+class TestTryAdmit:
+    def test_disabled_admits_without_touching_redis(self, monkeypatch, redis_client):
+        _caps(monkeypatch)
+        assert admission.try_admit("e1", 1, 1) is True
+        assert redis_client.keys("admission:*") == []
+
+    def test_global_cap_queues_overflow(self, monkeypatch, redis_client):
+        _caps(monkeypatch, total=2)
+        assert admission.try_admit("e1", 1, 1) is True
+        assert admission.try_admit("e2", 2, 2) is True
+        assert admission.try_admit("e3", 3, 3) is False
+        assert redis_client.lrange(admission.PENDING_KEY, 0, -1) == ["e3"]
+
+    def test_per_workflow_cap_is_independent_per_workflow(self, monkeypatch, redis_client):
+        _caps(monkeypatch, per_workflow=1)
+        assert admission.try_admit("e1", 1, 1) is True
+        assert admission.try_admit("e2", 1, 2) is False
+        assert admission.try_admit("e3", 2, 1) is True
+
+    def test_per_user_cap(self, monkeypatch, redis_client):
+        _caps(monkeypatch, per_user=1)
+        assert admission.try_admit("e1", 1, 7) is True
+        assert admission.try_admit("e2", 2, 7) is False
+
+    def test_is_idempotent(self, monkeypatch, redis_client):
+        _caps(monkeypatch, total=1)
+        assert admission.try_admit("e1", 1, 1) is True
+        assert admission.try_admit("e1", 1, 1) is True
+        assert admission.try_admit("e2", 1, 1) is False
+        assert admission.try_admit("e2", 1, 1) is False
+        assert redis_client.hgetall(admission.COUNTS_KEY) == {"workflow:1": "1", "user:1": "1"}
+        assert redis_client.lrange(admission.PENDING_KEY, 0, -1) == ["e2"]
+
+
+class TestRelease:
+    def test_admits_oldest_waiting_execution(self, monkeypatch, redis_client, enqueued):
+        _caps(monkeypatch, total=1)
+        admission.try_admit("e1", 1, 1)
+        admission.try_admit("e2", 1, 1)
+        admission.try_admit("e3", 1, 1)
+
+        assert admission.release("e1") == ["e2"]
+        enqueued.assert_called_once_with("e2")
+        # e2 now holds the slot; starting it does not queue it again
+        assert admission.try_admit("e2", 1, 1) is True
+        assert redis_client.lrange(admission.PENDING_KEY, 0, -1) == ["e3"]
+
+    def test_skips_waiting_executions_still_over_their_cap(self, monkeypatch, redis_client, enqueued):
+        _caps(monkeypatch, total=3, per_workflow=1)
+        admission.try_admit("a1", 1, 1)
+        admission.try_admit("b1", 2, 1)
+        admission.try_admit("a2", 1, 1)
+        admission.try_admit("b2", 2, 1)
+
+        assert admission.release("b1") == ["b2"]
+        assert redis_client.lrange(admission.PENDING_KEY, 0, -1) == ["a2"]
+
+    def test_cancelled_waiting_execution_leaves_the_queue(self, monkeypatch, redis_client, enqueued):
+        _caps(monkeypatch, total=1)
+        admission.try_admit("e1", 1, 1)
+        admission.try_admit("e2", 1, 1)
+
+        assert admission.release("e2") == []
+        assert redis_client.llen(admission.PENDING_KEY) == 0
+        assert redis_client.hlen(admission.PENDING_INFO_KEY) == 0
+
+    def test_drops_idle_counters(self, monkeypatch, redis_client, enqueued):
+        _caps(monkeypatch, total=1)
+        admission.try_admit("e1", 1, 1)
+        admission.release("e1")
+        assert redis_client.keys("admission:*") == []
+
+    def test_drains_queue_after_caps_are_disabled(self, monkeypatch, redis_client, enqueued):
+        _caps(monkeypatch, total=1)
+        admission.try_admit("e1", 1, 1)
+        admission.try_admit("e2", 1, 1)
+        _caps(monkeypatch)
+
+        assert admission.release("e1") == ["e2"]
+
+    def test_redis_errors_are_not_raised(self, monkeypatch):
+        _caps(monkeypatch, total=1)
+        with patch("services.admission.get_redis", side_effect=ConnectionError("down")):
+            assert admission.release("e1") == []
+
+
+class TestBackpressure:
+    def test_disabled_by_default(self, monkeypatch):
+        monkeypatch.setattr(settings, "EXECUTION_QUEUE_MAX_DEPTH", 0)
+        with patch("services.admission.queue_depth") as mock_depth:
+            admission.check_backpressure()
+        mock_depth.assert_not_called()
+
+    def test_rejects_at_limit(self, monkeypatch):
+        monkeypatch.setattr(settings, "EXECUTION_QUEUE_MAX_DEPTH", 10)
+        with patch("services.admission.queue_depth", return_value=10):
+            with pytest.raises(admission.BackpressureError):
+                admission.check_backpressure()
+        with patch("services.admission.queue_depth", return_value=9):
+            admission.check_backpressure()
+
+    def test_depth_counts_queued_jobs_and_waiting_executions(self, monkeypatch):
+        from rq import Queue
+
+        binary = fakeredis.FakeRedis()
+        binary.rpush(Queue("llm", connection=binary).key, "job-1", "job-2")
+        binary.rpush(admission.PENDING_KEY, "e1")
+        with patch("services.admission.get_redis_binary", return_value=binary):
+            assert admission.queue_depth() == 3
+
+
+class TestStats:
+    def test_reports_counts_and_limits(self, monkeypatch, redis_client):
+        _caps(monkeypatch, total=1)
+        admission.try_admit("e1", 4, 9)
+        admission.try_admit("e2", 4, 9)
+
+        with patch("services.admission.queue_depth", return_value=1):
+            stats = admission.stats()
+
+        assert stats["admitted"] == 1
+        assert stats["pending"] == 1
+        assert stats["admitted_by_workflow"] == {"4": 1}
+        assert stats["admitted_by_user"] == {"9": 1}
+        assert stats["limits"]["global"] == 1
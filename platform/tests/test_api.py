@@ -162,6 +162,29 @@ class TestWorkflowAPI:
         assert resp.status_code == 204
         assert db.query(Workflow).filter(Workflow.slug == slug).first() is None
 
+    def test_delete_workflow_invalidates_topology_cache(self, auth_client, workflow):
+        from unittest.mock import patch
+
+        with patch("api.workflows.invalidate_topology") as mock_invalidate:
+            resp = auth_client.delete(f"/api/v1/workflows/{workflow.slug}/")
+
+        assert resp.status_code == 204
+        mock_invalidate.assert_called_once_with(workflow.id)
+
+    def test_failed_invalidation_keeps_the_saved_change(self, auth_client, workflow):
+        from unittest.mock import patch
+
+        import redis
+
+        with (
+            patch("api._helpers.invalidate_topology_cache", side_effect=redis.ConnectionError("down")),
+            patch("api.workflows.broadcast"),
+        ):
+            resp = auth_client.patch(f"/api/v1/workflows/{workflow.slug}/", json={"name": "Updated"})
+
+        assert resp.status_code == 200
+        assert resp.json()["name"] == "Updated"
+
     def test_unauthenticated(self, client):
         resp = client.get("/api/v1/workflows/")
         assert resp.status_code in (401, 403)
@@ -423,6 +446,18 @@ class TestEdgeAPI:
         resp = auth_client.delete(f"/api/v1/workflows/{workflow.slug}/edges/{edge.id}/")
         assert resp.status_code == 204
 
+    def test_mutations_invalidate_topology_cache(self, auth_client, workflow, node, edge):
+        from unittest.mock import patch
+
+        with patch("api.nodes.invalidate_topology") as mock_invalidate:
+            auth_client.patch(f"/api/v1/workflows/{workflow.slug}/nodes/{node.node_id}/", json={"is_entry_point": False})
+            auth_client.patch(f"/api/v1/workflows/{workflow.slug}/edges/{edge.id}/", json={"priority": 5})
+            auth_client.delete(f"/api/v1/workflows/{workflow.slug}/edges/{edge.id}/")
+            auth_client.get(f"/api/v1/workflows/{workflow.slug}/edges/")
+
+        assert mock_invalidate.call_count == 3
+        mock_invalidate.assert_called_with(workflow.id)
+
 
 # ── Execution API ─────────────────────────────────────────────────────────────
 
@@ -0,0 +1,218 @@
+"""Tests for offloading large node outputs to the blob store."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import pytest
+
+from config import settings
+from services import blob_store, state_codec
+
+
+@pytest.fixture(autouse=True)
+def blob_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "BLOB_STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "NODE_OUTPUT_OFFLOAD_BYTES", 100)
+    return tmp_path
+
+
+@pytest.fixture
+def redis_client():
+    r = fakeredis.FakeRedis(decode_responses=True)
+    with patch("services.orchestrator._redis", return_value=r):
+        yield r
+
+
+def _big(tag="x"):
+    return {"text": tag * 500}
+
+
+class TestStore:
+    def test_round_trip_and_dedup(self, blob_dir):
+        encoded = json.dumps(_big())
+        ref = blob_store.put(encoded)
+
+        assert blob_store.is_ref(ref)
+        assert ref["size"] == len(encoded)
+        assert blob_store.get(ref) == _big()
+        assert blob_store.put(encoded) == ref
+        assert len(list(blob_dir.rglob("*.json"))) == 1
+
+    def test_only_hex_digests_are_references(self):
+        assert not blob_store.is_ref({"$blob": "../../etc/passwd", "size": 1})
+        assert not blob_store.is_ref({"$blob": "a" * 64, "size": 1, "text": "user data"})
+        assert blob_store.resolve({"$blob": "nope", "size": 1}) == {"$blob": "nope", "size": 1}
+
+    def test_missing_blob_raises(self):
+        with pytest.raises(FileNotFoundError):
+            blob_store.get({"$blob": "0" * 64, "size": 1})
+
+
+class TestSweep:
+    def _age(self, path, days):
+        old = time.time() - days * 86400
+        os.utime(path, (old, old))
+
+    def test_deletes_blobs_past_retention(self, blob_dir, monkeypatch):
+        monkeypatch.setattr(settings, "BLOB_STORE_RETENTION_DAYS", 30)
+        stale = blob_store.put(json.dumps(_big("x")))
+        fresh = blob_store.put(json.dumps(_big("y")))
+        self._age(blob_store._path(stale["$blob"]), 31)
+
+        assert blob_store.sweep() == 1
+        with pytest.raises(FileNotFoundError):
+            blob_store.get(stale)
+        assert blob_store.get(fresh) == _big("y")
+
+    def test_rewriting_restarts_retention(self, blob_dir, monkeypatch):
+        monkeypatch.setattr(settings, "BLOB_STORE_RETENTION_DAYS", 30)
+        encoded = json.dumps(_big())
+        ref = blob_store.put(encoded)
+        self._age(blob_store._path(ref["$blob"]), 31)
+
+        blob_store.put(encoded)
+
+        assert blob_store.sweep() == 0
+        assert blob_store.get(ref) == _big()
+
+    def test_removes_stale_temporary_files(self, blob_dir, monkeypatch):
+        monkeypatch.setattr(settings, "BLOB_STORE_RETENTION_DAYS", 30)
+        tmp = blob_dir / "ab" / ".tmp-crashed"
+        tmp.parent.mkdir()
+        tmp.write_bytes(b"{")
+        self._age(tmp, 1)
+
+        blob_store.sweep()
+
+        assert not tmp.exists()
+
+    def test_zero_keeps_everything(self, blob_dir, monkeypatch):
+        monkeypatch.setattr(settings, "BLOB_STORE_RETENTION_DAYS", 0)
+        ref = blob_store.put(json.dumps(_big()))
+        self._age(blob_store._path(ref["$blob"]), 3650)
+
+        assert blob_store.sweep() == 0
+        assert blob_store.get(ref) == _big()
+
+    def test_schedules_one_chain(self, monkeypatch):
+        from rq import Queue
+
+        monkeypatch.setattr(settings, "BLOB_STORE_RETENTION_DAYS", 30)
+        server = fakeredis.FakeServer()
+        binary = fakeredis.FakeRedis(server=server)
+        with (
+            patch("services.redis_pool.get_redis", return_value=fakeredis.FakeRedis(server=server, decode_responses=True)),
+            patch("services.redis_pool.get_redis_binary", return_value=binary),
+        ):
+            blob_store.schedule_sweep()
+            blob_store.schedule_sweep()
+            assert len(Queue("maintenance", connection=binary).scheduled_job_registry.get_job_ids()) == 1
+            blob_store.schedule_sweep(reschedule=True)
+            assert len(Queue("maintenance", connection=binary).scheduled_job_registry.get_job_ids()) == 2
+
+
+class TestSaveState:
+    def test_large_outputs_are_stored_as_references(self, redis_client):
+        from services.orchestrator import _node_outputs_key, load_state, save_state
+
+        state = {"node_outputs": {"big": _big(), "small": {"n": 1}}}
+        save_state("exec-1", state)
+
+        stored = redis_client.hgetall(_node_outputs_key("exec-1"))
+        assert blob_store.is_ref(json.loads(stored["big"]))
+        assert json.loads(stored["small"]) == {"n": 1}
+        # The caller's state now holds the reference too, behind lazy lookups
+        assert blob_store.is_ref(blob_store.stored(state["node_outputs"], "big"))
+        assert state["node_outputs"]["big"] == _big()
+
+        loaded = load_state("exec-1")
+        assert isinstance(loaded["node_outputs"], blob_store.LazyNodeOutputs)
+        assert loaded["node_outputs"]["big"] == _big()
+        assert loaded["node_outputs"].get("small") == {"n": 1}
+        assert dict(loaded["node_outputs"].items())["big"] == _big()
+
+    def test_unchanged_reference_is_not_rewritten(self, redis_client):
+        from services.orchestrator import load_state, save_state
+
+        save_state("exec-1", {"node_outputs": {"big": _big()}})
+        state = load_state("exec-1")
+        state["node_outputs"]["other"] = {"n": 1}
+
+        assert save_state("exec-1", state) == {"node_outputs": {"other": state_codec.encode({"n": 1})}}
+
+    def test_disabled_at_zero(self, redis_client, monkeypatch):
+        from services.orchestrator import _node_outputs_key, save_state
+
+        monkeypatch.setattr(settings, "NODE_OUTPUT_OFFLOAD_BYTES", 0)
+        save_state("exec-1", {"node_outputs": {"big": _big()}})
+
+        assert json.loads(redis_client.hget(_node_outputs_key("exec-1"), "big")) == _big()
+
+
+class TestReaders:
+    def test_expressions_load_referenced_outputs_only(self):
+        from services.expressions import resolve_expressions
+
+        outputs = {
+            "big": blob_store.put(json.dumps(_big("y"))),
+            "gone": {"$blob": "0" * 64, "size": 1},
+        }
+        assert resolve_expressions("{{ big.text[:3] }}", outputs) == "yyy"
+
+    def test_extract_output_resolves_references(self):
+        from services.orchestrator import _extract_output
+
+        outputs = blob_store.LazyNodeOutputs({"big": blob_store.put(json.dumps(_big()))})
+        assert _extract_output({"node_outputs": outputs}) == {"node_outputs": {"big": _big()}}
+
+    def test_api_log_output(self):
+        from api.executions import _log_output
+
+        ref = blob_store.put(json.dumps(_big()))
+        assert _log_output(ref) == _big()
+        missing = {"$blob": "0" * 64, "size": 1}
+        assert _log_output(missing) == missing
+
+
+class TestExecuteNode:
+    @patch("services.orchestrator._advance")
+    @patch("services.orchestrator._publish_event")
+    @patch("services.orchestrator._load_topology")
+    def test_log_gets_the_reference_and_ws_the_truncated_output(
+        self, mock_load_topo, mock_pub, mock_advance, redis_client,
+    ):
+        from services.orchestrator import _node_outputs_key, execute_node_job
+
+        mock_load_topo.return_value = {
+            "workflow_slug": "wf",
+            "nodes": {"c": {
+                "node_id": "c", "component_type": "code", "db_id": 1, "component_config_id": 1,
+                "interrupt_before": False, "interrupt_after": False,
+            }},
+            "edges_by_source": {}, "incoming_count": {}, "loop_bodies": {},
+            "loop_return_nodes": {}, "loop_body_all_nodes": {},
+        }
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.first.return_value = MagicMock(
+            status="running", execution_id="exec-1", started_at=None,
+        )
+        mock_db.get.return_value = MagicMock(component_config=MagicMock(system_prompt="", extra_config={}))
+
+        with (
+            patch("components.get_component_factory", return_value=lambda node: lambda state: {"text": "z" * 5000}),
+            patch("database.SessionLocal", return_value=mock_db),
+            patch("services.orchestrator._write_log") as mock_log,
+            patch("services.orchestrator.execution_journal.record"),
+        ):
+            execute_node_job("exec-1", "c")
+
+        stored = json.loads(redis_client.hget(_node_outputs_key("exec-1"), "c"))
+        assert blob_store.is_ref(stored)
+        assert mock_log.call_args.kwargs["output"] == stored
+        ws = [c.args[2] for c in mock_pub.call_args_list if c.args[2].get("status") == "success"]
+        assert ws[0]["output"]["text"] == "z" * 2048 + "..."
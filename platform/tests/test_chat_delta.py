@@ -0,0 +1,119 @@
+"""Tests for token-level chat_delta streaming from agent nodes."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from langchain.agents import create_agent
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+
+from components._agent_shared import ChatDeltaPublisher, PipelitAgentMiddleware
+from config import settings
+
+
+def _events(mock_pub, event_type):
+    return [c.args[2] for c in mock_pub.call_args_list if c.args[1] == event_type]
+
+
+def _run_agent(reply, callbacks):
+    model = GenericFakeChatModel(messages=iter([AIMessage(content=reply)]))
+    agent = create_agent(
+        model=model,
+        tools=[],
+        middleware=[PipelitAgentMiddleware(tool_metadata={}, agent_node_id="agent_1", workflow_slug="wf")],
+    )
+    return agent.invoke(
+        {"messages": [HumanMessage(content="hi")], "execution_id": "exec-1"},
+        config={"callbacks": callbacks},
+    )
+
+
+class TestChatDeltaPublisher:
+    @patch("services.orchestrator._publish_event")
+    def test_streams_reply_then_final_message(self, mock_pub, monkeypatch):
+        monkeypatch.setattr(settings, "CHAT_DELTA_INTERVAL_MS", 0)
+
+        _run_agent("Hello there friend", [ChatDeltaPublisher("exec-1", "agent_1", "wf")])
+
+        deltas = _events(mock_pub, "chat_delta")
+        assert len(deltas) > 1
+        assert "".join(d["text"] for d in deltas) == "Hello there friend"
+        assert [d["seq"] for d in deltas] == list(range(len(deltas)))
+        assert {d["node_id"] for d in deltas} == {"agent_1"}
+        assert mock_pub.call_args_list[0].kwargs["workflow_slug"] == "wf"
+        assert _events(mock_pub, "chat_message") == [{"text": "Hello there friend", "node_id": "agent_1"}]
+        # The final message follows every delta
+        types = [c.args[1] for c in mock_pub.call_args_list]
+        assert types[-1] == "chat_message"
+
+    @patch("services.orchestrator._publish_event")
+    def test_tokens_are_batched_within_the_interval(self, mock_pub, monkeypatch):
+        monkeypatch.setattr(settings, "CHAT_DELTA_INTERVAL_MS", 60_000)
+
+        _run_agent("one two three four five", [ChatDeltaPublisher("exec-1", "agent_1", "wf")])
+
+        deltas = _events(mock_pub, "chat_delta")
+        # The first token goes out at once, the rest when the model finishes
+        assert [d["text"] for d in deltas] == ["one", " two three four five"]
+
+    @patch("services.orchestrator._publish_event")
+    def test_ignores_model_calls_outside_the_agent_step(self, mock_pub):
+        handler = ChatDeltaPublisher("exec-1", "agent_1", "wf")
+        summary, subagent = uuid4(), uuid4()
+        handler.on_chat_model_start({}, [], run_id=summary, metadata={"langgraph_node": "summarize"})
+        handler.on_chat_model_start({}, [], run_id=subagent, metadata={
+            "langgraph_node": "model", "langgraph_checkpoint_ns": "tools:1|model:2",
+        })
+        for run_id in (summary, subagent):
+            handler.on_llm_new_token("x", run_id=run_id)
+            handler.on_llm_end(None, run_id=run_id)
+
+        mock_pub.assert_not_called()
+
+    @patch("services.orchestrator._publish_event", side_effect=ConnectionError("down"))
+    def test_publish_errors_are_not_raised(self, mock_pub):
+        handler = ChatDeltaPublisher("exec-1", "agent_1", "wf")
+        run_id = uuid4()
+        handler.on_chat_model_start({}, [], run_id=run_id, metadata={"langgraph_node": "model"})
+        handler.on_llm_new_token("x", run_id=run_id)
+        handler.on_llm_error(RuntimeError("boom"), run_id=run_id)
+
+
+class TestAgentStreamTokens:
+    def _node(self, **extra):
+        concrete = SimpleNamespace(system_prompt="", extra_config=extra, max_tokens=None)
+        config = SimpleNamespace(component_type="agent", extra_config=extra, system_prompt="", concrete=concrete)
+        return SimpleNamespace(
+            node_id="agent_1", workflow_id=1, component_type="agent",
+            component_config=config, workflow=SimpleNamespace(slug="wf"),
+        )
+
+    @pytest.fixture
+    def mock_agent(self):
+        agent = MagicMock()
+        agent.invoke.return_value = {"messages": [AIMessage(content="done")]}
+        with (
+            patch("components.agent._resolve_tools", return_value=([], {})),
+            patch("components.agent.resolve_llm_for_node"),
+            patch("components.agent.create_agent", return_value=agent),
+        ):
+            yield agent
+
+    def test_opted_in_agent_streams(self, mock_agent):
+        from components.agent import agent_factory
+
+        agent_factory(self._node(stream_tokens=True))({"messages": [], "execution_id": "exec-1"})
+
+        callbacks = mock_agent.invoke.call_args.kwargs["config"]["callbacks"]
+        assert [type(cb) for cb in callbacks] == [ChatDeltaPublisher]
+
+    def test_off_by_default(self, mock_agent):
+        from components.agent import agent_factory
+
+        agent_factory(self._node())({"messages": [], "execution_id": "exec-1"})
+
+        assert mock_agent.invoke.call_args.kwargs["config"] is None
@@ -107,12 +107,10 @@ class TestSendChatMessage:
 
     @patch("api.executions.execute_workflow_job")
     @patch("api.executions.Queue")
-    @patch("api.executions.redis")
+    @patch("api.executions.get_redis_binary")
     def test_happy_path(
         self, mock_redis, mock_queue_cls, mock_job, auth_client, chat_workflow, user_profile, db
     ):
-        mock_conn = MagicMock()
-        mock_redis.from_url.return_value = mock_conn
         mock_queue = MagicMock()
         mock_queue_cls.return_value = mock_queue
 
@@ -131,13 +129,11 @@ class TestSendChatMessage:
 
     @patch("api.executions.execute_workflow_job")
     @patch("api.executions.Queue")
-    @patch("api.executions.redis")
+    @patch("api.executions.get_redis_binary")
     def test_thread_id_format(
         self, mock_redis, mock_queue_cls, mock_job, auth_client, chat_workflow, user_profile, db
     ):
         """thread_id must be '{profile.id}:{workflow.id}' — not a random UUID."""
-        mock_conn = MagicMock()
-        mock_redis.from_url.return_value = mock_conn
         mock_queue_cls.return_value = MagicMock()
 
         resp = auth_client.post(
@@ -174,12 +170,27 @@ class TestSendChatMessage:
         )
         assert resp.status_code == 401
 
-    @patch("api.executions.redis")
+    @patch("services.admission.queue_depth", return_value=10)
+    def test_full_queues_return_503(self, mock_depth, auth_client, chat_workflow, db, monkeypatch):
+        from config import settings
+        from models.execution import WorkflowExecution
+
+        monkeypatch.setattr(settings, "EXECUTION_QUEUE_MAX_DEPTH", 10)
+        resp = auth_client.post(
+            f"/api/v1/workflows/{chat_workflow.slug}/chat/",
+            json={"text": "Hello"},
+        )
+
+        assert resp.status_code == 503
+        assert resp.headers["Retry-After"] == "5"
+        assert db.query(WorkflowExecution).count() == 0
+
+    @patch("api.executions.get_redis_binary")
     def test_enqueue_failure_rolls_back_execution(
         self, mock_redis, auth_client, chat_workflow, db
     ):
         """If RQ enqueue fails, the execution record is deleted and 503 returned."""
-        mock_redis.from_url.side_effect = ConnectionError("Redis down")
+        mock_redis.side_effect = ConnectionError("Redis down")
 
         resp = auth_client.post(
             f"/api/v1/workflows/{chat_workflow.slug}/chat/",
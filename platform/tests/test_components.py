@@ -26,6 +26,57 @@ def _make_node(component_type="test", extra_config=None, system_prompt=None):
     )
 
 
+# ── Component instance cache ──────────────────────────────────────────────────
+
+class TestBuildComponent:
+    @pytest.fixture
+    def reusable(self):
+        import components
+
+        factory = MagicMock(side_effect=lambda node: MagicMock(name=f"fn-{node.id}"))
+        components.clear_component_cache()
+        with patch.dict(components.COMPONENT_REGISTRY, {"test_reusable": factory, "test_plain": factory}), \
+             patch.object(components, "REUSABLE_COMPONENTS", {"test_reusable"}):
+            yield factory
+        components.clear_component_cache()
+
+    def _node(self, component_type, node_id=1):
+        node = _make_node(component_type)
+        node.id = node_id
+        return node
+
+    def test_reusable_instance_cached_per_key(self, reusable):
+        from components import build_component
+
+        first = build_component(self._node("test_reusable"), ("t1", 1))
+        assert build_component(self._node("test_reusable"), ("t1", 1)) is first
+        assert build_component(self._node("test_reusable"), ("t2", 1)) is not first
+        assert build_component(self._node("test_reusable", node_id=2), ("t1", 1)) is not first
+        assert reusable.call_count == 3
+
+    def test_non_reusable_or_unkeyed_always_built(self, reusable):
+        from components import build_component
+
+        build_component(self._node("test_plain"), ("t1", 1))
+        build_component(self._node("test_plain"), ("t1", 1))
+        build_component(self._node("test_reusable"))
+        build_component(self._node("test_reusable"))
+        assert reusable.call_count == 4
+
+    def test_expired_instance_rebuilt(self, reusable):
+        import components
+        from components import build_component
+
+        first = build_component(self._node("test_reusable"), "k")
+        with patch("components.time.monotonic", return_value=components.time.monotonic() + components.COMPONENT_CACHE_MAX_AGE + 1):
+            assert build_component(self._node("test_reusable"), "k") is not first
+
+    def test_agent_is_reusable(self):
+        from components import REUSABLE_COMPONENTS
+
+        assert "agent" in REUSABLE_COMPONENTS
+
+
 # ── Trigger pass-through ──────────────────────────────────────────────────────
 
 class TestTrigger:
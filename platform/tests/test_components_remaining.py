@@ -227,6 +227,15 @@ class TestLoopComponent:
         assert result["_loop"]["items"] == [1, 2, 3]
         assert result["items"] == [1, 2, 3]
 
+    def test_loop_max_concurrency(self):
+        fn = self._factory(source_node="prev", field="items", max_concurrency=4)
+        result = fn({"node_outputs": {"prev": {"items": [1, 2]}}})
+        assert result["_loop"]["max_concurrency"] == 4
+        # Defaults to sequential iteration
+        fn = self._factory(source_node="prev", field="items")
+        result = fn({"node_outputs": {"prev": {"items": [1, 2]}}})
+        assert result["_loop"]["max_concurrency"] == 1
+
     def test_loop_empty_items(self):
         fn = self._factory(source_node="prev", field="items")
         result = fn({"node_outputs": {"prev": {"items": []}}})
@@ -728,6 +737,79 @@ class TestAgentComponent:
         call_kwargs = mock_create_agent.call_args
         assert call_kwargs.kwargs.get("system_prompt") is not None
 
+    @patch("components.agent._resolve_tools", return_value=([], {}))
+    @patch("components.agent.create_agent")
+    @patch("components.agent.resolve_llm_for_node")
+    def test_agent_uses_per_run_system_prompt(self, mock_resolve, mock_create_agent, mock_tools):
+        from components.agent import agent_factory
+
+        mock_agent = MagicMock()
+        ai_msg = MagicMock(content="Response", type="ai", additional_kwargs={})
+        mock_agent.invoke.return_value = {"messages": [ai_msg]}
+        mock_create_agent.return_value = mock_agent
+
+        node = _make_node("agent", extra_config={"conversation_memory": False},
+                          system_prompt="Built for Alice")
+        fn = agent_factory(node)
+        fn({"messages": [], "user_context": {}, "_system_prompt": "Hello Bob"})
+
+        call = mock_agent.invoke.call_args
+        assert call.kwargs["context"]["system_prompt"] == "Hello Bob"
+        first_watchdog = call.kwargs["context"]["watchdog"]
+        sent = call.args[0]["messages"]
+        assert "Hello Bob" in sent[0].content
+        assert "Alice" not in sent[0].content
+
+        # Without a per-run prompt the built one is used and none is passed
+        fn({"messages": [], "user_context": {}})
+        call = mock_agent.invoke.call_args
+        assert "system_prompt" not in call.kwargs["context"]
+        assert "Built for Alice" in call.args[0]["messages"][0].content
+        mock_create_agent.assert_called_once()
+        # Each run gets its own watchdog
+        assert call.kwargs["context"]["watchdog"] is not first_watchdog
+
+    def test_middleware_applies_context_system_prompt(self):
+        from langchain_core.messages import SystemMessage
+
+        from components._agent_shared import PipelitAgentMiddleware
+
+        middleware = PipelitAgentMiddleware(tool_metadata={}, agent_node_id="agent_1", workflow_slug="")
+        request = MagicMock()
+        request.runtime.context = {"system_prompt": "Run prompt"}
+        overridden = MagicMock()
+        request.override.return_value = overridden
+        handler = MagicMock(return_value=MagicMock(result=[]))
+
+        middleware.wrap_model_call(request, handler)
+
+        system_message = request.override.call_args.kwargs["system_message"]
+        assert isinstance(system_message, SystemMessage)
+        assert system_message.content == "Run prompt"
+        handler.assert_called_once_with(overridden)
+
+    def test_middleware_dedups_chat_messages_per_run(self):
+        from components._agent_shared import PipelitAgentMiddleware
+
+        middleware = PipelitAgentMiddleware(tool_metadata={}, agent_node_id="agent_1", workflow_slug="wf")
+        reply = MagicMock(content="Same reply")
+        handler = MagicMock(return_value=MagicMock(result=[reply]))
+
+        def run_request():
+            request = MagicMock()
+            request.runtime.context = {}
+            request.state = {"execution_id": "exec-1"}
+            return request
+
+        first, second = run_request(), run_request()
+        with patch("services.orchestrator._publish_event") as mock_publish:
+            middleware.wrap_model_call(first, handler)
+            middleware.wrap_model_call(first, handler)
+            middleware.wrap_model_call(second, handler)
+
+        # Deduplicated within a run; a concurrent run keeps its own marker
+        assert mock_publish.call_count == 2
+
 
 # ── AI Model ──────────────────────────────────────────────────────────────────
 
@@ -464,10 +464,11 @@ class TestOrchestratorHelpers:
         from services.orchestrator import _cleanup_redis
 
         mock_r = MagicMock()
-        mock_r.keys.return_value = ["execution:e1:state", "execution:e1:topo"]
+        mock_r.smembers.return_value = set()
         with patch("services.orchestrator._redis", return_value=mock_r):
             _cleanup_redis("e1")
-        mock_r.delete.assert_called()
+        mock_r.unlink.assert_called()
+        mock_r.keys.assert_not_called()
 
     def test_build_initial_state(self):
         from services.orchestrator import _build_initial_state
@@ -523,7 +524,7 @@ class TestOrchestratorHelpers:
         # Empty state
         assert _extract_output({}) is None
 
-    def test_write_log(self, db, user_profile, workflow):
+    def test_write_log(self, db, user_profile, workflow, sync_execution_logs):
         from models.execution import ExecutionLog, WorkflowExecution
         from services.orchestrator import _write_log
 
@@ -14,7 +14,7 @@ class TestDispatchEvent:
         assert result is None
 
     def test_creates_execution_on_match(self, db, user_profile, telegram_trigger):
-        with patch("handlers.redis") as mock_redis, \
+        with patch("handlers.get_redis_binary"), \
              patch("handlers.Queue") as mock_queue_cls:
             mock_queue = mock_queue_cls.return_value
             mock_queue.enqueue.return_value = None
@@ -33,7 +33,7 @@ class TestDispatchEvent:
         assert result.user_profile_id == user_profile.id
 
     def test_manual_dispatch(self, db, user_profile, manual_trigger):
-        with patch("handlers.redis") as mock_redis, \
+        with patch("handlers.get_redis_binary"), \
              patch("handlers.Queue") as mock_queue_cls:
             mock_queue = mock_queue_cls.return_value
             mock_queue.enqueue.return_value = None
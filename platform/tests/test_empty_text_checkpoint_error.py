@@ -111,7 +111,7 @@ class TestEmptyTextCheckpointError:
         self, mock_load_topo, mock_load_state, mock_save_state,
         mock_redis_fn, mock_pub, mock_queue_fn, mock_clear_cp,
     ):
-        """Retries are skipped — enqueue_in is NOT called even at retry_count=0."""
+        """Retries are skipped — no delayed job is scheduled even at retry_count=0."""
         from services.orchestrator import execute_node_job
 
         mock_r = _mock_redis()
@@ -132,7 +132,7 @@ class TestEmptyTextCheckpointError:
                     execute_node_job("exec-1", "agent_1", retry_count=0)
 
         # Retry queue should NOT be called
-        mock_q.enqueue_in.assert_not_called()
+        mock_q.create_job.assert_not_called()
         # Execution should be marked as failed
         assert mock_execution.status == "failed"
 
@@ -212,7 +212,7 @@ class TestEmptyTextCheckpointError:
                     execute_node_job("exec-1", "agent_1", retry_count=0)
 
         # Normal error should still retry
-        mock_q.enqueue_in.assert_called_once()
+        mock_q.create_job.assert_called_once()
         # _clear_stale_checkpoints should NOT be called in the error detection block
         # (it may be called later in the permanent failure path, but not here)
         mock_clear_cp.assert_not_called()
@@ -0,0 +1,355 @@
+"""Tests for the completed-node journal and resuming executions from it."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import pytest
+
+from config import settings
+from models.execution import ExecutionJournalEntry, WorkflowExecution
+from services import execution_journal, state_codec
+
+
+def _edge(target, edge_type="direct", condition_value=""):
+    return {
+        "target_node_id": target,
+        "edge_type": edge_type,
+        "edge_label": "",
+        "condition_value": condition_value,
+    }
+
+
+def _topology():
+    """a -> (b, c); b -> m; c -> sw; sw routes "go" to d and "stop" to the end; d -> m."""
+    return {
+        "workflow_slug": "wf",
+        "entry_node_ids": ["a"],
+        "nodes": {
+            nid: {
+                "node_id": nid,
+                "component_type": "merge" if nid == "m" else "code",
+                "db_id": i,
+                "component_config_id": i,
+                "interrupt_before": False,
+                "interrupt_after": False,
+            }
+            for i, nid in enumerate(("a", "b", "c", "sw", "d", "m"), start=1)
+        },
+        "edges_by_source": {
+            "a": [_edge("b"), _edge("c")],
+            "b": [_edge("m")],
+            "c": [_edge("sw")],
+            "sw": [
+                _edge("d", "conditional", "go"),
+                _edge("__end__", "conditional", "stop"),
+            ],
+            "d": [_edge("m")],
+        },
+        "incoming_count": {"m": 2},
+        "loop_bodies": {},
+        "loop_return_nodes": {},
+        "loop_body_all_nodes": {},
+    }
+
+
+def _entries(*nodes):
+    return [
+        SimpleNamespace(node_id=n[0], route=n[1]) if isinstance(n, tuple)
+        else SimpleNamespace(node_id=n, route=None)
+        for n in nodes
+    ]
+
+
+@pytest.fixture
+def redis_client():
+    r = fakeredis.FakeRedis(decode_responses=True)
+    with patch("services.orchestrator._redis", return_value=r):
+        yield r
+
+
+@pytest.fixture
+def execution(db, workflow, user_profile):
+    ex = WorkflowExecution(
+        workflow_id=workflow.id,
+        user_profile_id=user_profile.id,
+        thread_id="test-thread",
+        status="running",
+        trigger_payload={"text": "hi"},
+    )
+    db.add(ex)
+    db.commit()
+    db.refresh(ex)
+    return ex
+
+
+class TestJournalRows:
+    def test_entries_in_write_order(self, db, execution):
+        execution_journal.record(db, execution.execution_id, "a", {"node_outputs": {"a": "1"}})
+        execution_journal.record(db, execution.execution_id, "sw", {}, route="go")
+
+        rows = execution_journal.entries(db, execution.execution_id)
+        assert [(row.node_id, row.route) for row in rows] == [("a", None), ("sw", "go")]
+        assert rows[0].state_delta == {"node_outputs": {"a": "1"}}
+
+    def test_discard(self, db, execution):
+        execution_journal.record(db, execution.execution_id, "a", {})
+        with patch("database.SessionLocal", return_value=MagicMock(wraps=db, close=MagicMock())):
+            execution_journal.discard(execution.execution_id)
+        assert db.query(ExecutionJournalEntry).count() == 0
+
+
+class TestJournalBatching:
+    def test_entries_wait_for_flush(self, db, execution):
+        eid = execution.execution_id
+        with execution_journal.batched():
+            execution_journal.record(db, eid, "a", {})
+            execution_journal.record(db, eid, "sw", {}, route="go")
+            assert execution_journal.entries(db, eid) == []
+
+            execution_journal.flush()
+
+            rows = execution_journal.entries(db, eid)
+            assert [(row.node_id, row.route) for row in rows] == [("a", None), ("sw", "go")]
+
+    def test_rest_written_when_the_block_ends(self, db, execution):
+        with execution_journal.batched():
+            execution_journal.record(db, execution.execution_id, "a", {})
+
+        assert [row.node_id for row in execution_journal.entries(db, execution.execution_id)] == ["a"]
+
+    def test_discard_drops_buffered_entries(self, db, execution):
+        with (
+            execution_journal.batched(),
+            patch("database.SessionLocal", return_value=MagicMock(wraps=db, close=MagicMock())),
+        ):
+            execution_journal.record(db, execution.execution_id, "a", {})
+            execution_journal.discard(execution.execution_id)
+
+        assert db.query(ExecutionJournalEntry).count() == 0
+
+    @patch("services.orchestrator._queue")
+    def test_flushed_before_a_successor_is_enqueued(self, mock_queue_fn, db, execution):
+        from services.orchestrator import _enqueue_node_job
+
+        eid = execution.execution_id
+        journaled = []
+
+        def enqueue(*args, **kwargs):
+            journaled.extend(row.node_id for row in execution_journal.entries(db, eid))
+            return MagicMock(id="job-1")
+
+        mock_queue_fn.return_value.enqueue.side_effect = enqueue
+        with execution_journal.batched():
+            execution_journal.record(db, eid, "a", {})
+            _enqueue_node_job(eid, "b", topo_data={"nodes": {"b": {"component_type": "code"}}})
+
+        assert journaled == ["a"]
+
+
+class TestJournalPayloads:
+    @pytest.fixture(autouse=True)
+    def threshold(self, monkeypatch):
+        monkeypatch.setattr(settings, "JOURNAL_COMPRESSION_MIN_BYTES", 100)
+        monkeypatch.setattr(settings, "STATE_COMPRESSION", "zlib")
+
+    def test_large_fields_are_compressed_inline(self, db, execution):
+        big = state_codec.encode({"text": "x" * 500})
+        reply = state_codec.encode({"type": "ai", "data": {"content": "y" * 500, "type": "ai"}})
+        delta = {
+            "state": {"route": state_codec.encode("go")},
+            "node_outputs": {"a": big},
+            "messages_appended": [reply],
+            "removed": ["loop"],
+        }
+        execution_journal.record(db, execution.execution_id, "a", delta)
+
+        row = execution_journal.entries(db, execution.execution_id)[0]
+        assert row.state_delta["state"] == delta["state"]
+        assert row.state_delta["removed"] == ["loop"]
+        assert row.state_delta["node_outputs"]["a"].startswith(state_codec.ZLIB_TAG)
+        assert row.state_delta["messages_appended"][0].startswith(state_codec.ZLIB_TAG)
+
+        restored = execution_journal.state_delta(row)
+        assert state_codec.decode(restored["node_outputs"]["a"]) == {"text": "x" * 500}
+        assert state_codec.decode(restored["messages_appended"][0])["data"]["content"] == "y" * 500
+
+    def test_compressed_fields_are_kept_as_they_are(self, db, execution):
+        framed = state_codec.pack(json.dumps({"text": "x" * 500}), min_bytes=0)
+        execution_journal.record(db, execution.execution_id, "a", {"node_outputs": {"a": framed}})
+
+        assert execution_journal.entries(db, execution.execution_id)[0].state_delta == {"node_outputs": {"a": framed}}
+
+
+class TestSaveStateDelta:
+    def test_returns_only_changed_fields(self, redis_client):
+        from services.orchestrator import load_state, save_state
+
+        save_state("exec-1", {"route": "", "node_outputs": {"a": {"x": 1}}})
+        state = load_state("exec-1")
+        state["route"] = "go"
+        state["node_outputs"]["b"] = {"y": 2}
+
+        delta = save_state("exec-1", state)
+
+        assert delta == {"state": {"route": state_codec.encode("go")}, "node_outputs": {"b": state_codec.encode({"y": 2})}}
+
+    def test_reports_removed_keys(self, redis_client):
+        from services.orchestrator import load_state, save_state
+
+        save_state("exec-1", {"loop": {"index": 0}, "node_outputs": {}})
+        state = load_state("exec-1")
+        state.pop("loop")
+
+        assert save_state("exec-1", state) == {"removed": ["loop"]}
+
+
+class TestJournalFrontier:
+    def test_nothing_journaled_restarts_entries(self):
+        from services.orchestrator import _journal_frontier
+
+        assert _journal_frontier(_topology(), []) == (["a"], {})
+
+    def test_frontier_follows_direct_edges(self):
+        from services.orchestrator import _journal_frontier
+
+        frontier, fanin = _journal_frontier(_topology(), _entries("a", "c"))
+        assert frontier == ["b", "sw"]
+        assert fanin == {}
+
+    def test_conditional_route_and_partial_fan_in(self):
+        from services.orchestrator import _journal_frontier
+
+        frontier, fanin = _journal_frontier(_topology(), _entries("a", "b", "c", ("sw", "go")))
+        assert frontier == ["d"]
+        assert fanin == {"m": 1}
+
+    def test_route_to_end_stops_the_branch(self):
+        from services.orchestrator import _journal_frontier
+
+        frontier, fanin = _journal_frontier(_topology(), _entries("a", "b", "c", ("sw", "stop")))
+        assert frontier == []
+        assert fanin == {"m": 1}
+
+    def test_merge_runs_once_all_parents_are_journaled(self):
+        from services.orchestrator import _journal_frontier
+
+        entries = _entries("a", "b", "c", ("sw", "go"), "d")
+        frontier, fanin = _journal_frontier(_topology(), entries)
+        assert frontier == ["m"]
+        assert fanin == {"m": 2}
+
+
+class TestResumeFromJournal:
+    @pytest.fixture
+    def orchestrator(self):
+        with (
+            patch("services.orchestrator._compiled_topology", side_effect=lambda *a: ("topo-key", _topology())),
+            patch("services.orchestrator._save_topology"),
+            patch("services.orchestrator._publish_event"),
+            patch("services.orchestrator._enqueue_node_job") as mock_enqueue,
+            patch("services.orchestrator._finalize") as mock_finalize,
+        ):
+            yield SimpleNamespace(enqueue=mock_enqueue, finalize=mock_finalize)
+
+    def test_replays_state_and_enqueues_frontier(self, db, execution, redis_client, orchestrator, monkeypatch):
+        from services.orchestrator import (
+            _completed_key, _fanin_key, _inflight_key, load_state, resume_from_journal,
+        )
+
+        # The long reply is journaled compressed
+        monkeypatch.setattr(settings, "STATE_COMPRESSION", "zlib")
+        eid = execution.execution_id
+        for node_id in ("a", "b", "c"):
+            execution_journal.record(db, eid, node_id, {"node_outputs": {node_id: json.dumps({"n": node_id})}})
+        execution_journal.record(db, eid, "sw", {"state": {"route": json.dumps("go")}}, route="go")
+        reply = state_codec.encode({"type": "ai", "data": {"content": "hello " * 300, "type": "ai", "id": "m2"}})
+        execution_journal.record(db, eid, "b", {"messages_appended": [reply]})
+        # Leftovers of the crashed run are dropped
+        redis_client.set(_inflight_key(eid), 7)
+
+        frontier = resume_from_journal(execution, db)
+
+        assert frontier == ["d"]
+        orchestrator.enqueue.assert_called_once()
+        assert orchestrator.enqueue.call_args[0] == (eid, "d")
+        orchestrator.finalize.assert_not_called()
+
+        state = load_state(eid)
+        assert state["route"] == "go"
+        assert state["node_outputs"]["c"] == {"n": "c"}
+        assert state["trigger"]["text"] == "hi"
+        assert [m.content for m in state["messages"]] == ["hi", "hello " * 300]
+        assert redis_client.smembers(_completed_key(eid)) == {"a", "b", "c", "sw"}
+        assert redis_client.get(_fanin_key(eid, "m")) == "1"
+        assert redis_client.get(_inflight_key(eid)) == "1"
+
+    def test_fully_journaled_execution_is_finalized(self, db, execution, redis_client, orchestrator):
+        from services.orchestrator import resume_from_journal
+
+        eid = execution.execution_id
+        for node_id in ("a", "b", "c"):
+            execution_journal.record(db, eid, node_id, {})
+        execution_journal.record(db, eid, "sw", {}, route="stop")
+
+        assert resume_from_journal(execution, db) == []
+        orchestrator.enqueue.assert_not_called()
+        orchestrator.finalize.assert_called_once_with(eid, db)
+
+    def test_open_episode_survives_the_resume(self, db, execution, redis_client, orchestrator):
+        from models.memory import MemoryEpisode
+        from services.orchestrator import _episode_key, resume_from_journal
+
+        eid = execution.execution_id
+        episode = MemoryEpisode(agent_id="workflow:1", execution_id=eid)
+        db.add(episode)
+        db.commit()
+        redis_client.set(_episode_key(eid), episode.id)
+        execution_journal.record(db, eid, "a", {})
+
+        resume_from_journal(execution, db)
+
+        assert redis_client.get(_episode_key(eid)) == episode.id
+
+
+class TestNodeJournaling:
+    @patch("services.orchestrator._advance")
+    @patch("services.orchestrator._publish_event")
+    @patch("services.orchestrator._redis")
+    @patch("services.orchestrator.load_state")
+    @patch("services.orchestrator._load_topology")
+    def test_completed_node_is_journaled_before_advancing(
+        self, mock_load_topo, mock_load_state, mock_redis_fn, mock_pub, mock_advance,
+    ):
+        from services.orchestrator import execute_node_job
+        from tests.redis_mocks import forward_pipeline
+
+        mock_redis_fn.return_value = forward_pipeline(MagicMock())
+        topo = _topology()
+        mock_load_topo.return_value = topo
+        mock_load_state.return_value = {"messages": [], "node_outputs": {}, "trigger": {}, "route": "go"}
+
+        mock_db = MagicMock()
+        mock_execution = MagicMock(status="running", execution_id="exec-1", started_at=None)
+        mock_db.query.return_value.filter.return_value.first.return_value = mock_execution
+        mock_db.get.return_value = MagicMock(component_config=MagicMock(system_prompt="", extra_config={}))
+
+        order = []
+        mock_advance.side_effect = lambda *a, **k: order.append("advance")
+        delta = {"node_outputs": {"sw": '{"route": "go"}'}}
+        mock_fn = MagicMock(return_value={"route": "go"})
+        with (
+            patch("components.get_component_factory", return_value=lambda node: mock_fn),
+            patch("database.SessionLocal", return_value=mock_db),
+            patch("services.orchestrator._write_log"),
+            patch("services.orchestrator.save_state", return_value=delta),
+            patch("services.orchestrator.execution_journal.record",
+                  side_effect=lambda *a, **k: order.append("record")) as mock_record,
+        ):
+            execute_node_job("exec-1", "sw")
+
+        mock_record.assert_called_once_with(mock_db, "exec-1", "sw", delta, route="go")
+        assert order == ["record", "advance"]
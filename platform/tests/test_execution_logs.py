@@ -0,0 +1,76 @@
+"""Tests for the buffered ExecutionLog writer."""
+
+from __future__ import annotations
+
+import uuid
+
+import fakeredis
+import pytest
+
+from models.execution import ExecutionLog, WorkflowExecution
+from services.execution_logs import ExecutionLogBuffer, pending_key
+
+
+@pytest.fixture
+def fake_redis():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def execution_id(db, user_profile, workflow):
+    execution = WorkflowExecution(
+        workflow_id=workflow.id, user_profile_id=user_profile.id,
+        thread_id=uuid.uuid4().hex, trigger_payload={},
+    )
+    db.add(execution)
+    db.commit()
+    return str(execution.execution_id)
+
+
+def _row(execution_id: str, node_id: str) -> dict:
+    return {"execution_id": execution_id, "node_id": node_id, "status": "completed", "output": {"n": node_id}}
+
+
+class TestExecutionLogBuffer:
+    def test_rows_are_buffered_until_flush(self, db, fake_redis, execution_id):
+        buffer = ExecutionLogBuffer(lambda: fake_redis, interval=60, batch_size=100)
+        buffer.add(db, _row(execution_id, "a"))
+        buffer.add(db, _row(execution_id, "b"))
+
+        assert db.query(ExecutionLog).count() == 0
+        assert fake_redis.get(pending_key(execution_id)) == "2"
+
+        buffer.flush()
+        logs = db.query(ExecutionLog).order_by(ExecutionLog.id).all()
+        assert [(log.node_id, log.output) for log in logs] == [("a", {"n": "a"}), ("b", {"n": "b"})]
+        assert all(log.timestamp is not None for log in logs)
+        assert fake_redis.get(pending_key(execution_id)) == "0"
+
+    def test_full_batch_is_written_inline(self, db, fake_redis, execution_id):
+        buffer = ExecutionLogBuffer(lambda: fake_redis, interval=60, batch_size=3)
+        for node_id in ("a", "b", "c"):
+            buffer.add(db, _row(execution_id, node_id))
+
+        assert db.query(ExecutionLog).count() == 3
+
+    def test_zero_interval_writes_through_session(self, db, fake_redis, execution_id):
+        buffer = ExecutionLogBuffer(lambda: fake_redis, interval=0, batch_size=100)
+        buffer.add(db, _row(execution_id, "a"))
+
+        assert db.query(ExecutionLog).count() == 1
+        assert fake_redis.get(pending_key(execution_id)) is None
+
+    def test_wait_for_execution_sees_other_workers_rows(self, db, fake_redis, execution_id):
+        other_worker = ExecutionLogBuffer(lambda: fake_redis, interval=0.02, batch_size=100)
+        finalizer = ExecutionLogBuffer(lambda: fake_redis, interval=60, batch_size=100)
+        other_worker.add(db, _row(execution_id, "a"))
+        finalizer.add(db, _row(execution_id, "b"))
+
+        assert finalizer.wait_for_execution(execution_id, timeout=5)
+        assert db.query(ExecutionLog).count() == 2
+
+    def test_wait_for_execution_gives_up_after_timeout(self, fake_redis):
+        buffer = ExecutionLogBuffer(lambda: fake_redis, interval=60, batch_size=100)
+        fake_redis.set(pending_key("exec-1"), 1)
+
+        assert buffer.wait_for_execution("exec-1", timeout=0.05) is False
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import sys
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import MagicMock, patch, call
@@ -16,6 +17,8 @@ if _platform_dir not in sys.path:
 from models.execution import WorkflowExecution
 from services.execution_recovery import (
     recover_zombie_executions,
+    schedule_watchdog,
+    _is_alive,
     _recover_one,
     _publish_zombie_event,
     _cleanup_redis,
@@ -31,7 +34,7 @@ def _utcnow_naive() -> datetime:
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
-def _make_execution(db, workflow, user_profile, *, status="running", started_at=None):
+def _make_execution(db, workflow, user_profile, *, status="running", started_at=None, **kwargs):
     """Create a WorkflowExecution with the given status and started_at."""
     ex = WorkflowExecution(
         workflow_id=workflow.id,
@@ -39,6 +42,7 @@ def _make_execution(db, workflow, user_profile, *, status="running", started_at=
         thread_id="test-thread",
         status=status,
         started_at=started_at,
+        **kwargs,
     )
     db.add(ex)
     db.commit()
@@ -58,10 +62,21 @@ def _patch_session(db):
     return patch("database.SessionLocal", return_value=_nonclosing_session(db))
 
 
+@pytest.fixture
+def silent():
+    """No sign of life for any execution, and no journal to resume from."""
+    with (
+        patch("services.execution_recovery._is_alive", return_value=False),
+        patch("services.orchestrator.resume_from_journal", side_effect=RuntimeError("no journal")),
+    ):
+        yield
+
+
 # ---------------------------------------------------------------------------
 # Core recovery tests
 # ---------------------------------------------------------------------------
 
+@pytest.mark.usefixtures("silent")
 class TestRecoverZombieExecutions:
     """Tests for the top-level recover_zombie_executions() function."""
 
@@ -199,6 +214,7 @@ class TestRecoverZombieExecutions:
 # _recover_one tests
 # ---------------------------------------------------------------------------
 
+@pytest.mark.usefixtures("silent")
 class TestRecoverOne:
     """Tests for the per-execution recovery helper."""
 
@@ -245,6 +261,173 @@ class TestRecoverOne:
         mock_redis.assert_called_once_with(ex.execution_id)
 
 
+class TestResumeFromJournal:
+    """Zombies with resume attempts left are resumed instead of failed."""
+
+    @patch("services.execution_recovery._cleanup_redis")
+    @patch("services.execution_recovery._publish_zombie_event")
+    @patch("services.orchestrator.resume_from_journal")
+    def test_resumes_and_counts_attempt(self, mock_resume, mock_pub, mock_redis, db, workflow, user_profile):
+        ex = _make_execution(
+            db, workflow, user_profile,
+            status="running",
+            started_at=_utcnow_naive() - timedelta(seconds=2000),
+        )
+        _recover_one(ex, db)
+
+        mock_resume.assert_called_once_with(ex, db)
+        db.refresh(ex)
+        assert ex.status == "running"
+        assert ex.retry_count == 1
+        mock_pub.assert_not_called()
+        mock_redis.assert_not_called()
+
+    @patch("services.execution_recovery._cleanup_redis")
+    @patch("services.execution_recovery._publish_zombie_event")
+    @patch("services.orchestrator.resume_from_journal")
+    def test_fails_once_attempts_are_used_up(self, mock_resume, mock_pub, mock_redis, db, workflow, user_profile):
+        ex = _make_execution(
+            db, workflow, user_profile,
+            status="running",
+            started_at=_utcnow_naive() - timedelta(seconds=2000),
+            retry_count=3,
+            max_retries=3,
+        )
+        _recover_one(ex, db)
+
+        mock_resume.assert_not_called()
+        db.refresh(ex)
+        assert ex.status == "failed"
+        mock_redis.assert_called_once_with(ex.execution_id)
+
+    @patch("services.execution_recovery._cleanup_redis")
+    @patch("services.execution_recovery._publish_zombie_event")
+    def test_alive_executions_are_skipped(self, mock_pub, mock_redis, db, workflow, user_profile):
+        ex = _make_execution(
+            db, workflow, user_profile,
+            status="running",
+            started_at=_utcnow_naive() - timedelta(seconds=2000),
+        )
+
+        with _patch_session(db), patch("services.execution_recovery._is_alive", return_value=True):
+            count = recover_zombie_executions(threshold_seconds=900)
+
+        assert count == 0
+        db.refresh(ex)
+        assert ex.status == "running"
+
+
+class TestIsAlive:
+    """Liveness signals checked before an execution is treated as a zombie."""
+
+    @pytest.fixture
+    def redis_clients(self):
+        import fakeredis
+
+        server = fakeredis.FakeServer()
+        r = fakeredis.FakeRedis(server=server, decode_responses=True)
+        binary = fakeredis.FakeRedis(server=server)
+        with (
+            patch("services.redis_pool.get_redis", return_value=r),
+            patch("services.redis_pool.get_redis_binary", return_value=binary),
+        ):
+            yield r, binary
+
+    def _execution(self, db, workflow, user_profile, **kwargs):
+        return _make_execution(
+            db, workflow, user_profile,
+            status="running",
+            started_at=_utcnow_naive() - timedelta(seconds=2000),
+            **kwargs,
+        )
+
+    def test_silent_execution_is_not_alive(self, redis_clients, db, workflow, user_profile):
+        ex = self._execution(db, workflow, user_profile)
+        assert _is_alive(ex, time.time() - 900, db) is False
+
+    def test_recent_heartbeat(self, redis_clients, db, workflow, user_profile):
+        from services.heartbeats import beat
+
+        r, _ = redis_clients
+        ex = self._execution(db, workflow, user_profile)
+        beat(r, ex.execution_id)
+        assert _is_alive(ex, time.time() - 900, db) is True
+        # A beat from before the silence window does not count
+        assert _is_alive(ex, time.time() + 1, db) is False
+
+    def test_queued_node_job(self, redis_clients, db, workflow, user_profile):
+        from rq import Queue
+
+        from services.orchestrator import _jobs_key
+
+        r, binary = redis_clients
+        ex = self._execution(db, workflow, user_profile)
+        job = Queue("workflows", connection=binary).enqueue("builtins.print")
+        r.sadd(_jobs_key(ex.execution_id), job.id, "vanished-job")
+        assert _is_alive(ex, time.time() + 1, db) is True
+
+        job.set_status("started")
+        assert _is_alive(ex, time.time() + 1, db) is False
+
+    def test_running_child_execution(self, redis_clients, db, workflow, user_profile):
+        ex = self._execution(db, workflow, user_profile)
+        _make_execution(
+            db, workflow, user_profile,
+            status="pending",
+            parent_execution_id=ex.execution_id,
+        )
+        assert _is_alive(ex, time.time() + 1, db) is True
+
+
+class TestScheduleWatchdog:
+    """The periodic watchdog keeps a single chain of scheduled runs."""
+
+    @pytest.fixture
+    def redis_clients(self):
+        import fakeredis
+
+        server = fakeredis.FakeServer()
+        r = fakeredis.FakeRedis(server=server, decode_responses=True)
+        binary = fakeredis.FakeRedis(server=server)
+        with (
+            patch("services.redis_pool.get_redis", return_value=r),
+            patch("services.redis_pool.get_redis_binary", return_value=binary),
+        ):
+            yield r, binary
+
+    def _scheduled(self, binary):
+        from rq import Queue
+
+        return Queue("maintenance", connection=binary).scheduled_job_registry.get_job_ids()
+
+    def test_schedules_one_run(self, redis_clients, monkeypatch):
+        from config import settings
+
+        monkeypatch.setattr(settings, "EXECUTION_WATCHDOG_INTERVAL_SECONDS", 60)
+        _, binary = redis_clients
+        schedule_watchdog()
+        schedule_watchdog()
+        assert len(self._scheduled(binary)) == 1
+
+    def test_reschedule_adds_next_run(self, redis_clients, monkeypatch):
+        from config import settings
+
+        monkeypatch.setattr(settings, "EXECUTION_WATCHDOG_INTERVAL_SECONDS", 60)
+        _, binary = redis_clients
+        schedule_watchdog()
+        schedule_watchdog(reschedule=True)
+        assert len(self._scheduled(binary)) == 2
+
+    def test_disabled(self, redis_clients, monkeypatch):
+        from config import settings
+
+        monkeypatch.setattr(settings, "EXECUTION_WATCHDOG_INTERVAL_SECONDS", 0)
+        r, binary = redis_clients
+        schedule_watchdog()
+        assert self._scheduled(binary) == []
+        assert r.get("execution_watchdog:scheduled") is None
+
+
 # ---------------------------------------------------------------------------
 # _publish_zombie_event tests
 # ---------------------------------------------------------------------------
@@ -252,11 +435,11 @@ class TestRecoverOne:
 class TestPublishZombieEvent:
     """Tests for best-effort WS event publishing."""
 
-    @patch("services.execution_recovery.redis_lib")
-    def test_publishes_to_execution_channel(self, mock_redis_mod):
+    @patch("services.redis_pool.get_redis")
+    def test_publishes_to_execution_channel(self, mock_get_redis):
         """Event is published to execution:<id> channel."""
         mock_r = MagicMock()
-        mock_redis_mod.from_url.return_value = mock_r
+        mock_get_redis.return_value = mock_r
 
         _publish_zombie_event("exec-123", None)
 
@@ -264,11 +447,11 @@ class TestPublishZombieEvent:
         channel = mock_r.publish.call_args[0][0]
         assert channel == "execution:exec-123"
 
-    @patch("services.execution_recovery.redis_lib")
-    def test_publishes_to_workflow_channel(self, mock_redis_mod):
+    @patch("services.redis_pool.get_redis")
+    def test_publishes_to_workflow_channel(self, mock_get_redis):
         """Event is also published to workflow:<slug> when slug is provided."""
         mock_r = MagicMock()
-        mock_redis_mod.from_url.return_value = mock_r
+        mock_get_redis.return_value = mock_r
 
         _publish_zombie_event("exec-123", "my-workflow")
 
@@ -277,10 +460,9 @@ class TestPublishZombieEvent:
         assert "execution:exec-123" in channels
         assert "workflow:my-workflow" in channels
 
-    @patch("services.execution_recovery.redis_lib")
-    def test_redis_failure_does_not_raise(self, mock_redis_mod):
+    @patch("services.redis_pool.get_redis", side_effect=ConnectionError("Redis down"))
+    def test_redis_failure_does_not_raise(self, _mock_get_redis):
         """Redis errors are swallowed (best-effort)."""
-        mock_redis_mod.from_url.side_effect = ConnectionError("Redis down")
 
         # Should not raise
         _publish_zombie_event("exec-123", "slug")
@@ -293,40 +475,42 @@ class TestPublishZombieEvent:
 class TestCleanupRedis:
     """Tests for best-effort Redis key cleanup."""
 
-    @patch("services.execution_recovery.redis_lib")
-    def test_deletes_matching_keys(self, mock_redis_mod):
-        """All execution:*:* keys are deleted."""
+    @patch("services.redis_pool.get_redis")
+    def test_unlinks_fixed_and_tracked_keys(self, mock_get_redis):
+        """Fixed per-execution keys plus the keyset members are unlinked."""
         mock_r = MagicMock()
-        mock_redis_mod.from_url.return_value = mock_r
-        mock_r.keys.return_value = [
-            "execution:abc:state",
-            "execution:abc:topo",
-            "execution:abc:inflight",
-        ]
+        mock_get_redis.return_value = mock_r
+        mock_r.smembers.return_value = {"execution:abc:fanin:merge_1"}
 
         _cleanup_redis("abc")
 
-        mock_r.delete.assert_called_once_with(
-            "execution:abc:state",
-            "execution:abc:topo",
-            "execution:abc:inflight",
-        )
+        mock_r.smembers.assert_called_once_with("execution:abc:keys")
+        unlinked = mock_r.unlink.call_args[0]
+        assert "execution:abc:state" in unlinked
+        assert "execution:abc:inflight" in unlinked
+        assert "execution:abc:keys" in unlinked
+        assert "execution:abc:fanin:merge_1" in unlinked
+        mock_r.keys.assert_not_called()
+        mock_r.delete.assert_not_called()
 
-    @patch("services.execution_recovery.redis_lib")
-    def test_no_keys_no_delete(self, mock_redis_mod):
-        """No delete call when there are no matching keys."""
-        mock_r = MagicMock()
-        mock_redis_mod.from_url.return_value = mock_r
-        mock_r.keys.return_value = []
+    def test_uses_the_shared_pool(self):
+        """Cleanup goes through get_redis, so its commands are counted."""
+        import fakeredis
 
-        _cleanup_redis("abc")
+        from services.redis_pool import _CountingRedis, count_commands
 
-        mock_r.delete.assert_not_called()
+        r = fakeredis.FakeRedis(decode_responses=True)
+        r.set("execution:abc:state", "x")
+        counting = _CountingRedis(connection_pool=r.connection_pool)
+        with patch("services.redis_pool.get_redis", return_value=counting), count_commands() as counter:
+            _cleanup_redis("abc")
+
+        assert r.exists("execution:abc:state") == 0
+        assert counter.commands > 0
 
-    @patch("services.execution_recovery.redis_lib")
-    def test_redis_failure_does_not_raise(self, mock_redis_mod):
+    @patch("services.redis_pool.get_redis", side_effect=ConnectionError("Redis down"))
+    def test_redis_failure_does_not_raise(self, _mock_get_redis):
         """Redis errors are swallowed (best-effort)."""
-        mock_redis_mod.from_url.side_effect = ConnectionError("Redis down")
 
         # Should not raise
         _cleanup_redis("abc")
@@ -339,12 +523,14 @@ class TestCleanupRedis:
 class TestRQTaskWrapper:
     """Test that the tasks module wrapper delegates correctly."""
 
+    @patch("services.execution_recovery.schedule_watchdog")
     @patch("services.execution_recovery.recover_zombie_executions", return_value=5)
-    def test_task_wrapper_delegates(self, mock_recover):
+    def test_task_wrapper_delegates(self, mock_recover, mock_schedule):
         from tasks import recover_zombie_executions_job
         result = recover_zombie_executions_job()
         assert result == 5
         mock_recover.assert_called_once()
+        mock_schedule.assert_called_once_with(reschedule=True)
 
 
 # ---------------------------------------------------------------------------
@@ -493,6 +679,7 @@ class TestOnExecutionJobFailure:
 # Slug lookup failure in _recover_one
 # ---------------------------------------------------------------------------
 
+@pytest.mark.usefixtures("silent")
 class TestRecoverOneSlugLookup:
     @patch("services.execution_recovery._cleanup_redis")
     @patch("services.execution_recovery._publish_zombie_event")
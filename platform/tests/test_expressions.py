@@ -106,3 +106,47 @@ def test_ternary_expression():
         {"agent_1": {"output": ""}},
     )
     assert result2 == "no"
+
+
+def test_compiled_template_cached_by_source():
+    from services.expressions import compile_template
+
+    template = "Cached {{ agent_1.output }} {{ trigger.text }}"
+    first = compile_template(template)
+    assert compile_template(template) is first
+    assert first.variables == {"agent_1", "trigger"}
+
+
+def test_only_referenced_outputs_in_context():
+    from unittest.mock import patch
+
+    from services.expressions import compile_template
+
+    template = "Only {{ a.x }}"
+    compiled = compile_template(template)
+    with patch.object(compiled.template, "render", wraps=compiled.template.render) as mock_render:
+        result = resolve_expressions(template, {"a": {"x": 1}, "b": {"x": 2}}, {"text": "t"})
+    assert result == "Only 1"
+    assert mock_render.call_args[0][0] == {"a": {"x": 1}}
+
+
+def test_syntax_error_returns_original():
+    from services.expressions import compile_template
+
+    template = "Broken {{ a.x "
+    assert resolve_expressions(template, {"a": {"x": 1}}) == template
+    assert compile_template(template) is None
+
+
+def test_template_free_config_returned_unchanged():
+    config = {"model": "x", "nested": {"k": [1, "plain", {"deep": True}]}, "n": 3}
+    assert resolve_config_expressions(config, {"a": {"x": 1}}) is config
+
+
+def test_templated_config_does_not_mutate_original():
+    config = {"static": {"k": "v"}, "items": ["{{ a.x }}", "plain"]}
+    resolved = resolve_config_expressions(config, {"a": {"x": 1}})
+    assert resolved == {"static": {"k": "v"}, "items": ["1", "plain"]}
+    assert config["items"] == ["{{ a.x }}", "plain"]
+    # Untouched subtrees are shared, not copied
+    assert resolved["static"] is config["static"]
@@ -238,11 +238,10 @@ class TestConfirmationFlow:
 
         payload = _make_payload(text=f"/confirm_{task_id}")
 
-        with patch("api.inbound.redis") as mock_redis, \
+        with patch("api.inbound.get_redis_binary"), \
              patch("api.inbound.Queue") as mock_queue_cls:
             mock_queue = MagicMock()
             mock_queue_cls.return_value = mock_queue
-            mock_redis.from_url.return_value = MagicMock()
 
             resp = client.post("/api/v1/inbound", json=payload, headers=gateway_headers)
 
@@ -13,7 +13,7 @@ import pytest
 
 class TestDispatchEvent:
     @patch("handlers.Queue")
-    @patch("handlers.redis.from_url")
+    @patch("handlers.get_redis_binary")
     @patch("handlers.trigger_resolver")
     def test_dispatch_matches(self, mock_resolver, mock_redis, mock_queue_cls):
         from handlers import dispatch_event
@@ -164,6 +164,18 @@ class TestInboundEndpoint:
         assert event_data["chat_id"] == "12345"
         assert event_data["credential_id"] == "cred-abc"
 
+    @patch("api.inbound.dispatch_event")
+    def test_backpressure_returns_503(self, mock_dispatch, client, db, workflow, trigger_node, gateway_headers):
+        """Full execution queues -> 503 with Retry-After."""
+        from services.admission import BackpressureError
+
+        mock_dispatch.side_effect = BackpressureError("Execution queues are full")
+
+        resp = client.post("/api/v1/inbound", json=_make_payload(), headers=gateway_headers)
+
+        assert resp.status_code == 503
+        assert resp.headers["Retry-After"] == "5"
+
     def test_invalid_gateway_token_returns_401(self, client, db, workflow, trigger_node):
         """Invalid gateway token -> 401."""
         payload = _make_payload()
@@ -242,11 +254,10 @@ class TestInboundEndpoint:
         mock_gw_client.return_value = mock_client_instance
 
         payload = _make_payload(text=f"/confirm_{task_id}")
-        with patch("api.inbound.redis") as mock_redis, \
+        with patch("api.inbound.get_redis_binary"), \
              patch("api.inbound.Queue") as mock_queue_cls:
             mock_queue = MagicMock()
             mock_queue_cls.return_value = mock_queue
-            mock_redis.from_url.return_value = MagicMock()
 
             resp = client.post("/api/v1/inbound", json=payload, headers=gateway_headers)
 
@@ -289,7 +300,7 @@ class TestInboundEndpoint:
 
         payload = _make_payload(text=f"/cancel_{task_id}")
         # Cancel path doesn't enqueue to redis, but mock for consistency with confirm test
-        with patch("api.inbound.redis"), patch("api.inbound.Queue"):
+        with patch("api.inbound.get_redis_binary"), patch("api.inbound.Queue"):
             resp = client.post("/api/v1/inbound", json=payload, headers=gateway_headers)
 
         assert resp.status_code == 200
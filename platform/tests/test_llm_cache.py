@@ -0,0 +1,124 @@
+"""Tests for the exact-match LLM response cache."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from config import settings
+from services import llm_cache
+from services.llm_cache import ResponseCache
+
+
+@pytest.fixture
+def redis_client():
+    r = fakeredis.FakeRedis(decode_responses=True)
+    with patch("services.llm_cache.get_redis", return_value=r):
+        yield r
+
+
+def _model(credential_id=1, responses=("first", "second")):
+    return FakeListChatModel(responses=list(responses), cache=ResponseCache(credential_id))
+
+
+def _messages(text="hi", timestamp="t1"):
+    return [
+        SystemMessage(content="Classify the message."),
+        HumanMessage(content=text, additional_kwargs={"timestamp": timestamp}),
+    ]
+
+
+class TestResponseCache:
+    def test_identical_prompt_is_answered_from_cache(self, redis_client):
+        llm = _model()
+        assert llm.invoke(_messages(timestamp="t1")).content == "first"
+        cached = llm.invoke(_messages(timestamp="t2"))
+
+        assert cached.content == "first"
+        assert cached.response_metadata["cache_hit"] is True
+        assert cached.usage_metadata["total_tokens"] == 0
+        assert llm_cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    def test_different_message_misses(self, redis_client):
+        llm = _model()
+        llm.invoke(_messages("hi"))
+        assert llm.invoke(_messages("/start")).content == "second"
+
+    def test_scoped_per_credential(self, redis_client):
+        _model(credential_id=1).invoke(_messages())
+        assert _model(credential_id=2, responses=("other",)).invoke(_messages()).content == "other"
+
+    def test_evicts_least_recently_used(self, redis_client, monkeypatch):
+        monkeypatch.setattr(settings, "LLM_RESPONSE_CACHE_MAX_ENTRIES", 1)
+        llm = _model(responses=("a", "b", "c"))
+        llm.invoke(_messages("one"))
+        llm.invoke(_messages("two"))
+
+        assert redis_client.zcard(llm_cache.LRU_KEY) == 1
+        assert llm.invoke(_messages("one")).content == "c"
+
+    def test_redis_errors_fall_through_to_the_model(self):
+        llm = _model()
+        with patch("services.llm_cache.get_redis", side_effect=ConnectionError("down")):
+            assert llm.invoke(_messages()).content == "first"
+            assert llm.invoke(_messages()).content == "second"
+
+
+class TestResolveLlmForNode:
+    def _node(self, component_type="categorizer", **extra):
+        cc = SimpleNamespace(
+            component_type=component_type,
+            extra_config=extra,
+            llm_model_config_id=7,
+        )
+        return SimpleNamespace(node_id="cat_1", component_config=cc)
+
+    def _resolve(self, node):
+        from services.llm import resolve_llm_for_node
+
+        model_config = SimpleNamespace(
+            component_type="ai_model", model_name="gpt-4", llm_credential_id=10,
+            temperature=0, max_tokens=None, frequency_penalty=None, presence_penalty=None,
+            top_p=None, timeout=None, max_retries=None, response_format=None,
+        )
+        mock_db = MagicMock()
+        mock_db.get.return_value = model_config
+        with patch("services.llm.create_llm_from_db", return_value=SimpleNamespace(cache=None)):
+            return resolve_llm_for_node(node, db=mock_db)
+
+    def test_opted_in_node_gets_the_cache(self):
+        llm = self._resolve(self._node(cache_llm_responses=True))
+        assert isinstance(llm.cache, ResponseCache)
+        assert llm.cache.credential_id == 10
+
+    def test_off_by_default(self):
+        assert self._resolve(self._node()).cache is None
+
+    def test_only_classification_nodes(self):
+        assert self._resolve(self._node("agent", cache_llm_responses=True)).cache is None
+
+
+class TestCategorizerUsage:
+    @patch("components.categorizer.resolve_llm_for_node")
+    @patch("components.categorizer.get_model_name_for_node", return_value="gpt-4")
+    def test_cached_answer_is_a_free_call(self, mock_model_name, mock_resolve, redis_client):
+        from components.categorizer import categorizer_factory
+
+        mock_resolve.return_value = _model(responses=('{"category": "chat"}',))
+        config = SimpleNamespace(
+            extra_config={"categories": [{"name": "chat"}]},
+            concrete=SimpleNamespace(system_prompt=""),
+        )
+        node_fn = categorizer_factory(SimpleNamespace(node_id="cat_1", component_config=config))
+
+        node_fn({"messages": [HumanMessage(content="hi")]})
+        result = node_fn({"messages": [HumanMessage(content="hi")]})
+
+        assert result["category"] == "chat"
+        assert result["_token_usage"]["llm_calls"] == 0
+        assert result["_token_usage"]["cost_usd"] == 0
@@ -15,7 +15,7 @@ from models.workflow import Workflow
 
 class TestManualExecuteView:
     @patch("rq.Queue")
-    @patch("redis.from_url")
+    @patch("services.redis_pool.get_redis_binary")
     def test_execute_with_trigger_node_id(self, mock_redis, mock_queue, db, workflow, manual_trigger):
         from handlers.manual import manual_execute_view, ManualExecuteIn
 
@@ -24,6 +24,20 @@ class TestManualExecuteView:
         assert "execution_id" in result
         assert result["status"] == "pending"
 
+    @patch("services.admission.queue_depth", return_value=10)
+    def test_execute_with_trigger_node_id_full_queues(self, mock_depth, db, workflow, manual_trigger, monkeypatch):
+        from fastapi import HTTPException
+
+        from config import settings
+        from handlers.manual import manual_execute_view, ManualExecuteIn
+
+        monkeypatch.setattr(settings, "EXECUTION_QUEUE_MAX_DEPTH", 10)
+        payload = ManualExecuteIn(text="hello", trigger_node_id="manual_trigger_1")
+        with pytest.raises(HTTPException) as exc_info:
+            manual_execute_view(workflow.slug, payload, db, MagicMock(id=1))
+        assert exc_info.value.status_code == 503
+        assert db.query(WorkflowExecution).count() == 0
+
     @patch("handlers.manual.dispatch_event")
     def test_execute_fallback_dispatch(self, mock_dispatch, db, workflow, manual_trigger):
         from handlers.manual import manual_execute_view, ManualExecuteIn
@@ -47,7 +61,7 @@ class TestManualExecuteView:
         assert exc_info.value.status_code == 404
 
     @patch("rq.Queue")
-    @patch("redis.from_url")
+    @patch("services.redis_pool.get_redis_binary")
     def test_execute_trigger_node_not_found(self, mock_redis, mock_queue, db, workflow):
         from fastapi import HTTPException
         from handlers.manual import manual_execute_view, ManualExecuteIn
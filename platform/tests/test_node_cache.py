@@ -0,0 +1,190 @@
+"""Tests for memoization of deterministic node outputs."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import pytest
+from langchain_core.messages import HumanMessage
+
+from config import settings
+from services import node_cache
+
+
+def _node(component_type="switch", node_id="n1", model_config_id=None, **extra):
+    config = SimpleNamespace(
+        extra_config=extra,
+        system_prompt="",
+        llm_model_config_id=model_config_id,
+    )
+    return SimpleNamespace(component_type=component_type, node_id=node_id, component_config=config)
+
+
+def _state(**outputs):
+    return {"node_outputs": outputs, "trigger": {"text": "hi"}, "route": ""}
+
+
+@pytest.fixture
+def redis_client():
+    r = fakeredis.FakeRedis(decode_responses=True)
+    with patch("services.node_cache.get_redis", return_value=r):
+        yield r
+
+
+class TestCacheKey:
+    def test_requires_opt_in(self):
+        assert node_cache.cache_key(_node(), _state(), MagicMock()) is None
+        assert node_cache.cache_key(_node(cache_outputs=True), _state(), MagicMock()) is not None
+
+    def test_only_deterministic_types(self):
+        assert node_cache.cache_key(_node("agent", cache_outputs=True), _state(), MagicMock()) is None
+        # Code snippets see the whole state
+        assert node_cache.cache_key(_node("code", cache_outputs=True), _state(), MagicMock()) is None
+
+    def test_same_inputs_same_key(self):
+        a = node_cache.cache_key(_node(cache_outputs=True), _state(up={"x": 1}), MagicMock(), ["up"])
+        b = node_cache.cache_key(_node(cache_outputs=True), _state(up={"x": 1}), MagicMock(), ["up"])
+        assert a == b
+
+    def test_inputs_and_config_change_the_key(self):
+        base = node_cache.cache_key(_node(cache_outputs=True), _state(up={"x": 1}), MagicMock(), ["up"])
+        assert node_cache.cache_key(_node(cache_outputs=True), _state(up={"x": 2}), MagicMock(), ["up"]) != base
+        changed = _node(cache_outputs=True, condition_field="output")
+        assert node_cache.cache_key(changed, _state(up={"x": 1}), MagicMock(), ["up"]) != base
+
+    def test_only_inbound_and_referenced_outputs_are_hashed(self):
+        node = _node(cache_outputs=True, rules=[{"id": "a", "field": "state.node_outputs.cat.category"}])
+        keys = {
+            node_cache.cache_key(node, _state(up=1, cat={"category": "x"}, other=other), MagicMock(), ["up"])
+            for other in ("a", "b")
+        }
+        assert len(keys) == 1
+        assert node_cache.cache_key(
+            node, _state(up=1, cat={"category": "y"}, other="a"), MagicMock(), ["up"],
+        ) not in keys
+
+    def test_offloaded_outputs_are_hashed_by_reference(self):
+        from services.blob_store import LazyNodeOutputs
+
+        ref = {"$blob": "0" * 64, "size": 10}
+        state = {**_state(), "node_outputs": LazyNodeOutputs(up=ref)}
+        with patch("services.blob_store.get") as mock_get:
+            assert node_cache.cache_key(_node(cache_outputs=True), state, MagicMock(), ["up"]) is not None
+        mock_get.assert_not_called()
+
+    def test_source_node_limits_the_inputs(self):
+        node = _node("filter", cache_outputs=True, source_node="up")
+        a = node_cache.cache_key(node, _state(up=[1], other="a"), MagicMock(), ["other"])
+        b = node_cache.cache_key(node, _state(up=[1], other="b"), MagicMock(), ["other"])
+        assert a == b
+
+    def test_message_timestamps_are_ignored(self):
+        node = _node("output_parser", cache_outputs=True)
+        states = [
+            {**_state(), "messages": [HumanMessage(content="hi", additional_kwargs={"timestamp": ts})]}
+            for ts in ("t1", "t2")
+        ]
+        assert node_cache.cache_key(node, states[0], MagicMock()) == node_cache.cache_key(node, states[1], MagicMock())
+
+    def test_llm_nodes_need_a_greedy_model(self):
+        db = MagicMock()
+        node = _node("categorizer", model_config_id=5, cache_outputs=True)
+
+        db.get.return_value = SimpleNamespace(
+            id=5, temperature=0.7, model_name="m", llm_credential_id=1,
+            max_tokens=None, response_format=None, updated_at=None,
+        )
+        assert node_cache.cache_key(node, _state(), db) is None
+
+        db.get.return_value.temperature = 0
+        assert node_cache.cache_key(node, _state(), db) is not None
+
+        assert node_cache.cache_key(_node("categorizer", cache_outputs=True), _state(), db) is None
+
+
+class TestStore:
+    def test_round_trip_drops_token_usage(self, redis_client):
+        assert node_cache.store("k", {"_route": "a", "category": "a", "_token_usage": {"cost_usd": 1}}, 60)
+        assert node_cache.lookup("k") == {"_route": "a", "category": "a"}
+        assert 0 < redis_client.ttl(node_cache.ENTRY_PREFIX + "k") <= 60
+
+    def test_miss(self, redis_client):
+        assert node_cache.lookup("missing") is None
+
+    def test_side_effects_are_not_stored(self, redis_client):
+        assert not node_cache.store("k", {"_loop": {"items": [1]}}, 60)
+        assert not node_cache.store("k", {"value": object()}, 60)
+        assert redis_client.keys("node_cache:*") == []
+
+    def test_evicts_least_recently_used(self, redis_client, monkeypatch):
+        monkeypatch.setattr(settings, "NODE_CACHE_MAX_ENTRIES", 2)
+        node_cache.store("a", {"v": 1}, 60)
+        node_cache.store("b", {"v": 2}, 60)
+        node_cache.lookup("a")
+        node_cache.store("c", {"v": 3}, 60)
+
+        assert node_cache.lookup("b") is None
+        assert node_cache.lookup("a") == {"v": 1}
+        assert node_cache.lookup("c") == {"v": 3}
+        assert redis_client.zcard(node_cache.LRU_KEY) == 2
+
+    def test_redis_errors_are_not_raised(self):
+        with patch("services.node_cache.get_redis", side_effect=ConnectionError("down")):
+            assert node_cache.lookup("k") is None
+            assert node_cache.store("k", {"v": 1}, 60) is False
+
+
+class TestExecuteNodeCacheHit:
+    @patch("services.orchestrator._advance")
+    @patch("services.orchestrator._publish_event")
+    @patch("services.orchestrator._redis")
+    @patch("services.orchestrator.save_state", return_value={})
+    @patch("services.orchestrator.load_state")
+    @patch("services.orchestrator._load_topology")
+    def test_hit_skips_the_component(
+        self, mock_load_topo, mock_load_state, mock_save, mock_redis_fn, mock_pub, mock_advance, redis_client,
+    ):
+        from services.orchestrator import execute_node_job
+        from tests.redis_mocks import forward_pipeline
+
+        mock_redis_fn.return_value = forward_pipeline(MagicMock())
+        mock_load_topo.return_value = {
+            "workflow_slug": "wf",
+            "nodes": {"f": {
+                "node_id": "f", "component_type": "filter", "db_id": 1, "component_config_id": 1,
+                "interrupt_before": False, "interrupt_after": False,
+            }},
+            "edges_by_source": {},
+            "incoming_count": {},
+            "loop_bodies": {},
+            "loop_return_nodes": {},
+            "loop_body_all_nodes": {},
+        }
+        mock_load_state.return_value = {"messages": [], "node_outputs": {"up": [1, 2]}, "trigger": {}}
+
+        db_node = _node("filter", node_id="f", cache_outputs=True, source_node="up")
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.first.return_value = MagicMock(
+            status="running", execution_id="exec-1", started_at=None,
+        )
+        mock_db.get.return_value = db_node
+
+        key = node_cache.cache_key(db_node, {"node_outputs": {"up": [1, 2]}, "trigger": {}}, mock_db)
+        node_cache.store(key, {"filtered": [2]}, 60)
+
+        with (
+            patch("components.build_component") as mock_build,
+            patch("database.SessionLocal", return_value=mock_db),
+            patch("services.orchestrator._write_log") as mock_log,
+            patch("services.orchestrator.execution_journal.record"),
+        ):
+            execute_node_job("exec-1", "f")
+
+        mock_build.assert_not_called()
+        saved_state = mock_save.call_args[0][1]
+        assert saved_state["node_outputs"]["f"] == {"filtered": [2]}
+        assert mock_log.call_args.kwargs["metadata"]["cache_hit"] is True
+        events = [c.args[2] for c in mock_pub.call_args_list if c.args[1] == "node_status"]
+        assert events[-1]["cache_hit"] is True
@@ -10,6 +10,7 @@ import pytest
 from models.node import BaseComponentConfig, WorkflowEdge, WorkflowNode
 from services.state import deserialize_state, merge_state_update, serialize_state
 from services.topology import Topology, build_topology
+from tests.redis_mocks import forward_pipeline
 
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
@@ -231,7 +232,7 @@ class TestOrchestratorAdvance:
              patch("services.orchestrator._publish_event"):
             mock_queue = MagicMock()
             mock_q.return_value = mock_queue
-            mock_redis = MagicMock()
+            mock_redis = forward_pipeline(MagicMock())
             mock_r.return_value = mock_redis
             mock_redis.decr.return_value = 0
 
@@ -276,7 +277,7 @@ class TestOrchestratorAdvance:
              patch("services.orchestrator._publish_event"):
             mock_queue = MagicMock()
             mock_q.return_value = mock_queue
-            mock_redis = MagicMock()
+            mock_redis = forward_pipeline(MagicMock())
             mock_r.return_value = mock_redis
             mock_redis.decr.return_value = 0
 
@@ -310,7 +311,7 @@ class TestOrchestratorAdvance:
              patch("services.orchestrator._publish_event"):
             mock_queue = MagicMock()
             mock_q.return_value = mock_queue
-            mock_redis = MagicMock()
+            mock_redis = forward_pipeline(MagicMock())
             mock_r.return_value = mock_redis
             mock_redis.decr.return_value = 0
 
@@ -339,7 +340,7 @@ class TestOrchestratorAdvance:
             mock_queue = MagicMock()
             mock_q.return_value = mock_queue
 
-            mock_redis = MagicMock()
+            mock_redis = forward_pipeline(MagicMock())
             mock_r.return_value = mock_redis
             # First parent done — count=1, not enough
             mock_redis.incr.return_value = 1
@@ -366,7 +367,7 @@ class TestOrchestratorAdvance:
         with patch("services.orchestrator._finalize") as mock_fin, \
              patch("services.orchestrator._redis") as mock_r, \
              patch("services.orchestrator._publish_event"):
-            mock_redis = MagicMock()
+            mock_redis = forward_pipeline(MagicMock())
             mock_r.return_value = mock_redis
             mock_redis.decr.return_value = 0
 
@@ -390,7 +391,7 @@ class TestOrchestratorAdvance:
              patch("services.orchestrator._redis") as mock_r, \
              patch("services.orchestrator.save_state") as mock_save, \
              patch("services.orchestrator._publish_event"):
-            mock_redis = MagicMock()
+            mock_redis = forward_pipeline(MagicMock())
             mock_r.return_value = mock_redis
             mock_redis.decr.return_value = 0
 
@@ -420,7 +421,7 @@ class TestOrchestratorAdvance:
              patch("services.orchestrator._redis") as mock_r, \
              patch("services.orchestrator.save_state") as mock_save, \
              patch("services.orchestrator._publish_event"):
-            mock_redis = MagicMock()
+            mock_redis = forward_pipeline(MagicMock())
             mock_r.return_value = mock_redis
             mock_redis.decr.return_value = 0
 
@@ -446,7 +447,7 @@ class TestOrchestratorAdvance:
              patch("services.orchestrator._redis") as mock_r, \
              patch("services.orchestrator.save_state") as mock_save, \
              patch("services.orchestrator._publish_event"):
-            mock_redis = MagicMock()
+            mock_redis = forward_pipeline(MagicMock())
             mock_r.return_value = mock_redis
             mock_redis.decr.return_value = 0
 
@@ -479,7 +480,7 @@ class TestOrchestratorAdvance:
              patch("services.orchestrator._publish_event"):
             mock_queue = MagicMock()
             mock_q.return_value = mock_queue
-            mock_redis = MagicMock()
+            mock_redis = forward_pipeline(MagicMock())
             mock_r.return_value = mock_redis
             mock_redis.decr.return_value = 0
 
@@ -11,6 +11,8 @@ from unittest.mock import MagicMock, patch, call
 
 import pytest
 
+from tests.redis_mocks import forward_pipeline
+
 
 def _mock_redis():
     """Return a mock Redis client with common methods."""
@@ -24,7 +26,7 @@ def _mock_redis():
     r.sadd.return_value = 1
     r.smembers.return_value = set()
     r.keys.return_value = []
-    return r
+    return forward_pipeline(r)
 
 
 # ── _cache_parent_info / _get_parent_info ─────────────────────────────────────
@@ -82,6 +84,7 @@ class TestParentInfoCache:
 # ── _publish_event child forwarding ──────────────────────────────────────────
 
 
+@pytest.mark.usefixtures("sync_events")
 class TestPublishEventChildForwarding:
     @patch("services.orchestrator._get_parent_info")
     @patch("services.orchestrator._redis")
@@ -215,8 +218,9 @@ class TestStartExecution:
         # Should not raise
         start_execution("nonexistent", db=mock_db)
 
+    @patch("services.orchestrator.admission.release")
     @patch("services.orchestrator._publish_event")
-    def test_workflow_not_found(self, mock_pub):
+    def test_workflow_not_found(self, mock_pub, mock_release):
         from services.orchestrator import start_execution
 
         mock_db = MagicMock()
@@ -226,6 +230,48 @@ class TestStartExecution:
 
         start_execution("exec-1", db=mock_db)
 
+        # An execution admitted after its workflow was deleted gives its slot back
+        mock_release.assert_called_once_with("exec-1")
+
+    @patch("services.orchestrator._cleanup_redis")
+    @patch("services.orchestrator.admission.try_admit", return_value=True)
+    @patch("services.orchestrator._publish_event")
+    @patch("services.orchestrator._start_episode", side_effect=RuntimeError("db gone"))
+    def test_failed_start_releases_its_slot(self, mock_episode, mock_pub, mock_admit, mock_cleanup):
+        from services.orchestrator import start_execution
+
+        mock_db = MagicMock()
+        mock_execution = MagicMock(workflow_id=1, user_profile_id=7, status="pending", parent_execution_id=None)
+        mock_db.query.return_value.filter.return_value.first.side_effect = [mock_execution, MagicMock(id=1)]
+
+        start_execution("exec-1", db=mock_db)
+
+        assert mock_execution.status == "failed"
+        mock_cleanup.assert_called_once_with("exec-1")
+
+    @patch("services.orchestrator._save_topology")
+    @patch("services.orchestrator.admission.try_admit", return_value=False)
+    @patch("services.orchestrator._publish_event")
+    def test_over_admission_cap_stays_pending(self, mock_pub, mock_admit, mock_save_topo):
+        from services.orchestrator import start_execution
+
+        mock_db = MagicMock()
+        mock_execution = MagicMock()
+        mock_execution.workflow_id = 1
+        mock_execution.user_profile_id = 7
+        mock_execution.status = "pending"
+        mock_execution.parent_execution_id = None
+        mock_workflow = MagicMock()
+        mock_workflow.id = 1
+        mock_db.query.return_value.filter.return_value.first.side_effect = [mock_execution, mock_workflow]
+
+        start_execution("exec-1", db=mock_db)
+
+        mock_admit.assert_called_once_with("exec-1", 1, 7)
+        assert mock_execution.status == "pending"
+        mock_save_topo.assert_not_called()
+        mock_pub.assert_not_called()
+
     @patch("services.orchestrator._cache_parent_info")
     @patch("services.orchestrator._get_parent_info")
     @patch("services.orchestrator._queue")
@@ -422,6 +468,49 @@ class TestExecuteNodeJob:
         mock_save_state.assert_called()
         mock_advance.assert_called_once()
 
+    @patch("services.orchestrator._advance")
+    @patch("services.orchestrator._publish_event")
+    @patch("services.orchestrator._redis")
+    @patch("services.orchestrator.save_state")
+    @patch("services.orchestrator.load_state")
+    @patch("services.orchestrator._load_topology")
+    def test_reusable_component_gets_cache_key_and_run_prompt(self, mock_load_topo, mock_load_state, mock_save_state, mock_redis_fn, mock_pub, mock_advance):
+        from datetime import datetime
+
+        from services.orchestrator import execute_node_job
+
+        mock_redis_fn.return_value = _mock_redis()
+        mock_load_topo.return_value = {
+            "workflow_slug": "wf", "version": "3",
+            "nodes": {"agent_1": {
+                "node_id": "agent_1", "component_type": "agent", "db_id": 10,
+                "component_config_id": 20, "interrupt_before": False, "interrupt_after": False,
+            }},
+            "edges_by_source": {}, "incoming_count": {},
+            "loop_bodies": {}, "loop_return_nodes": {}, "loop_body_all_nodes": {},
+        }
+        mock_load_state.return_value = {"messages": [], "node_outputs": {"n0": {"name": "Bob"}}, "trigger": {}}
+
+        updated = datetime(2026, 1, 1)
+        mock_config = MagicMock(system_prompt="Hello {{ n0.name }}", extra_config={"b": 1, "a": 2}, updated_at=updated)
+        mock_db_node = MagicMock(component_config=mock_config)
+        mock_db = MagicMock()
+        mock_execution = MagicMock(status="running", execution_id="exec-1", started_at=None)
+        mock_db.query.return_value.filter.return_value.first.return_value = mock_execution
+        mock_db.get.return_value = mock_db_node
+
+        seen_prompts = []
+        mock_fn = MagicMock(side_effect=lambda state: seen_prompts.append(state.get("_system_prompt")) or {"output": "ok"})
+        with patch("components.build_component", return_value=mock_fn) as mock_build, \
+             patch("database.SessionLocal", return_value=mock_db), \
+             patch("services.orchestrator._write_log"):
+            execute_node_job("exec-1", "agent_1")
+
+        mock_build.assert_called_once_with(mock_db_node, (updated, "3", '{"a": 2, "b": 1}'))
+        assert seen_prompts == ["Hello Bob"]
+        saved_state = mock_save_state.call_args[0][1]
+        assert "_system_prompt" not in saved_state
+
     @patch("services.orchestrator._publish_event")
     @patch("services.orchestrator._load_topology")
     def test_execution_not_runnable(self, mock_load_topo, mock_pub):
@@ -745,6 +834,51 @@ class TestAdvance:
         _advance("exec-1", "n1", {}, topo_data, MagicMock())
         assert mock_q.enqueue.call_count == 2
 
+    @patch("services.orchestrator._finalize")
+    def test_fan_out_is_one_round_trip(self, mock_finalize):
+        import fakeredis
+        import redis
+        from rq import Queue
+
+        from services.orchestrator import _advance, _inflight_key
+        from services.redis_pool import _CountingRedis, count_commands
+
+        server = fakeredis.FakeServer()
+
+        def client(decode):
+            return _CountingRedis(connection_pool=redis.ConnectionPool(
+                connection_class=fakeredis.FakeRedisConnection, server=server, decode_responses=decode,
+            ))
+
+        r = client(True)
+        q = Queue("workflows", connection=client(False))
+        q.get_redis_server_version()  # cached per Queue, as _queue() reuses it
+        r.set(_inflight_key("exec-1"), 1)
+        topo_data = {
+            "edges_by_source": {
+                "n1": [
+                    {"edge_type": "direct", "target_node_id": t, "edge_label": "", "condition_mapping": None, "condition_value": "", "priority": 0}
+                    for t in ("n2", "n3", "n4")
+                ]
+            },
+            "nodes": {t: {"component_type": "agent", "node_id": t} for t in ("n2", "n3", "n4")},
+            "incoming_count": {},
+            "workflow_slug": "wf",
+            "loop_bodies": {},
+            "loop_return_nodes": {},
+            "loop_body_all_nodes": {},
+        }
+
+        with patch("services.orchestrator._redis", return_value=r), \
+             patch("services.orchestrator._queue", return_value=q), \
+             count_commands() as counter:
+            _advance("exec-1", "n1", {}, topo_data, MagicMock())
+
+        assert counter.round_trips == 1
+        assert r.get(_inflight_key("exec-1")) == "3"
+        assert sorted(job.args[1] for job in q.get_jobs()) == ["n2", "n3", "n4"]
+        mock_finalize.assert_not_called()
+
     @patch("services.orchestrator._check_loop_body_done", return_value=False)
     @patch("services.orchestrator._finalize")
     @patch("services.orchestrator._publish_event")
@@ -781,15 +915,223 @@ class TestAdvance:
         mock_q.enqueue.assert_not_called()
 
 
+# ── Fused execution ───────────────────────────────────────────────────────────
+
+def _fused_topo(target_type: str, **target_extra) -> dict:
+    return {
+        "edges_by_source": {
+            "n1": [
+                {"edge_type": "direct", "target_node_id": "n2", "edge_label": "", "condition_mapping": None, "condition_value": "", "priority": 0},
+            ]
+        },
+        "nodes": {"n2": {"component_type": target_type, "node_id": "n2", **target_extra}},
+        "incoming_count": {},
+        "workflow_slug": "wf",
+        "loop_bodies": {},
+        "loop_return_nodes": {},
+        "loop_body_all_nodes": {},
+    }
+
+
+class TestFusedExecution:
+    @patch("services.orchestrator._check_loop_body_done", return_value=False)
+    @patch("services.orchestrator._finalize")
+    @patch("services.orchestrator._publish_event")
+    @patch("services.orchestrator._redis")
+    @patch("services.orchestrator._queue")
+    def test_advance_fuses_cheap_successor(self, mock_queue_fn, mock_redis_fn, mock_pub, mock_finalize, mock_loop):
+        from collections import deque
+        from services.orchestrator import _advance, _fused_targets
+
+        mock_r = _mock_redis()
+        mock_r.decr.return_value = 1
+        mock_redis_fn.return_value = mock_r
+        mock_q = MagicMock()
+        mock_queue_fn.return_value = mock_q
+
+        pending = deque()
+        token = _fused_targets.set(pending)
+        try:
+            _advance("exec-1", "n1", {}, _fused_topo("switch"), MagicMock())
+        finally:
+            _fused_targets.reset(token)
+
+        assert list(pending) == [("n2", None)]
+        mock_q.enqueue.assert_not_called()
+        # Inflight and node_enqueued bookkeeping still happen for fused nodes
+        mock_r.incrby.assert_called_once_with("execution:exec-1:inflight", 1)
+        mock_pub.assert_called_once_with("exec-1", "node_enqueued", {"node_id": "n2"}, workflow_slug="wf")
+
+    @patch("services.orchestrator._check_loop_body_done", return_value=False)
+    @patch("services.orchestrator._finalize")
+    @patch("services.orchestrator._publish_event")
+    @patch("services.orchestrator._redis")
+    @patch("services.orchestrator._queue")
+    def test_advance_enqueues_expensive_successor(self, mock_queue_fn, mock_redis_fn, mock_pub, mock_finalize, mock_loop):
+        from collections import deque
+        from services.orchestrator import _advance, _fused_targets
+
+        mock_r = _mock_redis()
+        mock_r.decr.return_value = 1
+        mock_redis_fn.return_value = mock_r
+        mock_q = MagicMock()
+        mock_queue_fn.return_value = mock_q
+
+        pending = deque()
+        token = _fused_targets.set(pending)
+        try:
+            _advance("exec-1", "n1", {}, _fused_topo("agent"), MagicMock())
+        finally:
+            _fused_targets.reset(token)
+
+        assert not pending
+        mock_q.enqueue.assert_called_once()
+
+    @patch("services.orchestrator._check_loop_body_done", return_value=False)
+    @patch("services.orchestrator._finalize")
+    @patch("services.orchestrator._publish_event")
+    @patch("services.orchestrator._redis")
+    @patch("services.orchestrator._queue")
+    def test_advance_does_not_fuse_delayed_or_interrupted(self, mock_queue_fn, mock_redis_fn, mock_pub, mock_finalize, mock_loop):
+        from collections import deque
+        from services.orchestrator import _advance, _fused_targets
+
+        mock_r = _mock_redis()
+        mock_r.decr.return_value = 1
+        mock_redis_fn.return_value = mock_r
+        mock_q = MagicMock()
+        mock_queue_fn.return_value = mock_q
+
+        pending = deque()
+        token = _fused_targets.set(pending)
+        try:
+            _advance("exec-1", "n1", {}, _fused_topo("switch"), MagicMock(), delay_seconds=5)
+            _advance("exec-1", "n1", {}, _fused_topo("switch", interrupt_before=True), MagicMock())
+        finally:
+            _fused_targets.reset(token)
+
+        assert not pending
+        mock_q.create_job.assert_called_once()
+        mock_q.enqueue.assert_called_once()
+
+    @pytest.mark.parametrize("origin, kept", [("llm", True), ("workflows", False)])
+    @patch("services.orchestrator._check_loop_body_done", return_value=False)
+    @patch("services.orchestrator._finalize")
+    @patch("services.orchestrator._publish_event")
+    @patch("services.orchestrator._redis")
+    @patch("services.orchestrator._queue")
+    def test_affinity_keeps_lone_successor_of_own_queue(
+        self, mock_queue_fn, mock_redis_fn, mock_pub, mock_finalize, mock_loop, origin, kept,
+    ):
+        from collections import deque
+        from services.orchestrator import _advance, _kept_targets
+
+        mock_r = _mock_redis()
+        mock_r.decr.return_value = 1
+        mock_redis_fn.return_value = mock_r
+        mock_q = MagicMock()
+        mock_queue_fn.return_value = mock_q
+
+        pending = deque()
+        token = _kept_targets.set(pending)
+        try:
+            with (
+                patch("services.orchestrator.settings.EXECUTION_AFFINITY", True),
+                patch("rq.get_current_job", return_value=SimpleNamespace(origin=origin)),
+            ):
+                _advance("exec-1", "n1", {}, _fused_topo("agent"), MagicMock())
+        finally:
+            _kept_targets.reset(token)
+
+        assert (list(pending) == [("n2", None)]) is kept
+        assert mock_q.enqueue.called is not kept
+
+    @patch("services.orchestrator._mark_job_started")
+    @patch("services.orchestrator._queue")
+    @patch("services.orchestrator._execute_node")
+    def test_job_runs_fused_nodes_inline(self, mock_exec, mock_queue_fn, _mock_started):
+        from services.orchestrator import _fused_targets, execute_node_job
+
+        def run(execution_id, node_id, retry_count=0, loop_iteration=None):
+            if node_id == "n1":
+                _fused_targets.get().append(("n2", None))
+
+        mock_exec.side_effect = run
+        execute_node_job("exec-1", "n1")
+
+        assert [c.args[1] for c in mock_exec.call_args_list] == ["n1", "n2"]
+        mock_queue_fn.assert_not_called()
+
+    @patch("services.orchestrator._mark_job_started")
+    @patch("services.orchestrator._queue")
+    @patch("services.orchestrator._execute_node")
+    def test_job_enqueues_overflow_past_budget(self, mock_exec, mock_queue_fn, _mock_started):
+        from services.orchestrator import _fused_targets, execute_node_job
+
+        mock_q = MagicMock()
+        mock_queue_fn.return_value = mock_q
+
+        def run(execution_id, node_id, retry_count=0, loop_iteration=None):
+            _fused_targets.get().append((f"{node_id}+", None))
+
+        mock_exec.side_effect = run
+        with patch("services.orchestrator.settings.FUSED_EXECUTION_MAX_NODES", 2):
+            execute_node_job("exec-1", "n1")
+
+        assert mock_exec.call_count == 3  # origin + 2 fused
+        mock_q.enqueue.assert_called_once()
+        assert mock_q.enqueue.call_args[0][2] == "n1+++"
+
+    @patch("services.orchestrator._mark_job_started")
+    @patch("services.orchestrator._execute_node")
+    def test_job_without_budget_does_not_fuse(self, mock_exec, _mock_started):
+        from services.orchestrator import _fused_targets, execute_node_job
+
+        seen = []
+        mock_exec.side_effect = lambda *a, **k: seen.append(_fused_targets.get())
+        with patch("services.orchestrator.settings.FUSED_EXECUTION_MAX_NODES", 0):
+            execute_node_job("exec-1", "n1")
+
+        assert seen == [None]
+
+    @patch("services.orchestrator._mark_job_started")
+    @patch("services.orchestrator._queue")
+    @patch("services.orchestrator._execute_node")
+    def test_affinity_has_its_own_budget(self, mock_exec, mock_queue_fn, _mock_started):
+        from services.orchestrator import _fused_targets, _kept_targets, execute_node_job
+
+        mock_q = MagicMock()
+        mock_queue_fn.return_value = mock_q
+        seen = []
+
+        def run(execution_id, node_id, retry_count=0, loop_iteration=None):
+            seen.append(_fused_targets.get())
+            _kept_targets.get().append((f"{node_id}+", None))
+
+        mock_exec.side_effect = run
+        with (
+            patch("services.orchestrator.settings.FUSED_EXECUTION_MAX_NODES", 0),
+            patch("services.orchestrator.settings.EXECUTION_AFFINITY", True),
+            patch("services.orchestrator.settings.EXECUTION_AFFINITY_MAX_NODES", 2),
+        ):
+            execute_node_job("exec-1", "n1")
+
+        # Kept without any fusion budget, and handed back once over its own
+        assert seen == [None, None, None]
+        assert mock_exec.call_count == 3
+        assert mock_q.enqueue.call_args[0][2] == "n1+++"
+
+
 # ── _finalize ─────────────────────────────────────────────────────────────────
 
 class TestFinalize:
+    @patch("services.orchestrator._execution_logs")
     @patch("services.orchestrator._cleanup_redis")
     @patch("services.orchestrator._complete_episode")
     @patch("services.orchestrator._get_workflow_slug", return_value="wf")
     @patch("services.orchestrator._publish_event")
     @patch("services.orchestrator.load_state")
-    def test_basic(self, mock_load_state, mock_pub, mock_slug, mock_episode, mock_cleanup):
+    def test_basic(self, mock_load_state, mock_pub, mock_slug, mock_episode, mock_cleanup, mock_logs):
         from services.orchestrator import _finalize
 
         mock_load_state.return_value = {"output": "final result", "messages": []}
@@ -808,6 +1150,29 @@ class TestFinalize:
         mock_delivery.deliver.assert_called_once()
         mock_cleanup.assert_called_once()
 
+    @patch("services.orchestrator._execution_logs")
+    @patch("services.orchestrator._cleanup_redis")
+    @patch("services.orchestrator._complete_episode")
+    @patch("services.orchestrator._get_workflow_slug", return_value="wf")
+    @patch("services.orchestrator._publish_event")
+    @patch("services.orchestrator.load_state")
+    def test_log_wait_failure_still_completes(self, mock_load_state, mock_pub, mock_slug, mock_episode, mock_cleanup, mock_logs):
+        from services.orchestrator import _finalize
+
+        mock_load_state.return_value = {"output": "final result", "messages": []}
+        mock_logs.wait_for_execution.side_effect = ConnectionError("redis down")
+
+        mock_db = MagicMock()
+        mock_execution = MagicMock()
+        mock_execution.status = "running"
+        mock_db.query.return_value.filter.return_value.first.return_value = mock_execution
+
+        with patch("services.delivery.output_delivery"):
+            _finalize("exec-1", mock_db)
+
+        assert mock_execution.status == "completed"
+        mock_cleanup.assert_called_once()
+
     @patch("services.orchestrator.load_state")
     def test_already_completed(self, mock_load_state):
         from services.orchestrator import _finalize
@@ -821,6 +1186,7 @@ class TestFinalize:
         # Should not re-complete
         mock_load_state.assert_not_called()
 
+    @patch("services.orchestrator._execution_logs")
     @patch("services.orchestrator._cleanup_redis")
     @patch("services.orchestrator._complete_episode")
     @patch("services.orchestrator._get_workflow_slug", return_value="wf")
@@ -828,7 +1194,7 @@ class TestFinalize:
     @patch("services.orchestrator.load_state")
     def test_child_cost_rollup(
         self, mock_load_state, mock_pub, mock_slug,
-        mock_episode, mock_cleanup,
+        mock_episode, mock_cleanup, mock_logs,
     ):
         from services.orchestrator import _finalize
 
@@ -901,6 +1267,7 @@ class TestFinalize:
         assert summary["total_cost_usd"] == pytest.approx(0.01 + 0.005 + 0.003)
         assert summary["llm_calls"] == 2 + 1 + 1  # parent(2) + child1(1) + child2(1)
 
+    @patch("services.orchestrator._execution_logs")
     @patch("services.orchestrator._cleanup_redis")
     @patch("services.orchestrator._complete_episode")
     @patch("services.orchestrator._get_workflow_slug", return_value="wf")
@@ -908,7 +1275,7 @@ class TestFinalize:
     @patch("services.orchestrator.load_state")
     def test_child_cost_rollup_exception_logged(
         self, mock_load_state, mock_pub, mock_slug,
-        mock_episode, mock_cleanup,
+        mock_episode, mock_cleanup, mock_logs,
     ):
         from services.orchestrator import _finalize
 
@@ -9,6 +9,8 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from tests.redis_mocks import forward_pipeline
+
 
 # ── Redis key helpers ─────────────────────────────────────────────────────────
 
@@ -41,6 +43,14 @@ class TestRedisKeyHelpers:
         from services.orchestrator import _inflight_key
         assert _inflight_key("exec-1") == "execution:exec-1:inflight"
 
+    def test_node_outputs_key(self):
+        from services.orchestrator import _node_outputs_key
+        assert _node_outputs_key("exec-1") == "execution:exec-1:node_outputs"
+
+    def test_node_results_key(self):
+        from services.orchestrator import _node_results_key
+        assert _node_results_key("exec-1") == "execution:exec-1:node_results"
+
     def test_loop_key(self):
         from services.orchestrator import _loop_key
         assert _loop_key("exec-1", "loop_1") == "execution:exec-1:loop:loop_1"
@@ -57,38 +67,240 @@ class TestRedisKeyHelpers:
 # ── State helpers ─────────────────────────────────────────────────────────────
 
 class TestStateHelpers:
-    @patch("services.orchestrator._redis")
-    def test_load_state_empty(self, mock_redis_fn):
+    @pytest.fixture
+    def fake_redis(self):
+        import fakeredis
+
+        r = fakeredis.FakeRedis(decode_responses=True)
+        with patch("services.orchestrator._redis", return_value=r):
+            yield r
+
+    def test_load_state_empty(self, fake_redis):
         from services.orchestrator import load_state
-        mock_r = MagicMock()
-        mock_r.get.return_value = None
-        mock_redis_fn.return_value = mock_r
 
         result = load_state("exec-1")
         assert result == {}
 
-    @patch("services.orchestrator._redis")
-    def test_load_and_save_roundtrip(self, mock_redis_fn):
+    def test_load_and_save_roundtrip(self, fake_redis):
         from services.orchestrator import load_state, save_state
 
-        stored = {}
-        mock_r = MagicMock()
-
-        def mock_set(key, value, **kwargs):
-            stored["data"] = value
-
-        def mock_get(key):
-            return stored.get("data")
-
-        mock_r.set.side_effect = mock_set
-        mock_r.get.side_effect = mock_get
-        mock_redis_fn.return_value = mock_r
-
         save_state("exec-1", {"route": "a", "node_outputs": {"n1": {"output": "hi"}}})
         result = load_state("exec-1")
         assert result["route"] == "a"
         assert result["node_outputs"]["n1"]["output"] == "hi"
 
+    def test_messages_roundtrip(self, fake_redis):
+        from langchain_core.messages import AIMessage, HumanMessage
+        from services.orchestrator import load_state, save_state
+
+        save_state("exec-1", {"messages": [HumanMessage(content="hi")], "node_outputs": {}})
+        state = load_state("exec-1")
+        state["messages"] = state["messages"] + [AIMessage(content="hello")]
+        save_state("exec-1", state)
+
+        assert [m.content for m in load_state("exec-1")["messages"]] == ["hi", "hello"]
+
+    def test_new_messages_are_appended_to_the_log(self, fake_redis):
+        from langchain_core.messages import AIMessage, HumanMessage
+        from services import state_codec
+        from services.orchestrator import _messages_key, _state_key, load_state, save_state
+
+        save_state("exec-1", {"messages": [HumanMessage(content="hi", id="m1")], "route": ""})
+        state = load_state("exec-1")
+        state["messages"] = state["messages"] + [AIMessage(content="hello", id="m2")]
+        delta = save_state("exec-1", state)
+
+        assert list(delta) == ["messages_appended"]
+        assert [state_codec.decode(m)["data"]["id"] for m in delta["messages_appended"]] == ["m2"]
+        assert fake_redis.llen(_messages_key("exec-1")) == 2
+        assert not fake_redis.hexists(_state_key("exec-1"), "messages")
+        assert save_state("exec-1", state) == {}
+
+    def test_messages_can_be_left_out(self, fake_redis):
+        from langchain_core.messages import AIMessage, HumanMessage
+        from services.orchestrator import load_state, save_state
+
+        save_state("exec-1", {"messages": [HumanMessage(content="hi")], "route": ""})
+        state = load_state("exec-1", messages=False)
+        assert "messages" not in state
+
+        # A node that never read the conversation can still add to it
+        state["route"] = "a"
+        state["messages"] = state.get("messages", []) + [AIMessage(content="hello")]
+        save_state("exec-1", state)
+
+        assert [m.content for m in load_state("exec-1")["messages"]] == ["hi", "hello"]
+        assert [m.content for m in load_state("exec-1", fields=("messages",))["messages"]] == ["hi", "hello"]
+
+    def test_parallel_branches_both_append(self, fake_redis):
+        from langchain_core.messages import AIMessage, HumanMessage
+        from services.orchestrator import load_state, save_state
+
+        save_state("exec-1", {"messages": [HumanMessage(content="hi")]})
+        branch_a = load_state("exec-1")
+        branch_b = load_state("exec-1")
+        branch_a["messages"] = branch_a["messages"] + [AIMessage(content="A")]
+        branch_b["messages"] = branch_b["messages"] + [AIMessage(content="B")]
+        save_state("exec-1", branch_a)
+        save_state("exec-1", branch_b)
+
+        assert [m.content for m in load_state("exec-1")["messages"]] == ["hi", "A", "B"]
+
+    def test_rewritten_conversation_replaces_the_log(self, fake_redis):
+        from langchain_core.messages import HumanMessage
+        from services.orchestrator import load_state, save_state
+
+        save_state("exec-1", {"messages": [HumanMessage(content="a"), HumanMessage(content="b")]})
+        state = load_state("exec-1")
+        state["messages"] = state["messages"][1:]
+        delta = save_state("exec-1", state)
+
+        assert "messages" in delta
+        assert [m.content for m in load_state("exec-1")["messages"]] == ["b"]
+
+    def test_messages_in_the_state_hash_move_to_the_log(self, fake_redis):
+        from langchain_core.messages import AIMessage, HumanMessage, messages_to_dict
+        from services.orchestrator import _messages_key, _state_key, load_state, save_state
+
+        fake_redis.hset(_state_key("exec-1"), mapping={
+            "messages": json.dumps(messages_to_dict([HumanMessage(content="hi")])),
+            "route": json.dumps(""),
+        })
+        state = load_state("exec-1", messages=False)
+        assert [m.content for m in state["messages"]] == ["hi"]
+        state["messages"] = state["messages"] + [AIMessage(content="hello")]
+        save_state("exec-1", state)
+
+        assert not fake_redis.hexists(_state_key("exec-1"), "messages")
+        assert fake_redis.llen(_messages_key("exec-1")) == 2
+        assert [m.content for m in load_state("exec-1")["messages"]] == ["hi", "hello"]
+
+    def test_save_writes_only_changed_fields(self, fake_redis):
+        from services import state_codec
+        from services.orchestrator import _node_outputs_key, _state_key, load_state, save_state
+
+        save_state("exec-1", {"route": "a", "plan": [1, 2], "node_outputs": {"n1": {"output": "x"}}})
+        state = load_state("exec-1")
+        state["route"] = "b"
+        state["node_outputs"]["n2"] = {"output": "y"}
+
+        with patch.object(fake_redis, "pipeline", wraps=fake_redis.pipeline) as mock_pipeline:
+            save_state("exec-1", state)
+        assert mock_pipeline.call_count == 1
+        assert fake_redis.hgetall(_state_key("exec-1")) == {
+            "route": state_codec.encode("b"), "plan": state_codec.encode([1, 2]),
+        }
+        assert set(fake_redis.hkeys(_node_outputs_key("exec-1"))) == {"n1", "n2"}
+
+    def test_save_removes_popped_keys(self, fake_redis):
+        from services.orchestrator import load_state, save_state
+
+        save_state("exec-1", {"loop": {"index": 0}, "_resume_input": "yes", "node_outputs": {}})
+        state = load_state("exec-1")
+        state.pop("loop")
+        save_state("exec-1", state)
+        state.pop("_resume_input")
+        save_state("exec-1", state)
+
+        reloaded = load_state("exec-1")
+        assert "loop" not in reloaded
+        assert "_resume_input" not in reloaded
+
+    def test_parallel_branches_merge_node_outputs(self, fake_redis):
+        from services.orchestrator import load_state, save_state
+
+        save_state("exec-1", {"node_outputs": {"start": {"output": 0}}})
+        branch_a = load_state("exec-1")
+        branch_b = load_state("exec-1")
+        branch_a["node_outputs"]["a"] = {"output": "A"}
+        branch_a["node_results"] = {"a": {"status": "success"}}
+        branch_b["node_outputs"]["b"] = {"output": "B"}
+        branch_b["node_results"] = {"b": {"status": "success"}}
+        save_state("exec-1", branch_a)
+        save_state("exec-1", branch_b)
+
+        state = load_state("exec-1")
+        assert set(state["node_outputs"]) == {"start", "a", "b"}
+        assert set(state["node_results"]) == {"a", "b"}
+
+    def test_partial_load(self, fake_redis):
+        from services.orchestrator import load_node_outputs, load_state, save_state
+
+        save_state("exec-1", {
+            "_execution_token_usage": {"total_tokens": 5},
+            "route": "a",
+            "node_outputs": {"n1": {"output": 1}, "n2": {"output": 2}},
+        })
+
+        assert load_state("exec-1", fields=("_execution_token_usage", "missing")) == {
+            "_execution_token_usage": {"total_tokens": 5},
+        }
+        assert load_state("exec-1", fields=("node_outputs",)) == {
+            "node_outputs": {"n1": {"output": 1}, "n2": {"output": 2}},
+        }
+        assert load_node_outputs("exec-1", ["n2", "n3"]) == {"n2": {"output": 2}}
+
+    def test_affinity_reuses_the_state_this_worker_saved(self, fake_redis):
+        from services.orchestrator import _remember_state, load_state, save_state
+        from services.redis_pool import _CountingRedis, count_commands
+
+        save_state("exec-1", {"route": "", "node_outputs": {}})
+        state = load_state("exec-1")
+        state["node_outputs"]["n1"] = {"output": "x"}
+        save_state("exec-1", state)
+
+        with patch("services.orchestrator.settings.EXECUTION_AFFINITY", True):
+            _remember_state("exec-1", state)
+            counting = _CountingRedis(connection_pool=fake_redis.connection_pool)
+            with patch("services.orchestrator._redis", return_value=counting), count_commands() as counter:
+                hot = load_state("exec-1")
+            # Taken out on use: a second load reads Redis
+            reloaded = load_state("exec-1")
+
+        assert hot is state
+        assert counter.commands == 1
+        assert reloaded is not state
+        assert reloaded == hot
+
+    def test_affinity_ignores_state_written_elsewhere_since(self, fake_redis):
+        from services.orchestrator import _remember_state, load_state, save_state
+
+        save_state("exec-1", {"route": "", "node_outputs": {}})
+        state = load_state("exec-1")
+        other = load_state("exec-1")
+        save_state("exec-1", state)
+        other["node_outputs"]["b"] = {"output": "B"}
+        save_state("exec-1", other)
+
+        with patch("services.orchestrator.settings.EXECUTION_AFFINITY", True):
+            # Saved after another worker's write: never remembered as current
+            _remember_state("exec-1", other)
+            assert load_state("exec-1") is not other
+            # Current when saved, but another worker has written since
+            state = load_state("exec-1")
+            save_state("exec-1", state)
+            _remember_state("exec-1", state)
+            save_state("exec-1", {"route": "c"})
+            reloaded = load_state("exec-1")
+
+        assert reloaded is not state
+        assert reloaded["route"] == "c"
+        assert set(reloaded["node_outputs"]) == {"b"}
+
+    def test_affinity_reloads_messages_left_out(self, fake_redis):
+        from langchain_core.messages import HumanMessage
+        from services.orchestrator import _remember_state, load_state, save_state
+
+        save_state("exec-1", {"messages": [HumanMessage(content="hi")], "route": ""})
+        with patch("services.orchestrator.settings.EXECUTION_AFFINITY", True):
+            state = load_state("exec-1", messages=False)
+            save_state("exec-1", state)
+            _remember_state("exec-1", state)
+            reloaded = load_state("exec-1")
+
+        assert reloaded is not state
+        assert [m.content for m in reloaded["messages"]] == ["hi"]
+
 
 # ── _safe_json ────────────────────────────────────────────────────────────────
 
@@ -262,6 +474,7 @@ class TestBuildInitialState:
 
 # ── _write_log ────────────────────────────────────────────────────────────────
 
+@pytest.mark.usefixtures("sync_execution_logs")
 class TestWriteLog:
     def test_writes_log(self, db):
         from services.orchestrator import _write_log
@@ -324,12 +537,13 @@ class TestWriteLog:
 
 # ── _publish_event ────────────────────────────────────────────────────────────
 
+@pytest.mark.usefixtures("sync_events")
 class TestPublishEvent:
     @patch("services.orchestrator._redis")
     def test_publishes_to_execution_channel(self, mock_redis_fn):
         from services.orchestrator import _publish_event
 
-        mock_r = MagicMock()
+        mock_r = forward_pipeline(MagicMock())
         mock_redis_fn.return_value = mock_r
 
         _publish_event("exec-1", "node_status", {"node_id": "n1"})
@@ -344,7 +558,7 @@ class TestPublishEvent:
     def test_publishes_to_workflow_channel(self, mock_redis_fn):
         from services.orchestrator import _publish_event
 
-        mock_r = MagicMock()
+        mock_r = forward_pipeline(MagicMock())
         mock_redis_fn.return_value = mock_r
 
         _publish_event("exec-1", "node_status", {"node_id": "n1"}, workflow_slug="my-wf")
@@ -353,66 +567,188 @@ class TestPublishEvent:
         second_call = mock_r.publish.call_args_list[1]
         assert second_call[0][0] == "workflow:my-wf"
 
+    def test_workflow_payload_matches_separate_encoding(self):
+        from services.orchestrator import _event_messages
 
-# ── _save_topology / _load_topology ──────────────────────────────────────────
+        (_, exec_raw), (_, wf_raw) = _event_messages("exec-1", "node_status", {"node_id": "n1"}, "my-wf")
+        payload = json.loads(exec_raw)
+        assert wf_raw == json.dumps({**payload, "channel": "workflow:my-wf"})
 
-class TestTopologyStorage:
+    @patch("services.orchestrator._get_parent_info")
     @patch("services.orchestrator._redis")
-    def test_save_and_load(self, mock_redis_fn):
-        from services.orchestrator import _save_topology, _load_topology
+    def test_parent_lineage_looked_up_once_per_execution(self, mock_redis_fn, mock_get_parent):
+        from services.orchestrator import _publish_event
+
+        mock_redis_fn.return_value = forward_pipeline(MagicMock())
+        mock_get_parent.return_value = None
+
+        for status in ("running", "success"):
+            _publish_event("exec-1", "node_status", {"node_id": "n1", "status": status})
+
+        mock_get_parent.assert_called_once_with("exec-1")
+
 
-        stored = {}
+class TestEventPublisher:
+    def test_buffers_until_flush_in_one_pipeline(self):
+        from services.events import EventPublisher
+
+        mock_r = MagicMock()
+        publisher = EventPublisher(lambda: mock_r, interval=60)
+        publisher.publish([("execution:e", "a")])
+        publisher.publish([("execution:e", "b"), ("workflow:w", "b2")])
+        mock_r.pipeline.assert_not_called()
+
+        publisher.publish([("execution:e", "done")], flush=True)
+        mock_r.pipeline.assert_called_once_with(transaction=False)
+        pipe = mock_r.pipeline.return_value
+        assert [c[0] for c in pipe.publish.call_args_list] == [
+            ("execution:e", "a"), ("execution:e", "b"), ("workflow:w", "b2"), ("execution:e", "done"),
+        ]
+        pipe.execute.assert_called_once()
+
+    def test_background_thread_flushes_after_interval(self):
+        import threading
+        from services.events import EventPublisher
+
+        flushed = threading.Event()
         mock_r = MagicMock()
+        mock_r.pipeline.return_value.execute.side_effect = lambda: flushed.set()
+        publisher = EventPublisher(lambda: mock_r, interval=0.01)
+        publisher.publish([("execution:e", "a")])
 
-        def mock_set(key, value, **kwargs):
-            stored[key] = value
+        assert flushed.wait(5)
+        mock_r.pipeline.return_value.publish.assert_called_once_with("execution:e", "a")
 
-        def mock_get(key):
-            return stored.get(key)
 
-        mock_r.set.side_effect = mock_set
-        mock_r.get.side_effect = mock_get
-        mock_redis_fn.return_value = mock_r
+# ── _save_topology / _load_topology ──────────────────────────────────────────
 
-        topo = SimpleNamespace(
-            workflow_slug="my-wf",
-            entry_node_ids=["trigger_1"],
-            nodes={
-                "trigger_1": SimpleNamespace(
-                    node_id="trigger_1",
-                    component_type="trigger_manual",
-                    db_id=1,
-                    component_config_id=1,
-                    interrupt_before=False,
-                    interrupt_after=False,
-                ),
-            },
-            edges_by_source={
-                "trigger_1": [
-                    SimpleNamespace(
-                        source_node_id="trigger_1",
-                        target_node_id="agent_1",
-                        edge_type="direct",
-                        edge_label="",
-                        condition_mapping=None,
-                        condition_value="",
-                        priority=0,
-                    )
-                ],
-            },
-            incoming_count={"agent_1": 1},
-            loop_bodies={},
-            loop_return_nodes={},
-            loop_body_all_nodes={},
-        )
+def _storage_topo(slug="my-wf"):
+    return SimpleNamespace(
+        workflow_slug=slug,
+        entry_node_ids=["trigger_1"],
+        nodes={
+            "trigger_1": SimpleNamespace(
+                node_id="trigger_1",
+                component_type="trigger_manual",
+                db_id=1,
+                component_config_id=1,
+                interrupt_before=False,
+                interrupt_after=False,
+            ),
+        },
+        edges_by_source={
+            "trigger_1": [
+                SimpleNamespace(
+                    source_node_id="trigger_1",
+                    target_node_id="agent_1",
+                    edge_type="direct",
+                    edge_label="",
+                    condition_mapping=None,
+                    condition_value="",
+                    priority=0,
+                )
+            ],
+        },
+        incoming_count={"agent_1": 1},
+        loop_bodies={},
+        loop_return_nodes={},
+        loop_body_all_nodes={},
+    )
+
+
+class TestTopologyStorage:
+    @pytest.fixture
+    def fake_r(self):
+        import fakeredis
+
+        from services import orchestrator
+
+        r = fakeredis.FakeRedis(decode_responses=True)
+        orchestrator._topology_memo.clear()
+        with patch("services.orchestrator._redis", return_value=r), \
+             patch("services.redis_pool.get_redis", return_value=r):
+            yield r
+        orchestrator._topology_memo.clear()
+
+    @patch("services.orchestrator.build_topology")
+    def test_save_and_load(self, mock_build, fake_r):
+        from services.orchestrator import _compiled_topology, _load_topology, _save_topology
+
+        mock_build.return_value = _storage_topo()
+        key, data = _compiled_topology(SimpleNamespace(id=7), MagicMock(), 3)
+        _save_topology("exec-1", key)
 
-        _save_topology("exec-1", topo)
+        assert key == "topology:7:3:v0"
+        assert fake_r.get("execution:exec-1:topo") == key
         result = _load_topology("exec-1")
+        assert result == data
         assert result["workflow_slug"] == "my-wf"
         assert result["entry_node_ids"] == ["trigger_1"]
         assert "trigger_1" in result["nodes"]
         assert result["incoming_count"]["agent_1"] == 1
 
+    @patch("services.orchestrator.build_topology")
+    def test_compiled_topology_shared_until_invalidated(self, mock_build, fake_r):
+        from services.orchestrator import _compiled_topology
+        from services.topology import invalidate_topology_cache
+
+        wf = SimpleNamespace(id=7)
+        mock_build.return_value = _storage_topo()
+        first, _ = _compiled_topology(wf, MagicMock(), None)
+        second, _ = _compiled_topology(wf, MagicMock(), None)
+        assert first == second
+        assert mock_build.call_count == 1
+
+        invalidate_topology_cache(7)
+        mock_build.return_value = _storage_topo(slug="renamed")
+        third, data = _compiled_topology(wf, MagicMock(), None)
+        assert third != first
+        assert data["workflow_slug"] == "renamed"
+        assert mock_build.call_count == 2
+
+    @patch("services.orchestrator.build_topology")
+    def test_reads_do_not_extend_the_entry(self, mock_build, fake_r):
+        from services.orchestrator import _compiled_topology
+        from services.topology import TOPOLOGY_CACHE_TTL
+
+        mock_build.return_value = _storage_topo()
+        key, _ = _compiled_topology(SimpleNamespace(id=7), MagicMock(), None)
+        fake_r.expire(key, TOPOLOGY_CACHE_TTL - 600)
+
+        _compiled_topology(SimpleNamespace(id=7), MagicMock(), None)
+
+        assert fake_r.ttl(key) <= TOPOLOGY_CACHE_TTL - 600
+        assert mock_build.call_count == 1
+
+    @patch("services.orchestrator.build_topology")
+    def test_entry_about_to_expire_is_rebuilt(self, mock_build, fake_r):
+        from services.orchestrator import _compiled_topology
+        from services.topology import TOPOLOGY_CACHE_TTL
+
+        mock_build.return_value = _storage_topo()
+        key, _ = _compiled_topology(SimpleNamespace(id=7), MagicMock(), None)
+        fake_r.expire(key, 60)
+
+        _compiled_topology(SimpleNamespace(id=7), MagicMock(), None)
+
+        assert mock_build.call_count == 2
+        assert fake_r.ttl(key) > TOPOLOGY_CACHE_TTL - 60
+
+    def test_load_reads_legacy_inline_copy(self, fake_r):
+        import json
+
+        from services.orchestrator import _load_topology
+
+        fake_r.set("execution:exec-1:topo", json.dumps({"workflow_slug": "old", "nodes": {}}))
+        assert _load_topology("exec-1")["workflow_slug"] == "old"
+
+    def test_load_missing_shared_entry_raises(self, fake_r):
+        from services.orchestrator import _load_topology
+
+        fake_r.set("execution:exec-1:topo", "topology:7:all:v0")
+        with pytest.raises(RuntimeError, match="not found"):
+            _load_topology("exec-1")
+
     @patch("services.orchestrator._redis")
     def test_load_missing_raises(self, mock_redis_fn):
         from services.orchestrator import _load_topology
@@ -429,26 +765,47 @@ class TestTopologyStorage:
 
 class TestCleanupRedis:
     @patch("services.orchestrator._redis")
-    def test_deletes_keys(self, mock_redis_fn):
-        from services.orchestrator import _cleanup_redis
+    def test_unlinks_tracked_keys_without_scanning(self, mock_redis_fn):
+        from services.orchestrator import _cleanup_redis, _fixed_keys
 
         mock_r = MagicMock()
-        mock_r.keys.return_value = ["execution:e1:state", "execution:e1:topo"]
+        mock_r.smembers.return_value = {"execution:e1:loop:l1", "execution:e1:fanin:m1"}
         mock_redis_fn.return_value = mock_r
 
         _cleanup_redis("e1")
-        mock_r.delete.assert_called_once_with("execution:e1:state", "execution:e1:topo")
+        mock_r.keys.assert_not_called()
+        mock_r.smembers.assert_called_once_with("execution:e1:keys")
+        unlinked = mock_r.unlink.call_args[0]
+        assert set(unlinked) == {*_fixed_keys("e1"), "execution:e1:loop:l1", "execution:e1:fanin:m1"}
+
+    def test_fixed_keys_cover_execution_scoped_helpers(self):
+        from services.orchestrator import _fixed_keys
+
+        keys = _fixed_keys("e1")
+        assert "execution:e1:state" in keys
+        assert "execution:e1:node_outputs" in keys
+        assert "execution:e1:log_pending" in keys
+        assert "execution:e1:keys" in keys
+        assert all(k.startswith("execution:e1:") for k in keys)
+
+    def test_created_keys_are_tracked(self):
+        import fakeredis
+        from services.orchestrator import (
+            _cleanup_redis, _init_loop_state, _record_loop_iteration_output, save_state,
+        )
 
-    @patch("services.orchestrator._redis")
-    def test_no_keys(self, mock_redis_fn):
-        from services.orchestrator import _cleanup_redis
+        r = fakeredis.FakeRedis(decode_responses=True)
+        with patch("services.orchestrator._redis", return_value=r):
+            save_state("e1", {"node_outputs": {"a": 1}, "route": ""})
+            _init_loop_state("e1", "loop_1", [1, 2], next_index=1)
+            _record_loop_iteration_output("e1", "loop_1", 0, "body", {"ok": True})
+            r.set("execution:e2:state", "other")
+            assert r.keys("execution:e1:*")
 
-        mock_r = MagicMock()
-        mock_r.keys.return_value = []
-        mock_redis_fn.return_value = mock_r
+            _cleanup_redis("e1")
 
-        _cleanup_redis("e1")
-        mock_r.delete.assert_not_called()
+        assert r.keys("execution:e1:*") == []
+        assert r.get("execution:e2:state") == "other"
 
 
 # ── _get_workflow_slug ────────────────────────────────────────────────────────
@@ -634,16 +991,18 @@ class TestEpisodeHelpers:
 # ── _queue ───────────────────────────────────────────────────────────────────
 
 class TestQueueHelper:
-    @patch("services.orchestrator.redis_lib.from_url")
-    def test_queue_returns_queue(self, mock_from_url):
+    @patch("services.orchestrator.get_redis_binary")
+    def test_queue_returns_queue(self, mock_get_redis_binary):
         from services.orchestrator import _queue
 
         mock_conn = MagicMock()
-        mock_from_url.return_value = mock_conn
+        mock_get_redis_binary.return_value = mock_conn
 
         q = _queue()
         assert q is not None
-        mock_from_url.assert_called_once()
+        assert q.connection is mock_conn
+        # Same pool — the Queue (and RQ's cached server version) is reused
+        assert _queue() is q
 
 
 # ── _get_node_meta ───────────────────────────────────────────────────────────
@@ -710,10 +1069,12 @@ class TestStartExecutionErrorPaths:
         mock_wf = MagicMock()
         mock_wf.slug = "test"
 
-        # Make build_topology fail
+        # Make build_topology fail; cleanup (which opens sessions of its own) is mocked
         with patch("database.SessionLocal", return_value=mock_session), \
-             patch("services.orchestrator.build_topology", side_effect=ValueError("no nodes")):
+             patch("services.orchestrator.build_topology", side_effect=ValueError("no nodes")), \
+             patch("services.orchestrator._cleanup_redis") as mock_cleanup:
             start_execution(execution_id, db=None)
 
         # Should close the session it created
         mock_session.close.assert_called_once()
+        mock_cleanup.assert_called_once_with(execution_id)
@@ -7,6 +7,8 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from tests.redis_mocks import forward_pipeline
+
 
 def _mock_redis():
     """Return a mock Redis client with common methods."""
@@ -20,7 +22,7 @@ def _mock_redis():
     r.sadd.return_value = 1
     r.smembers.return_value = set()
     r.keys.return_value = []
-    return r
+    return forward_pipeline(r)
 
 
 # ── _advance_loop_body ───────────────────────────────────────────────────────
@@ -44,7 +46,9 @@ class TestAdvanceLoopBody:
         _advance_loop_body("exec-1", "loop_1", topo_data, "wf", iter_index=0)
 
         assert mock_q.enqueue.call_count == 2
-        assert mock_r.incr.call_count == 2  # inflight for each body target
+        # Inflight for both body targets in one command, on one pipeline
+        mock_r.incrby.assert_called_once_with("execution:exec-1:inflight", 2)
+        assert mock_r.pipeline.call_count == 1
 
     @patch("services.orchestrator._publish_event")
     @patch("services.orchestrator._queue")
@@ -63,9 +67,47 @@ class TestAdvanceLoopBody:
         }
         _advance_loop_body("exec-1", "loop_1", topo_data, "wf", iter_index=0, delay_seconds=5.0)
 
-        mock_q.enqueue_in.assert_called_once()
+        mock_q.create_job.assert_called_once()
         mock_q.enqueue.assert_not_called()
 
+    @pytest.mark.parametrize("delay_seconds", [None, 5.0])
+    @patch("services.orchestrator._publish_event")
+    def test_iteration_is_one_round_trip(self, mock_pub, delay_seconds):
+        import fakeredis
+        import redis
+        from rq import Queue
+        from rq.registry import ScheduledJobRegistry
+
+        from services.orchestrator import _advance_loop_body, _inflight_key, _jobs_key
+        from services.redis_pool import _CountingRedis, count_commands
+
+        server = fakeredis.FakeServer()
+
+        def client(decode):
+            return _CountingRedis(connection_pool=redis.ConnectionPool(
+                connection_class=fakeredis.FakeRedisConnection, server=server, decode_responses=decode,
+            ))
+
+        r = client(True)
+        q = Queue("workflows", connection=client(False))
+        q.get_redis_server_version()  # cached per Queue, as _queue() reuses it
+        targets = [f"body_{i}" for i in range(20)]
+        topo_data = {"loop_bodies": {"loop_1": targets}, "workflow_slug": "wf"}
+
+        with patch("services.orchestrator._redis", return_value=r), \
+             patch("services.orchestrator._queue", return_value=q), \
+             count_commands() as counter:
+            _advance_loop_body("exec-1", "loop_1", topo_data, "wf", iter_index=3, delay_seconds=delay_seconds)
+
+        assert counter.round_trips == 1
+        assert r.get(_inflight_key("exec-1")) == "20"
+        assert r.scard(_jobs_key("exec-1")) == 20
+        if delay_seconds:
+            assert len(ScheduledJobRegistry(queue=q).get_job_ids()) == 20
+        else:
+            assert sorted(job.args[1] for job in q.get_jobs()) == sorted(targets)
+            assert {job.args[3] for job in q.get_jobs()} == {3}
+
 
 # ── _check_loop_body_done ────────────────────────────────────────────────────
 
@@ -145,112 +187,120 @@ class TestCheckLoopBodyDone:
 
 # ── _loop_next_iteration ─────────────────────────────────────────────────────
 
+@pytest.fixture
+def fake_redis():
+    """Provide a fakeredis instance so loop bookkeeping runs real list/hash ops."""
+    import fakeredis
+
+    r = fakeredis.FakeRedis(decode_responses=True)
+    with patch("services.orchestrator._redis", return_value=r):
+        yield r
+
+
+def _seed_loop(r, items: list, next_index: int, iter_outputs: dict | None = None, iter_index: int = 0) -> None:
+    from services.orchestrator import _init_loop_state, _loop_iter_outputs_key
+
+    _init_loop_state("exec-1", "loop_1", items, next_index)
+    for nid, out in (iter_outputs or {}).items():
+        r.hset(_loop_iter_outputs_key("exec-1", "loop_1", iter_index), nid, json.dumps(out))
+
+
+def _stored_results(r) -> dict:
+    from services.orchestrator import _loop_results_key
+
+    return {int(i): json.loads(raw) for i, raw in r.hgetall(_loop_results_key("exec-1", "loop_1")).items()}
+
+
 class TestLoopNextIteration:
     @patch("services.orchestrator._advance_loop_body")
     @patch("services.orchestrator.save_state")
     @patch("services.orchestrator.load_state")
-    @patch("services.orchestrator._redis")
-    def test_advances_to_next_item(self, mock_redis_fn, mock_load_state, mock_save_state, mock_advance_loop):
-        from services.orchestrator import _loop_next_iteration
+    def test_advances_to_next_item(self, mock_load_state, mock_save_state, mock_advance_loop, fake_redis):
+        from services.orchestrator import _loop_key, _loop_next_iteration
 
-        mock_r = _mock_redis()
-        mock_r.get.return_value = json.dumps({
-            "items": ["a", "b", "c"], "index": 0, "results": [],
-            "body_targets": ["body_a"],
-        })
-        mock_redis_fn.return_value = mock_r
-        mock_load_state.return_value = {"node_outputs": {"body_a": {"out": 1}}, "_loop_errors": {}}
+        _seed_loop(fake_redis, ["a", "b", "c"], 1, {"body_a": {"out": 1}})
 
         topo_data = {
+            "loop_bodies": {"loop_1": ["body_a"]},
             "loop_return_nodes": {},
             "workflow_slug": "wf",
         }
-        _loop_next_iteration("exec-1", "loop_1", topo_data, MagicMock())
+        _loop_next_iteration("exec-1", "loop_1", topo_data, MagicMock(), iter_index=0)
 
-        # Should advance to next iteration (index 1)
+        # Should launch the next iteration (index 1)
         mock_advance_loop.assert_called_once()
-        # Should save state with loop context
-        saved_state = mock_save_state.call_args[0][1]
-        assert saved_state["loop"]["index"] == 1
-        assert saved_state["loop"]["item"] == "b"
+        assert mock_advance_loop.call_args[1]["iter_index"] == 1
+        assert _stored_results(fake_redis) == {0: {"body_a": {"out": 1}}}
+        counters = fake_redis.hgetall(_loop_key("exec-1", "loop_1"))
+        assert counters["next_index"] == "2"
+        assert counters["completed"] == "1"
+        mock_save_state.assert_not_called()
 
     @patch("services.orchestrator._advance")
     @patch("services.orchestrator.save_state")
     @patch("services.orchestrator.load_state")
-    @patch("services.orchestrator._redis")
-    def test_completes_loop(self, mock_redis_fn, mock_load_state, mock_save_state, mock_advance):
-        from services.orchestrator import _loop_next_iteration
+    def test_completes_loop(self, mock_load_state, mock_save_state, mock_advance, fake_redis):
+        from services.orchestrator import (
+            _loop_items_key, _loop_key, _loop_next_iteration, _loop_results_key,
+        )
 
-        mock_r = _mock_redis()
-        # Last item (index 1, 2 items total)
-        mock_r.get.return_value = json.dumps({
-            "items": ["a", "b"], "index": 1, "results": [{"body_a": {"out": 1}}],
-            "body_targets": ["body_a"],
-        })
-        mock_redis_fn.return_value = mock_r
-        mock_load_state.return_value = {"node_outputs": {"body_a": {"out": 2}}}
+        # Last item (index 1, 2 items total); iteration 0 already recorded
+        _seed_loop(fake_redis, ["a", "b"], 2, {"body_a": {"out": 2}}, iter_index=1)
+        fake_redis.hset(_loop_results_key("exec-1", "loop_1"), "0", json.dumps({"body_a": {"out": 1}}))
+        fake_redis.hset(_loop_key("exec-1", "loop_1"), "completed", 1)
+        mock_load_state.return_value = {"node_outputs": {}, "loop": {"item": "b", "index": 1, "total": 2}}
 
         topo_data = {
+            "loop_bodies": {"loop_1": ["body_a"]},
             "loop_return_nodes": {},
             "workflow_slug": "wf",
         }
-        _loop_next_iteration("exec-1", "loop_1", topo_data, MagicMock())
+        _loop_next_iteration("exec-1", "loop_1", topo_data, MagicMock(), iter_index=1)
 
         # Should advance via normal edges (loop complete)
         mock_advance.assert_called_once()
-        # loop_1 should have results in node_outputs
         saved_state = mock_save_state.call_args[0][1]
-        assert "results" in saved_state["node_outputs"]["loop_1"]
-        assert "loop" not in saved_state  # loop context cleared
+        assert saved_state["node_outputs"]["loop_1"]["results"] == [
+            {"body_a": {"out": 1}}, {"body_a": {"out": 2}},
+        ]
+        assert "loop" not in saved_state
+        # Loop bookkeeping is dropped once results are materialised
+        assert not fake_redis.exists(
+            _loop_key("exec-1", "loop_1"),
+            _loop_items_key("exec-1", "loop_1"),
+            _loop_results_key("exec-1", "loop_1"),
+        )
 
     @patch("services.orchestrator._advance_loop_body")
     @patch("services.orchestrator.save_state")
     @patch("services.orchestrator.load_state")
-    @patch("services.orchestrator._redis")
-    def test_handles_loop_errors(self, mock_redis_fn, mock_load_state, mock_save_state, mock_advance_loop):
+    def test_handles_loop_errors(self, mock_load_state, mock_save_state, mock_advance_loop, fake_redis):
         from services.orchestrator import _loop_next_iteration
 
-        mock_r = _mock_redis()
-        mock_r.get.return_value = json.dumps({
-            "items": ["a", "b"], "index": 0, "results": [],
-            "body_targets": ["body_a"],
-        })
-        mock_redis_fn.return_value = mock_r
-        mock_load_state.return_value = {
-            "node_outputs": {},
-            "_loop_errors": {
-                "loop_1": {"body_a": {"error": "failed", "error_code": "RuntimeError"}},
-            },
-        }
+        # on_error=continue records the error as the node's iteration output
+        _seed_loop(fake_redis, ["a", "b"], 1, {"body_a": {"error": "failed", "error_code": "RuntimeError"}})
 
         topo_data = {
+            "loop_bodies": {"loop_1": ["body_a"]},
             "loop_return_nodes": {},
             "workflow_slug": "wf",
         }
-        _loop_next_iteration("exec-1", "loop_1", topo_data, MagicMock())
+        _loop_next_iteration("exec-1", "loop_1", topo_data, MagicMock(), iter_index=0)
 
         # Errors should be captured in results
         mock_advance_loop.assert_called_once()
-        saved_state = mock_save_state.call_args[0][1]
-        # Loop errors for this iteration should be cleared
-        assert "loop_1" not in saved_state.get("_loop_errors", {})
+        assert _stored_results(fake_redis)[0] == {"body_a": {"error": "failed", "error_code": "RuntimeError"}}
 
     @patch("services.orchestrator._advance")
     @patch("services.orchestrator.save_state")
     @patch("services.orchestrator.load_state")
-    @patch("services.orchestrator._redis")
-    def test_complete_loop_with_delay(self, mock_redis_fn, mock_load_state, mock_save_state, mock_advance):
+    def test_complete_loop_with_delay(self, mock_load_state, mock_save_state, mock_advance, fake_redis):
         from services.orchestrator import _loop_next_iteration
 
-        mock_r = _mock_redis()
-        mock_r.get.return_value = json.dumps({
-            "items": ["a"], "index": 0, "results": [],
-            "body_targets": ["body_a"],
-        })
-        mock_redis_fn.return_value = mock_r
-        mock_load_state.return_value = {"node_outputs": {"body_a": {"out": 1}}}
+        _seed_loop(fake_redis, ["a"], 1, {"body_a": {"out": 1}})
+        mock_load_state.return_value = {"node_outputs": {}}
 
-        topo_data = {"loop_return_nodes": {}, "workflow_slug": "wf"}
+        topo_data = {"loop_bodies": {"loop_1": ["body_a"]}, "loop_return_nodes": {}, "workflow_slug": "wf"}
         _loop_next_iteration("exec-1", "loop_1", topo_data, MagicMock(), delay_seconds=2.0)
 
         mock_advance.assert_called_once()
@@ -258,6 +308,209 @@ class TestLoopNextIteration:
         _, kwargs = mock_advance.call_args
         assert kwargs.get("delay_seconds") == 2.0
 
+    @patch("services.orchestrator._advance")
+    @patch("services.orchestrator._advance_loop_body")
+    @patch("services.orchestrator.save_state")
+    @patch("services.orchestrator.load_state")
+    def test_concurrent_iteration_waits_for_others(self, mock_load_state, mock_save_state, mock_advance_loop, mock_advance, fake_redis):
+        from services.orchestrator import _loop_key, _loop_next_iteration
+
+        # All items launched (next_index == total); iteration 2 finishes first
+        _seed_loop(fake_redis, ["a", "b", "c"], 3, {"body_a": {"out": "c"}}, iter_index=2)
+
+        topo_data = {"loop_bodies": {"loop_1": ["body_a"]}, "loop_return_nodes": {}, "workflow_slug": "wf"}
+        _loop_next_iteration("exec-1", "loop_1", topo_data, MagicMock(), iter_index=2)
+
+        mock_advance_loop.assert_not_called()
+        mock_advance.assert_not_called()
+        # Result lands at its input position even though it finished first
+        assert _stored_results(fake_redis) == {2: {"body_a": {"out": "c"}}}
+        assert fake_redis.hget(_loop_key("exec-1", "loop_1"), "completed") == "1"
+
+    @patch("services.orchestrator._advance")
+    @patch("services.orchestrator._advance_loop_body")
+    @patch("services.orchestrator.save_state")
+    @patch("services.orchestrator.load_state")
+    def test_out_of_order_results_materialise_in_input_order(self, mock_load_state, mock_save_state, mock_advance_loop, mock_advance, fake_redis):
+        from services.orchestrator import _loop_iter_outputs_key, _loop_next_iteration
+
+        _seed_loop(fake_redis, ["a", "b", "c"], 3)
+        mock_load_state.return_value = {"node_outputs": {}}
+        topo_data = {"loop_bodies": {"loop_1": ["body_a"]}, "loop_return_nodes": {}, "workflow_slug": "wf"}
+
+        for i in (2, 0, 1):
+            fake_redis.hset(_loop_iter_outputs_key("exec-1", "loop_1", i), "body_a", json.dumps({"out": i}))
+            _loop_next_iteration("exec-1", "loop_1", topo_data, MagicMock(), iter_index=i)
+
+        mock_advance_loop.assert_not_called()
+        mock_advance.assert_called_once()
+        saved_state = mock_save_state.call_args[0][1]
+        assert saved_state["node_outputs"]["loop_1"]["results"] == [
+            {"body_a": {"out": 0}}, {"body_a": {"out": 1}}, {"body_a": {"out": 2}},
+        ]
+
+    @patch("services.orchestrator._advance")
+    @patch("services.orchestrator.save_state")
+    @patch("services.orchestrator.load_state")
+    def test_falls_back_to_shared_outputs(self, mock_load_state, mock_save_state, mock_advance, fake_redis):
+        from services.orchestrator import _loop_next_iteration
+
+        from services.orchestrator import _node_outputs_key
+
+        _seed_loop(fake_redis, ["a"], 1)
+        fake_redis.hset(_node_outputs_key("exec-1"), "body_a", json.dumps({"out": "shared"}))
+        mock_load_state.return_value = {"node_outputs": {"body_a": {"out": "shared"}}}
+
+        topo_data = {"loop_bodies": {"loop_1": ["body_a"]}, "loop_return_nodes": {}, "workflow_slug": "wf"}
+        _loop_next_iteration("exec-1", "loop_1", topo_data, MagicMock(), iter_index=0)
+
+        saved_state = mock_save_state.call_args[0][1]
+        assert saved_state["node_outputs"]["loop_1"]["results"] == [{"body_a": {"out": "shared"}}]
+
+
+class TestLoopIterationScoping:
+    def test_init_loop_state_stores_items_by_index(self, fake_redis):
+        from services.orchestrator import _init_loop_state, _loop_items_key, _loop_key
+
+        items = [{"n": i} for i in range(2500)]
+        _init_loop_state("exec-1", "loop_1", items, 2)
+
+        assert fake_redis.llen(_loop_items_key("exec-1", "loop_1")) == 2500
+        assert json.loads(fake_redis.lindex(_loop_items_key("exec-1", "loop_1"), 1234)) == {"n": 1234}
+        assert fake_redis.hgetall(_loop_key("exec-1", "loop_1")) == {
+            "total": "2500", "next_index": "2", "completed": "0",
+        }
+
+    def test_apply_loop_iteration_sets_context_and_outputs(self, fake_redis):
+        from services.orchestrator import _apply_loop_iteration
+
+        _seed_loop(fake_redis, ["a", "b", "c"], 1, {"body_a": {"out": "b!"}}, iter_index=1)
+
+        state = {"node_outputs": {"src": {"items": ["a", "b", "c"]}, "body_a": {"out": "stale"}}}
+        _apply_loop_iteration("exec-1", "loop_1", 1, state)
+
+        assert state["loop"] == {"item": "b", "index": 1, "total": 3}
+        assert state["node_outputs"]["body_a"] == {"out": "b!"}
+        assert state["node_outputs"]["src"] == {"items": ["a", "b", "c"]}
+
+    def test_owning_loop(self):
+        from services.orchestrator import _owning_loop
+
+        topo_data = {
+            "loop_bodies": {"loop_1": ["body_a"]},
+            "loop_body_all_nodes": {"loop_1": ["body_a", "body_b"]},
+        }
+        assert _owning_loop("body_b", topo_data) == "loop_1"
+        assert _owning_loop("other", topo_data) is None
+
+    @patch("services.orchestrator._publish_event")
+    @patch("services.orchestrator._queue")
+    @patch("services.orchestrator._redis")
+    def test_advance_propagates_iteration_to_body_successors(self, mock_redis_fn, mock_queue_fn, mock_pub):
+        from services.orchestrator import _advance
+
+        mock_r = _mock_redis()
+        mock_r.decr.return_value = 1
+        mock_redis_fn.return_value = mock_r
+        mock_q = MagicMock()
+        mock_queue_fn.return_value = mock_q
+
+        topo_data = {
+            "edges_by_source": {
+                "body_a": [
+                    {"edge_type": "direct", "target_node_id": "body_b", "edge_label": "", "condition_mapping": None, "condition_value": "", "priority": 0},
+                ]
+            },
+            "nodes": {"body_b": {"component_type": "agent", "node_id": "body_b"}},
+            "incoming_count": {},
+            "workflow_slug": "wf",
+            "loop_bodies": {"loop_1": ["body_a"]},
+            "loop_return_nodes": {"loop_1": ["body_b"]},
+            "loop_body_all_nodes": {"loop_1": ["body_a", "body_b"]},
+        }
+        _advance("exec-1", "body_a", {}, topo_data, MagicMock(), iter_index=4)
+
+        args = mock_q.enqueue.call_args[0]
+        assert args[1:] == ("exec-1", "body_b", 0, 4)
+
+
+# ── Nested loops ──────────────────────────────────────────────────────────────
+
+def _loop_edge(source: str, target: str, label: str) -> dict:
+    return {
+        "edge_type": "direct", "source_node_id": source, "target_node_id": target, "edge_label": label,
+        "condition_mapping": None, "condition_value": "", "priority": 0,
+    }
+
+
+def _nested_loop_topo() -> dict:
+    """outer loop -> [inner loop -> leaf] -> after, where after reads the inner results."""
+    return {
+        "workflow_slug": "wf",
+        "nodes": {
+            nid: {"node_id": nid, "component_type": ctype, "db_id": i, "interrupt_before": False, "interrupt_after": False}
+            for i, (nid, ctype) in enumerate([("outer", "loop"), ("inner", "loop"), ("leaf", "code"), ("after", "code")])
+        },
+        "edges_by_source": {
+            "outer": [_loop_edge("outer", "inner", "loop_body")],
+            "inner": [_loop_edge("inner", "leaf", "loop_body"), _loop_edge("inner", "after", "")],
+            "leaf": [_loop_edge("leaf", "inner", "loop_return")],
+            "after": [_loop_edge("after", "outer", "loop_return")],
+        },
+        "incoming_count": {},
+        "loop_bodies": {"outer": ["inner"], "inner": ["leaf"]},
+        "loop_return_nodes": {"outer": ["after"], "inner": ["leaf"]},
+        "loop_body_all_nodes": {"outer": ["inner", "after"], "inner": ["leaf"]},
+    }
+
+
+class TestNestedLoops:
+    @pytest.mark.parametrize("outer_concurrency", [1, 2])
+    @patch("services.orchestrator.execution_journal")
+    @patch("services.orchestrator._write_log")
+    @patch("services.orchestrator._publish_event")
+    def test_inner_loop_completes_into_its_outer_iteration(self, mock_pub, mock_log, mock_journal, fake_redis, outer_concurrency):
+        from collections import deque
+        from services.orchestrator import _execute_node, _inflight_key, load_state
+
+        outer_items = [[1, 2], [3, 4, 5], [6]]
+
+        def component(state):
+            node_id = state["current_node"]
+            if node_id == "outer":
+                return {"_loop": {"items": outer_items, "max_concurrency": outer_concurrency}, "items": outer_items}
+            if node_id == "inner":
+                return {"_loop": {"items": state["loop"]["item"]}, "items": state["loop"]["item"]}
+            if node_id == "leaf":
+                return {"output": state["loop"]["item"] * 10}
+            return {"output": [r["leaf"]["output"] for r in state["node_outputs"]["inner"]["results"]]}
+
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.first.return_value = MagicMock(status="running", started_at=None)
+        mock_db.get.return_value = MagicMock(component_config=MagicMock(system_prompt="", extra_config={}))
+
+        jobs: deque = deque()
+        fake_redis.set(_inflight_key("exec-1"), 1)
+        with (
+            patch("services.orchestrator._load_topology", return_value=_nested_loop_topo()),
+            patch("services.orchestrator._enqueue_node_job", side_effect=lambda eid, nid, **kw: jobs.append((nid, kw.get("loop_iteration")))),
+            patch("services.orchestrator._finalize") as mock_finalize,
+            patch("components.get_component_factory", return_value=lambda node: component),
+            patch("database.SessionLocal", return_value=mock_db),
+        ):
+            _execute_node("exec-1", "outer")
+            # Queued jobs run in order, so concurrent outer iterations interleave
+            while jobs:
+                node_id, loop_iteration = jobs.popleft()
+                _execute_node("exec-1", node_id, loop_iteration=loop_iteration)
+
+        results = load_state("exec-1")["node_outputs"]["outer"]["results"]
+        assert results == [{"after": {"output": [10 * x for x in item]}} for item in outer_items]
+        # Each outer iteration ran its own inner loop, dropped once complete
+        assert not fake_redis.keys("execution:exec-1:loop:inner@*")
+        assert fake_redis.get(_inflight_key("exec-1")) == "0"
+        mock_finalize.assert_called_once()
+
 
 # ── execute_node_job error paths ─────────────────────────────────────────────
 
@@ -375,7 +628,7 @@ class TestExecuteNodeJobErrors:
                     execute_node_job("exec-1", "agent_1", retry_count=0)
 
         # Should enqueue retry
-        mock_q.enqueue_in.assert_called_once()
+        mock_q.create_job.assert_called_once()
 
     @patch("services.orchestrator._advance")
     @patch("services.orchestrator._publish_event")
@@ -443,6 +696,61 @@ class TestExecuteNodeJobErrors:
         assert saved_state["custom_key"] == "custom_val"
         assert "switch_1" in saved_state["node_outputs"]
 
+    @patch("services.orchestrator._init_loop_state")
+    @patch("services.orchestrator._advance_loop_body")
+    @patch("services.orchestrator._publish_event")
+    @patch("services.orchestrator._redis")
+    @patch("services.orchestrator.save_state")
+    @patch("services.orchestrator.load_state")
+    @patch("services.orchestrator._load_topology")
+    def test_loop_starts_max_concurrency_iterations(self, mock_load_topo, mock_load_state, mock_save_state, mock_redis_fn, mock_pub, mock_advance_loop, mock_init):
+        from services.orchestrator import execute_node_job
+
+        mock_r = _mock_redis()
+        mock_redis_fn.return_value = mock_r
+
+        topo_data = {
+            "workflow_slug": "wf",
+            "nodes": {
+                "loop_1": {
+                    "node_id": "loop_1", "component_type": "loop",
+                    "db_id": 10, "component_config_id": 20,
+                    "interrupt_before": False, "interrupt_after": False,
+                }
+            },
+            "edges_by_source": {},
+            "incoming_count": {},
+            "loop_bodies": {"loop_1": ["body_a"]},
+            "loop_return_nodes": {},
+            "loop_body_all_nodes": {"loop_1": ["body_a"]},
+        }
+        mock_load_topo.return_value = topo_data
+        mock_load_state.return_value = {"messages": [], "node_outputs": {}, "trigger": {}}
+
+        mock_config = MagicMock()
+        mock_config.system_prompt = ""
+        mock_config.extra_config = {}
+        mock_db_node = MagicMock()
+        mock_db_node.component_config = mock_config
+
+        mock_db = MagicMock()
+        mock_execution = MagicMock()
+        mock_execution.status = "running"
+        mock_execution.started_at = None
+        mock_db.query.return_value.filter.return_value.first.return_value = mock_execution
+        mock_db.get.return_value = mock_db_node
+
+        def _component(state):
+            return {"_loop": {"items": ["a", "b", "c"], "max_concurrency": 2}, "items": ["a", "b", "c"]}
+
+        with patch("components.get_component_factory", return_value=lambda node: _component):
+            with patch("database.SessionLocal", return_value=mock_db):
+                with patch("services.orchestrator._write_log"):
+                    execute_node_job("exec-1", "loop_1")
+
+        assert [c[1]["iter_index"] for c in mock_advance_loop.call_args_list] == [0, 1]
+        mock_init.assert_called_once_with("exec-1", "loop_1", ["a", "b", "c"], 2, scope=None)
+
     @patch("services.orchestrator._publish_event")
     @patch("services.orchestrator._load_topology")
     def test_node_not_in_topology(self, mock_load_topo, mock_pub):
@@ -584,7 +892,7 @@ class TestAdvanceEdgeCases:
         }
 
         _advance("exec-1", "n1", {}, topo_data, MagicMock(), delay_seconds=3.0)
-        mock_q.enqueue_in.assert_called_once()
+        mock_q.create_job.assert_called_once()
 
     @patch("services.orchestrator._check_loop_body_done", return_value=False)
     @patch("services.orchestrator._finalize")
@@ -0,0 +1,78 @@
+"""Tests for routing jobs onto typed RQ queues."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from services.queues import (
+    CONTROL_QUEUE,
+    LLM_QUEUE,
+    SANDBOX_QUEUE,
+    queue_for_component,
+)
+
+
+class TestQueueForComponent:
+    @pytest.mark.parametrize("component_type", ["agent", "deep_agent", "categorizer", "chat_model"])
+    def test_llm_components(self, component_type):
+        assert queue_for_component(component_type) == LLM_QUEUE
+
+    def test_code_runs_in_sandbox_queue(self):
+        assert queue_for_component("code") == SANDBOX_QUEUE
+
+    @pytest.mark.parametrize("component_type", ["switch", "merge", "loop", "filter", "unknown_type"])
+    def test_everything_else_is_control(self, component_type):
+        assert queue_for_component(component_type) == CONTROL_QUEUE
+
+
+class TestEnqueueNodeJobRouting:
+    TOPO = {
+        "nodes": {
+            "agent_1": {"component_type": "agent"},
+            "code_1": {"component_type": "code"},
+            "switch_1": {"component_type": "switch"},
+        },
+    }
+
+    @pytest.mark.parametrize("node_id,queue_name", [
+        ("agent_1", LLM_QUEUE),
+        ("code_1", SANDBOX_QUEUE),
+        ("switch_1", CONTROL_QUEUE),
+    ])
+    @patch("services.orchestrator._queue")
+    def test_routes_by_component_type(self, mock_queue_fn, node_id, queue_name):
+        from services.orchestrator import _enqueue_node_job
+
+        _enqueue_node_job("exec-1", node_id, topo_data=self.TOPO)
+
+        mock_queue_fn.assert_called_once_with(queue_name)
+        mock_queue_fn.return_value.enqueue.assert_called_once()
+
+    @patch("services.orchestrator._load_topology", side_effect=RuntimeError("gone"))
+    @patch("services.orchestrator._queue")
+    def test_unknown_topology_falls_back_to_control(self, mock_queue_fn, _mock_load):
+        from services.orchestrator import _enqueue_node_job
+
+        _enqueue_node_job("exec-1", "agent_1")
+
+        mock_queue_fn.assert_called_once_with()
+        mock_queue_fn.return_value.enqueue.assert_called_once()
+
+
+class TestWorkerProfiles:
+    def test_profiles_size_from_their_settings(self):
+        import fakeredis
+        from rq import Queue
+
+        from worker_class import LLMWorker, SandboxWorker
+
+        conn = fakeredis.FakeRedis()
+        with patch("worker_class.setup_logging"), \
+                patch("worker_class.settings", MagicMock(WORKER_CONCURRENCY=5, SANDBOX_WORKER_CONCURRENCY=2)):
+            llm = LLMWorker([Queue(LLM_QUEUE, connection=conn)], connection=conn)
+            sandbox = SandboxWorker([Queue(SANDBOX_QUEUE, connection=conn)], connection=conn)
+
+        assert llm.concurrency == 5
+        assert sandbox.concurrency == 2
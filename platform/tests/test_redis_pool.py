@@ -0,0 +1,99 @@
+"""Tests for services/redis_pool.py — shared pools and per-job command counting."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def fake_pool():
+    """Back pooled clients with an in-process fakeredis server."""
+    import fakeredis
+    import redis
+
+    server = fakeredis.FakeServer()
+    pools = {
+        decode: redis.ConnectionPool(
+            connection_class=fakeredis.FakeRedisConnection, server=server, decode_responses=decode,
+        )
+        for decode in (True, False)
+    }
+    with patch("services.redis_pool._pool", side_effect=lambda decode: pools[decode]):
+        yield pools
+
+
+class TestPools:
+    def test_pool_reused_per_url_and_decoding(self):
+        from services.redis_pool import _pool, reset_pools
+
+        reset_pools()
+        try:
+            assert _pool(True) is _pool(True)
+            assert _pool(False) is _pool(False)
+            assert _pool(True) is not _pool(False)
+        finally:
+            reset_pools()
+
+    def test_pool_settings(self):
+        from config import settings
+        from services.redis_pool import _pool, reset_pools
+
+        reset_pools()
+        try:
+            pool = _pool(True)
+            assert pool.max_connections == settings.REDIS_POOL_MAX_CONNECTIONS
+            assert pool.connection_kwargs["health_check_interval"] == settings.REDIS_HEALTH_CHECK_INTERVAL
+            assert pool.connection_kwargs["decode_responses"] is True
+        finally:
+            reset_pools()
+
+    def test_decoded_and_binary_clients(self, fake_pool):
+        from services.redis_pool import get_redis, get_redis_binary
+
+        get_redis().set("k", "v")
+        assert get_redis().get("k") == "v"
+        assert get_redis_binary().get("k") == b"v"
+
+
+class TestCountCommands:
+    def test_counts_commands_and_round_trips(self, fake_pool):
+        from services.redis_pool import count_commands, get_redis
+
+        r = get_redis()
+        with count_commands() as counter:
+            r.set("a", 1)
+            r.incr("a")
+            pipe = r.pipeline()
+            pipe.incr("a")
+            pipe.expire("a", 10)
+            pipe.get("a")
+            pipe.execute()
+
+        assert counter.commands == 5
+        assert counter.round_trips == 3
+
+    def test_not_counted_outside_context(self, fake_pool):
+        from services.redis_pool import count_commands, get_redis
+
+        r = get_redis()
+        r.set("a", 1)
+        with count_commands() as counter:
+            pass
+        r.get("a")
+        assert counter.commands == 0
+
+    @patch("services.orchestrator._execute_node_and_fused")
+    def test_execute_node_job_logs_command_count(self, mock_run, fake_pool, caplog):
+        import logging
+
+        from services.orchestrator import execute_node_job
+        from services.redis_pool import get_redis
+
+        mock_run.side_effect = lambda *args: get_redis().set("x", 1)
+        with caplog.at_level(logging.DEBUG, logger="services.orchestrator"):
+            execute_node_job("exec-1", "node_a")
+
+        # The node's command plus the heartbeat written when the job starts
+        assert "Node job node_a issued 2 Redis commands in 2 round-trips" in caplog.text
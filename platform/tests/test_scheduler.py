@@ -129,6 +129,25 @@ class TestStateMachine:
         assert scheduled_job.run_count == 1
         mock_enqueue.assert_not_called()
 
+    @patch("services.scheduler._enqueue_next")
+    @patch("services.scheduler._dispatch_scheduled_trigger")
+    @patch("services.scheduler.SessionLocal")
+    def test_backpressure_skips_the_run(self, mock_session_cls, mock_dispatch, mock_enqueue, db, scheduled_job):
+        """Full queues → same run retried after the interval, not counted as a failure."""
+        from services.admission import BackpressureError
+
+        mock_dispatch.side_effect = BackpressureError("Execution queues are full")
+        mock_session = MagicMock()
+        mock_session.get.return_value = scheduled_job
+        mock_session_cls.return_value = mock_session
+
+        execute_scheduled_job(scheduled_job.id, current_repeat=2, current_retry=0)
+
+        assert scheduled_job.error_count == 0
+        assert scheduled_job.run_count == 0
+        assert scheduled_job.status == "active"
+        mock_enqueue.assert_called_once_with(scheduled_job, 2, 0, 300)
+
     @patch("services.scheduler._enqueue_next")
     @patch("services.scheduler._dispatch_scheduled_trigger", side_effect=Exception("trigger failed"))
     @patch("services.scheduler.SessionLocal")
@@ -658,10 +677,11 @@ class TestEnqueueNext:
         mock_conn = MagicMock()
         mock_queue = MagicMock()
 
-        with patch("redis.from_url", return_value=mock_conn), \
-             patch("rq.Queue", return_value=mock_queue):
+        with patch("services.redis_pool.get_redis_binary", return_value=mock_conn), \
+             patch("rq.Queue", return_value=mock_queue) as mock_queue_cls:
             _enqueue_next(scheduled_job, 0, 0, 300)
 
+        assert mock_queue_cls.call_args[1]["connection"] is mock_conn
         assert scheduled_job.next_run_at is not None
         mock_queue.enqueue_in.assert_called_once()
         call_kwargs = mock_queue.enqueue_in.call_args[1]
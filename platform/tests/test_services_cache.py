@@ -207,7 +207,13 @@ class TestTaskWrappers:
         from tasks import execute_node_job
         with patch("services.orchestrator.execute_node_job") as mock_fn:
             execute_node_job("exec-1", "node-1", 0)
-            mock_fn.assert_called_once_with("exec-1", "node-1", 0)
+            mock_fn.assert_called_once_with("exec-1", "node-1", 0, None)
+
+    def test_execute_node_job_loop_iteration(self):
+        from tasks import execute_node_job
+        with patch("services.orchestrator.execute_node_job") as mock_fn:
+            execute_node_job("exec-1", "node-1", 0, 3)
+            mock_fn.assert_called_once_with("exec-1", "node-1", 0, 3)
 
     def test_start_execution_job(self):
         from tasks import start_execution_job
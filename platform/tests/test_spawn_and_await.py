@@ -11,6 +11,7 @@ from unittest.mock import MagicMock, call, patch
 import pytest
 
 from models.execution import WorkflowExecution
+from tests.redis_mocks import forward_pipeline
 
 
 def _make_node(component_type, workflow_id, node_id="tool_node_1"):
@@ -368,7 +369,7 @@ class TestInterruptFlow:
                 "workflow_slug": "child-workflow",
                 "input_text": f"Task {i}",
             }
-            with patch("redis.from_url", return_value=MagicMock()), \
+            with patch("services.redis_pool.get_redis_binary", return_value=MagicMock()), \
                  patch("rq.Queue", return_value=MagicMock()):
                 child_id = _create_child_from_interrupt(task_data, state, "agent_1")
                 child_ids.append(child_id)
@@ -414,7 +415,7 @@ class TestInterruptFlow:
             "input_text": "Do something",
         }
 
-        with patch("redis.from_url", return_value=MagicMock()), \
+        with patch("services.redis_pool.get_redis_binary", return_value=MagicMock()), \
              patch("rq.Queue", return_value=MagicMock()):
             child_id = _create_child_from_interrupt(task_data, state, "agent_1")
 
@@ -481,7 +482,7 @@ class TestInterruptFlow:
             "input_text": "Do something",
         }
 
-        with patch("redis.from_url", return_value=MagicMock()), \
+        with patch("services.redis_pool.get_redis_binary", return_value=MagicMock()), \
              patch("rq.Queue", return_value=MagicMock()):
             child_id = _create_child_from_interrupt(task_data, state, "agent_1")
 
@@ -531,7 +532,7 @@ class TestInterruptFlow:
             "input_text": "Do something",
         }
 
-        with patch("redis.from_url", return_value=MagicMock()), \
+        with patch("services.redis_pool.get_redis_binary", return_value=MagicMock()), \
              patch("rq.Queue", return_value=MagicMock()):
             child_id = _create_child_from_interrupt(task_data, state, "agent_1")
 
@@ -635,7 +636,7 @@ class TestSpawnDepthLimit:
         }
         task_data = {"workflow_slug": "child-wf", "input_text": "test"}
 
-        with patch("redis.from_url", return_value=MagicMock()), \
+        with patch("services.redis_pool.get_redis_binary", return_value=MagicMock()), \
              patch("rq.Queue", return_value=MagicMock()):
             child_id = _create_child_from_interrupt(task_data, state, "agent_1")
 
@@ -1034,7 +1035,7 @@ class TestCreateChildEdgeCases:
             "input_data": {},
         }
 
-        with patch("redis.from_url", return_value=MagicMock()), \
+        with patch("services.redis_pool.get_redis_binary", return_value=MagicMock()), \
              patch("rq.Queue", return_value=MagicMock()):
             child_id = _create_child_from_interrupt(task_data, state, "agent_1")
 
@@ -1779,7 +1780,7 @@ class TestExecuteNodeJobSpawnPaths:
         mock_db.get.return_value = mock_db_node
 
         topo = self._make_topo_data()
-        mock_redis = MagicMock()
+        mock_redis = forward_pipeline(MagicMock())
 
         def fake_factory(node):
             def fn(state):
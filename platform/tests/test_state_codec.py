@@ -0,0 +1,107 @@
+"""Tests for the Redis execution state codec."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from config import settings
+from services import state_codec
+
+
+@pytest.fixture(autouse=True)
+def codec_settings(monkeypatch):
+    monkeypatch.setattr(settings, "STATE_JSON_ENCODER", "orjson")
+    monkeypatch.setattr(settings, "STATE_COMPRESSION", "zstd")
+    monkeypatch.setattr(settings, "STATE_COMPRESSION_MIN_BYTES", 256)
+
+
+def _large():
+    return {"rows": [{"id": i, "status": "shipped", "note": "left the warehouse"} for i in range(100)]}
+
+
+class TestEncode:
+    def test_small_values_are_plain_compact_json(self):
+        assert state_codec.encode({"a": [1, 2]}) == '{"a":[1,2]}'
+        assert state_codec.encode({1: "x"}) == '{"1":"x"}'
+
+    def test_stdlib_encoder(self, monkeypatch):
+        monkeypatch.setattr(settings, "STATE_JSON_ENCODER", "json")
+        assert state_codec.encode({"a": [1, 2]}) == json.dumps({"a": [1, 2]})
+
+    def test_values_orjson_rejects_fall_back_to_json(self):
+        assert state_codec.decode(state_codec.encode(2 ** 70)) == 2 ** 70
+
+    @pytest.mark.parametrize("algorithm, tag", [("zstd", state_codec.ZSTD_TAG), ("zlib", state_codec.ZLIB_TAG)])
+    def test_large_values_are_compressed(self, monkeypatch, algorithm, tag):
+        monkeypatch.setattr(settings, "STATE_COMPRESSION", algorithm)
+        encoded = state_codec.encode(_large())
+
+        assert encoded.startswith(tag)
+        assert len(encoded) < len(json.dumps(_large())) / 4
+        assert state_codec.decode(encoded) == _large()
+        # Deterministic, so save_state's diff sees no change
+        assert state_codec.encode(_large()) == encoded
+
+    def test_compression_off(self, monkeypatch):
+        monkeypatch.setattr(settings, "STATE_COMPRESSION", "none")
+        assert state_codec.encode(_large()).startswith("{")
+
+    def test_incompressible_values_stay_plain(self):
+        noise = "".join(chr(0x100 + b) for b in os.urandom(600))
+        assert state_codec.encode(noise) == state_codec.dumps(noise)
+
+
+class TestDecode:
+    def test_reads_values_written_before_the_codec(self):
+        assert state_codec.decode(json.dumps({"a": [1, 2]})) == {"a": [1, 2]}
+        assert state_codec.decode(b'{"a": 1}') == {"a": 1}
+        assert math.isnan(state_codec.decode(json.dumps(float("nan"))))
+
+    def test_reads_every_frame_whatever_the_settings(self, monkeypatch):
+        monkeypatch.setattr(settings, "STATE_COMPRESSION", "zlib")
+        framed = state_codec.encode(_large())
+        monkeypatch.setattr(settings, "STATE_COMPRESSION", "none")
+        monkeypatch.setattr(settings, "STATE_JSON_ENCODER", "json")
+
+        assert state_codec.decode(framed) == _large()
+
+    def test_unknown_frame(self):
+        with pytest.raises(ValueError):
+            state_codec.decode("~x9:abc")
+
+
+class TestExecutionState:
+    def test_conversation_round_trip(self):
+        from services.orchestrator import _messages_key, load_state, save_state
+
+        r = fakeredis.FakeRedis(decode_responses=True)
+        messages = [
+            HumanMessage(content="Where is order 1234?", id="m1"),
+            AIMessage(
+                content="",
+                id="m2",
+                tool_calls=[{"name": "lookup_order", "args": {"order_id": "1234"}, "id": "call_1"}],
+                usage_metadata={"input_tokens": 120, "output_tokens": 18, "total_tokens": 138},
+            ),
+            ToolMessage(content=json.dumps(_large()), tool_call_id="call_1", id="m3"),
+            AIMessage(content="It shipped yesterday.", id="m4"),
+        ]
+        with patch("services.orchestrator._redis", return_value=r):
+            save_state("exec-1", {"messages": messages, "route": "", "node_outputs": {"a": _large()}})
+            stored = r.lrange(_messages_key("exec-1"), 0, -1)
+            state = load_state("exec-1")
+
+        # Each message is a log entry of its own, compressed if it is large
+        assert len(stored) == 4
+        assert stored[2].startswith(state_codec.ZSTD_TAG)
+        assert not stored[3].startswith(state_codec.ZSTD_TAG)
+        assert [(m.type, m.content) for m in state["messages"]] == [(m.type, m.content) for m in messages]
+        assert state["messages"][1].tool_calls[0]["args"] == {"order_id": "1234"}
+        assert state["node_outputs"]["a"] == _large()
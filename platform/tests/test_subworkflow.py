@@ -296,7 +296,7 @@ class TestCreateChildExecutionImplicit:
             obj.execution_id = "child-exec-abc"
         mock_db.refresh.side_effect = refresh_side_effect
 
-        with patch("redis.from_url"), \
+        with patch("services.redis_pool.get_redis_binary"), \
              patch("rq.Queue") as mock_queue_cls:
             mock_q = MagicMock()
             mock_queue_cls.return_value = mock_q
@@ -338,7 +338,7 @@ class TestCreateChildExecutionImplicit:
             obj.execution_id = "child-fallback"
         mock_db.refresh.side_effect = refresh_side_effect
 
-        with patch("redis.from_url"), \
+        with patch("services.redis_pool.get_redis_binary"), \
              patch("rq.Queue") as mock_queue_cls:
             mock_queue_cls.return_value = MagicMock()
 
@@ -423,7 +423,7 @@ class TestCreateChildExecutionImplicit:
             obj.execution_id = "child-from-parent"
         mock_db.refresh.side_effect = refresh_side_effect
 
-        with patch("redis.from_url"), \
+        with patch("services.redis_pool.get_redis_binary"), \
              patch("rq.Queue") as mock_queue_cls:
             mock_queue_cls.return_value = MagicMock()
 
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import pytest
 
-from services.topology import build_topology, _reachable_node_ids, SUB_COMPONENT_TYPES
+from services.topology import build_topology, compile_plan, plan_tables, _reachable_node_ids, SUB_COMPONENT_TYPES
 
 
 class TestReachableNodeIds:
@@ -235,6 +235,69 @@ class TestBuildTopology:
             build_topology(workflow, db, trigger_node_id=trigger.id)
 
 
+class TestPlanTables:
+    """Test the compiled plan's lookup tables."""
+
+    _add_node = TestBuildTopology._add_node
+    _add_edge = TestBuildTopology._add_edge
+
+    def test_loop_lookups(self, db, workflow):
+        trigger = self._add_node(db, workflow, "trigger_1", "trigger_manual")
+        self._add_node(db, workflow, "loop_1", "loop")
+        self._add_node(db, workflow, "body_a", "code")
+        self._add_node(db, workflow, "body_b", "code")
+        self._add_node(db, workflow, "after", "code")
+
+        self._add_edge(db, workflow, "trigger_1", "loop_1")
+        self._add_edge(db, workflow, "loop_1", "body_a", edge_label="loop_body")
+        self._add_edge(db, workflow, "body_a", "body_b")
+        self._add_edge(db, workflow, "body_b", "loop_1", edge_label="loop_return")
+        self._add_edge(db, workflow, "loop_1", "after")
+        db.commit()
+
+        plan = compile_plan(build_topology(workflow, db, trigger_node_id=trigger.id))
+
+        assert plan["owning_loop"] == {"body_a": "loop_1", "body_b": "loop_1"}
+        assert plan["completion_role"] == {"body_b": "loop_1"}
+        assert plan["loop_completion_nodes"] == {"loop_1": ["body_b"]}
+        # loop_body/loop_return edges are not flow successors
+        assert plan["direct_successors"] == {"loop_1": ["after"], "body_a": ["body_b"]}
+
+    def test_routes_and_fan_in(self, db, workflow):
+        trigger = self._add_node(db, workflow, "trigger_1", "trigger_manual")
+        self._add_node(db, workflow, "switch_1", "switch")
+        self._add_node(db, workflow, "code_a", "code")
+        self._add_node(db, workflow, "code_b", "code")
+        self._add_node(db, workflow, "merge_1", "merge")
+        self._add_node(db, workflow, "reply", "reply_chat")
+
+        self._add_edge(db, workflow, "trigger_1", "switch_1")
+        self._add_edge(db, workflow, "switch_1", "code_a", edge_type="conditional", condition_value="a")
+        self._add_edge(db, workflow, "switch_1", "code_b", edge_type="conditional", condition_value="b")
+        self._add_edge(db, workflow, "code_a", "merge_1")
+        self._add_edge(db, workflow, "code_b", "merge_1")
+        self._add_edge(db, workflow, "merge_1", "reply")
+        db.commit()
+
+        plan = compile_plan(build_topology(workflow, db, trigger_node_id=trigger.id))
+
+        assert plan["conditional_routes"] == {"switch_1": {"a": "code_a", "b": "code_b"}}
+        assert plan["direct_successors"]["switch_1"] == []
+        assert plan["fan_in"] == {"merge_1": 2}
+        assert sorted(plan["predecessors"]["merge_1"]) == ["code_a", "code_b"]
+        assert plan["has_reply_chat"] is True
+        assert "reply" not in plan["direct_successors"]
+
+    def test_condition_value_overrides_legacy_mapping(self):
+        edge = {
+            "source_node_id": "sw", "target_node_id": "x", "edge_type": "conditional",
+            "edge_label": "", "condition_mapping": {"a": "legacy_a", "z": "legacy_z"},
+            "condition_value": "a", "priority": 0,
+        }
+        tables = plan_tables({"nodes": {}, "edges_by_source": {"sw": [edge]}})
+        assert tables["conditional_routes"]["sw"] == {"a": "x", "z": "legacy_z"}
+
+
 class TestSubComponentTypes:
     def test_known_sub_components(self):
         expected = {"ai_model", "run_command", "output_parser", "memory_read",
@@ -44,7 +44,7 @@ def anon_client(app):
 
 class TestManualExecuteView:
     def test_valid_manual_trigger(self, authed_client, db, user_profile, manual_trigger, workflow):
-        with patch("handlers.redis") as mock_redis, \
+        with patch("handlers.get_redis_binary"), \
              patch("handlers.Queue") as mock_queue_cls:
             mock_queue_cls.return_value.enqueue.return_value = None
             response = authed_client.post(
@@ -0,0 +1,75 @@
+"""Tests for the concurrent AsyncPipelitWorker."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+from rq import Queue
+from rq.job import JobStatus
+
+from logging_config import execution_id_var
+
+
+def sleepy_job(seconds: float) -> str:
+    time.sleep(seconds)
+    return "done"
+
+
+def context_job(execution_id: str) -> str:
+    execution_id_var.set(execution_id)
+    time.sleep(0.1)
+    return execution_id_var.get()
+
+
+def failing_job() -> None:
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def queue():
+    return Queue("workflows", connection=fakeredis.FakeRedis())
+
+
+def _worker(queue, concurrency):
+    from worker_class import AsyncPipelitWorker
+
+    with patch("worker_class.setup_logging"):
+        return AsyncPipelitWorker([queue], connection=queue.connection, concurrency=concurrency)
+
+
+class TestAsyncPipelitWorker:
+    def test_runs_jobs_concurrently(self, queue):
+        jobs = [queue.enqueue(sleepy_job, 0.5) for _ in range(4)]
+        worker = _worker(queue, concurrency=4)
+
+        started = time.monotonic()
+        assert worker.work(burst=True) is True
+        elapsed = time.monotonic() - started
+
+        assert all(job.get_status(refresh=True) == JobStatus.FINISHED for job in jobs)
+        assert elapsed < 1.5  # four half-second jobs, not run one after another
+
+    def test_logging_context_stays_per_job(self, queue):
+        jobs = [queue.enqueue(context_job, f"exec-{i}") for i in range(3)]
+        _worker(queue, concurrency=3).work(burst=True)
+
+        assert [job.return_value(refresh=True) for job in jobs] == ["exec-0", "exec-1", "exec-2"]
+
+    def test_failed_job_frees_its_slot(self, queue):
+        failed = queue.enqueue(failing_job)
+        ok = queue.enqueue(sleepy_job, 0)
+        _worker(queue, concurrency=1).work(burst=True)
+
+        assert failed.get_status(refresh=True) == JobStatus.FAILED
+        assert ok.get_status(refresh=True) == JobStatus.FINISHED
+
+    def test_slots_are_registered_and_removed(self, queue):
+        from rq import Worker
+
+        worker = _worker(queue, concurrency=2)
+        assert [slot.name for slot in worker._slots] == [f"{worker.name}.0", f"{worker.name}.1"]
+        worker.work(burst=True)
+        assert Worker.all(connection=queue.connection) == []
@@ -55,7 +55,7 @@ class TestBroadcastJsonDefault:
 
 
 class TestBroadcast:
-    @patch("ws.broadcast.redis_lib.from_url")
+    @patch("ws.broadcast.get_redis")
     def test_broadcast_with_data(self, mock_from_url):
         from ws.broadcast import broadcast
 
@@ -72,9 +72,10 @@ class TestBroadcast:
         assert payload["channel"] == "workflow:my-wf"
         assert payload["data"]["node_id"] == "n1"
         assert "timestamp" in payload
-        mock_r.close.assert_called_once()
+        # Pooled client — the connection goes back to the pool, not closed
+        mock_r.close.assert_not_called()
 
-    @patch("ws.broadcast.redis_lib.from_url")
+    @patch("ws.broadcast.get_redis")
     def test_broadcast_without_data(self, mock_from_url):
         from ws.broadcast import broadcast
 
@@ -86,7 +87,7 @@ class TestBroadcast:
         payload = json.loads(mock_r.publish.call_args[0][1])
         assert "data" not in payload
 
-    @patch("ws.broadcast.redis_lib.from_url")
+    @patch("ws.broadcast.get_redis")
     def test_broadcast_with_datetime_data(self, mock_from_url):
         from ws.broadcast import broadcast
 
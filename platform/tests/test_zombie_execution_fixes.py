@@ -250,16 +250,20 @@ class TestInflightDecrementOnException:
         def exploding_factory(node):
             raise RuntimeError("Unexpected kaboom")
 
-        with patch("database.SessionLocal", return_value=mock_db):
-            with patch("components.get_component_factory", return_value=exploding_factory):
-                execute_node_job("exec-1", "agent_1")
+        with (
+            patch("database.SessionLocal", return_value=mock_db),
+            patch("components.get_component_factory", return_value=exploding_factory),
+            patch("services.orchestrator._execution_logs") as mock_logs,
+        ):
+            execute_node_job("exec-1", "agent_1")
 
         # MUST decrement inflight
         mock_r.decr.assert_called()
         # MUST mark execution as failed
         assert mock_execution.status == "failed"
         assert "kaboom" in mock_execution.error_message
-        # MUST clean up Redis
+        # MUST write buffered log rows, then clean up Redis
+        mock_logs.flush.assert_called()
         mock_cleanup.assert_called_once_with("exec-1")
 
     @patch("services.orchestrator._cleanup_redis")
@@ -390,12 +394,13 @@ class TestFinalizeExceptionSafety:
         # Cleanup MUST always run
         mock_cleanup.assert_called_once_with("exec-1")
 
+    @patch("services.orchestrator._execution_logs")
     @patch("services.orchestrator._cleanup_redis")
     @patch("services.orchestrator._complete_episode")
     @patch("services.orchestrator._get_workflow_slug", return_value="wf")
     @patch("services.orchestrator._publish_event")
     @patch("services.orchestrator.load_state")
-    def test_successful_finalize_still_cleans_redis(self, mock_load_state, mock_pub, mock_slug, mock_episode, mock_cleanup):
+    def test_successful_finalize_still_cleans_redis(self, mock_load_state, mock_pub, mock_slug, mock_episode, mock_cleanup, mock_logs):
         """Normal completion should also clean Redis (moved to finally block)."""
         from services.orchestrator import _finalize
 
@@ -495,6 +500,7 @@ class TestLLMCredentialNullChecks:
 # ── Fix 3.1: _publish_event failure safety ────────────────────────────────────
 
 
+@pytest.mark.usefixtures("sync_events")
 class TestPublishEventSafety:
     """Fix 3.1: _publish_event must not raise on Redis/serialization failures."""
 
@@ -514,7 +520,7 @@ class TestPublishEventSafety:
         from services.orchestrator import _publish_event
 
         mock_r = MagicMock()
-        mock_r.publish.side_effect = ConnectionError("Redis publish failed")
+        mock_r.pipeline.return_value.execute.side_effect = ConnectionError("Redis publish failed")
         mock_redis_fn.return_value = mock_r
 
         # Should NOT raise
@@ -531,7 +537,7 @@ class TestPublishEventSafety:
         _publish_event("exec-1", "node_status", {"node_id": "n1"}, workflow_slug="wf")
 
         # Should have published to both channels
-        assert mock_r.publish.call_count == 2
+        assert mock_r.pipeline.return_value.publish.call_count == 2
 
 
 # ── Execution timeout enforcement ─────────────────────────────────────────────
@@ -578,11 +584,15 @@ class TestExecutionTimeout:
         mock_execution.parent_node_id = None
         mock_db.query.return_value.filter.return_value.first.return_value = mock_execution
 
-        with patch("database.SessionLocal", return_value=mock_db):
+        with (
+            patch("database.SessionLocal", return_value=mock_db),
+            patch("services.orchestrator._execution_logs") as mock_logs,
+        ):
             execute_node_job("exec-1", "agent_1")
 
         assert mock_execution.status == "failed"
         assert "timed out" in mock_execution.error_message
+        mock_logs.flush.assert_called()
         mock_cleanup.assert_called_once_with("exec-1")
 
     @patch("services.orchestrator._publish_event")
@@ -1,19 +1,188 @@
-"""Custom RQ Worker with unified logging.
+"""Custom RQ Workers with unified logging.
 
-Launch with:
-    rq worker --worker-class worker_class.PipelitWorker workflows --with-scheduler
+Jobs are routed to typed queues (see ``services.queues``); each queue gets
+a worker profile sized to its resource profile:
+
+    rq worker --worker-class worker_class.PipelitWorker maintenance workflows --with-scheduler
+    rq worker-pool workflows -w worker_class.PipelitWorker -n 2
+    rq worker --worker-class worker_class.LLMWorker llm --with-scheduler
+    rq worker --worker-class worker_class.SandboxWorker sandbox --with-scheduler
+
+RQ's scheduler only moves delayed jobs (retries, loop delays) of the queues
+its worker listens on, hence ``--with-scheduler`` on each profile.
 """
 
 from __future__ import annotations
 
+import asyncio
 import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
 
 from rq import SimpleWorker
+from rq.exceptions import StopRequested
+from rq.job import Job
+from rq.queue import Queue
+from rq.timeouts import TimerDeathPenalty
+from rq.utils import now
+from rq.worker import WorkerStatus
 
+from config import settings
 from logging_config import setup_logging
 
+# How long the dispatcher blocks waiting for a job before re-checking for
+# shutdown and heartbeating idle slots.
+DISPATCH_POLL_SECONDS = 5
+
 
 class PipelitWorker(SimpleWorker):
     def __init__(self, *args, **kwargs):
         setup_logging(f"Worker-{os.getpid()}")
         super().__init__(*args, **kwargs)
+
+
+class _Slot(SimpleWorker):
+    """One concurrent job lane of an ``AsyncPipelitWorker``.
+
+    Registered as an RQ worker of its own, so each running job has a live
+    owner in the started-job registry, just as under ``PipelitWorker``.
+    Signals only reach the main thread, so job timeouts use a timer.
+    """
+
+    death_penalty_class = TimerDeathPenalty
+
+
+class AsyncPipelitWorker(PipelitWorker):
+    """Runs up to ``concurrency`` node jobs at once in one process.
+
+    Node jobs spend most of their time waiting on LLM HTTP calls, so a
+    process per in-flight job mostly holds idle memory. This worker runs an
+    event loop that dequeues from the same queues whenever a slot is free
+    and hands each job to a bounded thread pool. Jobs run the usual
+    synchronous orchestrator and component code unchanged; blocking network
+    I/O releases the GIL. The ``tasks`` wrappers set ``execution_id_var`` and
+    ``node_id_var`` inside the job's own thread, so log context stays per job.
+    Cached component instances are shared by those threads; see
+    ``components.REUSABLE_COMPONENTS`` for what that requires of them.
+
+    Differences from ``PipelitWorker``: job timeouts are enforced by a timer
+    instead of SIGALRM, so an agent's inactivity timeout does not apply (the
+    job timeout remains the hard ceiling). ``--with-scheduler`` forks RQ's
+    scheduler before the dispatcher starts any job thread.
+    """
+
+    concurrency_setting = "WORKER_CONCURRENCY"
+
+    def __init__(self, *args, concurrency: int | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.concurrency = concurrency or getattr(settings, self.concurrency_setting)
+        self._slots = [
+            _Slot(
+                self.queues,
+                name=f"{self.name}.{i}",
+                connection=self.connection,
+                job_class=self.job_class,
+                queue_class=self.queue_class,
+                serializer=self.serializer,
+            )
+            for i in range(self.concurrency)
+        ]
+
+    def work(self, burst: bool = False, logging_level: str | None = None, max_jobs: int | None = None, **kwargs) -> bool:
+        """Dispatch jobs to slots until stopped; returns whether any job ran.
+
+        ``burst`` returns once the queues are empty and running jobs have
+        finished. ``max_idle_time`` and dequeue strategies are not supported.
+        """
+        self.bootstrap(logging_level or "INFO")
+        for slot in self._slots:
+            slot.register_birth()
+            slot.set_state(WorkerStatus.IDLE)
+        if kwargs.get("with_scheduler"):
+            self._start_scheduler(burst, logging_level or "INFO")
+        try:
+            return asyncio.run(self._dispatch(burst, max_jobs))
+        finally:
+            for slot in self._slots:
+                slot.register_death()
+            self.teardown()
+
+    async def _dispatch(self, burst: bool, max_jobs: int | None) -> bool:
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        self._install_loop_signal_handlers(loop, stop)
+
+        idle: asyncio.Queue[_Slot] = asyncio.Queue()
+        for slot in self._slots:
+            idle.put_nowait(slot)
+        running: set[asyncio.Future] = set()
+        started = 0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="job") as pool:
+            while not stop.is_set() and (max_jobs is None or started < max_jobs):
+                slot = await idle.get()
+                self.check_for_suspension(burst)
+                if self.should_run_maintenance_tasks:
+                    self.run_maintenance_tasks()
+                for waiting in self._slots:
+                    if waiting.get_state() == WorkerStatus.IDLE:
+                        waiting.heartbeat()
+
+                result = await asyncio.to_thread(self._dequeue, None if burst else DISPATCH_POLL_SECONDS)
+                if result is None:
+                    idle.put_nowait(slot)
+                    if burst:
+                        if not running:
+                            break
+                        # Jobs still running may enqueue successors
+                        await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                job, queue = result
+                started += 1
+                future = loop.run_in_executor(pool, self._execute, slot, job, queue)
+                running.add(future)
+                future.add_done_callback(lambda f, s=slot: (running.discard(f), idle.put_nowait(s)))
+
+            if running:
+                self.log.info("Worker %s: waiting for %d running jobs", self.name, len(running))
+                await asyncio.wait(running)
+        return started > 0
+
+    def _dequeue(self, timeout: int | None) -> tuple[Job, Queue] | None:
+        try:
+            return self.dequeue_job_and_maintain_ttl(timeout, max_idle_time=timeout)
+        except StopRequested:
+            return None
+
+    def _execute(self, slot: _Slot, job: Job, queue: Queue) -> None:
+        try:
+            slot.execute_job(job, queue)
+        except Exception:
+            self.log.exception("Worker %s: slot %s failed running job %s", self.name, slot.name, job.id)
+        finally:
+            slot.heartbeat()
+
+    def _install_loop_signal_handlers(self, loop: asyncio.AbstractEventLoop, stop: asyncio.Event) -> None:
+        def request_stop(signum: int) -> None:
+            if stop.is_set():
+                self.request_force_stop(signum, None)
+            self.log.info("Worker %s: warm shut down requested, finishing running jobs", self.name)
+            self._shutdown_requested_date = now()
+            self._stop_requested = True
+            stop.set()
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, request_stop, signum)
+
+
+class LLMWorker(AsyncPipelitWorker):
+    """Profile for the ``llm`` queue: many concurrent jobs, each mostly
+    waiting on a model. Sized by ``WORKER_CONCURRENCY``."""
+
+
+class SandboxWorker(AsyncPipelitWorker):
+    """Profile for the ``sandbox`` queue: a few concurrent jobs, each holding
+    a sandboxed process's CPU and memory. Sized by ``SANDBOX_WORKER_CONCURRENCY``."""
+
+    concurrency_setting = "SANDBOX_WORKER_CONCURRENCY"
@@ -7,9 +7,7 @@ import time
 from datetime import date, datetime
 from decimal import Decimal
 
-import redis as redis_lib
-
-from config import settings
+from services.redis_pool import get_redis
 
 
 def _json_default(obj: object) -> str | float:
@@ -26,11 +24,7 @@ def broadcast(channel: str, event_type: str, data: dict | None = None) -> None:
 
     Sync function safe to call from FastAPI endpoints and RQ workers.
     """
-    r = redis_lib.from_url(settings.REDIS_URL, decode_responses=True)
-    try:
-        payload: dict = {"type": event_type, "channel": channel, "timestamp": time.time()}
-        if data is not None:
-            payload["data"] = data
-        r.publish(channel, json.dumps(payload, default=_json_default))
-    finally:
-        r.close()
+    payload: dict = {"type": event_type, "channel": channel, "timestamp": time.time()}
+    if data is not None:
+        payload["data"] = data
+    get_redis().publish(channel, json.dumps(payload, default=_json_default))